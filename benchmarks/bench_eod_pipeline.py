@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+benchmarks/bench_eod_pipeline.py
+
+Offline benchmark for the CN EOD pipeline (AShareDailyEngine), no DB / no network.
+
+Stages (timed separately, same order as _execute_pipeline):
+  snapshot   : synthetic datasources against the in-memory provider / recorded fixture load
+  factors    : _compute_factors
+  phase2     : _build_phase2 + distribution risk + structure facts + execution summary
+  gate       : _make_gate_decision
+  prediction : _generate_prediction
+  report     : _generate_report (ReportEngine.build_report + render + write)
+  persist    : presiste_data (SQLite L1/L2)
+
+Each pass runs in a fresh temp working directory (state/, data/, reports/ and run\\*
+are cwd-relative in the engine), with config/ linked in so YAML lookups match a
+repo-root run. Wall time is the median over --repeat untraced passes; peak memory
+comes from one extra pass under tracemalloc (its overhead would distort timings).
+
+Usage (from repo root):
+  # synthetic market, 5k and 10k symbols, compare with stored baseline
+  python benchmarks/bench_eod_pipeline.py --symbols 5000 10000
+
+  # recorded fixtures (a copy of run/temp from a production run)
+  python benchmarks/bench_eod_pipeline.py --fixtures path/to/run_temp --trade-date 2026-01-09
+
+  # refresh the stored baseline after an intended change
+  python benchmarks/bench_eod_pipeline.py --symbols 5000 10000 --update-baseline
+
+Exit code 1 when any stage regresses beyond tolerance vs. the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Ensure repo root on sys.path
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core.engines.cn.ashare_daily_engine import AShareDailyEngine, _ur_open_persist_conn  # noqa: E402
+from core.regime.observation.structure.structure_facts_builder import StructureFactsBuilder  # noqa: E402
+
+from benchmarks.fixtures import build_synthetic_snapshot, load_recorded_snapshot  # noqa: E402
+from benchmarks.stub_providers import build_provider, stub_db_providers  # noqa: E402
+
+
+STAGES = ("snapshot", "factors", "phase2", "gate", "prediction", "report", "persist")
+
+DEFAULT_BASELINE = REPO_ROOT / "benchmarks" / "baselines" / "eod_pipeline.json"
+DEFAULT_TRADE_DATE = "2026-01-09"
+
+# absolute floors so sub-10ms stages do not flap on relative tolerance alone
+MIN_WALL_DELTA_S = 0.05
+MIN_MEM_DELTA_MB = 5.0
+
+
+class BenchEngine(AShareDailyEngine):
+    """AShareDailyEngine with the snapshot injected instead of fetched."""
+
+    def __init__(self, trade_date: str, snapshot_fn: Callable[[], Dict[str, Any]]):
+        super().__init__(refresh_mode="readonly", trade_date_override=trade_date)
+        self._snapshot_fn = snapshot_fn
+
+    def _fetch_snapshot(self) -> Dict[str, Any]:
+        return self._snapshot_fn()
+
+
+class _StageMeter:
+    def __init__(self, track_memory: bool):
+        self.track_memory = bool(track_memory)
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if self.track_memory:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - t0
+            rec = {"wall_s": round(wall, 4)}
+            if self.track_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                rec["peak_mb"] = round(max(peak - base, 0) / (1024 * 1024), 2)
+            self.results[name] = rec
+
+
+@contextlib.contextmanager
+def _bench_workdir(keep: bool) -> Iterator[Path]:
+    prev = os.getcwd()
+    wd = Path(tempfile.mkdtemp(prefix="ur_bench_"))
+    try:
+        cfg = wd / "config"
+        try:
+            os.symlink(REPO_ROOT / "config", cfg, target_is_directory=True)
+        except (OSError, NotImplementedError):
+            shutil.copytree(REPO_ROOT / "config", cfg)
+        for d in ("data/persistent", "state", "run\\temp", "run\\reports", "run/temp", "run/reports"):
+            (wd / d).mkdir(parents=True, exist_ok=True)
+        os.chdir(wd)
+        yield wd
+    finally:
+        os.chdir(prev)
+        if keep:
+            print(f"[bench] workdir kept: {wd}")
+        else:
+            shutil.rmtree(wd, ignore_errors=True)
+
+
+def run_once(
+    trade_date: str,
+    snapshot_fn: Callable[[], Dict[str, Any]],
+    track_memory: bool = False,
+    keep_workdir: bool = False,
+) -> Dict[str, Dict[str, float]]:
+    """One full pipeline pass; returns {stage: {"wall_s", "peak_mb"?}}."""
+    meter = _StageMeter(track_memory)
+    with _bench_workdir(keep_workdir):
+        _ur_open_persist_conn("./data/persistent/unifiedrisk.db").close()
+
+        eng = BenchEngine(trade_date, snapshot_fn)
+        eng._init_persistence()
+        try:
+            eng.weights_cfg = eng._load_weights_cfg()
+            fp = eng.weights_cfg.get("factor_pipeline", {}) if isinstance(eng.weights_cfg, dict) else {}
+            structure_keys = fp.get("structure_factors", []) if isinstance(fp, dict) else []
+            if not isinstance(structure_keys, list):
+                structure_keys = []
+
+            with meter.stage("snapshot"):
+                eng.snapshot = eng._fetch_snapshot()
+
+            with meter.stage("factors"):
+                eng.factors = eng._compute_factors(eng.snapshot)
+
+            with meter.stage("phase2"):
+                bound = eng._build_phase2({})
+                eng._distribution_risk_active = eng._compute_distribution_risk(structure=bound["structure"])
+                bound["structure"] = StructureFactsBuilder(spec=eng._load_structure_facts_cfg()).build(
+                    factors=eng.factors,
+                    structure_keys=structure_keys,
+                    distribution_risk_active=eng._distribution_risk_active,
+                    drs_signal=eng._extract_drs_signal(bound),
+                )
+                bound["execution_summary"] = eng._build_execution_summary(
+                    structure=bound["structure"],
+                    observations=bound.get("observations", {}),
+                )
+
+            with meter.stage("gate"):
+                eng.gate = eng._make_gate_decision(bound)
+
+            with meter.stage("prediction"):
+                eng._generate_prediction(bound)
+
+            with meter.stage("report"):
+                report_text, des_payload = eng._generate_report(bound)
+
+            prev_conn = eng._conn
+            with meter.stage("persist"):
+                eng.presiste_data(report_text=report_text, des_payload=des_payload)
+            try:
+                prev_conn.close()
+            except Exception:
+                pass
+        finally:
+            try:
+                if getattr(eng, "_conn", None):
+                    eng._conn.close()
+            except Exception:
+                pass
+    return meter.results
+
+
+def _aggregate(samples: List[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, Any]]:
+    out: Dict[str, Dict[str, Any]] = {}
+    for st in STAGES:
+        walls = [s[st]["wall_s"] for s in samples if st in s]
+        if not walls:
+            continue
+        rec: Dict[str, Any] = {
+            "wall_s": round(statistics.median(walls), 4),
+            "wall_samples": walls,
+        }
+        out[st] = rec
+    return out
+
+
+def run_scenario(
+    name: str,
+    trade_date: str,
+    snapshot_fn: Callable[[], Dict[str, Any]],
+    repeat: int,
+    track_memory: bool,
+    keep_workdir: bool,
+) -> Dict[str, Any]:
+    samples: List[Dict[str, Dict[str, float]]] = []
+    for i in range(max(int(repeat), 1)):
+        t0 = time.perf_counter()
+        samples.append(run_once(trade_date, snapshot_fn, False, keep_workdir and i == 0))
+        print(f"[bench] {name} pass {i + 1}/{repeat} {time.perf_counter() - t0:.2f}s")
+    stages = _aggregate(samples)
+
+    if track_memory:
+        tracemalloc.start()
+        try:
+            mem = run_once(trade_date, snapshot_fn, True, False)
+        finally:
+            tracemalloc.stop()
+        for st, rec in mem.items():
+            if st in stages and "peak_mb" in rec:
+                stages[st]["peak_mb"] = rec["peak_mb"]
+        print(f"[bench] {name} memory pass done")
+    return {
+        "trade_date": trade_date,
+        "repeat": int(repeat),
+        "stages": stages,
+        "total_wall_s": round(sum(v["wall_s"] for v in stages.values()), 4),
+    }
+
+
+def compare_to_baseline(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    wall_tol: float,
+    mem_tol: float,
+) -> List[str]:
+    """Return human-readable regression lines (empty list = pass)."""
+    regressions: List[str] = []
+    base_scenarios = baseline.get("scenarios", {}) if isinstance(baseline, dict) else {}
+    for scen, cur in current.get("scenarios", {}).items():
+        base = base_scenarios.get(scen)
+        if not isinstance(base, dict):
+            print(f"[bench] {scen}: no baseline entry (run with --update-baseline)")
+            continue
+        for st, rec in cur.get("stages", {}).items():
+            b = base.get("stages", {}).get(st)
+            if not isinstance(b, dict):
+                continue
+            bw, cw = b.get("wall_s"), rec.get("wall_s")
+            if isinstance(bw, (int, float)) and isinstance(cw, (int, float)):
+                if cw > bw * (1.0 + wall_tol) and cw - bw > MIN_WALL_DELTA_S:
+                    regressions.append(f"{scen}.{st}: wall {bw:.3f}s -> {cw:.3f}s (+{(cw / bw - 1.0) * 100.0:.0f}%)")
+            bm, cm = b.get("peak_mb"), rec.get("peak_mb")
+            if isinstance(bm, (int, float)) and isinstance(cm, (int, float)):
+                if cm > bm * (1.0 + mem_tol) and cm - bm > MIN_MEM_DELTA_MB:
+                    regressions.append(f"{scen}.{st}: peak {bm:.1f}MB -> {cm:.1f}MB")
+    return regressions
+
+
+def _print_table(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    base_scenarios = (baseline or {}).get("scenarios", {})
+    for scen, cur in result.get("scenarios", {}).items():
+        base = base_scenarios.get(scen, {}).get("stages", {})
+        print(f"\n== {scen} (trade_date={cur.get('trade_date')}, repeat={cur.get('repeat')}) ==")
+        print(f"{'stage':<12}{'wall_s':>10}{'base_s':>10}{'peak_mb':>10}{'base_mb':>10}")
+        for st in STAGES:
+            rec = cur.get("stages", {}).get(st)
+            if not rec:
+                continue
+            b = base.get(st, {})
+
+            def _fmt(v: Any, nd: int) -> str:
+                return f"{v:.{nd}f}" if isinstance(v, (int, float)) else "-"
+
+            print(
+                f"{st:<12}{_fmt(rec.get('wall_s'), 3):>10}{_fmt(b.get('wall_s'), 3):>10}"
+                f"{_fmt(rec.get('peak_mb'), 1):>10}{_fmt(b.get('peak_mb'), 1):>10}"
+            )
+        print(f"{'total':<12}{cur.get('total_wall_s', 0.0):>10.3f}")
+
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data if isinstance(data, dict) else {}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Offline EOD pipeline benchmark (in-memory DB stubs)")
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--symbols", type=int, nargs="+", default=None, help="synthetic market sizes, e.g. 5000 10000")
+    src.add_argument("--fixtures", type=str, default=None, help="recorded run/temp directory or snapshot JSON")
+    ap.add_argument("--trade-date", type=str, default=None, help=f"trade date (synthetic default {DEFAULT_TRADE_DATE})")
+    ap.add_argument("--seed", type=int, default=None, help="synthetic market seed")
+    ap.add_argument("--repeat", type=int, default=3, help="timing passes per scenario (median reported)")
+    ap.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass (no peak_mb)")
+    ap.add_argument("--baseline", type=str, default=str(DEFAULT_BASELINE))
+    ap.add_argument("--update-baseline", action="store_true")
+    ap.add_argument("--wall-tolerance", type=float, default=0.30, help="relative wall-time slack (0.30 = +30%%)")
+    ap.add_argument("--mem-tolerance", type=float, default=0.20, help="relative peak-memory slack")
+    ap.add_argument("--out", type=str, default=None, help="write result JSON here")
+    ap.add_argument("--keep-workdir", action="store_true", help="keep the first pass temp workdir for inspection")
+    args = ap.parse_args(argv)
+
+    track_memory = not args.no_memory
+
+    scenarios: Dict[str, Any] = {}
+    if args.fixtures:
+        snap = load_recorded_snapshot(args.fixtures, trade_date=args.trade_date)
+        td = snap["trade_date"]
+        name = f"recorded:{Path(args.fixtures).name}"
+        scenarios[name] = run_scenario(
+            name, td, lambda: json.loads(json.dumps(snap)), args.repeat, track_memory, args.keep_workdir
+        )
+    else:
+        td = args.trade_date or DEFAULT_TRADE_DATE
+        for n in args.symbols or [5000]:
+            t0 = time.perf_counter()
+            provider = build_provider(td, n_symbols=n, seed=args.seed)
+            print(f"[bench] synthetic market n={n} built in {time.perf_counter() - t0:.2f}s")
+            name = f"synthetic_{n}"
+            with stub_db_providers(provider):
+                scenarios[name] = run_scenario(
+                    name, td, lambda: build_synthetic_snapshot(td), args.repeat, track_memory, args.keep_workdir
+                )
+            scenarios[name]["provider_calls"] = dict(provider.calls)
+
+    result = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "track_memory": track_memory,
+        "scenarios": scenarios,
+    }
+
+    baseline_path = Path(args.baseline)
+    baseline = _load_json(baseline_path)
+    _print_table(result, baseline)
+
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        merged = dict(baseline) if baseline else {}
+        merged.setdefault("scenarios", {})
+        for scen, cur in scenarios.items():
+            merged["scenarios"][scen] = {
+                "trade_date": cur["trade_date"],
+                "stages": {st: {k: v for k, v in rec.items() if k != "wall_samples"} for st, rec in cur["stages"].items()},
+                "total_wall_s": cur["total_wall_s"],
+            }
+        merged["updated_at"] = result["generated_at"]
+        merged["python"] = result["python"]
+        merged["platform"] = result["platform"]
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with baseline_path.open("w", encoding="utf-8") as f:
+            json.dump(merged, f, ensure_ascii=False, indent=2)
+        print(f"\n[bench] baseline updated: {baseline_path}")
+        return 0
+
+    if not baseline:
+        print(f"\n[bench] no baseline at {baseline_path} (run with --update-baseline)")
+        return 0
+
+    regressions = compare_to_baseline(result, baseline, args.wall_tolerance, args.mem_tolerance)
+    if regressions:
+        print("\n[bench] REGRESSIONS:")
+        for line in regressions:
+            print("  - " + line)
+        return 1
+    print("\n[bench] OK: within baseline tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+benchmarks/fixtures.py
+
+Snapshot sources for the offline EOD benchmark.
+
+- load_recorded_snapshot(): rebuild snapshot from a recorded run/temp directory
+  (the *_raw.json / index_tech.json / trend_in_force.json / etf_spot_sync_daily.json
+  dumps written by AshareDataFetcher.prepare_daily_market_snapshot).
+- build_synthetic_snapshot(): run the DB-backed datasources + fact block builders
+  against an InMemoryMarketProvider (see stub_providers.py).
+
+Network-only sources (akshare / yfinance: north_nps, margin, market_sentiment, global_*,
+core_theme, sector_proxy, rotation_snapshot, watchlist_*) are not synthesized; their
+factors degrade to NEUTRAL/MISSING exactly as they do in production when data is missing.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.adapters.block_builder.cn.index_tech_blkbd import IndexTechBlockBuilder
+from core.adapters.block_builder.cn.trend_facts_blkbd import TrendFactsBlockBuilder
+from core.adapters.block_builder.cn.unified_emotion_blkbd import UnifiedEmotionBlockBuilder
+from core.adapters.block_builder.cn.watchlist_lead_blkbd import WatchlistLeadBlockBuilder
+from core.adapters.datasources.cn.amount_source import AmountDataSource
+from core.adapters.datasources.cn.breadth_plus_source import BreadthPlusDataSource
+from core.adapters.datasources.cn.breadth_source import BreadthDataSource
+from core.adapters.datasources.cn.etf_flow_source import ETFFlowDataSource
+from core.adapters.datasources.cn.etf_spot_sync_daily_source import ETFSpotSyncDailyDataSource
+from core.adapters.datasources.cn.futures_basis_source import FuturesBasisDataSource
+from core.adapters.datasources.cn.index_core_source import IndexCoreDateSource
+from core.adapters.datasources.cn.liquidity_quality_source import LiquidityQualityDataSource
+from core.adapters.datasources.cn.options_risk_source import OptionsRiskDataSource
+from core.adapters.datasources.cn.participation_source import ParticipationDataSource
+from core.datasources.datasource_base import DataSourceConfig
+from core.utils.logger import get_logger
+
+LOG = get_logger("Bench.Fixtures")
+
+# legacy dump names -> snapshot keys
+_RECORDED_ALIASES = {
+    "index_core_rawtch": "index_core_raw",
+}
+
+# dumps that are pipeline outputs, not snapshot inputs
+_RECORDED_SKIP = {
+    "des_payload",
+}
+
+
+def _recorded_key(path: Path) -> str:
+    # On non-Windows hosts the fetcher's r"run\\temp\\x.json" lands as a flat file
+    # literally named "run\\temp\\x.json"; keep only the last segment.
+    name = path.name.replace("\\", "/").rsplit("/", 1)[-1]
+    stem = name[:-5] if name.endswith(".json") else name
+    return _RECORDED_ALIASES.get(stem, stem)
+
+
+def load_recorded_snapshot(src: str, trade_date: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load a recorded snapshot directory (or a single snapshot JSON file).
+
+    trade_date falls back to the first block carrying a string "trade_date".
+    """
+    p = Path(src)
+    if p.is_file():
+        with p.open("r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if not isinstance(snapshot, dict):
+            raise ValueError(f"snapshot file is not a JSON object: {p}")
+    elif p.is_dir():
+        snapshot = {}
+        for fp in sorted(p.iterdir()):
+            if not fp.is_file() or not fp.name.endswith(".json"):
+                continue
+            key = _recorded_key(fp)
+            if key in _RECORDED_SKIP:
+                continue
+            try:
+                with fp.open("r", encoding="utf-8") as f:
+                    snapshot[key] = json.load(f)
+            except Exception as e:
+                LOG.warning("[Bench.Fixtures] skip unreadable fixture %s: %s", fp, e)
+    else:
+        raise FileNotFoundError(f"fixture path not found: {src}")
+
+    if trade_date:
+        snapshot["trade_date"] = str(trade_date)
+    elif not isinstance(snapshot.get("trade_date"), str):
+        for v in snapshot.values():
+            if isinstance(v, dict) and isinstance(v.get("trade_date"), str):
+                snapshot["trade_date"] = v["trade_date"]
+                break
+    if not isinstance(snapshot.get("trade_date"), str):
+        raise ValueError("trade_date not found in fixtures; pass --trade-date")
+    return snapshot
+
+
+def _synthetic_sources() -> List[Tuple[str, Callable[[], Any]]]:
+    """(snapshot_key, datasource factory) in fetcher order."""
+    return [
+        ("breadth_raw", lambda: BreadthDataSource(DataSourceConfig(market="cn", ds_name="breadth"))),
+        ("amount_raw", lambda: AmountDataSource(DataSourceConfig(market="cn", ds_name="amount"))),
+        ("index_core_raw", lambda: IndexCoreDateSource(DataSourceConfig(market="cn", ds_name="index_core"))),
+        ("etf_flow_raw", lambda: ETFFlowDataSource(DataSourceConfig(market="cn", ds_name="etf_flow"))),
+        ("futures_basis_raw", lambda: FuturesBasisDataSource(DataSourceConfig(market="cn", ds_name="futures_basis"))),
+        ("liquidity_quality_raw", lambda: LiquidityQualityDataSource(DataSourceConfig(market="cn", ds_name="liquidity_quality"))),
+        ("options_risk_raw", lambda: OptionsRiskDataSource(DataSourceConfig(market="cn", ds_name="options_risk"))),
+        ("participation_raw", lambda: ParticipationDataSource(DataSourceConfig(market="cn", ds_name="participation"))),
+        ("etf_spot_sync_daily", lambda: ETFSpotSyncDailyDataSource(DataSourceConfig(market="cn", ds_name="etf_spot_sync_daily"))),
+        ("breadth_plus_raw", lambda: BreadthPlusDataSource(DataSourceConfig(market="cn", ds_name="breadth_plus"))),
+    ]
+
+
+def build_synthetic_snapshot(trade_date: str, refresh_mode: str = "full") -> Dict[str, Any]:
+    """
+    Build a snapshot the way AshareDataFetcher does, restricted to DB-backed sources.
+
+    Must run inside stub_db_providers() (datasource modules are imported at module
+    load so the patch sweep sees them); caches are written under the current
+    working directory (DataSourceConfig resolves data_root relative to cwd).
+    """
+    snapshot: Dict[str, Any] = {"trade_date": str(trade_date)}
+
+    for key, factory in _synthetic_sources():
+        try:
+            snapshot[key] = factory().build_block(trade_date=str(trade_date), refresh_mode=refresh_mode)
+        except Exception as e:
+            LOG.warning("[Bench.Fixtures] synthetic source failed key=%s err=%s", key, e)
+            snapshot[key] = {}
+
+    builders: List[Tuple[str, Callable[[Dict[str, Any]], Any]]] = [
+        ("unified_emotion_raw", lambda s: UnifiedEmotionBlockBuilder().build_block(s, refresh_mode=refresh_mode)),
+        ("watchlist_lead_input_raw", lambda s: WatchlistLeadBlockBuilder().build_block(s)),
+        ("index_tech", lambda s: IndexTechBlockBuilder().build_block(s)),
+        ("trend_in_force", lambda s: TrendFactsBlockBuilder().build_block(s)),
+    ]
+    for key, build in builders:
+        try:
+            snapshot[key] = build(snapshot)
+        except Exception as e:
+            LOG.warning("[Bench.Fixtures] synthetic block builder failed key=%s err=%s", key, e)
+            snapshot[key] = {}
+
+    return snapshot
+
+
+def dump_snapshot(snapshot: Dict[str, Any], out_dir: str) -> None:
+    """Write snapshot blocks as <key>.json so they can be replayed as recorded fixtures."""
+    os.makedirs(out_dir, exist_ok=True)
+    for key, block in snapshot.items():
+        if key == "trade_date":
+            continue
+        with open(os.path.join(out_dir, f"{key}.json"), "w", encoding="utf-8") as f:
+            json.dump(block, f, ensure_ascii=False, indent=2, default=str)
@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""
+benchmarks/stub_providers.py
+
+In-memory replacements for the market DB providers used by the EOD pipeline.
+
+- SyntheticMarket: deterministic (seeded) daily panel of N symbols + core indices.
+- InMemoryMarketProvider: DBMySQLMarketProvider-compatible object served from a
+  SyntheticMarket (same row shapes / DataFrame contracts as the SQL methods).
+- stub_db_providers(): context manager that swaps every module-level reference to
+  DBMySQLMarketProvider / get_db_provider under core.* for the in-memory provider.
+
+No network, no MySQL/Oracle. Raw SQL (execute / execute_mysql) is rejected on purpose,
+so an un-stubbed query path fails loudly instead of silently skewing timings.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import sys
+from collections import namedtuple
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.adapters.providers.db_columnar import STOCK_CLOSE_DTYPES, columns_frame
+from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider
+from core.adapters.providers import db_provider_factory, db_provider_router
+
+
+StockRow = namedtuple("StockRow", ["symbol", "exchange", "trade_date", "pre_close", "chg_pct", "close", "amount"])
+IndexRow = namedtuple("IndexRow", ["index_code", "trade_date", "close"])
+IndexPrevRow = namedtuple("IndexPrevRow", ["index_code", "trade_date", "pre_close", "close"])
+
+# index_code -> (beta to the equal-weight market, base level)
+INDEX_CODES: Dict[str, tuple] = {
+    "sh000001": (0.9, 3200.0),
+    "sz399001": (1.1, 10500.0),
+    "sh000300": (0.8, 3900.0),
+    "sh000905": (1.2, 5800.0),
+    "sh000852": (1.3, 6100.0),
+    "sh000016": (0.7, 2700.0),
+    "sh000688": (1.5, 1000.0),
+}
+
+# (first code, exchange, share of universe)
+_BOARDS = (
+    (600000, "SH", 0.30),
+    (1, "SZ", 0.25),
+    (300001, "SZ", 0.25),
+    (688001, "SH", 0.12),
+    (830001, "BJ", 0.08),
+)
+
+
+def _to_date(x: Any) -> date:
+    return pd.to_datetime(x).date()
+
+
+class SyntheticMarket:
+    """
+    Deterministic daily market panel.
+
+    closes/pre_closes/amounts are (days, symbols) float arrays aligned with
+    self.dates (weekdays only, ascending) and self.symbols.
+    """
+
+    def __init__(self, trade_date: str, n_symbols: int = 5000, history_days: int = 260, seed: int = 20260109):
+        self.trade_date = _to_date(trade_date)
+        self.n_symbols = int(n_symbols)
+        self.seed = int(seed)
+
+        rng = np.random.default_rng(self.seed)
+
+        dates = pd.bdate_range(end=pd.Timestamp(self.trade_date), periods=int(history_days))
+        self.dates: List[date] = [d.date() for d in dates]
+        self._date_index = pd.DatetimeIndex(dates)
+
+        symbols: List[str] = []
+        exchanges: List[str] = []
+        for first, exch, share in _BOARDS:
+            k = int(round(self.n_symbols * share)) + 1
+            symbols.extend(f"{first + i:06d}" for i in range(k))
+            exchanges.extend([exch] * k)
+        self.symbols = np.array(symbols[: self.n_symbols], dtype=object)
+        self.exchanges = np.array(exchanges[: self.n_symbols], dtype=object)
+
+        n_days = len(self.dates)
+        n = len(self.symbols)
+
+        # one market factor + idiosyncratic noise; returns in fraction
+        mkt = rng.normal(0.0003, 0.011, size=n_days)
+        beta = rng.uniform(0.6, 1.4, size=n)
+        idio = rng.normal(0.0, 0.018, size=(n_days, n))
+        rets = np.clip(mkt[:, None] * beta[None, :] + idio, -0.095, 0.095)
+        rets[0, :] = 0.0
+
+        base = rng.uniform(3.0, 80.0, size=n)
+        closes = np.round(base[None, :] * np.cumprod(1.0 + rets, axis=0), 2)
+        pre_closes = np.vstack([closes[:1, :], closes[:-1, :]])
+        amounts = np.round(rng.lognormal(mean=18.0, sigma=1.1, size=(n_days, n)), 2)
+
+        self.closes = closes
+        self.pre_closes = pre_closes
+        self.chg_pct = np.round((closes / pre_closes - 1.0) * 100.0, 4)
+        self.amounts = amounts
+
+        self.index_closes: Dict[str, np.ndarray] = {}
+        for code, (b, level) in INDEX_CODES.items():
+            self.index_closes[code] = np.round(level * np.cumprod(1.0 + mkt * b), 2)
+
+        # small per-day aggregates used by the C/D/E blocks
+        self.etf_flow = rng.normal(0.0, 5e8, size=n_days)
+        self.etf_volume = rng.lognormal(mean=22.0, sigma=0.2, size=n_days)
+        self.etf_amount = rng.lognormal(mean=24.0, sigma=0.2, size=n_days)
+        self.fut_basis = rng.normal(-12.0, 8.0, size=n_days)
+        self.fut_volume = rng.lognormal(mean=12.0, sigma=0.3, size=n_days)
+        self.opt_change = rng.normal(0.0, 0.02, size=n_days)
+        self.opt_volume = rng.lognormal(mean=14.0, sigma=0.3, size=n_days)
+        self.opt_close = rng.uniform(0.05, 0.4, size=n_days)
+
+    # ------------------------------------------------------------
+    def day_slice(self, start: Any, end: Any) -> slice:
+        lo = int(self._date_index.searchsorted(pd.Timestamp(_to_date(start)), side="left"))
+        hi = int(self._date_index.searchsorted(pd.Timestamp(_to_date(end)), side="right"))
+        return slice(lo, hi)
+
+
+class InMemoryMarketProvider(DBMySQLMarketProvider):
+    """
+    DBMySQLMarketProvider served from a SyntheticMarket.
+
+    Only the query methods reached by the EOD datasources are overridden; the
+    snapshot helpers (load_full_market_eod_snapshot / *_frame / load_latest_*) are
+    inherited and run on top of the overridden query_stock_closes(_frame) /
+    query_last_trade_date.
+    """
+
+    def __init__(self, market: SyntheticMarket):
+        # Intentionally no super().__init__(): no engine, no config, no network.
+        self.market = market
+        self.mysql_engine = None
+        self.tables = {
+            "stock_daily": "MEM_STOCK_DAILY",
+            "index_daily": "MEM_INDEX_DAILY",
+            "fund_etf_hist": "MEM_ETF_HIST",
+        }
+        self.schema = "MEM"
+        self.calls: Dict[str, int] = {}
+
+    def _hit(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    # ------------------------------------------------------------
+    def execute(self, sql: str, params: Dict[str, Any] | None = None):
+        return self.execute_mysql(sql, params)
+
+    def execute_mysql(self, sql: str, params: Dict[str, Any] | None = None):
+        self._hit("execute_mysql")
+        raise RuntimeError("InMemoryMarketProvider: raw SQL is not supported")
+
+    # ------------------------------------------------------------
+    def query_stock_closes(self, window_start, trade_date) -> List[StockRow]:
+        self._hit("query_stock_closes")
+        m = self.market
+        sl = m.day_slice(window_start, trade_date)
+        rows: List[StockRow] = []
+        n = len(m.symbols)
+        for di in range(sl.start, sl.stop):
+            d = m.dates[di]
+            rows.extend(
+                map(
+                    StockRow._make,
+                    zip(
+                        m.symbols,
+                        m.exchanges,
+                        [d] * n,
+                        m.pre_closes[di].tolist(),
+                        m.chg_pct[di].tolist(),
+                        m.closes[di].tolist(),
+                        m.amounts[di].tolist(),
+                    ),
+                )
+            )
+        return rows
+
+    def query_stock_closes_frame(self, window_start, trade_date) -> pd.DataFrame:
+        self._hit("query_stock_closes_frame")
+        m = self.market
+        sl = m.day_slice(window_start, trade_date)
+        n_days, n = sl.stop - sl.start, len(m.symbols)
+        return columns_frame(
+            {
+                "symbol": np.tile(m.symbols, n_days),
+                "exchange": np.tile(m.exchanges, n_days),
+                "trade_date": np.repeat(m._date_index[sl].values, n),
+                "pre_close": m.pre_closes[sl].ravel(),
+                "chg_pct": m.chg_pct[sl].ravel(),
+                "close": m.closes[sl].ravel(),
+                "amount": m.amounts[sl].ravel(),
+            },
+            STOCK_CLOSE_DTYPES,
+        )
+
+    def query_index_closes(self, index_code: str, window_start, trade_date) -> List[IndexRow]:
+        self._hit("query_index_closes")
+        m = self.market
+        series = m.index_closes.get(str(index_code))
+        if series is None:
+            return []
+        sl = m.day_slice(window_start, trade_date)
+        return [IndexRow(str(index_code), m.dates[i], float(series[i])) for i in range(sl.start, sl.stop)]
+
+    def query_index_close_with_prev(self, index_code: str, trade_date) -> List[IndexPrevRow]:
+        self._hit("query_index_close_with_prev")
+        m = self.market
+        series = m.index_closes.get(str(index_code))
+        sl = m.day_slice(trade_date, trade_date)
+        if series is None or sl.stop <= sl.start:
+            return []
+        i = sl.start
+        prev = float(series[i - 1]) if i > 0 else float(series[i])
+        return [IndexPrevRow(str(index_code), m.dates[i], prev, float(series[i]))]
+
+    def query_last_trade_date(self, as_of_date) -> date:
+        self._hit("query_last_trade_date")
+        m = self.market
+        sl = m.day_slice(m.dates[0], as_of_date)
+        if sl.stop <= 0:
+            raise RuntimeError(f"no trade_date found <= {as_of_date}")
+        return m.dates[sl.stop - 1]
+
+    # ------------------------------------------------------------
+    def _calendar_slice(self, start_date, look_back_days: int) -> slice:
+        end = _to_date(start_date)
+        return self.market.day_slice(end - timedelta(days=int(look_back_days)), end)
+
+    def fetch_daily_amount_series(self, start_date: str, look_back_days: int = 60) -> pd.DataFrame:
+        self._hit("fetch_daily_amount_series")
+        m = self.market
+        sl = self._calendar_slice(start_date, look_back_days)
+        totals = m.amounts[sl].sum(axis=1)
+        df = pd.DataFrame(
+            {
+                "trade_date": pd.to_datetime(m.dates[sl]),
+                "total_amount": np.round(totals / 1e8, 2),
+            }
+        )
+        return df.set_index("trade_date")
+
+    def fetch_daily_new_low_stats(self, trade_date: str, look_back_days: int = 150) -> pd.DataFrame:
+        self._hit("fetch_daily_new_low_stats")
+        m = self.market
+        sl = self._calendar_slice(trade_date, look_back_days)
+        closes = pd.DataFrame(m.closes[sl])
+        low50 = closes.rolling(50, min_periods=1).min()
+        total = closes.notna().sum(axis=1).to_numpy()
+        new_low = (closes == low50).sum(axis=1).to_numpy()
+        df = pd.DataFrame(
+            {
+                "trade_date": pd.to_datetime(m.dates[sl]),
+                "count_total": total,
+                "count_new_low_50d": new_low,
+                "new_low_50d_ratio": np.round(new_low * 100.0 / np.maximum(total, 1), 2),
+            }
+        )
+        return df.sort_values("trade_date", ascending=False).head(30).reset_index(drop=True)
+
+    def fetch_etf_hist_series(self, start_date: str, look_back_days: int = 60) -> pd.DataFrame:
+        self._hit("fetch_etf_hist_series")
+        m = self.market
+        sl = self._calendar_slice(start_date, look_back_days)
+        df = pd.DataFrame(
+            {
+                "trade_date": pd.to_datetime(m.dates[sl]),
+                "total_change_amount": m.etf_flow[sl].astype(float),
+                "total_volume": m.etf_volume[sl].astype(float),
+                "total_amount": m.etf_amount[sl].astype(float),
+            }
+        )
+        return df.set_index("trade_date")
+
+    def fetch_futures_basis_series(self, start_date: str, look_back_days: int = 60) -> pd.DataFrame:
+        self._hit("fetch_futures_basis_series")
+        m = self.market
+        sl = self._calendar_slice(start_date, look_back_days)
+        index_px = m.index_closes["sh000300"][sl].astype(float)
+        basis = m.fut_basis[sl].astype(float)
+        df = pd.DataFrame(
+            {
+                "trade_date": pd.to_datetime(m.dates[sl]),
+                "avg_basis": basis,
+                "total_basis": basis * 4.0,
+                "total_volume": m.fut_volume[sl].astype(float),
+                "weighted_future_price": index_px + basis,
+                "weighted_index_price": index_px,
+            }
+        )
+        df["basis_ratio"] = df["avg_basis"] / df["weighted_index_price"]
+        return df.set_index("trade_date")
+
+    def fetch_options_risk_series(self, start_date: str, look_back_days: int = 60) -> pd.DataFrame:
+        self._hit("fetch_options_risk_series")
+        m = self.market
+        sl = self._calendar_slice(start_date, look_back_days)
+        change = m.opt_change[sl].astype(float)
+        close = m.opt_close[sl].astype(float)
+        df = pd.DataFrame(
+            {
+                "trade_date": pd.to_datetime(m.dates[sl]),
+                "weighted_change": change,
+                "total_change": change * 50.0,
+                "total_volume": m.opt_volume[sl].astype(float),
+                "weighted_close": close,
+            }
+        )
+        df["change_ratio"] = df["weighted_change"] / df["weighted_close"]
+        return df.set_index("trade_date")
+
+
+# ----------------------------------------------------------------
+# module patching
+# ----------------------------------------------------------------
+@contextlib.contextmanager
+def stub_db_providers(provider: Any) -> Iterator[Any]:
+    """
+    Replace every module-level DBMySQLMarketProvider / get_db_provider reference
+    under core.* with factories returning `provider`; restore on exit.
+
+    Modules imported inside the block are patched only if already loaded, so
+    import the pipeline (engine / fetcher / datasources) before entering.
+    """
+    originals = {
+        DBMySQLMarketProvider,
+        db_provider_router.get_db_provider,
+        db_provider_factory.get_db_provider,
+    }
+    # lru_cache wrapper may be referenced directly or via __wrapped__
+    for fn in list(originals):
+        wrapped = getattr(fn, "__wrapped__", None)
+        if wrapped is not None:
+            originals.add(wrapped)
+
+    def _provider_factory(*_args: Any, **_kwargs: Any) -> Any:
+        return provider
+
+    patched: List[tuple] = []
+    for mod_name, mod in list(sys.modules.items()):
+        if mod is None or not (mod_name == "core" or mod_name.startswith("core.")):
+            continue
+        if mod_name == DBMySQLMarketProvider.__module__:
+            continue
+        for attr, val in list(vars(mod).items()):
+            try:
+                hit = val in originals
+            except TypeError:
+                hit = False
+            if hit:
+                patched.append((mod, attr, val))
+                setattr(mod, attr, _provider_factory)
+    try:
+        yield provider
+    finally:
+        for mod, attr, val in reversed(patched):
+            setattr(mod, attr, val)
+
+
+def build_provider(trade_date: str, n_symbols: int, seed: Optional[int] = None) -> InMemoryMarketProvider:
+    kwargs: Dict[str, Any] = {"n_symbols": n_symbols}
+    if seed is not None:
+        kwargs["seed"] = seed
+    return InMemoryMarketProvider(SyntheticMarket(trade_date, **kwargs))
@@ -14,7 +14,7 @@ LOG = get_logger("DS.Cache")
 # ==========================================================
 def load_json(path: str) -> Optional[Any]:
     abs_path = os.path.abspath(path)
-    LOG.info("CacheRead: path=%s", abs_path)
+    LOG.debug("CacheRead: path=%s", abs_path)
 
     if not os.path.exists(abs_path):
         LOG.warning("CacheReadFailed: file not found path=%s", abs_path)
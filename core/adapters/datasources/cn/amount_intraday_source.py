@@ -12,7 +12,8 @@ from core.datasources.datasource_base import (
     DataSourceConfig,
     DataSourceBase,
 )
-from core.utils.spot_store import get_spot_daily
+from core.utils.intraday_spot_aggregator import intraday_summary
+from core.utils.spot_store import get_spot_view
 from core.utils.ds_refresh import apply_refresh_cleanup
 
 LOG = get_logger("DS.Amount")
@@ -72,31 +73,37 @@ class AmountDataSource(DataSourceBase):
             except Exception as e:
                 LOG.error("[DS.Amount] load cache error: %s", e)
 
-        # 1. 读取全行情（SpotStore 内部负责缓存）
-        try:
-            df: pd.DataFrame = get_spot_daily(trade_date, refresh_mode=refresh_mode)
-        except Exception as e:
-            LOG.error("[DS.Amount] get_spot_daily error: %s", e)
-            return self._neutral_block(trade_date)
-
-        if df is None or df.empty:
-            LOG.error("[DS.Amount] Spot DF is empty - return neutral block")
-            return self._neutral_block(trade_date)
-
-        # SpotStore 约定：
-        # - symbol 列：000001.SZ / 600000.SH / 830799.BJ
-        # - 成交额 列：单位为 元
-        def sum_market(suffix: str) -> float:
-            mask = df["symbol"].astype(str).str.endswith(f".{suffix}")
-            sub = df[mask]
-            if sub.empty:
-                return 0.0
-            # 元 -> 亿
-            return round(sub["成交额"].sum() / 1e8, 2)
-
-        sh_val = sum_market("SH")
-        sz_val = sum_market("SZ")
-        bj_val = sum_market("BJ")
+        # daemon 盘中路径（full = SpotSnapshotService 快照）：常驻增量计数器只应用变化行
+        agg = intraday_summary(trade_date) if refresh_mode == "full" else None
+        if agg is not None:
+            sh_val, sz_val, bj_val = (agg["amount"][k] for k in ("sh", "sz", "bj"))
+        else:
+            # 1. 读取全行情（SpotStore 内部负责缓存）
+            try:
+                df: pd.DataFrame = get_spot_view(trade_date, refresh_mode=refresh_mode, columns=["symbol", "成交额"])
+            except Exception as e:
+                LOG.error("[DS.Amount] get_spot_view error: %s", e)
+                return self._neutral_block(trade_date)
+
+            if df is None or df.empty:
+                LOG.error("[DS.Amount] Spot DF is empty - return neutral block")
+                return self._neutral_block(trade_date)
+
+            # SpotStore 约定：
+            # - symbol 列：000001.SZ / 600000.SH / 830799.BJ
+            # - 成交额 列：单位为 元
+            def sum_market(suffix: str) -> float:
+                mask = df["symbol"].astype(str).str.endswith(f".{suffix}")
+                sub = df[mask]
+                if sub.empty:
+                    return 0.0
+                # 元 -> 亿
+                return round(sub["成交额"].sum() / 1e8, 2)
+
+            sh_val = sum_market("SH")
+            sz_val = sum_market("SZ")
+            bj_val = sum_market("BJ")
+
         total_val = round(sh_val + sz_val + bj_val, 2)
 
         block: Dict[str, Any] = {
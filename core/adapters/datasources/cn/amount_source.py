@@ -15,7 +15,7 @@ from core.datasources.datasource_base import (
 #from core.utils.spot_store import get_spot_daily
 from core.utils.ds_refresh import apply_refresh_cleanup
 
-from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider
+from core.adapters.providers.db_provider_router import get_db_provider
 
 LOG = get_logger("DS.Amount")
 
@@ -37,7 +37,7 @@ class AmountDataSource(DataSourceBase):
         super().__init__(name="DS.Amount")
 
         self.config = config
-        self.db = DBMySQLMarketProvider()
+        self.db = get_db_provider()
 
         self.cache_root = config.cache_root
         self.history_root = config.history_root
@@ -103,7 +103,7 @@ class AmountDataSource(DataSourceBase):
         recent_df = df.head(look_back_days)
 
         if recent_df.empty:
-            LOG.error(f"[DS.Amount] no recent data after head({look_back_days}) for %s", trade_date)
+            LOG.error("[DS.Amount] no recent data after head(%s) for %s", look_back_days, trade_date)
             return self._empty_block()
 
         # 瑜版挸澧犻崐纭风窗缁楊兛绔寸悰宀嬬礄閸楄櫕娓堕弬棰佺婢垛晪绱?
@@ -25,7 +25,7 @@ import pandas as pd
 
 from core.utils.logger import get_logger
 from core.datasources.datasource_base import DataSourceBase, DataSourceConfig
-from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider
+from core.adapters.providers.db_provider_router import get_db_provider
 
 LOG = get_logger("DS.Breadth")
 
@@ -37,7 +37,7 @@ class BreadthDataSource(DataSourceBase):
         
         self.window = int(window)   # 閳?閳?韫囧懘銆忛張澶庣箹娑撯偓鐞?
         
-        self.db = DBMySQLMarketProvider()
+        self.db = get_db_provider()
 
     def build_block(self, trade_date: str, refresh_mode: str = "auto") -> Dict[str, Any]:
         td = pd.to_datetime(trade_date)
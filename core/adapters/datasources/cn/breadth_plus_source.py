@@ -27,7 +27,8 @@ import pandas as pd
 from core.utils.logger import get_logger
 from core.datasources.datasource_base import DataSourceBase, DataSourceConfig
 from core.utils.ds_refresh import apply_refresh_cleanup
-from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider
+from core.adapters.providers.db_columnar import stock_closes_frame
+from core.adapters.providers.db_provider_router import get_db_provider
 
 LOG = get_logger("DS.BreadthPlus")
 
@@ -87,7 +88,7 @@ class BreadthPlusDataSource(DataSourceBase):
         os.makedirs(self.cache_root, exist_ok=True)
         os.makedirs(self.history_root, exist_ok=True)
 
-        self.db = DBMySQLMarketProvider()
+        self.db = get_db_provider()
 
     # -------------------------
     # Public API
@@ -132,8 +133,8 @@ class BreadthPlusDataSource(DataSourceBase):
 
             window_start = asof - datetime.timedelta(days=look_back_days)
 
-            rows = self.db.query_stock_closes(window_start=window_start, trade_date=asof)
-            if not rows:
+            df = stock_closes_frame(self.db, window_start=window_start, trade_date=asof)
+            if df.empty:
                 block = self._missing_block(
                     schema_version=schema_version,
                     trade_date=str(asof),
@@ -143,10 +144,6 @@ class BreadthPlusDataSource(DataSourceBase):
                 self._save_cache(cache_file, block)
                 return block
 
-            df = pd.DataFrame(
-                rows,
-                columns=["symbol", "exchange", "trade_date", "pre_close", "chg_pct", "close", "amount"],
-            )
             LOG.info("[DS.BreadthPlus] Compute MA / NHNL on per-symbol tails...")
             # normalize trade_date to date
             df["trade_date"] = pd.to_datetime(df["trade_date"]).dt.date
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+UnifiedRisk V12 - 派生日序列层（C/D/E/F leading-structure blocks）
+
+    etf_flow          (C)  fetch_etf_hist_series
+    futures_basis     (D)  fetch_futures_basis_series
+    options_risk      (E)  fetch_options_risk_series
+    liquidity_quality (F)  query_stock_closes → top20 / big-small / down-low ratios
+
+每个 block 每个交易日一行，存于 ur_derived_series（data/persistent/derived_series.db）：
+- load_series(): 只为回看窗口内未计算过的日历区间（含中间空洞）计算聚合并追加，其余直接读已存行
+- force=True（refresh_mode=full）：重算 trade_date 当日
+- rebuild(): 聚合定义变化（DEF_VERSION）后，从指定日期起删除并重算
+- 存储不可用时退回整窗口直接计算（与旧路径一致）
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from core.adapters.providers.db_columnar import stock_closes_frame
+from core.persistence.sqlite.sqlite_connection import connect_sqlite
+from core.persistence.sqlite.sqlite_derived_series_store import SqliteDerivedSeriesStore
+from core.utils.logger import get_logger
+
+LOG = get_logger("DS.DerivedSeries")
+
+DEFAULT_DB_PATH = os.path.join("data", "persistent", "derived_series.db")
+
+# F block: ma20_amount 需要的日历回看（>= 20 个交易日）
+LIQ_MA_LOOKBACK_DAYS = 45
+
+
+def _as_date(x: Any) -> date:
+    return x if isinstance(x, date) else pd.to_datetime(str(x)).date()
+
+
+def _num(v: Any) -> Optional[float]:
+    try:
+        return float(v) if v is not None and pd.notna(v) else None
+    except Exception:
+        return None
+
+
+def _frame_rows(df: Optional[pd.DataFrame], start: date, columns: List[str]) -> List[Dict[str, Any]]:
+    """provider 日聚合 DataFrame（index=trade_date）→ [{trade_date, ...}]，仅保留 >= start。"""
+    if df is None or df.empty:
+        return []
+    out = []
+    for idx, row in df.sort_index().iterrows():
+        if idx.date() < start:
+            continue
+        rec: Dict[str, Any] = {"trade_date": idx.strftime("%Y-%m-%d")}
+        for c in columns:
+            rec[c] = _num(row.get(c))
+        out.append(rec)
+    return out
+
+
+def _etf_flow_rows(db: Any, start: date, end: date) -> List[Dict[str, Any]]:
+    df = db.fetch_etf_hist_series(start_date=end, look_back_days=(end - start).days)
+    return _frame_rows(df, start, ["total_change_amount", "total_volume", "total_amount"])
+
+
+def _futures_basis_rows(db: Any, start: date, end: date) -> List[Dict[str, Any]]:
+    df = db.fetch_futures_basis_series(start_date=end, look_back_days=(end - start).days)
+    return _frame_rows(
+        df,
+        start,
+        ["avg_basis", "total_basis", "basis_ratio", "total_volume", "weighted_future_price", "weighted_index_price"],
+    )
+
+
+def _options_risk_rows(db: Any, start: date, end: date) -> List[Dict[str, Any]]:
+    df = db.fetch_options_risk_series(start_date=end, look_back_days=(end - start).days)
+    return _frame_rows(
+        df,
+        start,
+        ["weighted_change", "total_change", "total_volume", "weighted_close", "change_ratio"],
+    )
+
+
+def liquidity_day_metrics(df_day: pd.DataFrame) -> Dict[str, Optional[float]]:
+    """单日 F block 指标；df_day 需含 symbol / amount / chg_pct / ma20_amount。"""
+    total_amount = float(df_day["amount"].sum())
+    top20_ratio = 0.0
+    if total_amount > 0:
+        topn = min(len(df_day), 20)
+        top20_ratio = float(df_day["amount"].nlargest(topn).sum()) / total_amount
+
+    symbols = df_day["symbol"].astype(str).fillna("")
+    big_mask = symbols.str.startswith(("60", "601", "603"))
+    big_amount = float(df_day.loc[big_mask, "amount"].sum())
+    small_amount = float(df_day.loc[~big_mask, "amount"].sum())
+    big_small_ratio = big_amount / small_amount if small_amount > 0 else None
+
+    df_neg = df_day[df_day["chg_pct"] < 0]
+    down_low_ratio = None
+    if len(df_neg) > 0:
+        down_low_ratio = float((df_neg["amount"] < df_neg["ma20_amount"]).sum()) / len(df_neg)
+
+    return {
+        "top20_ratio": round(top20_ratio, 4),
+        "big_small_ratio": round(big_small_ratio, 4) if big_small_ratio is not None else None,
+        "down_low_ratio": round(down_low_ratio, 4) if down_low_ratio is not None else None,
+    }
+
+
+def _liquidity_quality_rows(db: Any, start: date, end: date) -> List[Dict[str, Any]]:
+    df = stock_closes_frame(db, start - timedelta(days=LIQ_MA_LOOKBACK_DAYS), end)
+    if df.empty:
+        return []
+    df["amount"] = df["amount"].fillna(0.0)
+    df["chg_pct"] = df["chg_pct"].fillna(0.0)
+    df = df.sort_values(["symbol", "trade_date"])
+    df["ma20_amount"] = df.groupby("symbol")["amount"].transform(lambda x: x.rolling(window=20, min_periods=1).mean())
+
+    df = df[df["trade_date"] >= pd.Timestamp(start)]
+    out = []
+    for dt, df_day in df.groupby("trade_date", sort=True):
+        out.append({"trade_date": dt.strftime("%Y-%m-%d"), **liquidity_day_metrics(df_day)})
+    return out
+
+
+@dataclass(frozen=True)
+class DerivedBlock:
+    name: str
+    version: int
+    compute: Callable[[Any, date, date], List[Dict[str, Any]]]
+
+
+# 修改某个 block 的聚合定义时递增 version，然后运行 tools/derived_series.py rebuild --from ...
+DERIVED_BLOCKS: Dict[str, DerivedBlock] = {
+    "etf_flow": DerivedBlock("etf_flow", 1, _etf_flow_rows),
+    "futures_basis": DerivedBlock("futures_basis", 1, _futures_basis_rows),
+    "options_risk": DerivedBlock("options_risk", 1, _options_risk_rows),
+    "liquidity_quality": DerivedBlock("liquidity_quality", 1, _liquidity_quality_rows),
+}
+
+
+def open_store(db_path: Optional[str]) -> SqliteDerivedSeriesStore:
+    path = db_path or DEFAULT_DB_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return SqliteDerivedSeriesStore(connect_sqlite(path))
+
+
+def load_series(
+    block: str,
+    db: Any,
+    trade_date: Any,
+    look_back_days: int,
+    *,
+    force: bool = False,
+    db_path: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """[trade_date - look_back_days, trade_date] 的日序列（升序），缺失日期增量计算并落库。"""
+    spec = DERIVED_BLOCKS[block]
+    end = _as_date(trade_date)
+    lo = end - timedelta(days=int(look_back_days))
+    end_s, lo_s = end.isoformat(), lo.isoformat()
+
+    try:
+        store = open_store(db_path)
+    except Exception as e:
+        LOG.warning("[DerivedSeries] store unavailable, full-window compute block=%s: %s", block, e)
+        return spec.compute(db, lo, end)
+
+    try:
+        spans = _missing_spans(store.coverage(spec.name, spec.version, lo_s, end_s), lo, end)
+        if force and not (spans and spans[-1][1] == end):
+            spans.append((end, end))
+        for start, stop in spans:
+            rows = spec.compute(db, start, stop)
+            n = store.upsert(spec.name, spec.version, rows)
+            covered = stop
+            if stop == end and end_s not in {r["trade_date"] for r in rows}:
+                # 当日行尚未产出（盘中 / 非交易日）：只覆盖到已产出的最后一天，下次重试
+                done = [r["trade_date"] for r in rows]
+                covered = _as_date(max(done)) if done else start - timedelta(days=1)
+            store.add_coverage(spec.name, spec.version, start.isoformat(), covered.isoformat())
+            LOG.info("[DerivedSeries] %s computed %s..%s rows=%s", block, start, stop, n)
+        return store.read_range(spec.name, spec.version, lo_s, end_s)
+    finally:
+        store.conn.close()
+
+
+def _missing_spans(covered: List[Tuple[str, str]], lo: date, end: date) -> List[Tuple[date, date]]:
+    """[lo, end] 中未被已计算区间覆盖的日历子区间（升序）。"""
+    out: List[Tuple[date, date]] = []
+    cur = lo
+    for a, b in covered:
+        a_d, b_d = _as_date(a), _as_date(b)
+        if a_d > cur:
+            out.append((cur, min(a_d - timedelta(days=1), end)))
+        cur = max(cur, b_d + timedelta(days=1))
+        if cur > end:
+            return out
+    if cur <= end:
+        out.append((cur, end))
+    return out
+
+
+def load_frame(block: str, db: Any, trade_date: Any, look_back_days: int, **kwargs: Any) -> pd.DataFrame:
+    """load_series() 的 DataFrame 形式（index=trade_date），与 provider fetch_*_series 返回形状一致。"""
+    rows = load_series(block, db, trade_date, look_back_days, **kwargs)
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows)
+    df["trade_date"] = pd.to_datetime(df["trade_date"])
+    return df.set_index("trade_date")
+
+
+def rebuild(
+    block: str,
+    db: Any,
+    start: Any,
+    end: Any,
+    *,
+    chunk_days: int = 90,
+    db_path: Optional[str] = None,
+) -> int:
+    """删除 [start, end] 的已存行并按当前定义分段重算；返回写入行数。"""
+    spec = DERIVED_BLOCKS[block]
+    s, e = _as_date(start), _as_date(end)
+    store = open_store(db_path)
+    try:
+        store.delete_from(spec.name, s.isoformat(), e.isoformat())
+        total = 0
+        cur = s
+        while cur <= e:
+            stop = min(cur + timedelta(days=int(chunk_days) - 1), e)
+            total += store.upsert(spec.name, spec.version, spec.compute(db, cur, stop))
+            store.add_coverage(spec.name, spec.version, cur.isoformat(), stop.isoformat())
+            LOG.info("[DerivedSeries] rebuild %s %s..%s total=%s", block, cur, stop, total)
+            cur = stop + timedelta(days=1)
+        return total
+    finally:
+        store.conn.close()
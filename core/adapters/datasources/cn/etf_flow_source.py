@@ -35,7 +35,8 @@ import pandas as pd
 from core.datasources.datasource_base import DataSourceConfig, DataSourceBase
 from core.utils.ds_refresh import apply_refresh_cleanup
 from core.utils.logger import get_logger
-from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider
+from core.adapters.providers.db_provider_router import get_db_provider
+from core.adapters.datasources.cn.derived_series import load_frame
 
 LOG = get_logger("DS.ETFFlow")
 
@@ -53,7 +54,7 @@ class ETFFlowDataSource(DataSourceBase):
         super().__init__(name="DS.ETFFlow")
         self.config = config
         self.window = int(window) if window and window > 0 else 60
-        self.db = DBMySQLMarketProvider()
+        self.db = get_db_provider()
 
         # cache 閸?history 鐠侯垰绶?
         self.cache_root = config.cache_root
@@ -102,9 +103,13 @@ class ETFFlowDataSource(DataSourceBase):
 
         # 鐠囪褰囬懕姘値閺佺増宓?
         try:
-            df: pd.DataFrame = self.db.fetch_etf_hist_series(
-                start_date=trade_date,
-                look_back_days=self.window,
+            # 派生日序列：只为缺失日期聚合，回看窗口读已存行
+            df: pd.DataFrame = load_frame(
+                "etf_flow",
+                self.db,
+                trade_date,
+                self.window,
+                force=(refresh_mode == "full"),
             )
         except Exception as exc:
             LOG.error("[DS.ETFFlow] fetch_etf_hist_series error: %s", exc)
@@ -16,7 +16,7 @@ import json
 from typing import Dict, Any
 from datetime import datetime
 import pandas as pd
-from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider
+from core.adapters.providers.db_provider_router import get_db_provider
 
 from core.utils.logger import get_logger
 from core.datasources.datasource_base import (
@@ -44,7 +44,7 @@ class ETFSpotSyncDailyDataSource(DataSourceBase):
         self.cache_root = config.cache_root
         os.makedirs(self.cache_root, exist_ok=True)
 
-        self.db = DBMySQLMarketProvider()
+        self.db = get_db_provider()
         if self.db is None:
             raise RuntimeError("mysql provider not configured")
 
@@ -79,24 +79,14 @@ class ETFSpotSyncDailyDataSource(DataSourceBase):
         
         #last_td = self.oracle.query_last_trade_date(trade_date)  # trade_date is T (as-of)
         #snapshot = self.oracle.load_full_market_eod_snapshot(last_td)
-        snapshot = self.db.load_latest_full_market_eod_snapshot(trade_date)
-        
-        
-        market = snapshot.get("market")
-        if not market:
+        # columnar snapshot: typed frame (float64 chg_pct / amount / close / pre_close)
+        snapshot = self.db.load_latest_full_market_eod_frame(trade_date)
+
+        df = snapshot.get("frame")
+        if df is None or df.empty:
             LOG.error("[DS.ETFSpotSyncDaily] empty market snapshot")
             return self._neutral_block(trade_date)
 
-        # 鏉烆兛璐?DataFrame閿涘牏绮烘稉鈧拋锛勭暬閸欙絽绶為敍?
-        df = pd.DataFrame.from_dict(market, orient="index")
-        
-        NUMERIC_COLS = ["chg_pct", "amount", "close", "prev_close"]
-        
-        for c in NUMERIC_COLS:
-            if c in df.columns:
-                df[c] = df[c].astype(float)
-
-
         if "close" not in df.columns or "symbol" not in df.columns:
             LOG.error("[DS.ETFSpotSyncDaily] required columns missing in market snapshot")
             return self._neutral_block(trade_date)
@@ -110,7 +100,6 @@ class ETFSpotSyncDailyDataSource(DataSourceBase):
             return self._neutral_block(trade_date)
 
         #df["chg_pct"] = (df["close"] - df["prev_close"]) / df["prev_close"] * 100.0
-        df["chg_pct"] = df["chg_pct"].astype(float)
 
         total = len(df)
         if total == 0:
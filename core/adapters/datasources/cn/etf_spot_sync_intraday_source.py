@@ -24,7 +24,7 @@ from core.datasources.datasource_base import (
     DataSourceConfig,
     DataSourceBase,
 )
-from core.utils.spot_store import get_spot_daily
+from core.utils.spot_store import get_spot_view
 from core.utils.ds_refresh import apply_refresh_cleanup
 
 LOG = get_logger("DS.ETFSpotSyncIntraday")
@@ -85,12 +85,14 @@ class ETFSpotSyncIntradayDataSource(DataSourceBase):
         # ------------------------------------------------------------
         try: 
             
-            df: pd.DataFrame = get_spot_daily(
+            df: pd.DataFrame = get_spot_view(
                 trade_date=trade_date,
                 refresh_mode=refresh_mode,
+                columns=["昨收", "最新价", "成交额", "涨跌幅", "chg_pct", "amount", "close", "prev_close"],
+                intraday=self.is_intraday,
             )
         except Exception as e:
-            LOG.error("[DS.ETFSpotSync] get_spot_daily error: %s", e)
+            LOG.error("[DS.ETFSpotSync] get_spot_view error: %s", e)
             return self._neutral_block(trade_date, snapshot_type="UNKNOWN")
 
         if df is None or df.empty:
@@ -39,7 +39,8 @@ import pandas as pd
 from core.datasources.datasource_base import DataSourceBase, DataSourceConfig
 from core.utils.ds_refresh import apply_refresh_cleanup
 from core.utils.logger import get_logger
-from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider
+from core.adapters.providers.db_provider_router import get_db_provider
+from core.adapters.datasources.cn.derived_series import load_series
 
 LOG = get_logger("DS.LiquidityQuality")
 
@@ -51,7 +52,7 @@ class LiquidityQualityDataSource(DataSourceBase):
         super().__init__(name="DS.LiquidityQuality")
         self.config = config
         self.window = int(window) if window and window > 0 else 60
-        self.db = DBMySQLMarketProvider()
+        self.db = get_db_provider()
 
         # Prepare cache and history directories
         self.cache_root = config.cache_root
@@ -122,87 +123,20 @@ class LiquidityQualityDataSource(DataSourceBase):
             return self._neutral_block(trade_date)
 
         look_back_days = self.window + 20
-        # 鐠у嘲顫愰弮銉︽埂 = trade_date - look_back_days 婢?
-        start_dt = as_date - timedelta(days=look_back_days)
 
         try:
-            # 鐠嬪啰鏁?DBProvider 閼惧嘲褰囬弫鐗堝祦閿涘牆瀵橀幏顒勵暕閺€鍓佹磸/濞戙劏绌奸獮?閹存劒姘︽０婵撶礆
-            rows = self.db.query_stock_closes(start_dt, as_date)
+            # 派生日序列：每日 top20 / big_small / down_low 只算一次，回看窗口读已存行
+            series: List[Dict[str, Any]] = load_series(
+                "liquidity_quality",
+                self.db,
+                as_date,
+                look_back_days,
+                force=(refresh_mode == "full"),
+            )[-self.window:]
         except Exception as exc:
             LOG.error("[DS.LiquidityQuality] mysql fetch error: %s", exc)
             return self._neutral_block(trade_date)
 
-        if not rows:
-            LOG.warning("[DS.LiquidityQuality] no data returned for %s", trade_date)
-            return self._neutral_block(trade_date)
-
-        # 鏉烆兛璐?DataFrame
-        df = pd.DataFrame(rows, columns=["symbol", "exchange", "trade_date", "pre_close", "chg_pct", "close", "amount"])
-        # 缁鐎锋潪顒佸床
-        try:
-            df["trade_date"] = pd.to_datetime(df["trade_date"])
-        except Exception:
-            df["trade_date"] = pd.to_datetime(df["trade_date"], errors="coerce")
-        df["amount"] = pd.to_numeric(df["amount"], errors="coerce").fillna(0.0)
-        df["chg_pct"] = pd.to_numeric(df["chg_pct"], errors="coerce").fillna(0.0)
-
-        # 閹?symbol + trade_date 閹烘帒绨敍灞间簰娓氳儻顓哥粻妤佺泊閸斻劌娼庨崐?
-        df_sorted = df.sort_values(["symbol", "trade_date"]).copy()
-        # 鐠侊紕鐣诲В蹇庨嚋 symbol 閻ㄥ嫯绻?20 閺冦儱閽╅崸?amount閿涘牆瀵橀崥顐㈢秼閸撳秵妫╅敍?
-        df_sorted["ma20_amount"] = (
-            df_sorted.groupby("symbol")["amount"].transform(lambda x: x.rolling(window=20, min_periods=1).mean())
-        )
-
-        # 闁瀚ㄩ張鈧崥?window 閺冦儳娈戦弫鐗堝祦
-        # 妫ｆ牕鍘涢幍鎯у毉閹碘偓閺堝妫╅張鐕傜礉閸楀洤绨幒鎺戝灙
-        unique_dates = sorted(df_sorted["trade_date"].unique())
-        if not unique_dates:
-            return self._neutral_block(trade_date)
-        # 閸欐牗娓堕崥?window 婢?
-        selected_dates = unique_dates[-self.window:]
-
-        series: List[Dict[str, Any]] = []
-        for dt in selected_dates:
-            df_day = df_sorted[df_sorted["trade_date"] == dt]
-            total_amount = float(df_day["amount"].sum())
-            # Top20 閹存劒姘︽０婵嗗窗濮?
-            top20_ratio = 0.0
-            if total_amount > 0:
-                df_sorted_day = df_day.sort_values("amount", ascending=False)
-                topn = min(len(df_sorted_day), 20)
-                top_amount = float(df_sorted_day.head(topn)["amount"].sum())
-                if total_amount > 0:
-                    top20_ratio = top_amount / total_amount
-            # 婢?鐏忓繒娲忛幋鎰唉閸楃姵鐦?
-            big_prefixes = ("60", "601", "603")
-            # 閸掋倖鏌?symbol 妫ｆ牕鐡у▓纰夌礉濞夈劍鍓?symbol 閸欘垵鍏樻稉鍝勭摟缁楋缚瑕嗛幋鏍ㄦ殶鐎?
-            symbols = df_day["symbol"].astype(str).fillna("")
-            big_mask = symbols.str.startswith(big_prefixes)
-            big_amount = float(df_day.loc[big_mask, "amount"].sum())
-            small_amount = float(df_day.loc[~big_mask, "amount"].sum())
-            if small_amount > 0:
-                big_small_ratio = big_amount / small_amount
-            else:
-                # 婵″倹鐏夌亸蹇曟磸閹存劒姘︽０婵呰礋 0閿涘苯鍨弮鐘崇《鐠侊紕鐣诲В鏂剧伐閿涘矁顔曟稉?None
-                big_small_ratio = None
-            # 缂傗晠鍣烘稉瀣┘濮ｆ棑绱版稉瀣┘娑撴梹鍨氭禍銈夘杺娴ｅ簼绨?ma20_amount
-            df_neg = df_day[df_day["chg_pct"] < 0]
-            neg_cnt = len(df_neg)
-            if neg_cnt > 0:
-                down_low_cnt = (df_neg["amount"] < df_neg["ma20_amount"]).sum()
-                down_low_ratio = down_low_cnt / neg_cnt
-            else:
-                down_low_ratio = None
-
-            series.append(
-                {
-                    "trade_date": dt.strftime("%Y-%m-%d"),
-                    "top20_ratio": round(top20_ratio, 4) if top20_ratio is not None else None,
-                    "big_small_ratio": round(big_small_ratio, 4) if big_small_ratio is not None else None,
-                    "down_low_ratio": round(down_low_ratio, 4) if down_low_ratio is not None else None,
-                }
-            )
-
         # 婵″倹婀悽鐔稿灇 series 閹存牗娓堕弬鐗堟）閺堢喍绗夐崠褰掑帳閿涘苯鍨潻鏂挎礀娑擃厽鈧?
         if not series:
             return self._neutral_block(trade_date)
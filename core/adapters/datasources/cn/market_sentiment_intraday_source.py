@@ -13,7 +13,8 @@ from core.datasources.datasource_base import (
     DataSourceBase,
 )
 from core.utils.ds_refresh import apply_refresh_cleanup
-from core.utils.spot_store import get_spot_daily
+from core.utils.intraday_spot_aggregator import intraday_summary
+from core.utils.spot_store import get_spot_view
 
 LOG = get_logger("DS.Sentiment")
 
@@ -67,28 +68,34 @@ class MarketSentimentDataSource(DataSourceBase):
             except Exception as e:
                 LOG.error("[DS.Sentiment] load cache error: %s", e)
 
-        # 1) 获取全行情
-        try:
-            df: pd.DataFrame = get_spot_daily(trade_date, refresh_mode=refresh_mode)
-        except Exception as e:
-            LOG.error("[DS.Sentiment] get_spot_daily error: %s", e)
-            return self._neutral_block(trade_date)
+        # daemon 盘中路径（full = SpotSnapshotService 快照）：常驻增量计数器只应用变化行
+        agg = intraday_summary(trade_date) if refresh_mode == "full" else None
+        if agg is not None:
+            adv, dec, flat = agg["adv"], agg["dec"], agg["flat"]
+            limit_up, limit_down = agg["limit_up_naive"], agg["limit_down_naive"]
+        else:
+            # 1) 获取全行情
+            try:
+                df: pd.DataFrame = get_spot_view(trade_date, refresh_mode=refresh_mode, columns=["chg_pct"])
+            except Exception as e:
+                LOG.error("[DS.Sentiment] get_spot_view error: %s", e)
+                return self._neutral_block(trade_date)
 
-        if df is None or df.empty:
-            LOG.error("[DS.Sentiment] Spot DF empty")
-            return self._neutral_block(trade_date)
+            if df is None or df.empty:
+                LOG.error("[DS.Sentiment] Spot DF empty")
+                return self._neutral_block(trade_date)
 
-        if "chg_pct" not in df.columns:
-            LOG.error("[DS.Sentiment] 'chg_pct' column missing")
-            return self._neutral_block(trade_date)
+            if "chg_pct" not in df.columns:
+                LOG.error("[DS.Sentiment] 'chg_pct' column missing")
+                return self._neutral_block(trade_date)
 
-        # 2) 统计宽度
-        adv = int((df["chg_pct"] > 0).sum())
-        dec = int((df["chg_pct"] < 0).sum())
-        flat = int((df["chg_pct"] == 0).sum())
+            # 2) 统计宽度
+            adv = int((df["chg_pct"] > 0).sum())
+            dec = int((df["chg_pct"] < 0).sum())
+            flat = int((df["chg_pct"] == 0).sum())
 
-        limit_up = int((df["chg_pct"] >= 9.9).sum())
-        limit_down = int((df["chg_pct"] <= -9.9).sum())
+            limit_up = int((df["chg_pct"] >= 9.9).sum())
+            limit_down = int((df["chg_pct"] <= -9.9).sum())
 
         total = adv + dec + flat
         adv_ratio = round(adv / total, 4) if total > 0 else 0.0
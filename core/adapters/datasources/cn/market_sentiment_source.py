@@ -31,9 +31,11 @@ import pandas as pd
 from core.utils.logger import get_logger
 from core.datasources.datasource_base import DataSourceConfig, DataSourceBase
 from core.utils.ds_refresh import apply_refresh_cleanup
-from core.utils.spot_store import get_spot_daily
+from core.utils.intraday_spot_aggregator import intraday_summary
+from core.utils.spot_store import get_spot_view
+from core.utils.em_pool_store import get_pool, read_pool
 
-from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider
+from core.adapters.providers.db_provider_router import get_db_provider
 
 LOG = get_logger("DS.Sentiment")
 
@@ -77,13 +79,15 @@ class MarketSentimentDataSource(DataSourceBase):
     # - stuck quantile uses amount/volume within limit-down proxy group
     LOCK_PROXY_TOL_FRAC = 0.002
     LOCK_PROXY_STUCK_QUANTILE = 0.20
+    # intraday spot projection (chg_pct + symbol / name candidates of _pick_col)
+    SPOT_COLUMNS = ("chg_pct", "symbol", "code", "ts_code", "sec_code", "name", "sec_name")
 
     def __init__(self, config: DataSourceConfig, is_intraday: bool = False):
         super().__init__(name="DS.Sentiment")
         self.config = config
         self.cache_root = config.cache_root
         self.history_root = config.history_root
-        self.db = DBMySQLMarketProvider()
+        self.db = get_db_provider()
         self.is_intraday = is_intraday
 
         os.makedirs(self.cache_root, exist_ok=True)
@@ -582,95 +586,111 @@ class MarketSentimentDataSource(DataSourceBase):
         error_type: Optional[str] = None
         error_message: Optional[str] = None
 
-        try:
-            df: pd.DataFrame = get_spot_daily(trade_date, refresh_mode=refresh_mode)
-        except Exception as e:
-            LOG.error("[DS.Sentiment] get_spot_daily error: %s", e)
-            error_type = type(e).__name__
-            error_message = str(e)
-            return self._neutral_block(
-                trade_date=trade_date,
-                kind="INTRADAY",
-                data_status="ERROR",
-                warnings=["error:get_spot_daily_failed"],
-                error_type=error_type,
-                error_message=error_message,
-            )
-
-        if df is None or df.empty:
-            return self._neutral_block(
-                trade_date=trade_date,
-                kind="INTRADAY",
-                data_status="MISSING",
-                warnings=["empty:spot_df"],
-            )
-
-        if "chg_pct" not in df.columns:
-            return self._neutral_block(
-                trade_date=trade_date,
-                kind="INTRADAY",
-                data_status="ERROR",
-                warnings=["missing:spot_chg_pct_col"],
-                error_type="KeyError",
-                error_message="missing column chg_pct",
-            )
-
-        chg = pd.to_numeric(df["chg_pct"], errors="coerce")
-        if chg.isna().all():
-            return self._neutral_block(
-                trade_date=trade_date,
-                kind="INTRADAY",
-                data_status="ERROR",
-                warnings=["error:spot_chg_pct_all_nan"],
-                error_type="ValueError",
-                error_message="spot chg_pct all NaN",
-            )
-
-        # normalize unit: ratio(0.032) vs percent(3.2)
-        max_abs = float(chg.abs().max())
-        if max_abs <= 1.0:
-            chg = chg * 100.0
-            warnings.append("normalize:chg_pct_ratio_to_percent")
-
-        adv = int((chg > 0).sum())
-        dec = int((chg < 0).sum())
-        flat = int((chg == 0).sum())
-
-        # board-aware limit up/down
-        symbol_col = self._pick_col(df, ["symbol", "code", "ts_code", "sec_code"])
-        if symbol_col is None:
-            warnings.append("missing:symbol_col_limit_by_prefix_fallback_9.9")
-            data_status = "PARTIAL"
-            limit_up = int((chg >= (9.9 - self.LIMIT_TOL)).sum())
-            limit_down = int((chg <= -(9.9 - self.LIMIT_TOL)).sum())
-        else:
-            sym6 = df[symbol_col].astype(str).str.extract(r"(\d{6})", expand=False)
-            prefix3 = sym6.str[:3]
-            prefix2 = sym6.str[:2]
-            prefix1 = sym6.str[:1]
-
-            limit_pct = pd.Series(self.LIMIT_PCT_DEFAULT, index=df.index, dtype="float")
-            limit_pct = limit_pct.where(~prefix3.isin(self.BOARD20_PREFIX), self.LIMIT_PCT_20)
-            limit_pct = limit_pct.where(~(prefix1.isin(self.BOARD30_PREFIX_1) | prefix2.isin(self.BOARD30_PREFIX_2)), self.LIMIT_PCT_30)
-
-            name_col = self._pick_col(df, ["name", "sec_name"])
-            if name_col is not None:
-                nm = df[name_col].astype(str).str.strip().str.upper()
-                is_st = nm.str.startswith("*ST") | nm.str.startswith("ST")
-                # Apply ST 5% only when the stock is on mainboard default limit (10%).
-                is_mainboard = (limit_pct == float(self.LIMIT_PCT_DEFAULT))
-                st_applied = is_st & is_mainboard
-                limit_pct = limit_pct.where(~st_applied, self.LIMIT_PCT_ST)
+        # daemon 盘中路径（full = SpotSnapshotService 快照）：常驻增量计数器只应用变化行
+        agg = intraday_summary(trade_date) if refresh_mode == "full" else None
+        if agg is not None:
+            adv, dec, flat = agg["adv"], agg["dec"], agg["flat"]
+            limit_up, limit_down = agg["limit_up"], agg["limit_down"]
+            data_status = "OK"
+            if agg.get("ratio_unit"):
+                warnings.append("normalize:chg_pct_ratio_to_percent")
+            if agg.get("has_name"):
                 warnings.append("policy:intraday_st_limit_pct=5_mainboard_only_by_name_prefix(*ST|ST)")
             else:
                 warnings.append("assumption:intraday_st_flag_unavailable_assume_nonst")
-
-            limit_up = int((chg >= (limit_pct - self.LIMIT_TOL)).sum())
-            limit_down = int((chg <= -(limit_pct - self.LIMIT_TOL)).sum())
-            data_status = "OK"
-            if sym6.isna().any():
+            if agg.get("bad_symbol"):
                 data_status = "PARTIAL"
                 warnings.append("partial:symbol_extract_failed_some_rows")
+        else:
+            try:
+                df: pd.DataFrame = get_spot_view(trade_date, refresh_mode=refresh_mode, columns=self.SPOT_COLUMNS)
+            except Exception as e:
+                LOG.error("[DS.Sentiment] get_spot_view error: %s", e)
+                error_type = type(e).__name__
+                error_message = str(e)
+                return self._neutral_block(
+                    trade_date=trade_date,
+                    kind="INTRADAY",
+                    data_status="ERROR",
+                    warnings=["error:get_spot_daily_failed"],
+                    error_type=error_type,
+                    error_message=error_message,
+                )
+
+            if df is None or df.empty:
+                return self._neutral_block(
+                    trade_date=trade_date,
+                    kind="INTRADAY",
+                    data_status="MISSING",
+                    warnings=["empty:spot_df"],
+                )
+
+            if "chg_pct" not in df.columns:
+                return self._neutral_block(
+                    trade_date=trade_date,
+                    kind="INTRADAY",
+                    data_status="ERROR",
+                    warnings=["missing:spot_chg_pct_col"],
+                    error_type="KeyError",
+                    error_message="missing column chg_pct",
+                )
+
+            chg = pd.to_numeric(df["chg_pct"], errors="coerce")
+            if chg.isna().all():
+                return self._neutral_block(
+                    trade_date=trade_date,
+                    kind="INTRADAY",
+                    data_status="ERROR",
+                    warnings=["error:spot_chg_pct_all_nan"],
+                    error_type="ValueError",
+                    error_message="spot chg_pct all NaN",
+                )
+
+            # normalize unit: ratio(0.032) vs percent(3.2)
+            max_abs = float(chg.abs().max())
+            if max_abs <= 1.0:
+                chg = chg * 100.0
+                warnings.append("normalize:chg_pct_ratio_to_percent")
+
+            adv = int((chg > 0).sum())
+            dec = int((chg < 0).sum())
+            flat = int((chg == 0).sum())
+
+            # board-aware limit up/down
+            symbol_col = self._pick_col(df, ["symbol", "code", "ts_code", "sec_code"])
+            if symbol_col is None:
+                warnings.append("missing:symbol_col_limit_by_prefix_fallback_9.9")
+                data_status = "PARTIAL"
+                limit_up = int((chg >= (9.9 - self.LIMIT_TOL)).sum())
+                limit_down = int((chg <= -(9.9 - self.LIMIT_TOL)).sum())
+            else:
+                sym6 = df[symbol_col].astype(str).str.extract(r"(\d{6})", expand=False)
+                prefix3 = sym6.str[:3]
+                prefix2 = sym6.str[:2]
+                prefix1 = sym6.str[:1]
+
+                limit_pct = pd.Series(self.LIMIT_PCT_DEFAULT, index=df.index, dtype="float")
+                limit_pct = limit_pct.where(~prefix3.isin(self.BOARD20_PREFIX), self.LIMIT_PCT_20)
+                limit_pct = limit_pct.where(~(prefix1.isin(self.BOARD30_PREFIX_1) | prefix2.isin(self.BOARD30_PREFIX_2)), self.LIMIT_PCT_30)
+
+                name_col = self._pick_col(df, ["name", "sec_name"])
+                if name_col is not None:
+                    nm = df[name_col].astype(str).str.strip().str.upper()
+                    is_st = nm.str.startswith("*ST") | nm.str.startswith("ST")
+                    # Apply ST 5% only when the stock is on mainboard default limit (10%).
+                    is_mainboard = (limit_pct == float(self.LIMIT_PCT_DEFAULT))
+                    st_applied = is_st & is_mainboard
+                    limit_pct = limit_pct.where(~st_applied, self.LIMIT_PCT_ST)
+                    warnings.append("policy:intraday_st_limit_pct=5_mainboard_only_by_name_prefix(*ST|ST)")
+                else:
+                    warnings.append("assumption:intraday_st_flag_unavailable_assume_nonst")
+
+                limit_up = int((chg >= (limit_pct - self.LIMIT_TOL)).sum())
+                limit_down = int((chg <= -(limit_pct - self.LIMIT_TOL)).sum())
+                data_status = "OK"
+                if sym6.isna().any():
+                    data_status = "PARTIAL"
+                    warnings.append("partial:symbol_extract_failed_some_rows")
 
         total = adv + dec + flat
         adv_ratio = round(adv * 100.0 / total, 2) if total > 0 else 0.0  # percent
@@ -756,7 +776,9 @@ class MarketSentimentDataSource(DataSourceBase):
     # ------------------------------------------------------------
     def _build_zt_pool_stats(self, trade_date: str) -> Dict[str, Any]:
         warnings: List[str] = []
-        if not self._is_recent(trade_date, days=self.RECENT_ONLY_DAYS):
+        # frozen local pool first (no network for closed dates / replays)
+        df = read_pool("zt", trade_date)
+        if df is None and not self._is_recent(trade_date, days=self.RECENT_ONLY_DAYS):
             return {
                 "schema_version": "em_zt_pool.v1",
                 "asof": {"trade_date": trade_date, "kind": "EOD"},
@@ -767,10 +789,9 @@ class MarketSentimentDataSource(DataSourceBase):
                 "evidence": {"count": None},
             }
 
-        date_em = trade_date.replace("-", "")
         try:
-            import akshare as ak  # local import: avoid hard dependency at module import time
-            df = ak.stock_zt_pool_em(date=date_em)
+            if df is None:
+                df, _ = get_pool("zt", trade_date)
         except Exception as e:
             return {
                 "schema_version": "em_zt_pool.v1",
@@ -842,7 +863,8 @@ class MarketSentimentDataSource(DataSourceBase):
 
     def _build_zb_pool_stats(self, trade_date: str) -> Dict[str, Any]:
         warnings: List[str] = []
-        if not self._is_recent(trade_date, days=self.RECENT_ONLY_DAYS):
+        df = read_pool("zbgc", trade_date)
+        if df is None and not self._is_recent(trade_date, days=self.RECENT_ONLY_DAYS):
             return {
                 "schema_version": "em_zb_pool.v1",
                 "asof": {"trade_date": trade_date, "kind": "EOD"},
@@ -853,10 +875,9 @@ class MarketSentimentDataSource(DataSourceBase):
                 "evidence": {"count": None},
             }
 
-        date_em = trade_date.replace("-", "")
         try:
-            import akshare as ak
-            df = ak.stock_zt_pool_zbgc_em(date=date_em)
+            if df is None:
+                df, _ = get_pool("zbgc", trade_date)
         except Exception as e:
             return {
                 "schema_version": "em_zb_pool.v1",
@@ -37,7 +37,8 @@ import pandas as pd
 from core.datasources.datasource_base import DataSourceConfig, DataSourceBase
 from core.utils.ds_refresh import apply_refresh_cleanup
 from core.utils.logger import get_logger
-from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider
+from core.adapters.providers.db_provider_router import get_db_provider
+from core.adapters.datasources.cn.derived_series import load_frame
 
 LOG = get_logger("DS.OptionsRisk")
 
@@ -54,7 +55,7 @@ class OptionsRiskDataSource(DataSourceBase):
         super().__init__(name="DS.OptionsRisk")
         self.config = config
         self.window = int(window) if window and window > 0 else 60
-        self.db = DBMySQLMarketProvider()
+        self.db = get_db_provider()
 
         # 缂傛挸鐡ㄩ崪灞藉坊閸欒尪鐭惧?
         self.cache_root = config.cache_root
@@ -102,9 +103,13 @@ class OptionsRiskDataSource(DataSourceBase):
 
         # 鐠嬪啰鏁?DB provider 閼辨艾鎮庨弫鐗堝祦
         try:
-            df: pd.DataFrame = self.db.fetch_options_risk_series(
-                start_date=trade_date,
-                look_back_days=self.window,
+            # 派生日序列：只为缺失日期聚合，回看窗口读已存行
+            df: pd.DataFrame = load_frame(
+                "options_risk",
+                self.db,
+                trade_date,
+                self.window,
+                force=(refresh_mode == "full"),
             )
         except Exception as exc:
             LOG.error("[DS.OptionsRisk] fetch_options_risk_series error: %s", exc)
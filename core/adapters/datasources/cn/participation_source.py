@@ -29,7 +29,8 @@ import pandas as pd
 from core.utils.logger import get_logger
 from core.datasources.datasource_base import DataSourceConfig, DataSourceBase
 from core.utils.ds_refresh import apply_refresh_cleanup
-from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider
+from core.adapters.providers.db_columnar import stock_closes_frame
+from core.adapters.providers.db_provider_router import get_db_provider
 
 
 LOG = get_logger("DS.Participation")
@@ -69,7 +70,7 @@ class ParticipationDataSource(DataSourceBase):
         self.index_code = index_code
         self.lookback_days = int(lookback_days)
 
-        self.db = DBMySQLMarketProvider()
+        self.db = get_db_provider()
 
         LOG.info(
             "[DS.Participation] init ok. market=%s ds=%s cache=%s index=%s lookback_days=%s",
@@ -174,7 +175,7 @@ class ParticipationDataSource(DataSourceBase):
 
         # ---- 1) stocks close window ----
         try:
-            stock_df = self.db.query_stock_closes(window_start=window_start, trade_date=td_str)
+            stock_df = stock_closes_frame(self.db, window_start=window_start, trade_date=td_str)
         except Exception as e:
             LOG.error("[DS.Participation] db query_stock_closes failed: %s", e, exc_info=True)
             raise
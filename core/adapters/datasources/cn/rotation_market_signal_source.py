@@ -21,6 +21,7 @@ from decimal import Decimal
 from core.utils.logger import get_logger
 from core.datasources.datasource_base import DataSourceBase, DataSourceConfig
 from core.adapters.providers.db_provider_router import get_db_provider
+from core.adapters.providers.db_rotation_snapshot import resolve_default_run_id
 
 LOG = get_logger("DS.RotationMarketSignal")
 
@@ -90,30 +91,8 @@ class RotationMarketSignalDataSource(DataSourceBase):
 
     # ---------------------------------------------------------
     def _resolve_run_id_default(self) -> Optional[str]:
-        """Resolve baseline run_id from CN_BASELINE_REGISTRY_T (DEFAULT_BASELINE)."""
-        db = get_db_provider()
-        sql = """
-        SELECT run_id
-          FROM CN_BASELINE_REGISTRY_T
-         WHERE baseline_key = 'DEFAULT_BASELINE'
-           AND is_active = 1
-         LIMIT 1
-        """
-        try:
-            rows = db.execute(sql)
-            if rows:
-                r0 = rows[0]
-                try:
-                    m = getattr(r0, "_mapping", None)
-                    if m and "RUN_ID" in m:
-                        return str(m["RUN_ID"])
-                except Exception:
-                    pass
-                return str(r0[0])
-        except Exception as e:
-            LOG.warning("[DS.RotationMarketSignal] resolve_run_id_default failed: %s", e)
-
-        return "SR_BASE_V535_EP90_XP55_XC2_MH5_RF5_K2_COST5BPS"
+        """Resolve baseline run_id from CN_BASELINE_REGISTRY_T (DEFAULT_BASELINE); shared per-process memo."""
+        return resolve_default_run_id(get_db_provider())
 
     def _fetch(self, *, run_id: str, trade_date: str) -> List[Dict[str, Any]]:
         db = get_db_provider()
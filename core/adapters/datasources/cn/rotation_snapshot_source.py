@@ -8,6 +8,7 @@
     - SECOPR.CN_ROTATION_EXIT_SNAP_T
 - 不做业务判断/计算，不产生新信号
 - 只做轻量整形：分离明细（SECTOR_ID!=-1）与 summary（SECTOR_ID=-1）
+- 三张表一次查询（db_rotation_snapshot.ROTATION_SNAPSHOT_SQL）；build_blocks() 一次读取日期区间
 
 铁律提醒：报告层只读 snapshot，任何复杂计算一律禁止。
 """
@@ -16,12 +17,17 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
-from datetime import date, datetime
-from decimal import Decimal
+import pandas as pd
 
 from core.utils.logger import get_logger
 from core.datasources.datasource_base import DataSourceBase, DataSourceConfig
 from core.adapters.providers.db_provider_router import get_db_provider
+from core.adapters.providers.db_rotation_snapshot import (
+    jsonable,
+    resolve_default_run_id,
+    rotation_snapshots_frame,
+    snapshot_records,
+)
 
 LOG = get_logger("DS.RotationSnapshot")
 
@@ -48,11 +54,27 @@ class RotationSnapshotDataSource(DataSourceBase):
         refresh_mode is kept for interface consistency; this DS is DB-only read.
         """
         LOG.info("[DS.RotationSnapshot] build_block trade_date=%s mode=%s", trade_date, refresh_mode)
+        return self.build_blocks(trade_date, trade_date)[str(trade_date)]
 
-        run_id = self._resolve_run_id_default()
-        entry_rows = self._fetch_entry(run_id=run_id, trade_date=trade_date)
-        holding_rows = self._fetch_holding(run_id=run_id, trade_date=trade_date)
-        exit_rows = self._fetch_exit(run_id=run_id, trade_date=trade_date)
+    def build_blocks(self, start_date: str, end_date: str) -> Dict[str, Dict[str, Any]]:
+        """Raw blocks for every trade date in [start_date, end_date] (replay / backfill).
+
+        One query for the whole range (entry + holding + exit); keys are the
+        requested date strings for single-day calls, ISO dates otherwise.
+        """
+        db = get_db_provider()
+        run_id = resolve_default_run_id(db)
+        by_day = snapshot_records(rotation_snapshots_frame(db, run_id, start_date, end_date))
+
+        if str(start_date) == str(end_date):
+            day = pd.to_datetime(str(start_date)).date().isoformat()
+            return {str(start_date): self._block(start_date, run_id, by_day.get(day, {}))}
+        return {day: self._block(day, run_id, kinds) for day, kinds in sorted(by_day.items())}
+
+    def _block(self, trade_date: Any, run_id: Optional[str], kinds: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        entry_rows = kinds.get("ENTRY", [])
+        holding_rows = kinds.get("HOLDING", [])
+        exit_rows = kinds.get("EXIT", [])
 
         entry_detail, entry_summary = self._split_detail_summary(entry_rows)
         holding_detail, holding_summary = self._split_detail_summary(holding_rows)
@@ -89,120 +111,9 @@ class RotationSnapshotDataSource(DataSourceBase):
         Frozen behavior:
         - Prefer DEFAULT_BASELINE=1 (or truthy) row.
         - If no row found, return the frozen baseline id as a last-resort fallback.
+        Resolved once per process (db_rotation_snapshot.resolve_default_run_id).
         """
-        db = get_db_provider()
-
-        # Best-effort query; keep it simple and MySQL-friendly.
-        sql = """
-        SELECT run_id
-          FROM CN_BASELINE_REGISTRY_T
-         WHERE baseline_key = 'DEFAULT_BASELINE'
-           AND is_active = 1
-         LIMIT 1
-        """
-        try:
-            rows = db.execute(sql)
-            if rows:
-                # SQLAlchemy Row -> mapping
-                r0 = rows[0]
-                try:
-                    m = getattr(r0, "_mapping", None)
-                    if m and "RUN_ID" in m:
-                        return str(m["RUN_ID"])
-                except Exception:
-                    pass
-                # tuple fallback
-                return str(r0[0])
-        except Exception as e:
-            LOG.warning("[DS.RotationSnapshot] resolve_run_id_default failed: %s", e)
-
-        # Hard fallback to frozen baseline (per user spec).
-        return "SR_BASE_V535_EP90_XP55_XC2_MH5_RF5_K2_COST5BPS"
-
-    # ---------------------------------------------------------
-    def _fetch_entry(self, *, run_id: str, trade_date: str) -> List[Dict[str, Any]]:
-        db = get_db_provider()
-        sql = """
-        SELECT
-            RUN_ID,
-            TRADE_DATE,
-            SECTOR_TYPE,
-            SECTOR_ID,
-            SECTOR_NAME,
-            ENTRY_RANK,
-            ENTRY_CNT,
-            WEIGHT_SUGGESTED,
-            SIGNAL_SCORE,
-            ENERGY_SCORE,
-            ENERGY_PCT,
-            ENERGY_TIER,
-            STATE,
-            TRANSITION,
-            SOURCE_JSON,
-            CREATED_AT
-        FROM CN_ROTATION_ENTRY_SNAP_T
-        WHERE RUN_ID = :run_id
-          AND DATE(TRADE_DATE) = :trade_date
-        ORDER BY (ENTRY_RANK IS NULL) ASC, ENTRY_RANK ASC
-        """
-        rows = db.execute(sql, {"run_id": run_id, "trade_date": trade_date})
-        return self._rows_to_dicts(rows)
-
-    def _fetch_holding(self, *, run_id: str, trade_date: str) -> List[Dict[str, Any]]:
-        db = get_db_provider()
-        sql = """
-        SELECT
-            RUN_ID,
-            TRADE_DATE,
-            SECTOR_TYPE,
-            SECTOR_ID,
-            SECTOR_NAME,
-            ENTER_SIGNAL_DATE,
-            EXEC_ENTER_DATE,
-            HOLD_DAYS,
-            MIN_HOLD_DAYS,
-            EXIT_SIGNAL_TODAY,
-            EXIT_TRANSITION,
-            EXIT_EXEC_STATUS,
-            NEXT_EXIT_ELIGIBLE_DATE,
-            SOURCE_JSON,
-            CREATED_AT
-        FROM CN_ROTATION_HOLDING_SNAP_T
-        WHERE RUN_ID = :run_id
-          AND DATE(TRADE_DATE) = :trade_date
-        ORDER BY SECTOR_NAME
-        """
-        rows = db.execute(sql, {"run_id": run_id, "trade_date": trade_date})
-        return self._rows_to_dicts(rows)
-
-    def _fetch_exit(self, *, run_id: str, trade_date: str) -> List[Dict[str, Any]]:
-        db = get_db_provider()
-        sql = """
-        SELECT
-            RUN_ID,
-            TRADE_DATE,
-            EXEC_EXIT_DATE,
-            SECTOR_TYPE,
-            SECTOR_ID,
-            SECTOR_NAME,
-            STATE,
-            TRANSITION,
-            ENTRY_RANK,
-            SIGNAL_SCORE,
-            ENTER_SIGNAL_DATE,
-            EXEC_ENTER_DATE,
-            HOLD_DAYS,
-            MIN_HOLD_DAYS,
-            EXIT_EXEC_STATUS,
-            SOURCE_JSON,
-            CREATED_AT
-        FROM CN_ROTATION_EXIT_SNAP_T
-        WHERE RUN_ID = :run_id
-          AND DATE(TRADE_DATE) = :trade_date
-        ORDER BY SECTOR_NAME
-        """
-        rows = db.execute(sql, {"run_id": run_id, "trade_date": trade_date})
-        return self._rows_to_dicts(rows)
+        return resolve_default_run_id(get_db_provider())
 
     # ---------------------------------------------------------
     @staticmethod
@@ -213,46 +124,7 @@ class RotationSnapshotDataSource(DataSourceBase):
         - Some callers (e.g. debug dump / snapshot export) may json.dump the raw block.
         - SQLAlchemy/Oracle rows may contain datetime/date/Decimal which are not JSON-serializable.
         """
-        if v is None:
-            return None
-        # datetime/date
-        if isinstance(v, (datetime, date)):
-            try:
-                return v.isoformat()
-            except Exception:
-                return str(v)
-        # Decimal -> float (safe for display/debug)
-        if isinstance(v, Decimal):
-            try:
-                return float(v)
-            except Exception:
-                return str(v)
-        # bytes -> utf-8 str (best-effort)
-        if isinstance(v, (bytes, bytearray)):
-            try:
-                return v.decode("utf-8", errors="replace")
-            except Exception:
-                return str(v)
-        return v
-
-    @staticmethod
-    def _rows_to_dicts(rows: Any) -> List[Dict[str, Any]]:
-        out: List[Dict[str, Any]] = []
-        if not rows:
-            return out
-        for r in rows:
-            try:
-                m = getattr(r, "_mapping", None)
-                if m:
-                    # Normalize keys to UPPERCASE to match frozen snapshot schema
-                    # (Oracle columns are uppercase; downstream report blocks expect uppercase)
-                    out.append({str(k).upper(): RotationSnapshotDataSource._jsonable(m[k]) for k in m.keys()})
-                else:
-                    # tuple fallback (should not happen for SQLAlchemy Row)
-                    out.append({"_row": list(r)})
-            except Exception:
-                out.append({"_row": str(r)})
-        return out
+        return jsonable(v)
 
     @staticmethod
     def _split_detail_summary(rows: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+UnifiedRisk V12 - columnar result transport for DB providers
+
+Provider queries historically returned `result.fetchall()` (one SQLAlchemy Row per
+record), which callers turned into DataFrames or per-symbol dicts. For
+full-market windows that is millions of short-lived Python objects per run.
+
+This module moves results cursor -> typed NumPy columns -> DataFrame:
+- fetch_frame(): DBAPI cursor, fetchmany() chunks transposed straight into
+  arrays of the declared dtype (no Row / dict per record)
+- columns_frame(): already-columnar results (DuckDB fetchnumpy) cast to the
+  declared dtypes
+- rows_to_frame(): same declared dtypes for providers that only return rows
+- stock_closes_frame(): query_stock_closes as a typed frame, any provider
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# query_stock_closes column contract (order matches the SELECT)
+STOCK_CLOSE_COLUMNS: List[str] = ["symbol", "exchange", "trade_date", "pre_close", "chg_pct", "close", "amount"]
+STOCK_CLOSE_DTYPES: Dict[str, str] = {
+    "symbol": "object",
+    "exchange": "object",
+    "trade_date": "datetime64[ns]",
+    "pre_close": "float64",
+    "chg_pct": "float64",
+    "close": "float64",
+    "amount": "float64",
+}
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+def _column_array(values: Sequence[Any], dtype: Optional[str]) -> np.ndarray:
+    """One column of a fetched chunk -> ndarray of the declared dtype (None -> NaN/NaT)."""
+    if dtype is None or dtype == "object":
+        arr = np.empty(len(values), dtype=object)
+        arr[:] = values
+        return arr
+    kind = np.dtype(dtype).kind
+    if kind == "f":
+        return np.fromiter((np.nan if v is None else v for v in values), dtype=dtype, count=len(values))
+    if kind == "M":
+        return np.array(values, dtype=dtype)
+    return np.fromiter(values, dtype=dtype, count=len(values))
+
+
+def _cast_array(arr: Any, dtype: Optional[str]) -> np.ndarray:
+    """Columnar driver output (ndarray / masked array) -> declared dtype."""
+    if isinstance(arr, np.ma.MaskedArray):
+        if dtype is not None and np.dtype(dtype).kind == "f":
+            return arr.astype(dtype).filled(np.nan)
+        if dtype is not None and np.dtype(dtype).kind == "M":
+            return arr.astype(dtype).filled(np.datetime64("NaT"))
+        arr = arr.astype(object).filled(None)
+    arr = np.asarray(arr)
+    if dtype is None or arr.dtype == np.dtype(dtype):
+        return arr
+    return arr.astype(dtype)
+
+
+def columns_frame(columns: Mapping[str, Any], dtypes: Mapping[str, str]) -> pd.DataFrame:
+    """{name: array} -> DataFrame with declared dtypes (columns not declared pass through)."""
+    return pd.DataFrame({name: _cast_array(arr, dtypes.get(name)) for name, arr in columns.items()}, copy=False)
+
+
+def empty_frame(names: Sequence[str], dtypes: Mapping[str, str]) -> pd.DataFrame:
+    return columns_frame({n: np.empty(0, dtype=dtypes.get(n) or object) for n in names}, dtypes)
+
+
+def fetch_frame(cursor: Any, dtypes: Mapping[str, str], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> pd.DataFrame:
+    """DBAPI cursor -> DataFrame; each fetchmany() chunk is transposed into typed arrays."""
+    names = [d[0] for d in (cursor.description or [])]
+    parts: Dict[str, List[np.ndarray]] = {n: [] for n in names}
+    while True:
+        chunk = cursor.fetchmany(chunk_rows)
+        if not chunk:
+            break
+        for name, values in zip(names, zip(*chunk)):
+            parts[name].append(_column_array(values, dtypes.get(name)))
+    if not names or not parts[names[0]]:
+        return empty_frame(names, dtypes)
+    return pd.DataFrame({n: np.concatenate(p) if len(p) > 1 else p[0] for n, p in parts.items()}, copy=False)
+
+
+def rows_to_frame(rows: Sequence[Sequence[Any]], names: Sequence[str], dtypes: Mapping[str, str]) -> pd.DataFrame:
+    """Row tuples (legacy provider output) -> the same typed frame fetch_frame() builds."""
+    if not rows:
+        return empty_frame(names, dtypes)
+    return pd.DataFrame(
+        {n: _column_array(values, dtypes.get(n)) for n, values in zip(names, zip(*rows))},
+        copy=False,
+    )
+
+
+def stock_closes_frame(db: Any, window_start: Any, trade_date: Any) -> pd.DataFrame:
+    """query_stock_closes as a typed frame (STOCK_CLOSE_DTYPES), columnar when the provider supports it."""
+    fn = getattr(db, "query_stock_closes_frame", None)
+    if callable(fn):
+        return fn(window_start=window_start, trade_date=trade_date)
+    rows = db.query_stock_closes(window_start=window_start, trade_date=trade_date)
+    return rows_to_frame(rows or [], STOCK_CLOSE_COLUMNS, STOCK_CLOSE_DTYPES)
@@ -0,0 +1,305 @@
+"""DuckDB/Parquet market DB provider (UnifiedRisk V12)
+
+Offline / analytical backend selected with ``db.type: duckdb``.
+
+The provider reads a local Parquet mirror of the MySQL market tables:
+
+    <root>/<TABLE>/year=YYYY/month=MM/part.parquet   (dated tables)
+    <root>/<TABLE>/part.parquet                        (snapshot tables, e.g. universe)
+
+Every mirrored table is exposed to an embedded DuckDB connection as a view with
+the MySQL table name, and the MySQL provider's queries run unchanged apart from
+a small dialect translation in ``execute_mysql`` (``:name`` binds, ``#``
+comments, ``DATE_SUB(.., INTERVAL n DAY)``). All public methods and their
+post-processing are therefore inherited from ``DBMySQLMarketProvider``.
+
+``sync_mirror`` (see tools/sync_duckdb_mirror.py) refreshes the mirror
+incrementally from MySQL, one month-partition at a time.
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import re
+import threading
+from collections import namedtuple
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+from sqlalchemy import text
+
+try:
+    import duckdb
+except Exception:  # pragma: no cover - optional dependency
+    duckdb = None
+
+from core.adapters.providers.db_columnar import DEFAULT_CHUNK_ROWS, columns_frame
+from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider, _to_date
+from core.utils.config_loader import load_config
+from core.utils.logger import get_logger
+
+
+LOG = get_logger("DS.provider.duckdb.market")
+
+DEFAULT_MIRROR_ROOT = os.path.join("data", "mirror", "cn_market")
+
+# logical table -> date column (None: full snapshot table)
+MIRROR_DATE_COLUMNS: Dict[str, Optional[str]] = {
+    "stock_daily": "TRADE_DATE",
+    "index_daily": "TRADE_DATE",
+    "fund_etf_hist": "DATA_DATE",
+    "fut_index_hist": "TRADE_DATE",
+    "option_daily": "DATA_DATE",
+    "universe": None,
+}
+
+_MYSQL_COMMENT_RE = re.compile(r"#[^\n]*")
+_DATE_SUB_RE = re.compile(
+    r"DATE_SUB\(\s*(:[A-Za-z_]\w*|'[^']*')\s*,\s*INTERVAL\s+(:[A-Za-z_]\w*|\d+)\s+DAY\s*\)",
+    re.IGNORECASE,
+)
+_BIND_RE = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def translate_mysql_sql(sql: str) -> str:
+    """MySQL dialect used by DBMySQLMarketProvider -> DuckDB."""
+    out = _MYSQL_COMMENT_RE.sub("", sql)
+    out = _DATE_SUB_RE.sub(r"(CAST(\1 AS DATE) - CAST(\2 AS INTEGER))", out)
+    return _BIND_RE.sub(r"$\1", out)
+
+
+def _bind_params(sql: str, params: Dict[str, Any] | None) -> Dict[str, Any]:
+    # DuckDB rejects unused named parameters; ISO date strings bind as DATE
+    used = set(re.findall(r"\$([A-Za-z_]\w*)", sql))
+    out: Dict[str, Any] = {}
+    for k, v in (params or {}).items():
+        if k not in used:
+            continue
+        if isinstance(v, str) and _ISO_DATE_RE.match(v):
+            v = _to_date(v)
+        out[k] = v
+    return out
+
+
+class DBDuckDBMarketProvider(DBMySQLMarketProvider):
+    """DBMySQLMarketProvider over a local Parquet mirror (embedded DuckDB)."""
+
+    def __init__(self, root: Optional[str] = None, threads: Optional[int] = None):
+        if duckdb is None:
+            raise RuntimeError("duckdb is required for db.type=duckdb (pip install duckdb)")
+
+        db_cfg = load_config().get("db", {}) or {}
+        duck_cfg = db_cfg.get("duckdb", {}) or {}
+        mysql_cfg = db_cfg.get("mysql", {}) or {}
+
+        self.mysql_cfg = {}
+        self.mysql_engine = None
+        self._set_tables(duck_cfg.get("tables") or mysql_cfg.get("tables", {}) or {})
+        self.schema = "main"
+        self.root = root or os.getenv("DUCKDB_MIRROR_ROOT", str(duck_cfg.get("root", DEFAULT_MIRROR_ROOT)))
+
+        self._con = duckdb.connect(database=":memory:")
+        threads = threads or duck_cfg.get("threads")
+        if threads:
+            self._con.execute(f"SET threads = {int(threads)}")
+        self._lock = threading.Lock()
+        self.available: Dict[str, bool] = {}
+        self.refresh_views()
+        LOG.info(
+            "[DBDuckDBMarketProvider] mirror=%s tables=%s",
+            self.root,
+            ",".join(t for t, ok in self.available.items() if ok) or "-",
+        )
+
+    # ==================================================
+    # mirror views
+    # ==================================================
+    def refresh_views(self) -> None:
+        """(Re)create one view per mirrored table; tables without files stay unavailable."""
+        with self._lock:
+            for key, table in self.tables.items():
+                path = os.path.join(self.root, table)
+                files = glob.glob(os.path.join(path, "**", "*.parquet"), recursive=True)
+                self.available[table] = bool(files)
+                if not files:
+                    continue
+                pattern = os.path.join(path, "**", "*.parquet").replace("\\", "/").replace("'", "''")
+                self._con.execute(
+                    f"CREATE OR REPLACE VIEW {table} AS "
+                    f"SELECT * FROM read_parquet('{pattern}', hive_partitioning = true, union_by_name = true)"
+                )
+
+    def _require_mysql(self, table_name: str):
+        names = [t for t in re.split(r"[/,\s]+", str(table_name)) if t]
+        missing = [t for t in names if t in self.available and not self.available[t]]
+        if missing:
+            raise RuntimeError(f"table {','.join(missing)} not mirrored under {self.root}")
+
+    def _use_mysql_stock(self) -> bool:
+        return bool(self.available.get(self.mysql_stock_table))
+
+    # ==================================================
+    # low-level executor
+    # ==================================================
+    def execute_mysql(self, sql: str, params: Dict[str, Any] | None = None):
+        duck_sql = translate_mysql_sql(sql)
+        binds = _bind_params(duck_sql, params)
+        LOG.debug("[DBDuckDBMarketProvider] execute sql=%s params=%s", duck_sql, binds)
+        cur = self._con.cursor()
+        try:
+            cur.execute(duck_sql, binds)
+            rows = cur.fetchall()
+            # named rows like SQLAlchemy Row: pd.DataFrame(rows) keeps column names
+            Row = namedtuple("Row", [d[0] for d in cur.description], rename=True)
+            return [Row(*r) for r in rows]
+        finally:
+            cur.close()
+
+    def execute_mysql_frame(
+        self,
+        sql: str,
+        params: Dict[str, Any] | None = None,
+        dtypes: Dict[str, str] | None = None,
+    ) -> pd.DataFrame:
+        """Columnar path: DuckDB result -> NumPy columns (fetchnumpy) -> declared dtypes."""
+        duck_sql = translate_mysql_sql(sql)
+        binds = _bind_params(duck_sql, params)
+        LOG.debug("[DBDuckDBMarketProvider] execute_frame sql=%s params=%s", duck_sql, binds)
+        cur = self._con.cursor()
+        try:
+            cur.execute(duck_sql, binds)
+            return columns_frame(cur.fetchnumpy(), dtypes or {})
+        finally:
+            cur.close()
+
+    def execute_mysql_stream(
+        self,
+        sql: str,
+        params: Dict[str, Any] | None = None,
+        dtypes: Dict[str, str] | None = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """Streaming path: DuckDB vector chunks (2048 rows each) regrouped to ~chunk_rows per frame."""
+        duck_sql = translate_mysql_sql(sql)
+        binds = _bind_params(duck_sql, params)
+        LOG.debug("[DBDuckDBMarketProvider] execute_stream sql=%s params=%s chunk_rows=%s", duck_sql, binds, chunk_rows)
+        vectors = max(1, -(-int(chunk_rows) // 2048))
+        cur = self._con.cursor()
+        try:
+            cur.execute(duck_sql, binds)
+            while True:
+                part = cur.fetch_df_chunk(vectors)
+                if part is None or part.empty:
+                    break
+                yield columns_frame({c: part[c].to_numpy() for c in part.columns}, dtypes or {})
+        finally:
+            cur.close()
+
+
+# ==================================================
+# mirror sync (MySQL -> Parquet)
+# ==================================================
+def _write_parquet(df: pd.DataFrame, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def write_month_partition(root: str, table: str, date_col: str, df: pd.DataFrame, year: int, month: int) -> str:
+    """Replace one month-partition; rows sorted by date so row-group stats prune scans."""
+    path = os.path.join(root, table, f"year={year}", f"month={month:02d}", "part.parquet")
+    df = df.copy()
+    df[date_col] = pd.to_datetime(df[date_col]).dt.date
+    _write_parquet(df.sort_values(date_col, kind="stable").reset_index(drop=True), path)
+    return path
+
+
+def mirror_last_date(root: str, table: str, date_col: str) -> Optional[date]:
+    files = glob.glob(os.path.join(root, table, "**", "*.parquet"), recursive=True)
+    if not files or duckdb is None:
+        return None
+    pattern = os.path.join(root, table, "**", "*.parquet").replace("\\", "/").replace("'", "''")
+    row = duckdb.sql(
+        f"SELECT MAX({date_col}) FROM read_parquet('{pattern}', hive_partitioning = true, union_by_name = true)"
+    ).fetchone()
+    return _to_date(row[0]) if row and row[0] is not None else None
+
+
+def _month_starts(start: date, end: date) -> List[date]:
+    out, d = [], date(start.year, start.month, 1)
+    while d <= end:
+        out.append(d)
+        d = date(d.year + (d.month == 12), d.month % 12 + 1, 1)
+    return out
+
+
+def sync_table(engine, table: str, date_col: Optional[str], root: str, since=None, until=None) -> Dict[str, Any]:
+    """
+    Incremental MySQL -> Parquet copy of one table.
+
+    Dated tables: re-export every month from `since` (default: the month of the
+    mirror's last date, i.e. the possibly-partial tail) up to `until` / source max.
+    Snapshot tables: full rewrite.
+    """
+    if date_col is None:
+        with engine.connect() as conn:
+            df = pd.read_sql(text(f"SELECT * FROM {table}"), conn)  # nosec B608
+        _write_parquet(df, os.path.join(root, table, "part.parquet"))
+        return {"table": table, "months": 0, "rows": int(len(df))}
+
+    start = _to_date(since) if since else mirror_last_date(root, table, date_col)
+    with engine.connect() as conn:
+        lo, hi = conn.execute(
+            text(f"SELECT MIN({date_col}), MAX({date_col}) FROM {table} WHERE {date_col} >= :since"),  # nosec B608
+            {"since": start or date(1900, 1, 1)},
+        ).fetchone()
+        if lo is None:
+            return {"table": table, "months": 0, "rows": 0}
+        lo, hi = _to_date(lo), _to_date(hi)
+        if until:
+            hi = min(hi, _to_date(until))
+
+        months, rows = 0, 0
+        for m0 in _month_starts(lo, hi):
+            m1 = date(m0.year + (m0.month == 12), m0.month % 12 + 1, 1)
+            df = pd.read_sql(
+                text(f"SELECT * FROM {table} WHERE {date_col} >= :a AND {date_col} < :b"),  # nosec B608
+                conn,
+                params={"a": m0, "b": m1},
+            )
+            if df.empty:
+                continue
+            write_month_partition(root, table, date_col, df, m0.year, m0.month)
+            months += 1
+            rows += int(len(df))
+            LOG.info("[DuckDBMirror] %s %04d-%02d rows=%s", table, m0.year, m0.month, len(df))
+    return {"table": table, "months": months, "rows": rows, "from": str(lo), "to": str(hi)}
+
+
+def sync_mirror(
+    engine,
+    tables: Dict[str, str],
+    root: str,
+    *,
+    only: Optional[List[str]] = None,
+    since=None,
+    until=None,
+) -> List[Dict[str, Any]]:
+    """Sync every logical table in MIRROR_DATE_COLUMNS (or `only`); failures are logged per table."""
+    stats = []
+    for key, date_col in MIRROR_DATE_COLUMNS.items():
+        if only and key not in only and tables.get(key) not in only:
+            continue
+        table = tables.get(key)
+        if not table:
+            continue
+        try:
+            stats.append(sync_table(engine, table, date_col, root, since=since, until=until))
+        except Exception as e:
+            LOG.warning("[DuckDBMirror] sync failed table=%s: %s", table, e)
+            stats.append({"table": table, "error": str(e)})
+    return stats
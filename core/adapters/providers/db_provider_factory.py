@@ -24,5 +24,10 @@ def get_db_provider() -> Any:
 
         return DBMySQLMarketProvider()
 
+    if db_type == "duckdb":
+        from core.adapters.providers.db_provider_router import get_db_provider as _router_provider
+
+        return _router_provider()
+
     raise ValueError(f"Unsupported db.type={db_type}")
 
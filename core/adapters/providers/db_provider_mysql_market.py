@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 from datetime import date
 import os
 import re
@@ -6,6 +6,10 @@ import pandas as pd
 from sqlalchemy import create_engine, text
 from urllib.parse import quote_plus
 
+from core.adapters.providers.db_columnar import DEFAULT_CHUNK_ROWS, STOCK_CLOSE_DTYPES, fetch_frame, rows_to_frame
+from core.adapters.providers.db_query_cache import build_query_cache
+from core.adapters.providers.db_rotation_snapshot import ROTATION_SNAPSHOT_TABLES
+from core.adapters.providers.db_streaming import BreadthPlusCounter, SymbolTailReducer
 from core.utils.config_loader import load_config
 from core.utils.logger import get_logger
 
@@ -15,6 +19,9 @@ logger = get_logger(__name__)
 LOG = get_logger("DS.provider.mysql.market")
 _SQL_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
+# fetch_breadth_plus_metrics stream columns
+BREADTH_CLOSE_DTYPES = {"symbol": "object", "trade_date": "datetime64[ns]", "close": "float64"}
+
 
 def _to_date(x) -> date:
     """
@@ -40,6 +47,28 @@ class DBMySQLMarketProvider:
     MySQL-only market DB provider.
     """
 
+    # logical name -> (env override, default table)
+    TABLE_DEFAULTS = {
+        "stock_daily": ("MYSQL_STOCK_TABLE", "CN_STOCK_DAILY_PRICE"),
+        "fund_etf_hist": ("MYSQL_ETF_TABLE", "CN_FUND_ETF_HIST_EM"),
+        "index_daily": ("MYSQL_INDEX_TABLE", "CN_INDEX_DAILY_PRICE"),
+        "fut_index_hist": ("MYSQL_FUT_TABLE", "CN_FUT_INDEX_HIS"),
+        "option_daily": ("MYSQL_OPTION_TABLE", "CN_OPTION_SSE_DAILY"),
+        "universe": ("MYSQL_UNIVERSE_TABLE", "CN_UNIVERSE_SYMBOLS"),
+    }
+
+    def _set_tables(self, mysql_tables: Dict[str, Any]) -> None:
+        self.tables = {
+            key: _safe_ident(os.getenv(env, str(mysql_tables.get(key, default))), env)
+            for key, (env, default) in self.TABLE_DEFAULTS.items()
+        }
+        self.mysql_stock_table = self.tables["stock_daily"]
+        self.mysql_etf_table = self.tables["fund_etf_hist"]
+        self.mysql_index_table = self.tables["index_daily"]
+        self.mysql_fut_table = self.tables["fut_index_hist"]
+        self.mysql_option_table = self.tables["option_daily"]
+        self.mysql_universe_table = self.tables["universe"]
+
     def __init__(self):
         db_cfg = load_config().get("db", {}) or {}
 
@@ -53,41 +82,13 @@ class DBMySQLMarketProvider:
             "database": os.getenv("MYSQL_DATABASE", str(mysql_cfg.get("database", "cn_market"))),
             "charset": str(mysql_cfg.get("charset", "utf8mb4")),
         }
-        mysql_tables = mysql_cfg.get("tables", {}) or {}
-        self.mysql_stock_table = _safe_ident(
-            os.getenv("MYSQL_STOCK_TABLE", str(mysql_tables.get("stock_daily", "CN_STOCK_DAILY_PRICE"))),
-            "MYSQL_STOCK_TABLE",
-        )
-        self.mysql_etf_table = _safe_ident(
-            os.getenv("MYSQL_ETF_TABLE", str(mysql_tables.get("fund_etf_hist", "CN_FUND_ETF_HIST_EM"))),
-            "MYSQL_ETF_TABLE",
-        )
-        self.mysql_index_table = _safe_ident(
-            os.getenv("MYSQL_INDEX_TABLE", str(mysql_tables.get("index_daily", "CN_INDEX_DAILY_PRICE"))),
-            "MYSQL_INDEX_TABLE",
-        )
-        self.mysql_fut_table = _safe_ident(
-            os.getenv("MYSQL_FUT_TABLE", str(mysql_tables.get("fut_index_hist", "CN_FUT_INDEX_HIS"))),
-            "MYSQL_FUT_TABLE",
-        )
-        self.mysql_option_table = _safe_ident(
-            os.getenv("MYSQL_OPTION_TABLE", str(mysql_tables.get("option_daily", "CN_OPTION_SSE_DAILY"))),
-            "MYSQL_OPTION_TABLE",
-        )
-        self.mysql_universe_table = _safe_ident(
-            os.getenv("MYSQL_UNIVERSE_TABLE", str(mysql_tables.get("universe", "CN_UNIVERSE_SYMBOLS"))),
-            "MYSQL_UNIVERSE_TABLE",
-        )
+        self._set_tables(mysql_cfg.get("tables", {}) or {})
         self.schema = self.mysql_cfg["database"]
-        self.tables = {
-            "stock_daily": self.mysql_stock_table,
-            "fund_etf_hist": self.mysql_etf_table,
-            "index_daily": self.mysql_index_table,
-            "fut_index_hist": self.mysql_fut_table,
-            "option_daily": self.mysql_option_table,
-            "universe": self.mysql_universe_table,
-        }
         self.mysql_engine = None
+        # closed-date query results (read-through, on disk); None = disabled
+        self.query_cache = build_query_cache(
+            db_cfg.get("query_cache"), [*self.tables.values(), *ROTATION_SNAPSHOT_TABLES.values()]
+        )
         try:
             _pwd = quote_plus(str(self.mysql_cfg["password"]))
             mysql_conn_str = (
@@ -125,10 +126,68 @@ class DBMySQLMarketProvider:
     def execute_mysql(self, sql: str, params: Dict[str, Any] | None = None):
         if self.mysql_engine is None:
             raise RuntimeError("mysql engine not available")
-        logger.debug(f"[DBMySQLMarketProvider] execute_mysql sql={sql} params={params}")
+        cache = getattr(self, "query_cache", None)
+        if cache is not None:
+            cached = cache.get_rows(sql, params)
+            if cached is not None:
+                return cached
+        logger.debug("[DBMySQLMarketProvider] execute_mysql sql=%s params=%s", sql, params)
         with self.mysql_engine.connect() as conn:
             result = conn.execute(text(sql), params or {})
-            return result.fetchall()
+            rows = result.fetchall()
+            if cache is not None:
+                cache.put_rows(sql, params, list(result.keys()), rows)
+            return rows
+
+    def execute_mysql_frame(
+        self,
+        sql: str,
+        params: Dict[str, Any] | None = None,
+        dtypes: Dict[str, str] | None = None,
+    ) -> pd.DataFrame:
+        """Columnar variant of execute_mysql: DBAPI cursor -> typed DataFrame (no Row objects)."""
+        if self.mysql_engine is None:
+            raise RuntimeError("mysql engine not available")
+        cache = getattr(self, "query_cache", None)
+        if cache is not None:
+            cached = cache.get_frame(sql, params, dtypes or {})
+            if cached is not None:
+                return cached
+        logger.debug("[DBMySQLMarketProvider] execute_mysql_frame sql=%s params=%s", sql, params)
+        with self.mysql_engine.connect() as conn:
+            result = conn.execute(text(sql), params or {})
+            try:
+                df = fetch_frame(result.cursor, dtypes or {})
+            finally:
+                result.close()
+        if cache is not None:
+            cache.put_frame(sql, params, dtypes or {}, df)
+        return df
+
+    def execute_mysql_stream(
+        self,
+        sql: str,
+        params: Dict[str, Any] | None = None,
+        dtypes: Dict[str, str] | None = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Streaming variant of execute_mysql: server-side cursor (stream_results),
+        yields typed DataFrames of at most chunk_rows rows. Peak memory is one chunk.
+        """
+        if self.mysql_engine is None:
+            raise RuntimeError("mysql engine not available")
+        logger.debug("[DBMySQLMarketProvider] execute_mysql_stream sql=%s params=%s chunk_rows=%s", sql, params, chunk_rows)
+        with self.mysql_engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=int(chunk_rows)).execute(
+                text(sql), params or {}
+            )
+            names = list(result.keys())
+            try:
+                for part in result.partitions(int(chunk_rows)):
+                    yield rows_to_frame(part, names, dtypes or {})
+            finally:
+                result.close()
 
     def _stock_table_ref(self, use_mysql: bool) -> str:
         return self.mysql_stock_table
@@ -174,7 +233,11 @@ class DBMySQLMarketProvider:
             "trade_date": _to_date(trade_date),
         }
         self._require_mysql(table)
-        sql = f"""  # nosec B608
+        return self.execute_mysql(self._stock_closes_sql(), params)
+
+    def _stock_closes_sql(self) -> str:
+        # column order == STOCK_CLOSE_COLUMNS
+        return f"""  # nosec B608
         SELECT
             SYMBOL        AS symbol,
             EXCHANGE      AS exchange,
@@ -187,7 +250,21 @@ class DBMySQLMarketProvider:
         WHERE TRADE_DATE >= :window_start
           AND TRADE_DATE <= :trade_date
         """
-        return self.execute_mysql(sql, params)
+
+    def query_stock_closes_frame(self, window_start, trade_date) -> pd.DataFrame:
+        """
+        query_stock_closes as a columnar frame: STOCK_CLOSE_COLUMNS with
+        STOCK_CLOSE_DTYPES (trade_date datetime64, prices/amount float64).
+        """
+        table = self.tables.get("stock_daily")
+        if not table:
+            raise RuntimeError("db.mysql.tables.stock_daily not configured")
+        params = {
+            "window_start": _to_date(window_start),
+            "trade_date": _to_date(trade_date),
+        }
+        self._require_mysql(table)
+        return self.execute_mysql_frame(self._stock_closes_sql(), params, STOCK_CLOSE_DTYPES)
 
     # ==================================================
     # index daily prices (CLOSE -> CLOSE)
@@ -562,6 +639,50 @@ class DBMySQLMarketProvider:
             },
         }
     
+    def load_full_market_eod_frame(
+        self,
+        trade_date,
+    ) -> Dict[str, Any]:
+        """
+        Columnar form of load_full_market_eod_snapshot: same envelope, but the
+        market is a typed DataFrame under "frame" (one row per symbol,
+        STOCK_CLOSE_DTYPES) instead of a dict of per-symbol dicts.
+        """
+        df = self.query_stock_closes_frame(
+            window_start=trade_date,
+            trade_date=trade_date,
+        )
+        if df.empty:
+            raise RuntimeError(f"no EOD stock closes found for {trade_date}")
+        # same "last row wins" semantics as the dict snapshot
+        df = df.drop_duplicates(subset="symbol", keep="last").reset_index(drop=True)
+
+        return {
+            "trade_date": trade_date,
+            "snapshot_type": "EOD",
+            "frame": df,
+            "_meta": {
+                "source": "mysql",
+                "confirmed": True,
+                "record_count": len(df),
+            },
+        }
+
+    def load_latest_full_market_eod_frame(
+        self,
+        as_of_date,
+    ) -> Dict[str, Any]:
+        """Columnar form of load_latest_full_market_eod_snapshot (see load_full_market_eod_frame)."""
+        last_trade_date = self.query_last_trade_date(as_of_date)
+        snapshot = self.load_full_market_eod_frame(last_trade_date)
+        snapshot["_meta"].update(
+            {
+                "as_of_date": _to_date(as_of_date),
+                "resolved_trade_date": last_trade_date,
+            }
+        )
+        return snapshot
+
     def query_last_trade_date(self, as_of_date) -> str:
         table = self.tables.get("stock_daily")
         if not table:
@@ -925,6 +1046,7 @@ class DBMySQLMarketProvider:
         ma20_window: int = 20,
         ma50_window: int = 50,
         nhnl_window: int = 20,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
     ) -> Dict[str, Any]:
         """Compute breadth+ metrics from local daily price table.
 
@@ -934,8 +1056,9 @@ class DBMySQLMarketProvider:
         - new highs vs new lows ratio
 
         Notes:
-        - This method is designed to be robust and fast enough for daily runs:
-          it pulls the last N calendar days for all symbols (roughly 300k~600k rows).
+        - The last N calendar days for all symbols (roughly 300k~600k rows at 120d)
+          are streamed in chunk_rows chunks and reduced per symbol (BreadthPlusCounter),
+          so peak memory does not grow with look_back_days / MA windows.
         """
         table = self.tables.get("stock_daily") or "CN_STOCK_DAILY_PRICE"
         self._require_mysql(table)
@@ -950,59 +1073,54 @@ class DBMySQLMarketProvider:
               AND CLOSE IS NOT NULL
             ORDER BY SYMBOL ASC, TRADE_DATE ASC
         """
-        rows = self.execute_mysql(sql, {"asof_date": asof_date, "look_back_days": int(look_back_days)})
-        df = pd.DataFrame(rows)
-        if df is None or df.empty:
+        # stream (symbol, date)-ordered chunks into per-symbol tails: memory is bounded by
+        # chunk_rows + max(window) rows per open symbol, independent of look_back_days
+        counter = BreadthPlusCounter(asof_date, ma20_window, ma50_window, nhnl_window)
+        reducer = SymbolTailReducer(counter.tail_rows, counter.feed)
+        raw_rows = 0
+        valid_rows = 0
+        for chunk in self.execute_mysql_stream(
+            sql,
+            {"asof_date": asof_date, "look_back_days": int(look_back_days)},
+            dtypes=BREADTH_CLOSE_DTYPES,
+            chunk_rows=chunk_rows,
+        ):
+            raw_rows += len(chunk)
+            chunk = chunk.dropna(subset=["symbol", "trade_date", "close"])
+            valid_rows += len(chunk)
+            reducer.feed(chunk)
+        reducer.close()
+
+        if raw_rows == 0:
             return {
                 "asof_date": str(asof_date),
                 "data_status": "MISSING",
                 "reason": "empty_price_window",
             }
-
-        # normalize types
-        df["trade_date"] = pd.to_datetime(df["trade_date"]).dt.date
-        df["close"] = pd.to_numeric(df["close"], errors="coerce")
-        df = df.dropna(subset=["symbol", "trade_date", "close"]).copy()
-        if df.empty:
+        if valid_rows == 0:
             return {
                 "asof_date": str(asof_date),
                 "data_status": "MISSING",
                 "reason": "no_valid_rows",
             }
 
-        # rolling computations per symbol
-        g = df.groupby("symbol", sort=False)["close"]
-        df["ma20"] = g.transform(lambda s: s.rolling(int(ma20_window), min_periods=int(ma20_window)).mean())
-        df["ma50"] = g.transform(lambda s: s.rolling(int(ma50_window), min_periods=int(ma50_window)).mean())
-
-        # new high/low window based on prior N days (exclude current day)
-        df["max_prev"] = g.apply(
-            lambda s: s.shift(1).rolling(int(nhnl_window), min_periods=int(nhnl_window)).max()
-        ).reset_index(level=0, drop=True)
-        df["min_prev"] = g.apply(
-            lambda s: s.shift(1).rolling(int(nhnl_window), min_periods=int(nhnl_window)).min()
-        ).reset_index(level=0, drop=True)
-
-        # asof cross-section
         asof_str = str(asof_date)
-        d0 = df[df["trade_date"] == pd.to_datetime(asof_str).date()].copy()
-        if d0.empty:
+        c = counter.counts
+        if c["total"] == 0:
             return {
                 "asof_date": asof_str,
                 "data_status": "MISSING",
                 "reason": "asof_not_in_window",
             }
 
-        total = int(len(d0))
-        valid_ma20 = int(d0["ma20"].notna().sum())
-        valid_ma50 = int(d0["ma50"].notna().sum())
-        valid_nhnl = int(d0["max_prev"].notna().sum())
-
-        above_ma20 = int(((d0["close"] > d0["ma20"]) & d0["ma20"].notna()).sum())
-        above_ma50 = int(((d0["close"] > d0["ma50"]) & d0["ma50"].notna()).sum())
-
-        new_high = int(((d0["close"] >= d0["max_prev"]) & d0["max_prev"].notna()).sum())
-        new_low = int(((d0["close"] <= d0["min_prev"]) & d0["min_prev"].notna()).sum())
+        total = c["total"]
+        valid_ma20 = c["valid_ma20"]
+        valid_ma50 = c["valid_ma50"]
+        valid_nhnl = c["valid_nhnl"]
+        above_ma20 = c["above_ma20"]
+        above_ma50 = c["above_ma50"]
+        new_high = c["new_high"]
+        new_low = c["new_low"]
 
         pct_above_ma20 = round((above_ma20 / valid_ma20 * 100.0) if valid_ma20 else 0.0, 2)
         pct_above_ma50 = round((above_ma50 / valid_ma50 * 100.0) if valid_ma50 else 0.0, 2)
@@ -1125,7 +1243,9 @@ class DBMarketProvider:
         class _Impl(ProviderBase):
             def __init__(self):
                 super().__init__(name="db")
-                self._db = DBMySQLMarketProvider()
+                from core.adapters.providers.db_provider_router import get_db_provider  # local import
+
+                self._db = get_db_provider()
 
             @staticmethod
             def _empty_frame_for_method(method: str) -> pd.DataFrame:
@@ -3,6 +3,7 @@ from datetime import date
 import pandas as pd
 from sqlalchemy import create_engine, text
 
+from core.adapters.providers.db_query_cache import build_query_cache
 from core.utils.config_loader import load_config
 from core.utils.logger import get_logger
 
@@ -46,11 +47,12 @@ class DBOracleProvider:
         self.service = cfg["service"]
         self.schema = cfg.get("schema")
         self.tables = cfg.get("tables", {})
+        self.query_cache = build_query_cache(load_config().get("db", {}).get("query_cache"), self.tables.values())
 
         dsn = f"{self.host}:{self.port}/{self.service}"
         conn_str = f"oracle+oracledb://{self.user}:{self.password}@{dsn}"
 
-        logger.info(f"[DBOracleProvider] connecting to oracle tcp dsn={dsn}")
+        logger.info("[DBOracleProvider] connecting to oracle tcp dsn=%s", dsn)
 
         self.engine = create_engine(
             conn_str,
@@ -63,10 +65,18 @@ class DBOracleProvider:
     # low-level executor
     # ==================================================
     def execute(self, sql: str, params: Dict[str, Any] | None = None):
-        logger.debug(f"[DBOracleProvider] execute sql={sql} params={params}")
+        cache = getattr(self, "query_cache", None)
+        if cache is not None:
+            cached = cache.get_rows(sql, params)
+            if cached is not None:
+                return cached
+        logger.debug("[DBOracleProvider] execute sql=%s params=%s", sql, params)
         with self.engine.connect() as conn:
             result = conn.execute(text(sql), params or {})
-            return result.fetchall()
+            rows = result.fetchall()
+            if cache is not None:
+                cache.put_rows(sql, params, list(result.keys()), rows)
+            return rows
 
     # ==================================================
     # stock daily prices (CLOSE -> CLOSE)
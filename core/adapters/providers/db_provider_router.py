@@ -29,6 +29,12 @@ def get_db_provider() -> DBProviderBase:
         LOG.info("[DBProviderRouter] using mysql market provider")
         return DBMySQLMarketProvider()
 
-    LOG.error(f"[DBProviderRouter] unsupported db.type={db_type}")
+    if db_type == "duckdb":
+        from core.adapters.providers.db_provider_duckdb_market import DBDuckDBMarketProvider
+
+        LOG.info("[DBProviderRouter] using duckdb parquet-mirror market provider")
+        return DBDuckDBMarketProvider()
+
+    LOG.error("[DBProviderRouter] unsupported db.type=%s", db_type)
     raise RuntimeError(f"unsupported db.type: {db_type}")
 
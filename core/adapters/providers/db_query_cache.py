@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+UnifiedRisk V12 - persistent read-through query result cache (DB providers)
+
+Historical reruns / replays / backfills re-issue identical SQL against closed
+trading dates whose rows never change. This cache sits under
+DBMySQLMarketProvider.execute_mysql / execute_mysql_frame and
+DBOracleProvider.execute:
+
+- key: whitespace-normalised SQL + bound params (+ result kind / dtypes)
+- value: zstd-compressed Parquet (columnar) under <root>/<k[:2]>/<key>.parquet;
+  frames record every column's dtype so a hit equals the fetched frame exactly
+  (undeclared object columns come back as the same Python values)
+- only cached when the query has at least one date parameter and EVERY date
+  parameter is strictly before the latest closed trade date
+- index (<root>/index.db): tables referenced, size, last access -> LRU eviction
+  by total size, invalidation per table after an upstream reload
+  (tools/db_query_cache.py invalidate --table ...)
+
+All failures are soft: a broken cache means a DB round-trip, never an error.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+from contextlib import closing
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+from core.persistence.sqlite.sqlite_connection import connect_sqlite
+from core.utils.logger import get_logger
+from core.utils.time_utils import now_bj
+from core.utils.trade_calendar import get_trade_date_daily
+
+LOG = get_logger("DS.provider.query_cache")
+
+DEFAULT_CACHE_ROOT = os.path.join("data", "cache", "db_query")
+DEFAULT_MAX_MB = 1024
+
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$|^\d{8}$")
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def _as_param_date(v: Any) -> Optional[date]:
+    if isinstance(v, datetime):
+        return v.date()
+    if isinstance(v, date):
+        return v
+    if isinstance(v, str) and _ISO_DATE_RE.match(v.strip()):
+        try:
+            return pd.to_datetime(v.strip()).date()
+        except Exception:
+            return None
+    return None
+
+
+def _param_json(v: Any) -> Any:
+    if isinstance(v, (date, datetime)):
+        return v.isoformat()
+    return str(v)
+
+
+def _column_to_arrow(col: pd.Series) -> Any:
+    """DataFrame column -> Arrow array. Object columns keep their Python values (int stays int, NaN stays NaN)."""
+    if col.dtype == object:
+        return pa.array(col.tolist(), from_pandas=False)
+    return pa.array(col, from_pandas=True)
+
+
+def _restore_column(arr: Any, dtype: str) -> pd.Series:
+    """Arrow column -> Series of the dtype the frame had when it was cached."""
+    if dtype == "object":
+        values = np.empty(len(arr), dtype=object)
+        values[:] = arr.to_pylist()
+        return pd.Series(values, dtype=object, copy=False)
+    return arr.to_pandas().astype(dtype)
+
+
+def latest_closed_trade_date() -> date:
+    """最新已收盘交易日（BJ 15:00 后为当天）。"""
+    return get_trade_date_daily(now_bj())
+
+
+def ensure_schema_query_cache(conn) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS ur_query_cache (
+          cache_key       TEXT    PRIMARY KEY,
+          tables          TEXT    NOT NULL,
+          columns_json    TEXT    NOT NULL,
+          n_rows          INTEGER NOT NULL,
+          n_bytes         INTEGER NOT NULL,
+          created_at_utc  INTEGER NOT NULL,
+          last_access_ms  INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS ix_ur_query_cache_access ON ur_query_cache(last_access_ms);
+        """
+    )
+    conn.commit()
+
+
+class QueryResultCache:
+    """Disk-backed read-through cache for immutable (closed-date) query results."""
+
+    def __init__(
+        self,
+        root: str = DEFAULT_CACHE_ROOT,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+        tables: Iterable[str] = (),
+        cutoff: Optional[Callable[[], date]] = None,
+    ) -> None:
+        if pq is None:
+            raise RuntimeError("pyarrow is required for the db query cache")
+        self.root = root
+        self.max_bytes = int(max_bytes)
+        self.tables = {str(t).upper() for t in tables if t}
+        self._cutoff = cutoff or latest_closed_trade_date
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.root, exist_ok=True)
+        self._index_path = os.path.join(self.root, "index.db")
+        with self._index() as conn:
+            ensure_schema_query_cache(conn)
+
+    # ------------------------------------------------------------
+    def _index(self):
+        return closing(connect_sqlite(self._index_path))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.parquet")
+
+    def cacheable(self, params: Optional[Mapping[str, Any]]) -> bool:
+        dates = [d for d in (_as_param_date(v) for v in (params or {}).values()) if d is not None]
+        if not dates:
+            return False
+        cutoff = self._cutoff()
+        return all(d < cutoff for d in dates)
+
+    def key(self, sql: str, params: Optional[Mapping[str, Any]], kind: str = "rows") -> str:
+        norm = " ".join(str(sql).split())
+        p = json.dumps(sorted((str(k), _param_json(v)) for k, v in (params or {}).items()))
+        return hashlib.sha256(f"{kind}\n{norm}\n{p}".encode("utf-8")).hexdigest()
+
+    def tables_in(self, sql: str) -> List[str]:
+        return sorted(self.tables.intersection(t.upper() for t in _IDENT_RE.findall(str(sql))))
+
+    # ------------------------------------------------------------
+    def _read(self, key: str):
+        path = self._path(key)
+        with self._lock:
+            with self._index() as conn:
+                row = conn.execute("SELECT columns_json FROM ur_query_cache WHERE cache_key = ?", (key,)).fetchone()
+                if row is None or not os.path.exists(path):
+                    self.misses += 1
+                    return None, None
+                conn.execute(
+                    "UPDATE ur_query_cache SET last_access_ms = ? WHERE cache_key = ?",
+                    (int(time.time() * 1000), key),
+                )
+                conn.commit()
+        self.hits += 1
+        return json.loads(row[0]), pq.read_table(path)
+
+    def _write(self, key: str, sql: str, columns: Any, table: Any) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, path)
+        now = time.time()
+        with self._lock:
+            with self._index() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO ur_query_cache
+                      (cache_key, tables, columns_json, n_rows, n_bytes, created_at_utc, last_access_ms)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        key,
+                        "," + ",".join(self.tables_in(sql)) + ",",
+                        json.dumps(columns if isinstance(columns, dict) else list(columns)),
+                        int(table.num_rows),
+                        int(os.path.getsize(path)),
+                        int(now),
+                        int(now * 1000),
+                    ),
+                )
+                conn.commit()
+                self._evict(conn)
+
+    def _evict(self, conn) -> None:
+        total = int(conn.execute("SELECT COALESCE(SUM(n_bytes), 0) FROM ur_query_cache").fetchone()[0])
+        if total <= self.max_bytes:
+            return
+        removed = 0
+        for key, n_bytes in conn.execute(
+            "SELECT cache_key, n_bytes FROM ur_query_cache ORDER BY last_access_ms ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._drop(conn, key)
+            total -= int(n_bytes)
+            removed += 1
+        conn.commit()
+        LOG.info("[QueryCache] evicted %s entries (LRU), size=%s max=%s", removed, total, self.max_bytes)
+
+    def _drop(self, conn, key: str) -> None:
+        conn.execute("DELETE FROM ur_query_cache WHERE cache_key = ?", (key,))
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    # ------------------------------------------------------------
+    # rows (execute_mysql / execute)
+    # ------------------------------------------------------------
+    def get_rows(self, sql: str, params: Optional[Mapping[str, Any]]) -> Optional[List[Any]]:
+        if not self.cacheable(params):
+            return None
+        try:
+            names, table = self._read(self.key(sql, params, "rows"))
+            if table is None:
+                return None
+            Row = namedtuple("Row", names, rename=True)
+            cols = [c.to_pylist() for c in table.columns]
+            return [Row(*r) for r in zip(*cols)] if cols else []
+        except Exception as e:
+            LOG.warning("[QueryCache] read failed (ignored): %s", e)
+            return None
+
+    def put_rows(self, sql: str, params: Optional[Mapping[str, Any]], names: Sequence[str], rows: Sequence[Any]) -> None:
+        if not self.cacheable(params):
+            return
+        try:
+            cols = list(zip(*rows)) if rows else [()] * len(names)
+            table = pa.Table.from_arrays(
+                [pa.array(list(c)) for c in cols],
+                names=[f"c{i}" for i in range(len(names))],
+            )
+            self._write(self.key(sql, params, "rows"), sql, names, table)
+        except Exception as e:
+            LOG.warning("[QueryCache] write failed (ignored): %s", e)
+
+    # ------------------------------------------------------------
+    # typed frames (execute_mysql_frame)
+    # ------------------------------------------------------------
+    def get_frame(
+        self, sql: str, params: Optional[Mapping[str, Any]], dtypes: Mapping[str, str]
+    ) -> Optional[pd.DataFrame]:
+        if not self.cacheable(params):
+            return None
+        try:
+            meta, table = self._read(self._frame_key(sql, params, dtypes))
+            if table is None:
+                return None
+            return pd.DataFrame(
+                {n: _restore_column(c, t) for n, t, c in zip(meta["names"], meta["dtypes"], table.columns)},
+                copy=False,
+            )
+        except Exception as e:
+            LOG.warning("[QueryCache] read failed (ignored): %s", e)
+            return None
+
+    def put_frame(
+        self, sql: str, params: Optional[Mapping[str, Any]], dtypes: Mapping[str, str], df: pd.DataFrame
+    ) -> None:
+        if not self.cacheable(params):
+            return
+        try:
+            names = [str(c) for c in df.columns]
+            cols = [df.iloc[:, i] for i in range(len(names))]
+            table = pa.Table.from_arrays(
+                [_column_to_arrow(c) for c in cols],
+                names=[f"c{i}" for i in range(len(names))],
+            )
+            meta = {"names": names, "dtypes": [str(c.dtype) for c in cols]}
+            self._write(self._frame_key(sql, params, dtypes), sql, meta, table)
+        except Exception as e:
+            LOG.warning("[QueryCache] write failed (ignored): %s", e)
+
+    def _frame_key(self, sql: str, params: Optional[Mapping[str, Any]], dtypes: Mapping[str, str]) -> str:
+        # v2: entries carry every column's original dtype (see _restore_column)
+        return self.key(sql, params, "frame.v2:" + json.dumps(dict(dtypes), sort_keys=True))
+
+    # ------------------------------------------------------------
+    # maintenance
+    # ------------------------------------------------------------
+    def invalidate(self, table: str) -> int:
+        """Drop every entry whose SQL references `table` (upstream table reloaded)."""
+        pattern = f"%,{str(table).upper()},%"
+        with self._lock:
+            with self._index() as conn:
+                keys = [r[0] for r in conn.execute("SELECT cache_key FROM ur_query_cache WHERE tables LIKE ?", (pattern,))]
+                for key in keys:
+                    self._drop(conn, key)
+                conn.commit()
+        LOG.info("[QueryCache] invalidated table=%s entries=%s", table, len(keys))
+        return len(keys)
+
+    def clear(self) -> int:
+        with self._lock:
+            with self._index() as conn:
+                keys = [r[0] for r in conn.execute("SELECT cache_key FROM ur_query_cache")]
+                for key in keys:
+                    self._drop(conn, key)
+                conn.commit()
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._index() as conn:
+            n, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(n_bytes), 0) FROM ur_query_cache").fetchone()
+        return {
+            "root": self.root,
+            "entries": int(n),
+            "bytes": int(size),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def build_query_cache(cfg: Optional[Mapping[str, Any]], tables: Iterable[str]) -> Optional[QueryResultCache]:
+    """db.query_cache config -> cache (None when disabled / pyarrow missing / init failed)."""
+    cfg = cfg or {}
+    enabled = os.getenv("DB_QUERY_CACHE", str(cfg.get("enabled", False))).strip().lower()
+    if enabled not in ("1", "true", "yes", "on"):
+        return None
+    if pq is None:
+        LOG.warning("[QueryCache] disabled: pyarrow not installed")
+        return None
+    try:
+        root = os.getenv("DB_QUERY_CACHE_ROOT", str(cfg.get("root", DEFAULT_CACHE_ROOT)))
+        max_mb = int(cfg.get("max_mb", DEFAULT_MAX_MB))
+        cache = QueryResultCache(root=root, max_bytes=max_mb * 1024 * 1024, tables=tables)
+        LOG.info("[QueryCache] enabled root=%s max_mb=%s", root, max_mb)
+        return cache
+    except Exception as e:
+        LOG.warning("[QueryCache] init failed, running uncached: %s", e)
+        return None
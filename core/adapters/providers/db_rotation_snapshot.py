@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+UnifiedRisk V12 - rotation snapshot reader (entry / holding / exit in one query)
+
+RotationSnapshotDataSource used to make four sequential round trips per report
+(baseline run_id, then ENTRY / HOLDING / EXIT snapshot tables). Here:
+
+- resolve_default_run_id(): CN_BASELINE_REGISTRY_T DEFAULT_BASELINE, resolved
+  once per process (reset_default_run_id() after the registry changes)
+- rotation_snapshots_frame(): the three snapshot tables for run_id over a
+  trade-date range as ONE UNION ALL query -> typed frame with a SNAP_KIND column
+  (single date = range of one day; replays / backfills load a range at once)
+- snapshot_records(): frame -> {trade_date: {kind: [row dict, ...]}}, each
+  kind keeping its own table's columns (the frozen raw-block row contract)
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.adapters.providers.db_columnar import rows_to_frame
+from core.utils.logger import get_logger
+
+LOG = get_logger("DS.provider.rotation_snapshot")
+
+# Hard fallback to frozen baseline (per user spec).
+FROZEN_BASELINE_RUN_ID = "SR_BASE_V535_EP90_XP55_XC2_MH5_RF5_K2_COST5BPS"
+
+ROTATION_SNAPSHOT_TABLES: Dict[str, str] = {
+    "ENTRY": "CN_ROTATION_ENTRY_SNAP_T",
+    "HOLDING": "CN_ROTATION_HOLDING_SNAP_T",
+    "EXIT": "CN_ROTATION_EXIT_SNAP_T",
+}
+
+# per-kind columns, in each table's frozen SELECT order
+ROTATION_KIND_COLUMNS: Dict[str, List[str]] = {
+    "ENTRY": [
+        "RUN_ID", "TRADE_DATE", "SECTOR_TYPE", "SECTOR_ID", "SECTOR_NAME",
+        "ENTRY_RANK", "ENTRY_CNT", "WEIGHT_SUGGESTED", "SIGNAL_SCORE", "ENERGY_SCORE",
+        "ENERGY_PCT", "ENERGY_TIER", "STATE", "TRANSITION", "SOURCE_JSON", "CREATED_AT",
+    ],
+    "HOLDING": [
+        "RUN_ID", "TRADE_DATE", "SECTOR_TYPE", "SECTOR_ID", "SECTOR_NAME",
+        "ENTER_SIGNAL_DATE", "EXEC_ENTER_DATE", "HOLD_DAYS", "MIN_HOLD_DAYS", "EXIT_SIGNAL_TODAY",
+        "EXIT_TRANSITION", "EXIT_EXEC_STATUS", "NEXT_EXIT_ELIGIBLE_DATE", "SOURCE_JSON", "CREATED_AT",
+    ],
+    "EXIT": [
+        "RUN_ID", "TRADE_DATE", "EXEC_EXIT_DATE", "SECTOR_TYPE", "SECTOR_ID", "SECTOR_NAME",
+        "STATE", "TRANSITION", "ENTRY_RANK", "SIGNAL_SCORE", "ENTER_SIGNAL_DATE",
+        "EXEC_ENTER_DATE", "HOLD_DAYS", "MIN_HOLD_DAYS", "EXIT_EXEC_STATUS", "SOURCE_JSON", "CREATED_AT",
+    ],
+}
+
+ROTATION_SNAPSHOT_COLUMNS: List[str] = ["SNAP_KIND", "KIND_ORD", "SORT_RANK"] + list(
+    dict.fromkeys(c for cols in ROTATION_KIND_COLUMNS.values() for c in cols)
+)
+
+# scores are float64 columns; ids / ranks / day counts stay exact (object) so rows render as before
+ROTATION_SNAPSHOT_DTYPES: Dict[str, str] = {
+    "WEIGHT_SUGGESTED": "float64",
+    "SIGNAL_SCORE": "float64",
+    "ENERGY_SCORE": "float64",
+    "ENERGY_PCT": "float64",
+}
+
+
+def _branch(kind: str, kind_ord: int) -> str:
+    own = set(ROTATION_KIND_COLUMNS[kind])
+    sort_rank = "ENTRY_RANK" if kind == "ENTRY" else "NULL"
+    cols = [f"'{kind}' AS SNAP_KIND", f"{kind_ord} AS KIND_ORD", f"{sort_rank} AS SORT_RANK"]
+    cols += [c if c in own else f"NULL AS {c}" for c in ROTATION_SNAPSHOT_COLUMNS[3:]]
+    return (
+        f"SELECT {', '.join(cols)} FROM {ROTATION_SNAPSHOT_TABLES[kind]} "
+        "WHERE RUN_ID = :run_id AND TRADE_DATE >= :start_date AND TRADE_DATE < :end_exclusive"
+    )
+
+
+# constant text: one prepared statement / one query-cache key shape for every call
+# (range predicate instead of DATE(TRADE_DATE) = :d keeps the TRADE_DATE index usable)
+ROTATION_SNAPSHOT_SQL = (
+    "SELECT * FROM ("
+    + " UNION ALL ".join(_branch(k, i) for i, k in enumerate(ROTATION_SNAPSHOT_TABLES))
+    + ") u ORDER BY CAST(u.TRADE_DATE AS DATE), u.KIND_ORD, (u.SORT_RANK IS NULL), u.SORT_RANK, u.SECTOR_NAME"
+)
+
+
+def _as_date(x: Any) -> date:
+    if isinstance(x, datetime):
+        return x.date()
+    if isinstance(x, date):
+        return x
+    return pd.to_datetime(str(x)).date()
+
+
+def jsonable(v: Any) -> Any:
+    """DB scalar -> JSON-serializable value (datetime/date -> ISO, Decimal -> float, NaN -> None)."""
+    if v is None:
+        return None
+    if isinstance(v, float):
+        return None if v != v else v
+    if isinstance(v, (datetime, date)):
+        try:
+            return v.isoformat()
+        except Exception:
+            return str(v)
+    if isinstance(v, Decimal):
+        try:
+            return float(v)
+        except Exception:
+            return str(v)
+    if isinstance(v, (bytes, bytearray)):
+        try:
+            return v.decode("utf-8", errors="replace")
+        except Exception:
+            return str(v)
+    if isinstance(v, np.generic):
+        return jsonable(v.item())
+    return v
+
+
+# ==================================================
+# baseline run_id (memoized per process)
+# ==================================================
+_RUN_ID_LOCK = threading.Lock()
+_DEFAULT_RUN_ID: Optional[str] = None
+
+
+def resolve_default_run_id(db: Any) -> str:
+    """DEFAULT_BASELINE run_id from CN_BASELINE_REGISTRY_T; resolved once, frozen fallback on failure (not memoized)."""
+    global _DEFAULT_RUN_ID
+    if _DEFAULT_RUN_ID is not None:
+        return _DEFAULT_RUN_ID
+    sql = """
+        SELECT run_id
+          FROM CN_BASELINE_REGISTRY_T
+         WHERE baseline_key = 'DEFAULT_BASELINE'
+           AND is_active = 1
+         LIMIT 1
+        """
+    with _RUN_ID_LOCK:
+        if _DEFAULT_RUN_ID is not None:
+            return _DEFAULT_RUN_ID
+        try:
+            rows = db.execute(sql)
+            if rows:
+                r0 = rows[0]
+                m = getattr(r0, "_mapping", None)
+                run_id = str(m["RUN_ID"]) if m and "RUN_ID" in m else str(r0[0])
+                _DEFAULT_RUN_ID = run_id
+                return run_id
+        except Exception as e:
+            LOG.warning("[RotationSnapshot] resolve_default_run_id failed: %s", e)
+    return FROZEN_BASELINE_RUN_ID
+
+
+def reset_default_run_id() -> None:
+    global _DEFAULT_RUN_ID
+    with _RUN_ID_LOCK:
+        _DEFAULT_RUN_ID = None
+
+
+# ==================================================
+# snapshots
+# ==================================================
+def rotation_snapshots_frame(db: Any, run_id: str, start_date: Any, end_date: Any = None) -> pd.DataFrame:
+    """ENTRY / HOLDING / EXIT rows of run_id for trade dates [start_date, end_date] in one query."""
+    start = _as_date(start_date)
+    end = _as_date(end_date) if end_date is not None else start
+    params = {"run_id": run_id, "start_date": start, "end_exclusive": end + timedelta(days=1)}
+    fn = getattr(db, "execute_mysql_frame", None)
+    if callable(fn):
+        return fn(ROTATION_SNAPSHOT_SQL, params, ROTATION_SNAPSHOT_DTYPES)
+    rows = db.execute(ROTATION_SNAPSHOT_SQL, params)
+    return rows_to_frame(rows or [], ROTATION_SNAPSHOT_COLUMNS, ROTATION_SNAPSHOT_DTYPES)
+
+
+def snapshot_records(frame: pd.DataFrame) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """{trade_date ISO: {"ENTRY"|"HOLDING"|"EXIT": [row dict with that table's columns]}} (query order kept)."""
+    out: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    if frame is None or frame.empty:
+        return out
+    frame = frame.rename(columns=str.upper)
+    days = np.array([_as_date(v).isoformat() for v in frame["TRADE_DATE"].tolist()], dtype=object)
+    kinds = frame["SNAP_KIND"].astype(str).str.upper().to_numpy()
+    for kind, cols in ROTATION_KIND_COLUMNS.items():
+        mask = kinds == kind
+        if not mask.any():
+            continue
+        present = [c for c in cols if c in frame.columns]
+        values = [[jsonable(v) for v in frame.loc[mask, c].tolist()] for c in present]
+        for day, row in zip(days[mask], zip(*values)):
+            out.setdefault(day, {}).setdefault(kind, []).append(dict(zip(present, row)))
+    return out
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+UnifiedRisk V12 - incremental reducers for streamed provider queries
+
+execute_mysql_stream() yields fixed-size typed chunks from a server-side cursor;
+the reducers here consume them so large lookback aggregations run in memory
+bounded by chunk size (+ a few rows per symbol), not by window length.
+
+- SymbolTailReducer: per-symbol rolling state over SYMBOL, TRADE_DATE ordered
+  chunks; keeps only the last `tail_rows` rows of each symbol
+- BreadthPlusCounter: asof cross-section of fetch_breadth_plus_metrics
+  (above MA20/MA50, prior-N-day new highs / lows) from those tails
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class SymbolTailReducer:
+    """
+    Feed symbol-ordered chunks; every symbol is handed to on_symbols exactly once,
+    as its last `tail_rows` rows, when it can no longer continue in a later chunk.
+    """
+
+    def __init__(self, tail_rows: int, on_symbols: Callable[[pd.DataFrame], None], key: str = "symbol"):
+        self.tail_rows = int(tail_rows)
+        self.on_symbols = on_symbols
+        self.key = key
+        self._carry: Optional[pd.DataFrame] = None
+
+    def feed(self, chunk: pd.DataFrame) -> None:
+        if chunk is None or chunk.empty:
+            return
+        if self._carry is not None:
+            chunk = pd.concat([self._carry, chunk], ignore_index=True)
+        # the last symbol may continue in the next chunk
+        open_mask = (chunk[self.key] == chunk[self.key].iloc[-1]).to_numpy()
+        self._carry = chunk[open_mask].tail(self.tail_rows)
+        done = chunk[~open_mask]
+        if not done.empty:
+            self.on_symbols(done.groupby(self.key, sort=False).tail(self.tail_rows))
+
+    def close(self) -> None:
+        if self._carry is not None and not self._carry.empty:
+            self.on_symbols(self._carry)
+        self._carry = None
+
+
+def _tail_matrix(tails: pd.DataFrame, width: int, value: str) -> tuple:
+    """tails (symbol-contiguous) -> (symbols x width) right-aligned values (NaN padded), rows per symbol."""
+    codes, _ = pd.factorize(tails["symbol"], sort=False)
+    n_sym = int(codes.max()) + 1 if len(codes) else 0
+    counts = np.bincount(codes, minlength=n_sym)
+    # position from the end within each symbol (0 = last row)
+    from_end = tails.groupby(codes, sort=False).cumcount(ascending=False).to_numpy()
+    mat = np.full((n_sym, width), np.nan)
+    keep = from_end < width
+    mat[codes[keep], width - 1 - from_end[keep]] = tails[value].to_numpy(dtype="float64")[keep]
+    return mat, counts
+
+
+class BreadthPlusCounter:
+    """
+    Asof cross-section counters (same definitions as the former in-memory
+    fetch_breadth_plus_metrics):
+    - MA20 / MA50: rolling mean incl. asof, min_periods = window
+    - new high / low: asof close vs max / min of the prior `nhnl_window` closes
+    """
+
+    def __init__(self, asof_date: Any, ma20_window: int = 20, ma50_window: int = 50, nhnl_window: int = 20):
+        self.asof = pd.Timestamp(str(asof_date)).normalize()
+        self.ma20_window = int(ma20_window)
+        self.ma50_window = int(ma50_window)
+        self.nhnl_window = int(nhnl_window)
+        self.tail_rows = max(self.ma20_window, self.ma50_window, self.nhnl_window + 1)
+        self.counts: Dict[str, int] = dict.fromkeys(
+            ("total", "valid_ma20", "valid_ma50", "valid_nhnl", "above_ma20", "above_ma50", "new_high", "new_low"),
+            0,
+        )
+
+    def feed(self, tails: pd.DataFrame) -> None:
+        mat, n = _tail_matrix(tails, self.tail_rows, "close")
+        last_date = tails.groupby("symbol", sort=False)["trade_date"].last().to_numpy()
+        at_asof = pd.to_datetime(last_date).normalize() == self.asof
+        if not at_asof.any():
+            return
+        mat, n = mat[at_asof], n[at_asof]
+        close = mat[:, -1]
+
+        ok20, ma20 = n >= self.ma20_window, mat[:, -self.ma20_window:].mean(axis=1)
+        ok50, ma50 = n >= self.ma50_window, mat[:, -self.ma50_window:].mean(axis=1)
+        w = self.nhnl_window
+        ok_nh = n >= w + 1
+        prev = mat[:, -(w + 1):-1]
+        with np.errstate(invalid="ignore"):
+            max_prev = np.where(ok_nh, prev.max(axis=1), np.nan)
+            min_prev = np.where(ok_nh, prev.min(axis=1), np.nan)
+
+        c = self.counts
+        c["total"] += int(len(close))
+        c["valid_ma20"] += int(ok20.sum())
+        c["valid_ma50"] += int(ok50.sum())
+        c["valid_nhnl"] += int(ok_nh.sum())
+        c["above_ma20"] += int((ok20 & (close > ma20)).sum())
+        c["above_ma50"] += int((ok50 & (close > ma50)).sum())
+        c["new_high"] += int((ok_nh & (close >= max_prev)).sum())
+        c["new_low"] += int((ok_nh & (close <= min_prev)).sum())
@@ -26,6 +26,9 @@ from core.utils.config_loader import load_paths
 
 LOG = get_logger("DS.Config")
 
+# 进程内已确认存在的目录（每个目录只 makedirs / 记日志一次）
+_ENSURED_DIRS = set()
+
  
 @dataclass
 class DataSourceConfig:
@@ -63,16 +66,10 @@ class DataSourceConfig:
 
 
 
-        LOG.info(
-            "[DataSourceConfig] market=%s ds_name=%s\n"
-            "  data_root=%s\n"
-            "  market_root=%s\n"
-            "  cache_root=%s\n"
-            "  history_root=%s",
+        LOG.debug(
+            "[DataSourceConfig] market=%s ds_name=%s cache_root=%s history_root=%s",
             self.market,
             self.ds_name,
-            self.data_root,
-            self.market_root,
             self.cache_root,
             self.history_root,
         )
@@ -83,9 +80,13 @@ class DataSourceConfig:
         创建所有必要目录。
         """
         for path in [self.market_root, self.cache_root, self.history_root]:
+            if path in _ENSURED_DIRS:
+                continue
             try:
-                os.makedirs(path, exist_ok=True)
-                LOG.info("EnsureDir: %s", path)
+                if not os.path.isdir(path):
+                    os.makedirs(path, exist_ok=True)
+                    LOG.info("EnsureDir: created %s", path)
+                _ENSURED_DIRS.add(path)
             except Exception as e:
                 LOG.error("EnsureDirError: path=%s err=%s", path, e)
 
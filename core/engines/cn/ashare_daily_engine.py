@@ -3,33 +3,46 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, time
 import importlib
-import inspect
 from typing import Any, Dict, List, Optional, Tuple
 
-import baostock as bs
-import pandas as pd
-import pytz
 import os, json 
 import sqlite3
 
+# baostock / pandas / pytz / AshareDataFetcher（akshare / sqlalchemy / yfinance）按需在使用处 import：
+# 启动与 replay / 单测路径不承担数据源 import 成本
+
 # --- UnifiedRisk persistence helpers (SRP/OOP-friendly) ---
 from core.persistence.sqlite.sqlite_connection import connect_sqlite as ur_connect_sqlite
+from core.persistence.sqlite.sqlite_connection import ensure_schema_once
 from core.persistence.sqlite.sqlite_schema_l1 import ensure_schema_l1
 from core.persistence.sqlite.sqlite_schema import ensure_schema_l2
 
 
+# the one SQLite file of a run: L1/L2 persistence and observation continuity state
+UNIFIEDRISK_DB_PATH = r"./data/persistent/unifiedrisk.db"
+
+
 def _ur_open_persist_conn(db_path):
     """Open SQLite connection for UnifiedRisk persistence and ensure schemas exist."""
     conn = ur_connect_sqlite(str(db_path))
-    ensure_schema_l1(conn)
-    ensure_schema_l2(conn)
+    _ur_ensure_persist_schema(conn)
     return conn
 
 
+def _ur_ensure_persist_schema(conn):
+    """L1/L2 DDL at most once per connection (no-op on a connection that already ran it)."""
+    ensure_schema_once(conn, "l1", ensure_schema_l1)
+    ensure_schema_once(conn, "l2", ensure_schema_l2)
+
+
 def _ur_purge_l2_for_rerun(conn, trade_date: str, report_kind: str):
     """Best-effort purge L2 artifacts for same (trade_date, report_kind) to allow reruns."""
+    from contextlib import nullcontext
+    from core.persistence.sqlite.sqlite_run_writer import in_run_transaction
+
     try:
-        with conn:
+        # inside a run transaction the purge commits (or rolls back) with the run
+        with (nullcontext() if in_run_transaction(conn) else conn):
             conn.execute(
                 "DELETE FROM ur_report_des_link WHERE trade_date=? AND report_kind=?",
                 (trade_date, report_kind),
@@ -62,27 +75,19 @@ from core.persistence.sqlite.sqlite_l2_publisher import SqliteL2Publisher
 from core.persistence.regime_shift_auditor import RegimeShiftAuditor
 from core.services.regime_history_service import RegimeHistoryService
 from core.utils.data_freshness import compute_data_freshness, inject_asof_fields
-from core.utils.logger import get_logger
-from core.adapters.fetchers.cn.ashare_fetcher import AshareDataFetcher
+from core.utils.logger import get_logger, set_log_context
 
 # ===== Factors =====
-from core.factors.cn.unified_emotion_factor import UnifiedEmotionFactor
-from core.factors.cn.participation_factor import ParticipationFactor
-from core.factors.glo.global_macro_factor import GlobalMacroFactor
-from core.factors.glo.index_global_factor import IndexGlobalFactor
-from core.factors.glo.global_lead_factor import GlobalLeadFactor
-#from core.factors.cn.north_nps_factor import NorthNPSFactor
-from core.factors.cn.north_proxy_pressure_factor import NorthProxyPressureFactor
-from core.factors.cn.amount_factor import AmountFactor
-from core.factors.cn.margin_factor import MarginFactor
-from core.factors.cn.index_tech_factor import IndexTechFactor
-from core.factors.cn.breadth_factor import BreadthFactor
-#from core.factors.cn.etf_index_sync_factor import CrowdingConcentrationFactor
-from core.factors.cn.etf_index_sync_daily_factor import ETFIndexSyncDailyFactor
-from core.factors.cn.trend_in_force_factor import TrendInForceFactor
-from core.factors.cn.frf_factor import FRFFactor
-from core.factors.cn.sector_proxy_factor import SectorProxyFactor
+# 因子类只由 weights.yaml factor_pipeline.registry 驱动加载（_compute_factors -> _import_obj），
+# 此处不再 eager import，未启用的因子不会被加载
 from core.factors.factor_result import FactorResult
+from core.factors.factor_process_pool import (
+    PendingFactors,
+    import_obj,
+    instantiate_factor,
+    load_process_pool_spec,
+    submit_factors,
+)
 
 # ===== Regime / Governance =====
 from core.regime.ashares_gate_decider import ASharesGateDecider, GateDecision
@@ -150,6 +155,8 @@ class AShareDailyEngine:
         self.is_intraday = False
         self.report_kind = "EOD"
         self.trade_date = ""
+        # observation 连续性状态（按交易日）；区间回填可注入 MemoryStateStore
+        self.continuity_store: Optional[Any] = None
 
         td = (trade_date_override or "").strip()
         if td:
@@ -171,6 +178,10 @@ class AShareDailyEngine:
                 - is_intraday: True 表示当前是交易日且在 9:30~15:00 之间
                 - last_trade_date: 最近的交易日（'YYYY-MM-DD'�?
         """
+        import baostock as bs
+        import pandas as pd
+        import pytz
+
         tz = pytz.timezone('Asia/Shanghai')
         now = datetime.now(tz)
     
@@ -319,6 +330,8 @@ class AShareDailyEngine:
         run_persist, engine_version = self._init_persistence()
         run_id = None
         stage = "START"
+        # run_id / stage 进入每条日志（jsonl sink）；失败后保留，便于定位 tick 异常
+        set_log_context(run_id=None, stage=stage)
 
         try:
 
@@ -328,6 +341,8 @@ class AShareDailyEngine:
                 report_kind=self.report_kind,
                 engine_version=engine_version,
             )
+            self._run_id = run_id
+            set_log_context(run_id=run_id, stage=stage)
           
             self.weights_cfg = self._load_weights_cfg()
             fp = self.weights_cfg.get("factor_pipeline", {}) if isinstance(self.weights_cfg, dict) else {}
@@ -337,12 +352,18 @@ class AShareDailyEngine:
     
               
             
+            stage = "SNAPSHOT"
+            set_log_context(stage=stage)
             self.snapshot = self._fetch_snapshot()
             
             
+            stage = "FACTORS"
+            set_log_context(stage=stage)
             self.factors = self._compute_factors(self.snapshot)
     
             # policy slot binder 已弃用：Phase-2/Report 统一�?YAML 读取结构与语义；此处不再做额外绑�?
+            stage = "PHASE2"
+            set_log_context(stage=stage)
             factors_bound: Dict[str, Any] = {}
             factors_bound = self._build_phase2( factors_bound)
     
@@ -366,9 +387,13 @@ class AShareDailyEngine:
                 observations=factors_bound.get("observations", {}),
             )
     
+            stage = "GATE"
+            set_log_context(stage=stage)
             self.gate = self._make_gate_decision(factors_bound)
 
             self._generate_prediction(factors_bound)
+            stage = "REPORT"
+            set_log_context(stage=stage)
             report_text , des_payload = self._generate_report( factors_bound)
          
             ########## presiste  ###########
@@ -378,6 +403,8 @@ class AShareDailyEngine:
                 json.dump(des_payload, f, ensure_ascii=False, indent=2)
 
 
+            stage = "PERSIST"
+            set_log_context(stage=stage)
             self.presiste_data(report_text=report_text, des_payload= des_payload)
         except Exception as e:
         # 失败态也必须落库
@@ -390,79 +417,100 @@ class AShareDailyEngine:
                 )
             raise
         finally:
-            try:
-                if getattr(self, "_conn", None):
-                    self._conn.close()
-            except Exception:
-                pass 
+            self._close_persist_conn()
+
+    def _close_persist_conn(self) -> None:
+        """Close the run's connection and forget it: a reused engine opens a fresh one."""
+        conn, self._conn = getattr(self, "_conn", None), None
+        try:
+            if conn is not None:
+                conn.close()
+        except Exception:
+            pass
     
     def presiste_data(self, report_text: str, des_payload:dict):
-
+        """
+        L1 (snapshot / gate / factors) + L2 publish + run status in ONE transaction
+        on the connection opened by _init_persistence (SqliteRunWriter):
+        one commit per run; on failure nothing of this run's L1/L2 is kept.
+        """
         from core.persistence.sqlite.sqlite_run_persistence import SqliteRunPersistence
+        from core.persistence.sqlite.sqlite_run_writer import SqliteRunWriter
         from pathlib import Path
-        UNIFIEDRISK_DB_PATH = r"./data/persistent/unifiedrisk.db"
         db_path = Path(UNIFIEDRISK_DB_PATH)
         #if db_path.exists():
         #   db_path.unlink()
 
-        self._conn = _ur_open_persist_conn(db_path)
+        if getattr(self, "_conn", None) is None:
+            self._conn = _ur_open_persist_conn(db_path)
+        else:
+            _ur_ensure_persist_schema(self._conn)
 
         run_persist= SqliteRunPersistence(self._conn)
         publisher = SqliteL2Publisher(self._conn)
-        _ur_purge_l2_for_rerun(self._conn, self.trade_date, self.report_kind)
-        
-        now = datetime.now()
-        engine_version = "V_"+ now.strftime("%Y-%m-%d_%H:%M:%S")
-         
-        format_string = "%Y-%m-%d"
-        run_id = None
+        writer = SqliteRunWriter(self._conn)
+
+        engine_version = getattr(self, "_engine_version", None)
+        if not engine_version:
+            now = datetime.now()
+            engine_version = "V_"+ now.strftime("%Y-%m-%d_%H:%M:%S")
+
+        # run_meta row from _execute_pipeline (start_run 先落库); only standalone callers start one here
+        run_id = getattr(self, "_run_id", None)
         try:
-            run_id = run_persist.start_run(
+            if not run_id:
+                run_id = run_persist.start_run(
+                        trade_date=self.trade_date,
+                        report_kind = self.report_kind,
+                        engine_version=engine_version,
+                    )
+                self._run_id = run_id
+
+            with writer.transaction():
+                _ur_purge_l2_for_rerun(self._conn, self.trade_date, self.report_kind)
+
+                writer.add_snapshot(run_id, "internal_snapshot", self.snapshot)
+
+                gate = des_payload["governance"]["gate"]
+                drs = des_payload["governance"]["drs"]
+                frf = des_payload["governance"]["frf"]
+
+                writer.add_gate(run_id = run_id,
+                                gate=gate,
+                                drs=drs,
+                                frf = frf,
+                                action_hint=None,
+                                rule_hits=None
+                                )
+
+                for factor_name, fr in self.factors.items():
+                    writer.add_factor(
+                        run_id,
+                        factor_name,
+                        fr.to_dict(),
+                        factor_version="" # factor_result.get("version"),
+                    )
+                # L1 rows must be visible to finish_run's AUDIT_HASH rollup
+                writer.flush()
+
+                _ur_publish_l2(
+                    publisher,
                     trade_date=self.trade_date,
-                    report_kind = self.report_kind,
+                    report_kind=self.report_kind,
+                    report_text=report_text,
+                    des_payload=des_payload,
                     engine_version=engine_version,
-                )
-            
-            run_persist.record_snapshot(run_id, "internal_snapshot", self.snapshot)
-            
-            gate = des_payload["governance"]["gate"]
-            drs = des_payload["governance"]["drs"]
-            frf = des_payload["governance"]["frf"]
-    
-            run_persist.record_gate(run_id = run_id,
-                                    gate=gate, 
-                                    drs=drs,
-                                    frf = frf, 
-                                    action_hint=None, 
-                                    rule_hits=None
-                                    )
-    
-            for factor_name, fr in self.factors.items():
-                run_persist.record_factor(
-                    run_id,
-                    factor_name,
-                    fr.to_dict(),
-                    factor_version="" # factor_result.get("version"),
-                )
-      
-    
-            _ur_publish_l2(
-                publisher,
-                trade_date=self.trade_date,
-                report_kind=self.report_kind,
-                report_text=report_text,
-                des_payload=des_payload,
-                engine_version=engine_version,
-                run_id=run_id,
-                )
-            try:
-                run_persist.finish_run(run_id, status="COMPLETED")
-            except Exception as e_finish:
-                LOG.warning("[Persist] finish_run(COMPLETED) failed run_id=%s err=%s", run_id, e_finish)
+                    run_id=run_id,
+                    )
+                try:
+                    run_persist.finish_run(run_id, status="COMPLETED")
+                except Exception as e_finish:
+                    LOG.warning("[Persist] finish_run(COMPLETED) failed run_id=%s err=%s", run_id, e_finish)
             #run_persist.finish_run(run_id, status="COMPLETED")     
             #run_persist.record_factor(run_id, "breadth", breadth_result)
             #run_persist.record_factor(run_id, "new_top50_lows", ntl_result)
         except Exception as e:
+            # run transaction rolled back; the run_meta row (committed by start_run) records the failure
             if run_id:
                 try:
                     run_persist.finish_run(
@@ -548,6 +596,8 @@ class AShareDailyEngine:
 
 
     def _fetch_snapshot(self) -> Dict[str, Any]:
+        from core.adapters.fetchers.cn.ashare_fetcher import AshareDataFetcher
+
         return AshareDataFetcher(
             trade_date=self.trade_date,
             is_intraday=self.is_intraday,
@@ -586,22 +636,7 @@ class AShareDailyEngine:
         - 'package.module:ClassName'
         - 'package.module.ClassName'
         """
-        spec = (spec or "").strip()
-        if not spec:
-            raise ValueError("empty import spec")
-    
-        if ":" in spec:
-            mod_path, attr = spec.split(":", 1)
-        else:
-            mod_path, _, attr = spec.rpartition(".")
-            if not mod_path:
-                raise ValueError(f"invalid import spec: {spec}")
-    
-        module = importlib.import_module(mod_path)
-        obj = getattr(module, attr, None)
-        if obj is None:
-            raise ValueError(f"import failed: {spec} (attr not found)")
-        return obj
+        return import_obj(spec)
     
     def _guess_factor_import_spec(self, name: str) -> Optional[str]:
         """Best-effort import spec guess when YAML registry is not provided.
@@ -641,17 +676,41 @@ class AShareDailyEngine:
     
     def _instantiate_factor(self, cls: Any, params: Dict[str, Any]) -> Any:
         """Instantiate factor class with best-effort filtered kwargs."""
-        if not isinstance(params, dict):
-            params = {}
-        try:
-            sig = inspect.signature(cls.__init__)
-            kwargs = {}
-            for k, v in params.items():
-                if k in sig.parameters and k != "self":
-                    kwargs[k] = v
-            return cls(**kwargs)
-        except Exception:
-            return cls()
+        return instantiate_factor(cls, params)
+    
+    def _resolve_factor_spec(self, key: str, registry: Dict[str, Any]) -> str:
+        """factor key -> import spec (registry first, then naming-convention guess)."""
+        spec = None
+        if key in registry:
+            raw = registry.get(key)
+            if isinstance(raw, str):
+                spec = raw.strip()
+            elif isinstance(raw, dict):
+                spec = str(raw.get("import") or raw.get("path") or "").strip()
+        if not spec:
+            spec = self._guess_factor_import_spec(key)
+    
+        if not spec:
+            raise KeyError(f"factor not registered: {key} (set factor_pipeline.registry)")
+        return spec
+    
+    def _submit_process_factors(
+        self, keys: List[str], registry: Dict[str, Any], params_cfg: Dict[str, Any], snapshot: Dict[str, Any]
+    ) -> Optional[PendingFactors]:
+        """Submit process-eligible factors (factor_pipeline.process_pool) to the shared-memory process pool."""
+        cfg = self.weights_cfg if isinstance(getattr(self, "weights_cfg", None), dict) else {}
+        spec = load_process_pool_spec(cfg.get("factor_pipeline", {}))
+        if not spec.enabled:
+            return None
+        tasks = []
+        for key in keys:
+            if key not in spec.factors:
+                continue
+            try:
+                tasks.append((key, self._resolve_factor_spec(key, registry), params_cfg.get(key, {}) or {}))
+            except KeyError:
+                continue  # in-process path records the MISSING placeholder
+        return submit_factors(snapshot, tasks, workers=spec.max_workers)
     
     def _compute_factors(self, snapshot: Dict[str, Any]) -> Dict[str, FactorResult]:
         """Compute factors dynamically based on config/weights.yaml.
@@ -661,54 +720,51 @@ class AShareDailyEngine:
     
         Behavior:
         - Each enabled factor is instantiated then compute(snapshot) is called.
+        - factor_pipeline.process_pool (optional, for backfills): listed factors run in
+          a process pool against a shared-memory copy of the snapshot; same result contract.
         - Missing/failed factor will NOT crash the engine in UAT; instead it yields
           a NEUTRAL FactorResult with details.data_status = ERROR/MISSING.
         """
         enabled, registry, params_cfg = self._load_factor_pipeline_cfg()
         factors: Dict[str, FactorResult] = {}
+        keys = [name.strip() for name in enabled if isinstance(name, str) and name.strip()]
     
-        for name in enabled:
-            if not isinstance(name, str) or not name.strip():
-                continue
-            key = name.strip()
+        # process-eligible factors run in worker processes while the rest compute here
+        pending = self._submit_process_factors(keys, registry, params_cfg, snapshot)
     
-            try:
-                spec = None
-                if key in registry:
-                    raw = registry.get(key)
-                    if isinstance(raw, str):
-                        spec = raw.strip()
-                    elif isinstance(raw, dict):
-                        spec = str(raw.get("import") or raw.get("path") or "").strip()
-                if not spec:
-                    spec = self._guess_factor_import_spec(key)
-    
-                if not spec:
-                    raise KeyError(f"factor not registered: {key} (set factor_pipeline.registry)")
-    
-                cls = self._import_obj(spec)
-                factor = self._instantiate_factor(cls, params_cfg.get(key, {}))
-                fr = factor.compute(snapshot)
-    
-                if not isinstance(fr, FactorResult):
-                    raise TypeError(f"factor.compute() must return FactorResult, got={type(fr)}")
-    
-                # store under config key to keep YAML/structure alignment stable
-                factors[key] = fr
-                if fr.name != key:
-                    LOG.warning("FactorResult.name mismatch: cfg=%s result=%s", key, fr.name)
-    
-            except Exception as e:
-                LOG.exception("factor compute failed: %s", key)
-                factors[key] = FactorResult(
-                    name=key,
-                    score=50.0,
-                    level="NEUTRAL",
-                    details={
-                        "data_status": "ERROR" if not isinstance(e, KeyError) else "MISSING",
-                        "error": str(e),
-                    },
-                )
+        try:
+            for key in keys:
+                try:
+                    if pending is not None and key in pending:
+                        fr = pending.result(key)
+                    else:
+                        spec = self._resolve_factor_spec(key, registry)
+                        cls = self._import_obj(spec)
+                        factor = self._instantiate_factor(cls, params_cfg.get(key, {}))
+                        fr = factor.compute(snapshot)
+    
+                    if not isinstance(fr, FactorResult):
+                        raise TypeError(f"factor.compute() must return FactorResult, got={type(fr)}")
+    
+                    # store under config key to keep YAML/structure alignment stable
+                    factors[key] = fr
+                    if fr.name != key:
+                        LOG.warning("FactorResult.name mismatch: cfg=%s result=%s", key, fr.name)
+    
+                except Exception as e:
+                    LOG.exception("factor compute failed: %s", key)
+                    factors[key] = FactorResult(
+                        name=key,
+                        score=50.0,
+                        level="NEUTRAL",
+                        details={
+                            "data_status": "ERROR" if not isinstance(e, KeyError) else "MISSING",
+                            "error": str(e),
+                        },
+                    )
+        finally:
+            if pending is not None:
+                pending.close()
     
         return factors
     def _bind_policy_slots(self) -> Dict[str, Any]:
@@ -741,6 +797,25 @@ class AShareDailyEngine:
             raise
         return bound
 
+    def _get_continuity_store(self) -> Optional[Any]:
+        """
+        生产默认：unifiedrisk.db 的 ur_continuity_state，复用本次运行的唯一连接 self._conn
+        （_init_persistence 打开；表结构每连接只建一次）；打开失败 → None（退回 json 兜底）。
+        注入的 continuity_store（区间回填 MemoryStateStore）优先。
+        """
+        if self.continuity_store is not None:
+            return self.continuity_store
+        try:
+            from core.persistence.sqlite.sqlite_continuity_store import SqliteContinuityStore
+
+            if getattr(self, "_conn", None) is None:
+                os.makedirs(os.path.dirname(UNIFIEDRISK_DB_PATH), exist_ok=True)
+                self._conn = _ur_open_persist_conn(UNIFIEDRISK_DB_PATH)
+            return SqliteContinuityStore(self._conn, legacy_json_path="state/drs_persistence.json")
+        except Exception as e:
+            LOG.warning("[Engine] continuity store unavailable, fallback to json: %s", e)
+            return None
+
     def _build_phase2(self,  bound):
         cfg = self.weights_cfg if isinstance(getattr(self, "weights_cfg", None), dict) else {}
         fp = cfg.get("factor_pipeline", {}) if isinstance(cfg, dict) else {}
@@ -756,6 +831,7 @@ class AShareDailyEngine:
         drs = DRSContinuity.apply(
             drs_obs=drs_obs,
             asof=self.trade_date,
+            state_store=self._get_continuity_store(),
             fallback_state_path="state/drs_persistence.json",
         )
 
@@ -1284,14 +1360,16 @@ class AShareDailyEngine:
         from core.persistence.sqlite.sqlite_run_persistence import SqliteRunPersistence
         from pathlib import Path
     
-        UNIFIEDRISK_DB_PATH = r"./data/persistent/unifiedrisk.db"
         db_path = Path(UNIFIEDRISK_DB_PATH)
-        self._conn = connect_sqlite(str(db_path))
+        # the one connection of this run (schema ensured once; presiste_data reuses it)
+        self._conn = _ur_open_persist_conn(db_path)
+        self._run_id = None
     
         run_persist = SqliteRunPersistence(self._conn)
     
         now = datetime.now()
         engine_version = "V_" + now.strftime("%Y-%m-%d_%H:%M:%S")
+        self._engine_version = engine_version
         return run_persist, engine_version
     
 ##### end class
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+UnifiedRisk V12 · CN Intraday Warm Daemon
+
+Long-running intraday refresh loop (main.py --daemon):
+- 进程只启动一次：pandas / sqlalchemy / akshare / baostock 等依赖只 import 一次
+- AshareDataFetcher（全部 DataSourceConfig / DB provider）只构建一次
+- 首个 tick 构建完整 snapshot（EOD 静态历史 / lookback）并常驻内存
+- 之后每个 tick 只重拉盘中变化的数据源，写入 snapshot["intraday_overlay"]：
+    amount_intraday / breadth_intraday / market_sentiment_intraday / etf_spot_sync_intraday
+- 盘中宽度 / 成交额由 IntradaySpotAggregator 按快照差量增量维护，并输出 intraday_series
+- 每个 tick 复用 AShareDailyEngine 的 factors → gate → report → persist 流程
+
+冻结约束：
+- 不改变 EOD 单次运行语义（main.py 默认路径不受影响）
+- 单个 tick 失败只记录日志，不终止 daemon
+"""
+
+from __future__ import annotations
+
+import copy
+import time as _time
+from datetime import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.adapters.datasources.cn.amount_intraday_source import AmountDataSource as AmountIntradayDataSource
+from core.adapters.datasources.cn.breadth_intraday_source import BreadthDataSource as BreadthIntradayDataSource
+from core.adapters.datasources.cn.etf_spot_sync_intraday_source import ETFSpotSyncIntradayDataSource
+from core.adapters.datasources.cn.market_sentiment_intraday_source import (
+    MarketSentimentDataSource as MarketSentimentIntradayDataSource,
+)
+from core.adapters.fetchers.cn.ashare_fetcher import AshareDataFetcher
+from core.datasources.datasource_base import DataSourceConfig
+from core.engines.cn.ashare_daily_engine import AShareDailyEngine
+from core.utils.intraday_spot_aggregator import get_intraday_aggregator
+from core.utils.logger import get_logger
+from core.utils.spot_snapshot_service import configure_spot_service
+from core.utils.spot_store import get_spot_daily
+from core.utils.time_utils import now_bj
+
+LOG = get_logger("Engine.IntradayDaemon")
+
+DEFAULT_INTERVAL_S = 300
+# 盘中数据源每个 tick 都需要最新 spot：full = SpotSnapshotService 时间桶快照（staleness 内复用）
+INTRADAY_REFRESH_MODE = "full"
+A_SHARE_CLOSE = time(15, 0)
+
+
+class WarmIntradayEngine(AShareDailyEngine):
+    """
+    AShareDailyEngine with a resident snapshot.
+
+    - 首次 _fetch_snapshot(): 完整 fetch，结果缓存为 static snapshot
+    - 之后: 复制 static snapshot，仅刷新 intraday_overlay
+    """
+
+    def __init__(self, refresh_mode: str = "none", trade_date_override: Optional[str] = None) -> None:
+        super().__init__(refresh_mode=refresh_mode, trade_date_override=trade_date_override)
+        self._fetcher: Optional[AshareDataFetcher] = None
+        self._static_snapshot: Optional[Dict[str, Any]] = None
+        self._intraday_sources: Optional[List[Tuple[str, Any]]] = None
+
+    # ------------------------------------------------------------
+    def _build_intraday_sources(self) -> List[Tuple[str, Any]]:
+        """(overlay_key, datasource); 独立 ds_name，cache/history 不与 EOD 数据源混用。"""
+        return [
+            ("amount", AmountIntradayDataSource(DataSourceConfig(market="cn", ds_name="amount_intraday"))),
+            ("breadth", BreadthIntradayDataSource(DataSourceConfig(market="cn", ds_name="breadth_intraday"))),
+            (
+                "market_sentiment",
+                MarketSentimentIntradayDataSource(DataSourceConfig(market="cn", ds_name="market_sentiment_intraday")),
+            ),
+            (
+                "etf_spot_sync",
+                ETFSpotSyncIntradayDataSource(
+                    DataSourceConfig(market="cn", ds_name="etf_spot_sync_intraday"),
+                    is_intraday=self.is_intraday,
+                ),
+            ),
+        ]
+
+    def refresh_intraday_overlay(self) -> Dict[str, Any]:
+        if self._intraday_sources is None:
+            self._intraday_sources = self._build_intraday_sources()
+
+        # get_spot_daily 是进程内 lru_cache：daemon 必须每个 tick 清空，否则永远返回首个 tick 的行情
+        get_spot_daily.cache_clear()
+
+        overlay: Dict[str, Any] = {}
+        for key, ds in self._intraday_sources:
+            try:
+                overlay[key] = ds.build_block(trade_date=self.trade_date, refresh_mode=INTRADAY_REFRESH_MODE)
+            except Exception as e:
+                LOG.warning("[IntradayDaemon] intraday source failed key=%s err=%s", key, e)
+                overlay[key] = {}
+        # 盘中宽度 / 成交额时间序列（IntradaySpotAggregator：每个已应用的 spot 快照一点）
+        overlay["intraday_series"] = get_intraday_aggregator().series(self.trade_date)
+        overlay["refreshed_at"] = now_bj().isoformat(timespec="seconds")
+        return overlay
+
+    # ------------------------------------------------------------
+    def _fetch_snapshot(self) -> Dict[str, Any]:
+        if self._static_snapshot is None:
+            if self._fetcher is None:
+                self._fetcher = AshareDataFetcher(
+                    trade_date=self.trade_date,
+                    is_intraday=self.is_intraday,
+                    refresh_mode=self.refresh_mode,
+                )
+            self._static_snapshot = self._fetcher.prepare_daily_market_snapshot()
+
+        # factors / builders 不应修改 snapshot，但浅拷贝不足以防御嵌套写入；deepcopy 成本远小于一次 fetch
+        snapshot = copy.deepcopy(self._static_snapshot)
+        snapshot["intraday_overlay"] = self.refresh_intraday_overlay()
+        return snapshot
+
+    def _build_phase2(self, bound: Dict[str, Any]) -> Dict[str, Any]:
+        bound = super()._build_phase2(bound)
+        if isinstance(self.snapshot, dict) and isinstance(self.snapshot.get("intraday_overlay"), dict):
+            bound["intraday_overlay"] = self.snapshot["intraday_overlay"]
+        return bound
+
+
+class IntradayWarmDaemon:
+    """
+    Tick loop around a WarmIntradayEngine.
+
+    - interval_s: 两次 tick 开始时间的间隔（秒）；tick 耗时超过 interval 时立即进入下一个 tick
+    - max_ticks: None = 不限；运行至收盘（stop_at_close）或被中断
+    """
+
+    def __init__(
+        self,
+        *,
+        refresh_mode: str = "readonly",
+        interval_s: float = DEFAULT_INTERVAL_S,
+        max_ticks: Optional[int] = None,
+        stop_at_close: bool = True,
+        trade_date_override: Optional[str] = None,
+        engine_factory: Optional[Callable[..., AShareDailyEngine]] = None,
+        sleep_fn: Callable[[float], None] = _time.sleep,
+        spot_max_age_s: Optional[float] = None,
+    ) -> None:
+        self.interval_s = max(float(interval_s), 1.0)
+        # 同一 tick 内各数据源共享一份 spot；默认 staleness 小于 tick 间隔，保证每个 tick 至少刷新一次
+        configure_spot_service(max_age_s=spot_max_age_s if spot_max_age_s is not None else min(self.interval_s / 2.0, 60.0))
+        self.max_ticks = max_ticks
+        self.stop_at_close = stop_at_close
+        self._sleep = sleep_fn
+
+        factory = engine_factory or WarmIntradayEngine
+        self.engine = factory(refresh_mode=refresh_mode, trade_date_override=trade_date_override)
+        self.ticks = 0
+        self.last_tick_s: Optional[float] = None
+
+    def _should_continue(self) -> bool:
+        if self.max_ticks is not None and self.ticks >= self.max_ticks:
+            return False
+        if self.stop_at_close and self.ticks > 0 and now_bj().time() >= A_SHARE_CLOSE:
+            LOG.info("[IntradayDaemon] market closed, stop after %d ticks", self.ticks)
+            return False
+        return True
+
+    def tick(self) -> bool:
+        t0 = _time.perf_counter()
+        ok = True
+        try:
+            self.engine.run()
+        except Exception as e:
+            ok = False
+            LOG.exception("[IntradayDaemon] tick failed: %s", e)
+        self.ticks += 1
+        self.last_tick_s = _time.perf_counter() - t0
+        LOG.info(
+            "[IntradayDaemon] tick=%d ok=%s trade_date=%s kind=%s elapsed=%.2fs",
+            self.ticks,
+            ok,
+            self.engine.trade_date,
+            self.engine.report_kind,
+            self.last_tick_s,
+        )
+        return ok
+
+    def run_forever(self) -> None:
+        LOG.info(
+            "[IntradayDaemon] start trade_date=%s kind=%s interval=%.0fs max_ticks=%s",
+            self.engine.trade_date,
+            self.engine.report_kind,
+            self.interval_s,
+            self.max_ticks,
+        )
+        if not self.engine.is_intraday:
+            LOG.warning("[IntradayDaemon] not in trading session (kind=%s); overlay is post-close", self.engine.report_kind)
+
+        try:
+            while self._should_continue():
+                started = _time.perf_counter()
+                self.tick()
+                if not self._should_continue():
+                    break
+                wait = self.interval_s - (_time.perf_counter() - started)
+                if wait > 0:
+                    self._sleep(wait)
+        except KeyboardInterrupt:
+            LOG.info("[IntradayDaemon] interrupted after %d ticks", self.ticks)
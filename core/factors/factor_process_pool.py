@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+UnifiedRisk V12 - CPU 重因子进程池执行（snapshot 一次写入共享内存）
+
+部分因子是对大嵌套 dict 的纯 Python 计算（watchlist_lead / crowding_concentration /
+north_proxy_pressure 等），线程受 GIL 限制；逐任务 pickle snapshot 给子进程又太贵。这里：
+    - 父进程把 snapshot 序列化一次（pickle protocol 5）写入 multiprocessing.shared_memory
+    - 任务只携带 (factor key, import spec, params, 共享内存名)；worker 按名字只读映射，
+      同一 snapshot 在每个 worker 内只反序列化一次（backfill 下一个日期换新的共享内存段）
+    - worker 返回 FactorResult；进程池在进程内常驻复用（多日期 backfill 不重复起进程）
+    - worker 日志经 multiprocessing 队列回到父进程的 log listener（同一 log / jsonl 文件，
+      带提交时的 run_id / stage）
+
+配置（config/weights.yaml → factor_pipeline.process_pool）：
+    enabled: false            # 日常单次运行保持关闭；backfill 打开
+    workers: 0                # 0 = os.cpu_count()
+    factors: [watchlist_lead, crowding_concentration, north_proxy_pressure]
+
+约定：
+    - snapshot 中含不可 pickle 的对象、或共享内存不可用时，返回 None，调用方全部进程内计算
+    - 因子异常原样在父进程 result() 处抛出，由引擎统一生成 NEUTRAL 占位 FactorResult
+"""
+
+from __future__ import annotations
+
+import atexit
+import importlib
+import inspect
+import os
+import pickle
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.factors.factor_result import FactorResult
+from core.utils.logger import get_log_context, get_logger, init_worker_logging, log_context, worker_logging_args
+
+LOG = get_logger("Factor.ProcessPool")
+
+# (factor key, import spec, init params)
+FactorTask = Tuple[str, str, Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class ProcessPoolSpec:
+    enabled: bool = False
+    workers: int = 0
+    factors: Tuple[str, ...] = ()
+
+    @property
+    def max_workers(self) -> int:
+        return self.workers if self.workers > 0 else (os.cpu_count() or 1)
+
+
+def load_process_pool_spec(factor_pipeline: Any) -> ProcessPoolSpec:
+    """factor_pipeline.process_pool → ProcessPoolSpec（缺失 / 非法 → 关闭）。"""
+    fp = factor_pipeline if isinstance(factor_pipeline, dict) else {}
+    raw = fp.get("process_pool")
+    if not isinstance(raw, dict):
+        return ProcessPoolSpec()
+    factors = raw.get("factors") or []
+    if not isinstance(factors, list):
+        factors = []
+    try:
+        workers = int(raw.get("workers") or 0)
+    except (TypeError, ValueError):
+        workers = 0
+    return ProcessPoolSpec(
+        enabled=bool(raw.get("enabled", False)),
+        workers=max(workers, 0),
+        factors=tuple(str(x).strip() for x in factors if isinstance(x, str) and x.strip()),
+    )
+
+
+# ==================================================
+# factor loading (shared by engine and workers)
+# ==================================================
+def import_obj(spec: str) -> Any:
+    """'package.module:ClassName' / 'package.module.ClassName' → object."""
+    spec = (spec or "").strip()
+    if not spec:
+        raise ValueError("empty import spec")
+
+    if ":" in spec:
+        mod_path, attr = spec.split(":", 1)
+    else:
+        mod_path, _, attr = spec.rpartition(".")
+        if not mod_path:
+            raise ValueError(f"invalid import spec: {spec}")
+
+    module = importlib.import_module(mod_path)
+    obj = getattr(module, attr, None)
+    if obj is None:
+        raise ValueError(f"import failed: {spec} (attr not found)")
+    return obj
+
+
+def instantiate_factor(cls: Any, params: Dict[str, Any]) -> Any:
+    """Instantiate factor class with best-effort filtered kwargs."""
+    if not isinstance(params, dict):
+        params = {}
+    try:
+        sig = inspect.signature(cls.__init__)
+        kwargs = {k: v for k, v in params.items() if k in sig.parameters and k != "self"}
+        return cls(**kwargs)
+    except Exception:
+        return cls()
+
+
+# ==================================================
+# worker side
+# ==================================================
+_WORKER_SNAPSHOT: Dict[str, Any] = {"name": None, "snapshot": None}
+
+
+def _attach_snapshot(shm_name: str, size: int) -> Dict[str, Any]:
+    if _WORKER_SNAPSHOT["name"] == shm_name:
+        return _WORKER_SNAPSHOT["snapshot"]
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        with shm.buf[:size] as view:
+            snapshot = pickle.loads(view)
+    finally:
+        shm.close()
+    _WORKER_SNAPSHOT["name"], _WORKER_SNAPSHOT["snapshot"] = shm_name, snapshot
+    return snapshot
+
+
+def _compute_in_worker(args: Tuple[str, str, Dict[str, Any], str, int, Dict[str, Any]]) -> FactorResult:
+    key, spec, params, shm_name, size, log_ctx = args
+    with log_context(**log_ctx):
+        snapshot = _attach_snapshot(shm_name, size)
+        fr = instantiate_factor(import_obj(spec), params).compute(snapshot)
+    if not isinstance(fr, FactorResult):
+        raise TypeError(f"factor.compute() must return FactorResult, got={type(fr)}")
+    return fr
+
+
+# ==================================================
+# parent side
+# ==================================================
+class PendingFactors:
+    """一次 snapshot 的已提交因子；close() 等待全部完成后释放共享内存段。"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, futures: Dict[str, Future]) -> None:
+        self._shm = shm
+        self._futures = futures
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._futures
+
+    def keys(self) -> List[str]:
+        return list(self._futures)
+
+    def result(self, key: str) -> FactorResult:
+        try:
+            return self._futures[key].result()
+        except BrokenProcessPool:
+            shutdown_factor_pool()  # 下一个 snapshot 重建进程池
+            raise
+
+    def close(self) -> None:
+        for f in self._futures.values():
+            try:
+                f.result()
+            except Exception:
+                pass
+        shm, self._shm = self._shm, None
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+
+def get_factor_pool(workers: int) -> ProcessPoolExecutor:
+    """进程内常驻的 ProcessPoolExecutor（workers 变化时重建）。"""
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL_WORKERS != workers:
+            _POOL.shutdown(wait=True)
+            _POOL = None
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_worker_logging,
+                initargs=worker_logging_args(),
+            )
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+def shutdown_factor_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_factor_pool)
+
+
+def submit_factors(snapshot: Dict[str, Any], tasks: Sequence[FactorTask], *, workers: int) -> Optional[PendingFactors]:
+    """snapshot 写入共享内存一次，tasks 提交到进程池；不可用时返回 None（调用方进程内计算）。"""
+    if not tasks:
+        return None
+    try:
+        data = pickle.dumps(snapshot, protocol=5)
+    except Exception as e:
+        LOG.warning("[FactorPool] snapshot not picklable, compute in-process: %s", e)
+        return None
+
+    try:
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    except Exception as e:
+        LOG.warning("[FactorPool] shared memory unavailable, compute in-process: %s", e)
+        return None
+
+    try:
+        shm.buf[: len(data)] = data
+        pool = get_factor_pool(max(int(workers), 1))
+        ctx = get_log_context()
+        futures = {
+            key: pool.submit(_compute_in_worker, (key, spec, params, shm.name, len(data), ctx)) for key, spec, params in tasks
+        }
+    except Exception as e:
+        LOG.warning("[FactorPool] submit failed, compute in-process: %s", e)
+        shm.close()
+        shm.unlink()
+        return None
+
+    LOG.info("[FactorPool] submitted factors=%s snapshot_bytes=%s workers=%s", [t[0] for t in tasks], len(data), workers)
+    return PendingFactors(shm, futures)
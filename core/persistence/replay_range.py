@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""UnifiedRisk V12 · Date-range Replay + Drift Summary
+
+Fan-out of replay_runner.replay_run() over many persisted runs:
+- the parent only holds run ids; each worker opens its own read-only SQLite
+  connection and streams payloads from SqliteRunStore one run at a time
+- recompute runs in a process pool (workers=1 → in-process, same code path)
+- per-run audit_diff results are folded into one summary with drift counts per
+  block (rendered markdown is diffed per "## <block title>" section)
+
+Frozen principles (same as replay_runner):
+- deterministic ordering (summary follows the input run order)
+- a failing run is reported as an error entry, never silently dropped
+"""
+from __future__ import annotations
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from core.persistence.audit_diff import DiffItem, diffs_to_markdown
+from core.persistence.replay_runner import ReportBuilder, replay_run
+
+RENDERED_KEY = "rendered"
+# per-run diff items shipped back to the parent (counts are always exact)
+DEFAULT_MAX_DIFFS_PER_RUN = 200
+
+
+@dataclass
+class RunDrift:
+    run_id: str
+    trade_date: str = ""
+    kind: str = ""
+    diff_count: int = 0
+    blocks: Dict[str, int] = field(default_factory=dict)
+    warnings: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    diffs: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self, *, with_diffs: bool = False) -> Dict[str, Any]:
+        d = {
+            "run_id": self.run_id,
+            "trade_date": self.trade_date,
+            "kind": self.kind,
+            "diff_count": self.diff_count,
+            "blocks": dict(sorted(self.blocks.items())),
+            "warnings": list(self.warnings),
+            "error": self.error,
+        }
+        if with_diffs:
+            d["diffs"] = list(self.diffs)
+        return d
+
+
+def split_rendered_sections(text: str) -> Dict[str, str]:
+    """Markdown → {section_title: body}; text before the first '## ' is the header section."""
+    sections: Dict[str, List[str]] = {}
+    key = "_header"
+    seen: Counter = Counter()
+    for line in (text or "").splitlines():
+        if line.startswith("## "):
+            title = line[3:].strip() or "_untitled"
+            seen[title] += 1
+            key = title if seen[title] == 1 else f"{title}#{seen[title]}"
+        sections.setdefault(key, []).append(line)
+    return {k: "\n".join(v) for k, v in sections.items()}
+
+
+def block_drift(diffs: Sequence[DiffItem]) -> Dict[str, int]:
+    """Count diffs per block key.
+
+    - /rendered: expanded into 'rendered:<section title>' for each differing section
+    - other paths: first two path segments (e.g. '/des_payload/structure')
+    """
+    out: Counter = Counter()
+    for d in diffs:
+        if d.path == f"/{RENDERED_KEY}" and isinstance(d.a, str) and isinstance(d.b, str):
+            a = split_rendered_sections(d.a)
+            b = split_rendered_sections(d.b)
+            for k in sorted(set(a) | set(b)):
+                if a.get(k) != b.get(k):
+                    out[f"{RENDERED_KEY}:{k}"] += 1
+            continue
+        segs = [s for s in d.path.split("/") if s]
+        out["/" + "/".join(segs[:2]) if segs else "/"] += 1
+    return dict(out)
+
+
+# ---------- worker side ----------
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(db_path: str, builder: Optional[ReportBuilder]) -> None:
+    from core.persistence.sqlite.sqlite_connection import connect_sqlite_readonly
+    from core.persistence.sqlite.sqlite_run_store import SqliteRunStore
+
+    _WORKER["store"] = SqliteRunStore(connect_sqlite_readonly(db_path))
+    _WORKER["builder"] = builder
+
+
+def _replay_one(args: Tuple[str, str, Optional[str], float, Tuple[str, ...], int]) -> RunDrift:
+    run_id, mode, block_specs_path, float_atol, ignore_globs, max_diffs = args
+    try:
+        res = replay_run(
+            store=_WORKER["store"],
+            run_id=run_id,
+            mode=mode,
+            builder=_WORKER.get("builder") if mode == "recompute" else None,
+            block_specs_path=block_specs_path,
+            float_atol=float_atol,
+            ignore_globs=list(ignore_globs),
+        )
+    except Exception as e:
+        return RunDrift(run_id=run_id, error=f"{type(e).__name__}: {e}")
+
+    return RunDrift(
+        run_id=res.run_id,
+        trade_date=res.trade_date,
+        kind=res.kind,
+        diff_count=len(res.diffs),
+        blocks=block_drift(res.diffs),
+        warnings=list(res.warnings),
+        diffs=[d.to_dict() for d in res.diffs[: max(int(max_diffs), 0)]],
+    )
+
+
+# ---------- parent side ----------
+
+def iter_replay_range(
+    *,
+    db_path: str,
+    run_ids: Sequence[str],
+    mode: str = "recompute",
+    builder: Optional[ReportBuilder] = None,
+    block_specs_path: Optional[str] = None,
+    float_atol: float = 1e-8,
+    ignore_globs: Optional[Sequence[str]] = None,
+    workers: int = 1,
+    max_diffs_per_run: int = DEFAULT_MAX_DIFFS_PER_RUN,
+) -> Iterator[RunDrift]:
+    """Yield RunDrift per run id, in input order."""
+    if mode not in ("stored", "recompute"):
+        raise ValueError(f"invalid mode: {mode} (expected stored|recompute)")
+    if mode == "recompute" and builder is None:
+        raise ValueError("builder is required for mode=recompute")
+
+    tasks = [
+        (str(rid), mode, block_specs_path, float(float_atol), tuple(ignore_globs or ()), int(max_diffs_per_run))
+        for rid in run_ids
+    ]
+    if not tasks:
+        return
+
+    workers = max(int(workers), 1)
+    if workers == 1:
+        _init_worker(db_path, builder)
+        for t in tasks:
+            yield _replay_one(t)
+        return
+
+    chunksize = max(len(tasks) // (workers * 4), 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(db_path, builder)) as ex:
+        for r in ex.map(_replay_one, tasks, chunksize=chunksize):
+            yield r
+
+
+def summarize_drift(results: Iterable[RunDrift]) -> Dict[str, Any]:
+    """Fold per-run drift into one machine-readable summary."""
+    runs: List[RunDrift] = list(results)
+    by_block_runs: Counter = Counter()
+    by_block_diffs: Counter = Counter()
+    for r in runs:
+        for k, n in r.blocks.items():
+            by_block_runs[k] += 1
+            by_block_diffs[k] += int(n)
+
+    return {
+        "runs": len(runs),
+        "runs_with_drift": sum(1 for r in runs if r.diff_count > 0),
+        "runs_failed": sum(1 for r in runs if r.error),
+        "diff_total": sum(r.diff_count for r in runs),
+        "drift_by_block": {
+            k: {"runs": by_block_runs[k], "diffs": by_block_diffs[k]}
+            for k in sorted(by_block_runs, key=lambda x: (-by_block_runs[x], x))
+        },
+        "per_run": [r.to_dict() for r in runs],
+    }
+
+
+def drift_to_markdown(results: Sequence[RunDrift], summary: Dict[str, Any]) -> str:
+    lines: List[str] = ["# Replay Range Drift", ""]
+    lines += [
+        f"- Runs: **{summary.get('runs')}**",
+        f"- Runs with drift: **{summary.get('runs_with_drift')}**",
+        f"- Runs failed: **{summary.get('runs_failed')}**",
+    ]
+    limit = (summary.get("filters") or {}).get("limit")
+    if limit is not None:
+        note = " (range truncated)" if summary.get("limited") else ""
+        lines.append(f"- Limit: most recent **{limit}** runs{note}")
+    lines += [
+        "",
+        "| Block | Runs | Diffs |",
+        "|---|---|---|",
+    ]
+    for k, v in (summary.get("drift_by_block") or {}).items():
+        lines.append(f"| `{k}` | {v['runs']} | {v['diffs']} |")
+    lines.append("")
+
+    for r in results:
+        if r.error:
+            lines += [f"## {r.run_id}", "", f"> ❌ {r.error}", ""]
+            continue
+        if r.diff_count == 0:
+            continue
+        items = [DiffItem(path=d["path"], kind=d["kind"], a=d["a"], b=d["b"]) for d in r.diffs]
+        md = diffs_to_markdown(items, title=f"{r.trade_date} {r.kind} · {r.run_id}")
+        lines.append("#" + md)  # demote to '##'
+        if r.diff_count > len(items):
+            lines += [f"> Showing {len(items)} of {r.diff_count} diffs.", ""]
+    return "\n".join(lines)
@@ -2,12 +2,21 @@
 from __future__ import annotations
 
 import sqlite3
-from typing import Optional
+from typing import Callable, FrozenSet, Optional
+
+
+class URSqliteConnection(sqlite3.Connection):
+    """sqlite3.Connection with per-connection schema caches (DDL / PRAGMA table_info run once per connection)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ur_schema_ready: set = set()
+        self.ur_table_columns: dict = {}
 
 
 def connect_sqlite(db_path: str, timeout: float = 30.0) -> sqlite3.Connection:
     """Create a configured SQLite connection for UnifiedRisk persistence."""
-    conn = sqlite3.connect(db_path, timeout=timeout)
+    conn = sqlite3.connect(db_path, timeout=timeout, factory=URSqliteConnection)
     conn.row_factory = sqlite3.Row
 
     # Pragmas
@@ -15,3 +24,37 @@ def connect_sqlite(db_path: str, timeout: float = 30.0) -> sqlite3.Connection:
     conn.execute("PRAGMA foreign_keys=ON;")
     conn.execute("PRAGMA synchronous=NORMAL;")
     return conn
+
+
+def connect_sqlite_readonly(db_path: str, timeout: float = 30.0) -> sqlite3.Connection:
+    """Read-only SQLite connection (replay / audit workers; never writes or changes journal mode)."""
+    from pathlib import Path
+
+    uri = f"file:{Path(db_path).resolve().as_posix()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, timeout=timeout)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA query_only=ON;")
+    return conn
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> FrozenSet[str]:
+    """Lower-cased column names of `table`; cached on URSqliteConnection, plain PRAGMA otherwise."""
+    cache = getattr(conn, "ur_table_columns", None)
+    key = table.lower()
+    if cache is not None and key in cache:
+        return cache[key]
+    cols = frozenset(str(r[1]).lower() for r in conn.execute(f"PRAGMA table_info({table})").fetchall())
+    if cache is not None and cols:
+        cache[key] = cols
+    return cols
+
+
+def ensure_schema_once(conn: sqlite3.Connection, name: str, ensure_fn: Callable[[sqlite3.Connection], None]) -> None:
+    """Run an idempotent ensure_schema_* DDL at most once per connection."""
+    ready = getattr(conn, "ur_schema_ready", None)
+    if ready is not None and name in ready:
+        return
+    ensure_fn(conn)
+    if ready is not None:
+        ready.add(name)
+        conn.ur_table_columns.clear()  # DDL may have added columns
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+UnifiedRisk V12 - observation 连续性状态（按交易日）SQLite 存储
+
+表 ur_continuity_state，主键 (trade_date, observation)：
+- load_prev(observation, asof): asof 之前最近一个交易日的状态（与运行顺序无关）
+- save_state(observation, asof, state): 同一天重跑覆盖写（幂等）
+- rebuild(observation, config): 乱序回填后，按日期重放已存储的 signal 重算 count
+
+legacy_json_path：表内没有更早状态时，读取旧 JsonStateStore 文件作为种子
+（仅当其 asof 早于当前 asof），保证从 json 迁移时连续计数不断档。
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.persistence.sqlite.sqlite_connection import ensure_schema_once
+from core.persistence.sqlite.sqlite_run_writer import commit_unless_in_run, in_run_transaction
+from core.regime.observation.drs_continuity import DRSContinuityConfig, JsonStateStore, replay_continuity
+
+
+def ensure_schema_continuity(conn: sqlite3.Connection) -> None:
+    """Ensure ur_continuity_state exists. Idempotent."""
+    # execute (not executescript): executescript would COMMIT an open run transaction first
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ur_continuity_state (
+          trade_date     TEXT    NOT NULL,
+          observation    TEXT    NOT NULL,
+          signal         TEXT,
+          count          INTEGER,
+          payload_json   TEXT,
+          created_at_utc INTEGER NOT NULL,
+          PRIMARY KEY (trade_date, observation)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ur_continuity_obs_date ON ur_continuity_state (observation, trade_date)")
+    commit_unless_in_run(conn)
+
+
+class SqliteContinuityStore:
+    """按 (trade_date, observation) 的连续性状态存储（生产用）。"""
+
+    def __init__(self, conn: sqlite3.Connection, *, legacy_json_path: Optional[str] = None) -> None:
+        self.conn = conn
+        self.legacy_json_path = legacy_json_path
+        ensure_schema_once(conn, "continuity", ensure_schema_continuity)
+
+    @staticmethod
+    def _row_to_state(row: Any) -> Dict[str, Any]:
+        trade_date, signal, count, payload_json = row[0], row[1], row[2], row[3]
+        state: Dict[str, Any] = {}
+        if payload_json:
+            try:
+                obj = json.loads(payload_json)
+                if isinstance(obj, dict):
+                    state.update(obj)
+            except Exception:
+                pass
+        state.update({"asof": trade_date, "signal": signal, "count": count})
+        return state
+
+    def _legacy_prev(self, observation: str, asof: str) -> Optional[Dict[str, Any]]:
+        if not self.legacy_json_path:
+            return None
+        prev = JsonStateStore(self.legacy_json_path).load().get(observation)
+        if isinstance(prev, dict) and isinstance(prev.get("asof"), str) and prev["asof"] < asof:
+            return dict(prev)
+        return None
+
+    def load_prev(self, observation: str, asof: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            """
+            SELECT trade_date, signal, count, payload_json
+            FROM ur_continuity_state
+            WHERE observation = ? AND trade_date < ?
+            ORDER BY trade_date DESC
+            LIMIT 1
+            """,
+            (observation, asof),
+        ).fetchone()
+        if row is None:
+            return self._legacy_prev(observation, asof)
+        return self._row_to_state(row)
+
+    def get(self, observation: str, asof: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT trade_date, signal, count, payload_json FROM ur_continuity_state WHERE observation = ? AND trade_date = ?",
+            (observation, asof),
+        ).fetchone()
+        return self._row_to_state(row) if row is not None else None
+
+    def save_state(self, observation: str, asof: str, state: Dict[str, Any]) -> None:
+        self.save_many(observation, [(asof, state)])
+
+    def save_many(self, observation: str, rows: List[Tuple[str, Dict[str, Any]]]) -> None:
+        now = int(time.time())
+        # inside a run transaction (SqliteRunWriter) the state commits with the run
+        with (nullcontext() if in_run_transaction(self.conn) else self.conn):
+            self.conn.executemany(
+                """
+                INSERT INTO ur_continuity_state (trade_date, observation, signal, count, payload_json, created_at_utc)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (trade_date, observation) DO UPDATE SET
+                  signal = excluded.signal,
+                  count = excluded.count,
+                  payload_json = excluded.payload_json,
+                  created_at_utc = excluded.created_at_utc
+                """,
+                [
+                    (
+                        asof,
+                        observation,
+                        state.get("signal"),
+                        state.get("count"),
+                        json.dumps(state, ensure_ascii=False, sort_keys=True),
+                        now,
+                    )
+                    for asof, state in rows
+                ],
+            )
+
+    def signals(self, observation: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Tuple[str, str]]:
+        sql = "SELECT trade_date, signal FROM ur_continuity_state WHERE observation = ?"
+        args: List[Any] = [observation]
+        if start:
+            sql += " AND trade_date >= ?"
+            args.append(start)
+        if end:
+            sql += " AND trade_date <= ?"
+            args.append(end)
+        sql += " ORDER BY trade_date"
+        return [(r[0], r[1]) for r in self.conn.execute(sql, args).fetchall()]
+
+    def rebuild(self, observation: str, config: Optional[DRSContinuityConfig] = None) -> int:
+        """按日期顺序重放已存储的 signal，重写全部 count（乱序回填后使用）；返回行数。"""
+        replayed = replay_continuity(self.signals(observation), config)
+        rows = [(asof, {"asof": asof, "signal": st["signal"], "count": st["count"]}) for asof, st in replayed.items()]
+        if rows:
+            self.save_many(observation, rows)
+        return len(rows)
+
+
+def load_gate_drs_signals(
+    conn: sqlite3.Connection,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    report_kind: str = "EOD",
+) -> List[Tuple[str, str]]:
+    """
+    ur_gate_decision.drs 按交易日取最后一次运行：[(trade_date, drs)]。
+    用于在 ur_continuity_state 尚无历史时回放重建（注意：这是治理后的 DRS）。
+    """
+    sql = """
+        SELECT m.trade_date, g.drs
+        FROM ur_gate_decision g
+        JOIN ur_run_meta m ON m.run_id = g.run_id
+        WHERE m.report_kind = ?
+    """
+    args: List[Any] = [report_kind]
+    if start:
+        sql += " AND m.trade_date >= ?"
+        args.append(start)
+    if end:
+        sql += " AND m.trade_date <= ?"
+        args.append(end)
+    sql += " ORDER BY m.trade_date, g.created_at_utc"
+    latest: Dict[str, str] = {}
+    for trade_date, drs in conn.execute(sql, args).fetchall():
+        latest[trade_date] = drs
+    return sorted(latest.items())
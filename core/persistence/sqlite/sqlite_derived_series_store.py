@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+UnifiedRisk V12 - 派生日序列存储（C/D/E/F leading-structure blocks）
+
+表 ur_derived_series，主键 (block, trade_date)：每个 block 每个交易日一行聚合结果。
+- def_version：聚合定义版本；读取只认当前版本，定义变化后旧行视为缺失
+- 追加 / 覆盖写幂等（同一天重算覆盖）
+
+表 ur_derived_coverage：每个 (block, def_version) 已计算过的日历区间（合并后的闭区间）。
+非交易日没有行，只靠 MAX(trade_date) 无法区分"休市"与"从未计算"，窗口内的空洞按覆盖区间判定。
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import sqlite3
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def ensure_schema_derived_series(conn: sqlite3.Connection) -> None:
+    """Ensure ur_derived_series exists. Idempotent."""
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS ur_derived_series (
+          block          TEXT    NOT NULL,
+          trade_date     TEXT    NOT NULL,
+          def_version    INTEGER NOT NULL,
+          payload_json   TEXT    NOT NULL,
+          created_at_utc INTEGER NOT NULL,
+          PRIMARY KEY (block, trade_date)
+        );
+        CREATE TABLE IF NOT EXISTS ur_derived_coverage (
+          block          TEXT    NOT NULL,
+          def_version    INTEGER NOT NULL,
+          start_date     TEXT    NOT NULL,
+          end_date       TEXT    NOT NULL,
+          PRIMARY KEY (block, def_version, start_date)
+        );
+        """
+    )
+    conn.commit()
+
+
+def _clean(v: Any) -> Any:
+    if isinstance(v, float) and (math.isnan(v) or math.isinf(v)):
+        return None
+    return v
+
+
+class SqliteDerivedSeriesStore:
+    """每 (block, trade_date) 一行的派生序列存储。"""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        ensure_schema_derived_series(conn)
+
+    def last_date(self, block: str, version: int, asof: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT MAX(trade_date) FROM ur_derived_series WHERE block = ? AND def_version = ? AND trade_date <= ?",
+            (block, int(version), asof),
+        ).fetchone()
+        return row[0] if row and row[0] else None
+
+    def coverage(self, block: str, version: int, start: str, end: str) -> List[Tuple[str, str]]:
+        """与 [start, end] 相交的已计算区间（升序）。"""
+        return [
+            (a, b)
+            for a, b in self.conn.execute(
+                """
+                SELECT start_date, end_date FROM ur_derived_coverage
+                WHERE block = ? AND def_version = ? AND start_date <= ? AND end_date >= ?
+                ORDER BY start_date
+                """,
+                (block, int(version), end, start),
+            ).fetchall()
+        ]
+
+    def add_coverage(self, block: str, version: int, start: str, end: str) -> None:
+        """记录 [start, end] 已计算；与相交 / 相邻的区间合并为一条。"""
+        if start > end:
+            return
+        lo = (date.fromisoformat(start) - timedelta(days=1)).isoformat()
+        hi = (date.fromisoformat(end) + timedelta(days=1)).isoformat()
+        spans = self.coverage(block, version, lo, hi)
+        start = min([start] + [a for a, _ in spans])
+        end = max([end] + [b for _, b in spans])
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM ur_derived_coverage WHERE block = ? AND def_version = ? AND start_date = ?",
+                [(block, int(version), a) for a, _ in spans],
+            )
+            self.conn.execute(
+                "INSERT INTO ur_derived_coverage (block, def_version, start_date, end_date) VALUES (?, ?, ?, ?)",
+                (block, int(version), start, end),
+            )
+
+    def read_range(self, block: str, version: int, start: str, end: str) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            """
+            SELECT trade_date, payload_json FROM ur_derived_series
+            WHERE block = ? AND def_version = ? AND trade_date >= ? AND trade_date <= ?
+            ORDER BY trade_date
+            """,
+            (block, int(version), start, end),
+        ).fetchall()
+        out = []
+        for trade_date, payload in rows:
+            rec = json.loads(payload)
+            rec["trade_date"] = trade_date
+            out.append(rec)
+        return out
+
+    def upsert(self, block: str, version: int, rows: Iterable[Dict[str, Any]]) -> int:
+        now = int(time.time())
+        data: List[Tuple[Any, ...]] = []
+        for r in rows:
+            payload = {k: _clean(v) for k, v in r.items() if k != "trade_date"}
+            data.append((block, str(r["trade_date"]), int(version), json.dumps(payload, ensure_ascii=False, sort_keys=True), now))
+        if not data:
+            return 0
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO ur_derived_series (block, trade_date, def_version, payload_json, created_at_utc)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (block, trade_date) DO UPDATE SET
+                  def_version = excluded.def_version,
+                  payload_json = excluded.payload_json,
+                  created_at_utc = excluded.created_at_utc
+                """,
+                data,
+            )
+        return len(data)
+
+    def delete_from(self, block: str, start: str, end: Optional[str] = None) -> int:
+        sql = "DELETE FROM ur_derived_series WHERE block = ? AND trade_date >= ?"
+        args: List[Any] = [block, start]
+        if end:
+            sql += " AND trade_date <= ?"
+            args.append(end)
+        with self.conn:
+            cur = self.conn.execute(sql, args)
+            self._trim_coverage(block, start, end)
+        return int(cur.rowcount or 0)
+
+    def _trim_coverage(self, block: str, start: str, end: Optional[str]) -> None:
+        """从所有版本的覆盖区间中扣掉 [start, end]（调用方负责事务）。"""
+        rows = self.conn.execute(
+            "SELECT def_version, start_date, end_date FROM ur_derived_coverage WHERE block = ? AND end_date >= ?"
+            + (" AND start_date <= ?" if end else ""),
+            [block, start] + ([end] if end else []),
+        ).fetchall()
+        before = (date.fromisoformat(start) - timedelta(days=1)).isoformat()
+        after = (date.fromisoformat(end) + timedelta(days=1)).isoformat() if end else None
+        for version, a, b in rows:
+            self.conn.execute(
+                "DELETE FROM ur_derived_coverage WHERE block = ? AND def_version = ? AND start_date = ?",
+                (block, version, a),
+            )
+            keep = [(a, before)] if a < start else []
+            if after is not None and b > end:
+                keep.append((after, b))
+            self.conn.executemany(
+                "INSERT INTO ur_derived_coverage (block, def_version, start_date, end_date) VALUES (?, ?, ?, ?)",
+                [(block, version, x, y) for x, y in keep],
+            )
+
+    def status(self) -> List[Tuple[str, int, int, str, str]]:
+        """[(block, def_version, rows, first_date, last_date)]"""
+        return [
+            tuple(r)
+            for r in self.conn.execute(
+                """
+                SELECT block, def_version, COUNT(*), MIN(trade_date), MAX(trade_date)
+                FROM ur_derived_series GROUP BY block, def_version ORDER BY block, def_version
+                """
+            ).fetchall()
+        ]
@@ -10,6 +10,7 @@ from core.persistence.contracts.errors import AlreadyPublishedError, Persistence
 from core.persistence.sqlite.sqlite_report_store import SqliteReportStore
 from core.persistence.sqlite.sqlite_des_store import SqliteDecisionEvidenceStore
 from core.persistence.sqlite.sqlite_uow import SqliteUnitOfWork
+from core.persistence.sqlite.sqlite_run_writer import commit_unless_in_run
 
 
 class SqliteL2Publisher:
@@ -381,7 +382,7 @@ class SqliteL2Publisher:
 
                     )
 
-                    self._conn.commit()
+                    commit_unless_in_run(self._conn)
 
 
                     cur = self._conn.execute(
@@ -622,7 +623,7 @@ class SqliteL2Publisher:
 
                                 )
 
-                                self._conn.commit()
+                                commit_unless_in_run(self._conn)
 
 
                         # write REGIME_STATS always
@@ -675,7 +676,7 @@ class SqliteL2Publisher:
 
                         )
 
-                        self._conn.commit()
+                        commit_unless_in_run(self._conn)
 
                 except Exception:
 
@@ -690,7 +691,7 @@ class SqliteL2Publisher:
                        VALUES (?, ?, 'FAILED', ?, ?);""",
                     (trade_date, report_kind, json.dumps({"run_id": run_id, "engine_version": engine_version, "error_type": type(e).__name__, "error": str(e)}, sort_keys=True, ensure_ascii=False, separators=(",", ":")), int(time.time())),
                 )
-                self._conn.commit()
+                commit_unless_in_run(self._conn)
             except Exception:
                 pass
             raise
@@ -704,7 +705,7 @@ class SqliteL2Publisher:
                        VALUES (?, ?, 'FAILED', ?, ?);""",
                     (trade_date, report_kind, json.dumps({"run_id": run_id, "engine_version": engine_version, "error_type": type(e).__name__, "error": repr(e)}, sort_keys=True, ensure_ascii=False, separators=(",", ":")), int(time.time())),                    
                 )
-                self._conn.commit()
+                commit_unless_in_run(self._conn)
             except Exception:
                 pass
             if isinstance(e, PersistenceError):
@@ -15,11 +15,14 @@ from __future__ import annotations
 import json
 import sqlite3
 import uuid
+from contextlib import nullcontext
 from datetime import datetime
 from typing import Any, Dict, Optional
 
 from core.persistence.contracts.errors import PersistenceError
+from core.persistence.sqlite.sqlite_connection import table_columns
 from core.persistence.sqlite.sqlite_hashing import sha256_hex
+from core.persistence.sqlite.sqlite_run_writer import in_run_transaction
 
 
 class SqliteRunPersistence:
@@ -47,7 +50,7 @@ class SqliteRunPersistence:
         - Then insert a new run_meta row and return new run_id.
         """
         try:
-            with self._conn:
+            with self._tx():
                 # 🔥 핵심逻辑：同日同 kind 覆盖式重跑
                 self._purge_runs_by_date_kind(trade_date, report_kind)
 
@@ -196,7 +199,7 @@ class SqliteRunPersistence:
             audit_hash = sha256_hex(audit_payload)
             audit_payload["audit_hash"] = audit_hash
 
-            with self._conn:
+            with self._tx():
                 self._conn.execute(
                     """INSERT INTO ur_persistence_audit
                        (trade_date, report_kind, event, note, created_at_utc)
@@ -210,7 +213,7 @@ class SqliteRunPersistence:
                 )
     
         def _cols() -> set:
-            return {row[1] for row in self._conn.execute("PRAGMA table_info(ur_run_meta)").fetchall()}
+            return table_columns(self._conn, "ur_run_meta")
     
         def _update(status2: str, et: Optional[str], em: Optional[str]) -> None:
             cols = _cols()
@@ -224,7 +227,7 @@ class SqliteRunPersistence:
                 vals.append(now)
             sql = f"UPDATE ur_run_meta SET {', '.join(sets)} WHERE run_id = ?"
             vals.append(run_id)
-            with self._conn:
+            with self._tx():
                 self._conn.execute(sql, tuple(vals))
     
         def _assert_l2_complete(trade_date: str, report_kind: str) -> None:
@@ -294,7 +297,7 @@ class SqliteRunPersistence:
         """
         try:
             data = json.dumps(payload, ensure_ascii=False)
-            with self._conn:
+            with self._tx():
                 self._conn.execute(
                     """
                     INSERT INTO ur_snapshot_raw
@@ -326,7 +329,7 @@ class SqliteRunPersistence:
         """
         try:
             data = json.dumps(payload, ensure_ascii=False)
-            with self._conn:
+            with self._tx():
                 self._conn.execute(
                     """
                     INSERT INTO ur_factor_result
@@ -364,7 +367,7 @@ class SqliteRunPersistence:
                 if rule_hits is not None
                 else None
             )
-            with self._conn:
+            with self._tx():
                 self._conn.execute(
                     """
                     INSERT INTO ur_gate_decision
@@ -389,6 +392,10 @@ class SqliteRunPersistence:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _tx(self):
+        """`with self._conn` (commit per call) unless a SqliteRunWriter run transaction owns the commit."""
+        return nullcontext() if in_run_transaction(self._conn) else self._conn
+
     def _purge_runs_by_date_kind(
         self,
         trade_date: str,
@@ -109,6 +109,54 @@ class SqliteRunStore(RunStore):
         return [dict(zip(select_cols, row)) for row in rows]
     
 
+    def find_runs_range(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        kind: Optional[str] = None,
+        *,
+        status: Optional[str] = None,
+        latest_per_day: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Runs with start_date <= trade_date <= end_date, ordered by trade_date ASC.
+
+        latest_per_day: L2 artifacts are keyed by (trade_date, report_kind), so only the
+        latest run per key is replayable against its stored report; keep that one.
+        limit keeps the most recent N (trade_date, kind) entries.
+        """
+        select_cols = ["run_id", "trade_date", "report_kind", "engine_version", "status", "started_at_utc"]
+
+        where = []
+        args: List[Any] = []
+        if start_date:
+            where.append("trade_date >= ?")
+            args.append(start_date)
+        if end_date:
+            where.append("trade_date <= ?")
+            args.append(end_date)
+        if kind:
+            where.append("report_kind = ?")
+            args.append(kind)
+        if status:
+            where.append("status = ?")
+            args.append(status)
+
+        sql = f"SELECT {', '.join(select_cols)} FROM ur_run_meta"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY trade_date ASC, report_kind ASC, started_at_utc ASC"
+
+        rows = [dict(zip(select_cols, r)) for r in self._conn.execute(sql, tuple(args)).fetchall()]
+        if latest_per_day:
+            latest: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+            for r in rows:
+                latest[(r["trade_date"], r["report_kind"])] = r
+            rows = list(latest.values())
+        if limit is not None and int(limit) > 0:
+            rows = rows[-int(limit):]
+        return rows
+
     def load_run(self, run_id: str) -> RunPayload:
         if not isinstance(run_id, str) or not run_id.strip():
             raise ValueError("run_id must be non-empty str")
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+UnifiedRisk V12 - Sqlite Run Writer (L1 + L2 in one transaction)
+
+A run's persistence (L2 rerun purge, L1 snapshot / gate / factor rows, L2
+publish, run_meta status + AUDIT_HASH) is written inside ONE
+BEGIN IMMEDIATE transaction -> one commit (one WAL sync) per run, and L1/L2
+are either both visible or neither.
+
+- L1 rows are buffered and flushed with executemany() over constant SQL
+  (sqlite3's statement cache keeps them prepared).
+- While transaction() is active, SqliteRunPersistence / SqliteUnitOfWork /
+  SqliteL2Publisher detect it via in_run_transaction(conn): they skip their own
+  commits and the UoW nests as a SAVEPOINT instead of BEGIN IMMEDIATE.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.persistence.contracts.errors import PersistenceError
+
+# id(conn) of connections inside SqliteRunWriter.transaction()
+# (sqlite3.Connection does not support weakrefs)
+_ACTIVE: set = set()
+
+
+def in_run_transaction(conn: sqlite3.Connection) -> bool:
+    return id(conn) in _ACTIVE
+
+
+def commit_unless_in_run(conn: sqlite3.Connection) -> None:
+    """conn.commit() for standalone callers; inside a run transaction the run owns the commit."""
+    if not in_run_transaction(conn):
+        conn.commit()
+
+
+_SNAPSHOT_SQL = (
+    "INSERT INTO ur_snapshot_raw (run_id, snapshot_name, payload_json, created_at_utc) VALUES (?, ?, ?, ?)"
+)
+_FACTOR_SQL = (
+    "INSERT INTO ur_factor_result (run_id, factor_name, seq, factor_version, payload_json, created_at_utc) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_GATE_SQL = (
+    "INSERT INTO ur_gate_decision (run_id, gate, drs, frf, action_hint, rule_hits_json, created_at_utc) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat(timespec="seconds")
+
+
+class SqliteRunWriter:
+    """Run-scoped buffered writer for L1 rows (same row format as SqliteRunPersistence.record_*)."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        if conn is None:
+            raise PersistenceError("SqliteRunWriter requires a valid sqlite3.Connection")
+        self._conn = conn
+        self._snapshots: List[Tuple] = []
+        self._factors: List[Tuple] = []
+        self._gates: List[Tuple] = []
+
+    # ------------------------------------------------------------------
+    # Buffer
+    # ------------------------------------------------------------------
+
+    def add_snapshot(self, run_id: str, snapshot_name: str, payload: Dict[str, Any]) -> None:
+        self._snapshots.append((run_id, snapshot_name, json.dumps(payload, ensure_ascii=False), _now()))
+
+    def add_factor(
+        self,
+        run_id: str,
+        factor_name: str,
+        payload: Dict[str, Any],
+        factor_version: Optional[str] = None,
+        seq: int = 0,
+    ) -> None:
+        self._factors.append(
+            (run_id, factor_name, seq, factor_version, json.dumps(payload, ensure_ascii=False), _now())
+        )
+
+    def add_gate(
+        self,
+        run_id: str,
+        gate: str,
+        drs: str,
+        frf: str,
+        action_hint: Optional[str],
+        rule_hits: Optional[Dict[str, Any]],
+    ) -> None:
+        rule_hits_json = json.dumps(rule_hits, ensure_ascii=False) if rule_hits is not None else None
+        self._gates.append((run_id, gate, drs, frf, action_hint, rule_hits_json, _now()))
+
+    def pending(self) -> int:
+        return len(self._snapshots) + len(self._factors) + len(self._gates)
+
+    def flush(self) -> None:
+        """Write buffered rows (executemany per table). Never commits."""
+        for sql, rows in ((_SNAPSHOT_SQL, self._snapshots), (_FACTOR_SQL, self._factors), (_GATE_SQL, self._gates)):
+            if rows:
+                self._conn.executemany(sql, rows)
+                rows.clear()
+
+    def discard(self) -> None:
+        self._snapshots.clear()
+        self._factors.clear()
+        self._gates.clear()
+
+    # ------------------------------------------------------------------
+    # Transaction
+    # ------------------------------------------------------------------
+
+    def transaction(self) -> "_RunTransaction":
+        """BEGIN IMMEDIATE ... flush ... COMMIT; ROLLBACK (and drop the buffer) on any error."""
+        return _RunTransaction(self)
+
+
+class _RunTransaction:
+    # plain __enter__/__exit__: contextlib re-raise would assign __traceback__,
+    # which the frozen-dataclass persistence errors reject
+    def __init__(self, writer: SqliteRunWriter):
+        self._writer = writer
+        self._conn = writer._conn
+
+    def __enter__(self) -> SqliteRunWriter:
+        conn = self._conn
+        if in_run_transaction(conn):
+            raise PersistenceError("Run transaction already active on this connection")
+        if conn.in_transaction:
+            conn.commit()  # never fold a caller's implicit transaction into the run
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+        except Exception as e:
+            raise PersistenceError("Failed to begin run transaction", e)
+        _ACTIVE.add(id(conn))
+        return self._writer
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        conn = self._conn
+        try:
+            if exc_type is None:
+                try:
+                    self._writer.flush()
+                    conn.commit()
+                    return False
+                except BaseException:
+                    self._rollback()
+                    raise
+            self._rollback()
+            return False
+        finally:
+            _ACTIVE.discard(id(conn))
+
+    def _rollback(self) -> None:
+        self._writer.discard()
+        try:
+            self._conn.rollback()
+        except Exception:
+            pass
@@ -6,17 +6,25 @@ import time
 from typing import Optional
 
 from core.persistence.contracts.errors import PersistenceError
+from core.persistence.sqlite.sqlite_connection import table_columns
+from core.persistence.sqlite.sqlite_run_writer import in_run_transaction
+
+_SAVEPOINT = "ur_l2_uow"
 
 
 class SqliteUnitOfWork:
     """L2 Unit-of-Work for atomic publish.
 
     Owns a single connection and manages a BEGIN IMMEDIATE transaction.
+    Inside a SqliteRunWriter run transaction it nests as a SAVEPOINT instead:
+    commit() releases it, rollback() undoes only the publish, and the run
+    owns the final COMMIT.
     """
 
     def __init__(self, conn: sqlite3.Connection):
         self._conn = conn
         self._active = False
+        self._nested = False
 
     @property
     def conn(self) -> sqlite3.Connection:
@@ -26,7 +34,8 @@ class SqliteUnitOfWork:
         if self._active:
             raise PersistenceError("Transaction already active")
         try:
-            self._conn.execute("BEGIN IMMEDIATE;")
+            self._nested = in_run_transaction(self._conn)
+            self._conn.execute(f"SAVEPOINT {_SAVEPOINT};" if self._nested else "BEGIN IMMEDIATE;")
             self._active = True
         except Exception as e:
             raise PersistenceError("Failed to begin transaction", e)
@@ -35,7 +44,10 @@ class SqliteUnitOfWork:
         if not self._active:
             return
         try:
-            self._conn.commit()
+            if self._nested:
+                self._conn.execute(f"RELEASE SAVEPOINT {_SAVEPOINT};")
+            else:
+                self._conn.commit()
         except Exception as e:
             raise PersistenceError("Failed to commit transaction", e)
         finally:
@@ -45,7 +57,11 @@ class SqliteUnitOfWork:
         if not self._active:
             return
         try:
-            self._conn.rollback()
+            if self._nested:
+                self._conn.execute(f"ROLLBACK TO SAVEPOINT {_SAVEPOINT};")
+                self._conn.execute(f"RELEASE SAVEPOINT {_SAVEPOINT};")
+            else:
+                self._conn.rollback()
         except Exception:
             # best effort rollback
             pass
@@ -58,14 +74,10 @@ class SqliteUnitOfWork:
 
     def _has_column(self, table: str, col: str) -> bool:
         try:
-            rows = self._conn.execute(f"PRAGMA table_info({table})").fetchall()
-            for r in rows or []:
-                # r: (cid, name, type, notnull, dflt_value, pk)
-                if len(r) >= 2 and str(r[1]).lower() == col.lower():
-                    return True
+            # cached per connection (PRAGMA table_info once, not per audit row)
+            return col.lower() in table_columns(self._conn, table)
         except Exception:
             return False
-        return False
 
     def record_audit(self, trade_date: str, report_kind: str, event: str, note: Optional[str] = None) -> None:
         """Record an audit event inside the current transaction.
@@ -5,19 +5,44 @@ engine.py  (CN_ENTRY_POOL_ROTATION_V1)
 Public API (frozen):
 - run_eod(trade_date: str) -> str
 - run_t1(trade_date: str) -> str
+
+Backfill (additive):
+- run_eod_range(start_date: str, end_date: str) -> List[EODDayResult]
 """
 from __future__ import annotations
 
-from datetime import datetime, date
-from typing import List, Dict
+from dataclasses import dataclass, field
+from datetime import datetime, date, timedelta
+from typing import List, Dict, Optional, Tuple
 
-from .config import EPRConfig, load_config, default_state_row_from_db
-from .oracle_facts import make_oracle_engine, get_facts_for_symbols
+from .config import EPRConfig, StateRow, load_config, default_state_row_from_db
+from .oracle_facts import (
+    PRICE_BUFFER_DAYS,
+    SymbolFacts,
+    build_facts_from_series,
+    get_facts_for_symbols,
+    get_price_series_between,
+    index_price_series,
+    make_oracle_engine,
+)
 from .sqlite_store import SQLiteStore
 from .state_machine import evaluate_eod, evaluate_t1
 from .reporting import format_eod_summary, format_t1_summary
 
 
+# run_eod_range: flush snaps/events to SQLite every N trading days (one transaction each)
+DEFAULT_RANGE_FLUSH_DAYS = 20
+
+
+@dataclass
+class EODDayResult:
+    trade_date: str
+    snaps: Dict[str, dict] = field(default_factory=dict)
+    transitions: List[dict] = field(default_factory=list)
+    newly_triggered: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
 class CNEntryPoolRotationEngine:
     def __init__(self, cfg: EPRConfig):
         self.cfg = cfg
@@ -39,12 +64,120 @@ class CNEntryPoolRotationEngine:
             lookback_vol_ma=self.cfg.lookback_vol_ma,
         )
 
+        asof = datetime.now().isoformat(timespec="seconds")
+        priors = {
+            symbol: default_state_row_from_db(symbol, prior_states.get(symbol))
+            for symbol in self.cfg.entry_pool_symbols()
+        }
+        snaps, transitions, events = self._eod_step(trade_date, priors, facts_map, asof)
+        self.store.write_eod_batch(snaps=list(snaps.values()), events=events)
+
+        return format_eod_summary(trade_date, snaps, transitions)
+
+    def run_eod_range(
+        self,
+        start_date: str,
+        end_date: str,
+        flush_days: int = DEFAULT_RANGE_FLUSH_DAYS,
+    ) -> List[EODDayResult]:
+        """
+        Multi-date EOD backfill, equivalent to calling run_eod() for each trading day:
+        - schema / entry pool are prepared once
+        - ONE Oracle query loads prices for [start - lookback - buffer, end]
+        - rolling indicators are precomputed once per symbol (oracle_facts.SymbolSeries)
+        - trading days come from the loaded price calendar (no weekend / holiday calls)
+        - state-machine state is carried in memory from day to day
+        - snaps / events are flushed in batched transactions every `flush_days` trading days
+
+        A day with missing facts is reported as EODDayResult.error (state unchanged),
+        same as run_eod() raising for that day.
+        """
+        self.store.ensure_schema()
+        self.store.upsert_entry_pool(self.cfg.entry_pool)
+
+        d0 = self._parse_trade_date(start_date)
+        d1 = self._parse_trade_date(end_date)
+        if d1 < d0:
+            raise RuntimeError(f"Invalid range: {start_date} > {end_date}")
+
+        symbol_map = self.cfg.symbol_map_internal_to_oracle()
+        lookback = max(self.cfg.lookback_high, self.cfg.lookback_vol_ma)
+        series_map = get_price_series_between(
+            self.oracle_engine,
+            d0 - timedelta(days=lookback + PRICE_BUFFER_DAYS),
+            d1,
+            list(symbol_map.values()),
+        )
+        calendar = sorted({x[0] for s in series_map.values() for x in s if d0 <= x[0] <= d1})
+        # rolling high / vol MA for the whole range in one pass; each day is then a lookup
+        series_index = index_price_series(
+            series_map,
+            lookback_high=self.cfg.lookback_high,
+            lookback_vol_ma=self.cfg.lookback_vol_ma,
+        )
+
+        prior_states = self.store.get_latest_state_before(start_date)
+        priors: Dict[str, StateRow] = {
+            symbol: default_state_row_from_db(symbol, prior_states.get(symbol))
+            for symbol in self.cfg.entry_pool_symbols()
+        }
+
+        results: List[EODDayResult] = []
+        pending_snaps: List[dict] = []
+        pending_events: List[dict] = []
+
+        for i, td in enumerate(calendar):
+            trade_date = td.isoformat()
+            facts_map, missing = build_facts_from_series(
+                series_index,
+                td,
+                symbol_map,
+                lookback_high=self.cfg.lookback_high,
+                lookback_vol_ma=self.cfg.lookback_vol_ma,
+            )
+            if missing:
+                results.append(
+                    EODDayResult(
+                        trade_date=trade_date,
+                        error=f"RuntimeError: Missing facts for symbols on {td}: {missing}",
+                    )
+                )
+            else:
+                asof = datetime.now().isoformat(timespec="seconds")
+                snaps, transitions, events = self._eod_step(trade_date, priors, facts_map, asof)
+                newly = sorted(
+                    sym for sym, snap in snaps.items()
+                    if snap["state"] == "TRIGGERED" and priors[sym].state != "TRIGGERED"
+                )
+                for sym, snap in snaps.items():
+                    priors[sym] = default_state_row_from_db(sym, snap)
+                pending_snaps.extend(snaps.values())
+                pending_events.extend(events)
+                results.append(
+                    EODDayResult(trade_date=trade_date, snaps=snaps, transitions=transitions, newly_triggered=newly)
+                )
+
+            if (i + 1) % max(int(flush_days), 1) == 0:
+                self.store.write_eod_batch(snaps=pending_snaps, events=pending_events)
+                pending_snaps, pending_events = [], []
+
+        self.store.write_eod_batch(snaps=pending_snaps, events=pending_events)
+        return results
+
+    def _eod_step(
+        self,
+        trade_date: str,
+        priors: Dict[str, StateRow],
+        facts_map: Dict[str, SymbolFacts],
+        asof: str,
+    ) -> Tuple[Dict[str, dict], List[dict], List[dict]]:
+        """One EOD evaluation over the entry pool; pure (no I/O). Returns (snaps, transitions, events)."""
         transitions: List[dict] = []
+        events: List[dict] = []
         snaps: Dict[str, dict] = {}
-        asof = datetime.now().isoformat(timespec="seconds")
 
         for symbol in self.cfg.entry_pool_symbols():
-            prior = default_state_row_from_db(symbol, prior_states.get(symbol))
+            prior = priors[symbol]
             f = facts_map[symbol]
 
             # breakout_level fallback (spec): use prior.snap if present; else use high_60d
@@ -55,34 +188,26 @@ class CNEntryPoolRotationEngine:
             tr = evaluate_eod(self.cfg, trade_date, symbol, prior, f)
 
             if tr is not None:
-                self.store.insert_state_event(
-                    trade_date=trade_date,
-                    symbol=symbol,
-                    event_kind=tr.event_kind,
-                    from_state=tr.from_state,
-                    to_state=tr.to_state,
-                    reason_code=tr.reason_code,
-                    reason_text=tr.reason_text,
-                    payload_json=tr.payload_json,
+                events.append(
+                    {
+                        "trade_date": trade_date,
+                        "symbol": symbol,
+                        "event_kind": tr.event_kind,
+                        "from_state": tr.from_state,
+                        "to_state": tr.to_state,
+                        "reason_code": tr.reason_code,
+                        "reason_text": tr.reason_text,
+                        "payload_json": tr.payload_json,
+                    }
                 )
                 transitions.append(tr.as_dict())
                 snap = tr.snap_after
             else:
                 snap = prior.to_snap_dict(trade_date, asof, breakout_level)
 
-            self.store.upsert_state_snap(
-                trade_date=snap["trade_date"],
-                symbol=snap["symbol"],
-                state=snap["state"],
-                breakout_level=snap.get("breakout_level"),
-                confirm_ok_streak=int(snap.get("confirm_ok_streak") or 0),
-                fail_streak=int(snap.get("fail_streak") or 0),
-                cooldown_days_left=int(snap.get("cooldown_days_left") or 0),
-                asof=snap["asof"],
-            )
             snaps[symbol] = snap
 
-        return format_eod_summary(trade_date, snaps, transitions)
+        return snaps, transitions, events
 
     def run_t1(self, trade_date: str) -> str:
         self.store.ensure_schema()
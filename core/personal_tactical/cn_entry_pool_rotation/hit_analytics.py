@@ -0,0 +1,198 @@
+#-*- coding: utf-8 -*-
+"""
+hit_analytics.py (CN_ENTRY_POOL_ROTATION_V1)
+
+Batch forward-return analytics for breakout hits (tools/analyze_cn_epr_hits*.py).
+
+- ONE Oracle query (expanding IN) loads close series for every hit symbol
+- series are indexed per symbol as sorted NumPy arrays (searchsorted lookups)
+- ONE SQLite query reads breakout_level for every hit
+- forward returns / max drawdown are computed vectorized for all hits of a symbol
+
+Semantics are identical to the former per-hit loop:
+- a hit only "sees" rows in [hit_date, hit_date + window_days] (calendar days)
+- entry = hit row + entry_offset trading rows (0: hit close, 1: T+1 close)
+- ret_Nd = close[entry + N] / entry_close - 1 (None if fewer than N forward rows)
+- max_dd_Nd = min(close[entry+1 .. entry+N]) / entry_close - 1 (partial window allowed, None if empty)
+"""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Engine
+
+from core.utils.rolling_indicators import date_ordinals
+
+TABLE = "SECOPR.CN_STOCK_DAILY_PRICE"
+
+RET_HORIZONS: Tuple[int, ...] = (1, 5, 10, 20)
+DD_HORIZONS: Tuple[int, ...] = (10, 20)
+
+
+@dataclass(frozen=True)
+class CloseSeries:
+    dates: List[date]
+    ordinals: np.ndarray
+    closes: np.ndarray
+
+
+def fetch_close_series_batch(
+    engine: Engine,
+    symbols: Sequence[str],
+    start: date,
+    end: date,
+) -> Dict[str, CloseSeries]:
+    """(TRADE_DATE, CLOSE) for all symbols in [start, end], one round trip. Uses DATE binds."""
+    symbols = sorted(set(symbols))
+    if not symbols:
+        return {}
+
+    sql = text(f"""
+        SELECT SYMBOL, TRADE_DATE, CLOSE
+        FROM {TABLE}
+        WHERE SYMBOL IN :symbols
+          AND TRADE_DATE >= :d0
+          AND TRADE_DATE <= :d1
+        ORDER BY SYMBOL, TRADE_DATE
+    """).bindparams(bindparam("symbols", expanding=True))
+
+    with engine.connect() as conn:
+        rows = conn.execute(sql, {"symbols": symbols, "d0": start, "d1": end}).fetchall()
+
+    raw: Dict[str, List[Tuple[date, float]]] = {}
+    for sym, td, cl in rows:
+        if td is None or cl is None:
+            continue
+        if isinstance(td, datetime):
+            td = td.date()
+        raw.setdefault(str(sym), []).append((td, float(cl)))
+    return {sym: index_close_series(rows) for sym, rows in raw.items()}
+
+
+def index_close_series(rows: Sequence[Tuple[date, float]]) -> CloseSeries:
+    dates = [r[0] for r in rows]
+    return CloseSeries(
+        dates=dates,
+        ordinals=date_ordinals(dates),
+        closes=np.asarray([r[1] for r in rows], dtype=float),
+    )
+
+
+def read_breakout_levels(sqlite_db: Path, hits: Sequence[Tuple[date, str]]) -> Dict[Tuple[str, str], float]:
+    """
+    Optional enrichment: {(hit_date_iso, symbol): breakout_level} from cn_epr_state_snap.
+    One query over the hit date range; missing DB / table → {}.
+    """
+    if not hits or not Path(sqlite_db).exists():
+        return {}
+    wanted = {(d.isoformat(), s) for d, s in hits}
+    d0 = min(d for d, _ in hits).isoformat()
+    d1 = max(d for d, _ in hits).isoformat()
+    try:
+        conn = sqlite3.connect(str(sqlite_db))
+        try:
+            rows = conn.execute(
+                """
+                SELECT trade_date, symbol, breakout_level
+                FROM cn_epr_state_snap
+                WHERE trade_date BETWEEN :d0 AND :d1
+                  AND breakout_level IS NOT NULL
+                """,
+                {"d0": d0, "d1": d1},
+            ).fetchall()
+        finally:
+            conn.close()
+    except Exception:
+        return {}
+    return {(td, sym): float(bl) for td, sym, bl in rows if (td, sym) in wanted}
+
+
+def _empty_metrics(ret_horizons: Sequence[int], dd_horizons: Sequence[int]) -> Dict[str, Optional[object]]:
+    out: Dict[str, Optional[object]] = {"hit_close": None, "entry_date": None, "entry_close": None}
+    out.update({f"ret_{n}d": None for n in ret_horizons})
+    out.update({f"max_dd_{n}d": None for n in dd_horizons})
+    return out
+
+
+def forward_metrics_batch(
+    hits: Sequence[Tuple[date, str]],
+    series: Dict[str, CloseSeries],
+    *,
+    window_days: int,
+    entry_offset: int = 0,
+    ret_horizons: Sequence[int] = RET_HORIZONS,
+    dd_horizons: Sequence[int] = DD_HORIZONS,
+) -> List[Dict[str, Optional[object]]]:
+    """Metrics dict per hit, in input order (keys: hit_close, entry_date, entry_close, ret_Nd, max_dd_Nd)."""
+    out: List[Dict[str, Optional[object]]] = [_empty_metrics(ret_horizons, dd_horizons) for _ in hits]
+
+    by_symbol: Dict[str, List[int]] = {}
+    for k, (_, sym) in enumerate(hits):
+        by_symbol.setdefault(sym, []).append(k)
+
+    for sym, ks in by_symbol.items():
+        s = series.get(sym)
+        if s is None or len(s.dates) == 0:
+            continue
+        n_rows = len(s.dates)
+        hit_ord = np.asarray([hits[k][0].toordinal() for k in ks], dtype=np.int64)
+
+        hit_idx = np.searchsorted(s.ordinals, hit_ord, side="left")
+        found = (hit_idx < n_rows) & (s.ordinals[np.minimum(hit_idx, n_rows - 1)] == hit_ord)
+        # last row visible to each hit (calendar window)
+        last_idx = np.searchsorted(s.ordinals, hit_ord + int(window_days), side="right") - 1
+        entry_idx = hit_idx + int(entry_offset)
+        has_entry = found & (entry_idx <= last_idx)
+
+        safe_hit = np.minimum(hit_idx, n_rows - 1)
+        safe_entry = np.minimum(entry_idx, n_rows - 1)
+        hit_close = s.closes[safe_hit]
+        entry_close = s.closes[safe_entry]
+
+        rets: Dict[int, np.ndarray] = {}
+        for n in ret_horizons:
+            j = entry_idx + int(n)
+            ok = has_entry & (j <= last_idx)
+            r = np.full(len(ks), np.nan)
+            r[ok] = s.closes[j[ok]] / entry_close[ok] - 1.0
+            rets[n] = r
+
+        dds: Dict[int, np.ndarray] = {}
+        for n in dd_horizons:
+            # (hits × n) matrix of forward rows, clipped to each hit's visible window
+            cols = entry_idx[:, None] + 1 + np.arange(int(n))[None, :]
+            visible = has_entry[:, None] & (cols <= last_idx[:, None])
+            vals = np.where(visible, s.closes[np.minimum(cols, n_rows - 1)], np.inf)
+            mins = vals.min(axis=1)
+            d = np.full(len(ks), np.nan)
+            ok = np.isfinite(mins)
+            d[ok] = mins[ok] / entry_close[ok] - 1.0
+            dds[n] = d
+
+        for pos, k in enumerate(ks):
+            if not found[pos]:
+                continue
+            m = out[k]
+            m["hit_close"] = float(hit_close[pos])
+            if not has_entry[pos]:
+                continue
+            m["entry_date"] = s.dates[int(entry_idx[pos])].isoformat()
+            m["entry_close"] = float(entry_close[pos])
+            for n, r in rets.items():
+                m[f"ret_{n}d"] = float(r[pos]) if np.isfinite(r[pos]) else None
+            for n, d in dds.items():
+                m[f"max_dd_{n}d"] = float(d[pos]) if np.isfinite(d[pos]) else None
+    return out
+
+
+def hit_date_range(hits: Sequence[Tuple[date, str]], window_days: int) -> Tuple[date, date]:
+    """[first hit date, last hit date + window_days] — the single fetch range covering every hit."""
+    d0 = min(d for d, _ in hits)
+    d1 = max(d for d, _ in hits) + timedelta(days=int(window_days))
+    return d0, d1
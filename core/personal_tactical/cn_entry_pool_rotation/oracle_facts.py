@@ -14,11 +14,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Dict, Sequence, List, Tuple
+from typing import Dict, Sequence, List, Tuple, Union
+
+import numpy as np
 
 from sqlalchemy import create_engine, text, bindparam
 from sqlalchemy.engine import Engine
 
+from core.utils.rolling_indicators import date_ordinals, rolling_max, rolling_mean
+
 
 @dataclass(frozen=True)
 class SymbolFacts:
@@ -39,6 +43,10 @@ class SymbolFacts:
     rows_loaded: int
 
 
+# calendar-day buffer on top of the lookback window (weekends / holidays)
+PRICE_BUFFER_DAYS = 120
+
+
 def make_oracle_engine(oracle_dsn: str) -> Engine:
     # frozen DSN style: oracle+oracledb://...
     return create_engine(oracle_dsn, pool_pre_ping=True, future=True)
@@ -57,12 +65,24 @@ def get_price_series(
     - oracledb driver doesn't support binding a Python tuple directly to "IN :symbols"
     - Use SQLAlchemy expanding bindparam: SYMBOL IN (:symbols_1, :symbols_2, ...)
     """
+    end_date = trade_date
+    start_date = trade_date - timedelta(days=int(lookback_days) + PRICE_BUFFER_DAYS)  # buffer for non-trading days
+    return get_price_series_between(engine, start_date, end_date, oracle_symbols)
+
+
+def get_price_series_between(
+    engine: Engine,
+    start_date: date,
+    end_date: date,
+    oracle_symbols: Sequence[str],
+) -> Dict[str, List[Tuple[date, float, float]]]:
+    """
+    Same as get_price_series() but for an explicit [start_date, end_date] range
+    (one round trip for a whole multi-date backfill).
+    """
     if not oracle_symbols:
         return {}
 
-    end_date = trade_date
-    start_date = trade_date - timedelta(days=int(lookback_days) + 120)  # buffer for non-trading days
-
     stmt = (
         text(
             """
@@ -103,19 +123,61 @@ def get_price_series(
     return series
 
 
-def _compute_high(series: List[Tuple[date, float, float]], end_exclusive: date, window: int) -> float | None:
-    vals = [c for (d, c, v) in series if d < end_exclusive]
-    if len(vals) < window:
-        return None
-    return max(vals[-window:])
+@dataclass(frozen=True)
+class SymbolSeries:
+    """
+    One symbol's price series as sorted NumPy arrays, with rolling indicators
+    precomputed for every row in one vectorized pass:
+    - high[i]   = max(close[i-lookback_high:i])   (excluding row i)
+    - vol_ma[i] = mean(volume[i-lookback_vol_ma:i]) (excluding row i)
+    Any trade_date is then answered with one searchsorted lookup.
+    """
+    ordinals: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    high: np.ndarray
+    vol_ma: np.ndarray
+    lookback_high: int
+    lookback_vol_ma: int
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: List[Tuple[date, float, float]],
+        lookback_high: int = 60,
+        lookback_vol_ma: int = 20,
+    ) -> "SymbolSeries":
+        close = np.asarray([r[1] for r in rows], dtype=float)
+        volume = np.asarray([r[2] for r in rows], dtype=float)
+        return cls(
+            ordinals=date_ordinals(r[0] for r in rows),
+            close=close,
+            volume=volume,
+            high=rolling_max(close, lookback_high),
+            vol_ma=rolling_mean(volume, lookback_vol_ma),
+            lookback_high=int(lookback_high),
+            lookback_vol_ma=int(lookback_vol_ma),
+        )
+
+    def row_of(self, d: date) -> int:
+        """Index of the (last) row on d, or -1."""
+        o = d.toordinal()
+        i = int(np.searchsorted(self.ordinals, o, side="right")) - 1
+        return i if i >= 0 and self.ordinals[i] == o else -1
 
+    def first_row_on_or_after(self, d: date) -> int:
+        return int(np.searchsorted(self.ordinals, d.toordinal(), side="left"))
 
-def _compute_ma(series: List[Tuple[date, float, float]], end_exclusive: date, window: int) -> float | None:
-    vals = [v for (d, c, v) in series if d < end_exclusive]
-    if len(vals) < window:
-        return None
-    w = vals[-window:]
-    return sum(w) / float(window)
+
+def index_price_series(
+    series_map: Dict[str, List[Tuple[date, float, float]]],
+    lookback_high: int = 60,
+    lookback_vol_ma: int = 20,
+) -> Dict[str, SymbolSeries]:
+    return {
+        sym: SymbolSeries.from_rows(rows, lookback_high=lookback_high, lookback_vol_ma=lookback_vol_ma)
+        for sym, rows in series_map.items()
+    }
 
 
 def get_facts_for_symbols(
@@ -135,22 +197,57 @@ def get_facts_for_symbols(
     # Load enough history to compute indicators; range buffer handled in get_price_series()
     series_map = get_price_series(engine, trade_date, oracle_symbols, lookback_days=max(lookback_high, lookback_vol_ma))
 
+    facts, missing = build_facts_from_series(
+        series_map,
+        trade_date,
+        symbol_map,
+        lookback_high=lookback_high,
+        lookback_vol_ma=lookback_vol_ma,
+    )
+
+    if missing:
+        raise RuntimeError(f"Missing facts for symbols on {trade_date}: {missing}")
+
+    return facts
+
+
+def build_facts_from_series(
+    series_map: Dict[str, Union[SymbolSeries, List[Tuple[date, float, float]]]],
+    trade_date: date,
+    symbol_map: Dict[str, str],  # internal_symbol -> oracle_symbol
+    lookback_high: int = 60,
+    lookback_vol_ma: int = 20,
+) -> Tuple[Dict[str, SymbolFacts], List[str]]:
+    """
+    Pure part of get_facts_for_symbols(): (facts, missing oracle symbols) for trade_date.
+
+    series_map values are raw rows or (for multi-date backfills) SymbolSeries from
+    index_price_series(), built once for the whole range. A longer range than one day
+    needs is fine: history is only counted inside the same
+    [trade_date - lookback - buffer, trade_date] window get_price_series() would have
+    loaded, so facts are identical to a single-day run.
+    """
+    lookback = max(lookback_high, lookback_vol_ma)
+    start_date = trade_date - timedelta(days=lookback + PRICE_BUFFER_DAYS)
+
     facts: Dict[str, SymbolFacts] = {}
     missing: List[str] = []
 
     for internal_sym, oracle_sym in symbol_map.items():
-        s = series_map.get(oracle_sym) or []
+        ss = series_map.get(oracle_sym)
+        if not isinstance(ss, SymbolSeries) or (ss.lookback_high, ss.lookback_vol_ma) != (lookback_high, lookback_vol_ma):
+            ss = SymbolSeries.from_rows(
+                ss if isinstance(ss, list) else [], lookback_high=lookback_high, lookback_vol_ma=lookback_vol_ma
+            )
         # locate today's row
-        today_rows = [x for x in s if x[0] == trade_date]
-        if not today_rows:
+        i = ss.row_of(trade_date)
+        if i < 0:
             missing.append(oracle_sym)
             continue
-        td, close, vol = today_rows[-1]
+        first = ss.first_row_on_or_after(start_date)
 
-        high_60d = _compute_high(s, trade_date, lookback_high)
-        vol_ma20 = _compute_ma(s, trade_date, lookback_vol_ma)
-        if high_60d is None or vol_ma20 is None:
-            # insufficient history is also a hard failure (frozen: no silent)
+        # insufficient history inside the clipped window is also a hard failure (frozen: no silent)
+        if i - lookback_high < first or i - lookback_vol_ma < first:
             missing.append(oracle_sym)
             continue
 
@@ -158,16 +255,13 @@ def get_facts_for_symbols(
             symbol=internal_sym,
             oracle_symbol=oracle_sym,
             trade_date=trade_date,
-            close=float(close),
-            volume=float(vol),
-            high_60d=float(high_60d),
-            vol_ma20=float(vol_ma20),
-            start_date=trade_date - timedelta(days=max(lookback_high, lookback_vol_ma) + 120),
+            close=float(ss.close[i]),
+            volume=float(ss.volume[i]),
+            high_60d=float(ss.high[i]),
+            vol_ma20=float(ss.vol_ma[i]),
+            start_date=start_date,
             end_date=trade_date,
-            rows_loaded=len(s),
+            rows_loaded=i + 1 - first,
         )
 
-    if missing:
-        raise RuntimeError(f"Missing facts for symbols on {trade_date}: {missing}")
-
-    return facts
+    return facts, missing
@@ -18,7 +18,7 @@ from __future__ import annotations
 
 from dataclasses import asdict
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import sqlite3
 
@@ -212,105 +212,137 @@ class SQLiteStore:
             ).fetchall()
             return {r["symbol"]: dict(r) for r in rows}
 
+    @staticmethod
+    def _state_snap_upsert_sql(cols: set[str]) -> tuple[str, dict]:
+        """(upsert sql, legacy NOT NULL defaults) for the current cn_epr_state_snap columns."""
+        legacy_params = {}
+        legacy_sql_fields = {}
+
+        if "run_id" in cols:
+            legacy_params["run_id"] = "CN_ENTRY_POOL_ROTATION_V1"
+        if "suggested_action" in cols:
+            legacy_params["suggested_action"] = "NONE"
+        if "suggested_lots" in cols:
+            legacy_params["suggested_lots"] = 0
+        if "suggested_note" in cols:
+            legacy_params["suggested_note"] = ""
+        if "note" in cols and "suggested_note" not in legacy_params:
+            legacy_params["note"] = ""
+        if "created_at" in cols:
+            legacy_sql_fields["created_at"] = "datetime('now')"
+
+        insert_fields = ["trade_date", "symbol", "state", "breakout_level",
+                         "confirm_ok_streak", "fail_streak", "cooldown_days_left", "asof"]
+        insert_values = [":trade_date", ":symbol", ":state", ":breakout_level",
+                         ":confirm_ok_streak", ":fail_streak", ":cooldown_days_left", ":asof"]
+
+        for k in legacy_params.keys():
+            insert_fields.append(k)
+            insert_values.append(f":{k}")
+        for k, expr in legacy_sql_fields.items():
+            insert_fields.append(k)
+            insert_values.append(expr)
+
+        if "updated_at" in cols:
+            insert_fields.append("updated_at")
+            insert_values.append("datetime('now')")
+
+        update_assignments = [
+            "state=excluded.state",
+            "breakout_level=excluded.breakout_level",
+            "confirm_ok_streak=excluded.confirm_ok_streak",
+            "fail_streak=excluded.fail_streak",
+            "cooldown_days_left=excluded.cooldown_days_left",
+            "asof=excluded.asof",
+        ]
+        for k in legacy_params.keys():
+            update_assignments.append(f"{k}=excluded.{k}")
+        if "updated_at" in cols:
+            update_assignments.append("updated_at=datetime('now')")
+
+        sql = f"""
+            INSERT INTO cn_epr_state_snap ({", ".join(insert_fields)})
+            VALUES ({", ".join(insert_values)})
+            ON CONFLICT(trade_date, symbol) DO UPDATE SET {", ".join(update_assignments)}
+        """
+        return sql, legacy_params
+
+    @staticmethod
+    def _state_snap_params(snap: dict, legacy_params: dict) -> dict:
+        params = {
+            "trade_date": snap["trade_date"],
+            "symbol": snap["symbol"],
+            "state": snap["state"],
+            "breakout_level": snap.get("breakout_level"),
+            "confirm_ok_streak": int(snap.get("confirm_ok_streak") or 0),
+            "fail_streak": int(snap.get("fail_streak") or 0),
+            "cooldown_days_left": int(snap.get("cooldown_days_left") or 0),
+            "asof": snap["asof"],
+        }
+        params.update(legacy_params)
+        return params
+
     def upsert_state_snap(self, trade_date: str, symbol: str, state: str,
                          breakout_level: Optional[float],
                          confirm_ok_streak: int,
                          fail_streak: int,
                          cooldown_days_left: int,
                          asof: str) -> None:
-        with self._connect() as conn:
-            self._ensure_columns_state_snap(conn)
-            cols = self._table_columns(conn, "cn_epr_state_snap")
-
-            legacy_params = {}
-            legacy_sql_fields = {}
-
-            if "run_id" in cols:
-                legacy_params["run_id"] = "CN_ENTRY_POOL_ROTATION_V1"
-            if "suggested_action" in cols:
-                legacy_params["suggested_action"] = "NONE"
-            if "suggested_lots" in cols:
-                legacy_params["suggested_lots"] = 0
-            if "suggested_note" in cols:
-                legacy_params["suggested_note"] = ""
-            if "note" in cols and "suggested_note" not in legacy_params:
-                legacy_params["note"] = ""
-            if "created_at" in cols:
-                legacy_sql_fields["created_at"] = "datetime('now')"
-
-            insert_fields = ["trade_date", "symbol", "state", "breakout_level",
-                             "confirm_ok_streak", "fail_streak", "cooldown_days_left", "asof"]
-            insert_values = [":trade_date", ":symbol", ":state", ":breakout_level",
-                             ":confirm_ok_streak", ":fail_streak", ":cooldown_days_left", ":asof"]
-
-            params = {
+        self.write_eod_batch(
+            snaps=[{
                 "trade_date": trade_date,
                 "symbol": symbol,
                 "state": state,
                 "breakout_level": breakout_level,
-                "confirm_ok_streak": int(confirm_ok_streak),
-                "fail_streak": int(fail_streak),
-                "cooldown_days_left": int(cooldown_days_left),
+                "confirm_ok_streak": confirm_ok_streak,
+                "fail_streak": fail_streak,
+                "cooldown_days_left": cooldown_days_left,
                 "asof": asof,
-            }
-
-            for k, v in legacy_params.items():
-                insert_fields.append(k)
-                insert_values.append(f":{k}")
-                params[k] = v
-            for k, expr in legacy_sql_fields.items():
-                insert_fields.append(k)
-                insert_values.append(expr)
-
-            if "updated_at" in cols:
-                insert_fields.append("updated_at")
-                insert_values.append("datetime('now')")
-
-            update_assignments = [
-                "state=excluded.state",
-                "breakout_level=excluded.breakout_level",
-                "confirm_ok_streak=excluded.confirm_ok_streak",
-                "fail_streak=excluded.fail_streak",
-                "cooldown_days_left=excluded.cooldown_days_left",
-                "asof=excluded.asof",
-            ]
-            for k in legacy_params.keys():
-                update_assignments.append(f"{k}=excluded.{k}")
-            if "updated_at" in cols:
-                update_assignments.append("updated_at=datetime('now')")
-
-            sql = f"""
-                INSERT INTO cn_epr_state_snap ({", ".join(insert_fields)})
-                VALUES ({", ".join(insert_values)})
-                ON CONFLICT(trade_date, symbol) DO UPDATE SET {", ".join(update_assignments)}
-            """
-            conn.execute(sql, params)
+            }],
+            events=[],
+        )
+
+    _STATE_EVENT_INSERT_SQL = """
+        INSERT OR IGNORE INTO cn_epr_state_event
+          (trade_date, symbol, event_kind, from_state, to_state, reason_code, reason_text,
+           payload_json, created_at)
+        VALUES
+          (:trade_date, :symbol, :event_kind, :from_state, :to_state, :reason_code, :reason_text,
+           :payload_json, datetime('now'))
+    """
 
     def insert_state_event(self, trade_date: str, symbol: str, event_kind: str,
                            from_state: str, to_state: str, reason_code: str,
                            reason_text: str, payload_json: str) -> None:
+        self.write_eod_batch(
+            snaps=[],
+            events=[{
+                "trade_date": trade_date,
+                "symbol": symbol,
+                "event_kind": event_kind,
+                "from_state": from_state,
+                "to_state": to_state,
+                "reason_code": reason_code,
+                "reason_text": reason_text,
+                "payload_json": payload_json,
+            }],
+        )
+
+    def write_eod_batch(self, snaps: List[dict], events: List[dict]) -> None:
+        """
+        Write many state snaps + state events in ONE transaction (multi-date backfill).
+        snaps: dicts shaped like state_machine._snap(); events: insert_state_event() kwargs.
+        """
+        if not snaps and not events:
+            return
         with self._connect() as conn:
-            self._ensure_columns_state_event(conn)
-            conn.execute(
-                """
-                INSERT OR IGNORE INTO cn_epr_state_event
-                  (trade_date, symbol, event_kind, from_state, to_state, reason_code, reason_text,
-                   payload_json, created_at)
-                VALUES
-                  (:trade_date, :symbol, :event_kind, :from_state, :to_state, :reason_code, :reason_text,
-                   :payload_json, datetime('now'))
-                """,
-                {
-                    "trade_date": trade_date,
-                    "symbol": symbol,
-                    "event_kind": event_kind,
-                    "from_state": from_state,
-                    "to_state": to_state,
-                    "reason_code": reason_code,
-                    "reason_text": reason_text,
-                    "payload_json": payload_json,
-                },
-            )
+            if events:
+                self._ensure_columns_state_event(conn)
+                conn.executemany(self._STATE_EVENT_INSERT_SQL, events)
+            if snaps:
+                self._ensure_columns_state_snap(conn)
+                sql, legacy_params = self._state_snap_upsert_sql(self._table_columns(conn, "cn_epr_state_snap"))
+                conn.executemany(sql, [self._state_snap_params(x, legacy_params) for x in snaps])
 
     def get_latest_position_before(self, trade_date: str) -> Dict[str, dict]:
         with self._connect() as conn:
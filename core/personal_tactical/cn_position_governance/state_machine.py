@@ -3,6 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
+import numpy as np
+
+from core.utils.rolling_indicators import rolling_mean
+
 from .config import RISK_LOW, RISK_NORMAL, RISK_HIGH
 from .oracle_facts import PriceBar
 
@@ -32,32 +36,31 @@ class RiskStateMachine:
         if not bars or len(bars) < 21:
             return None
 
-        closes = [b.close for b in bars]
-        vols = [b.volume for b in bars]
+        closes = np.asarray([b.close for b in bars], dtype=float)
+        vols = np.asarray([b.volume for b in bars], dtype=float)
 
-        close = closes[-1]
+        close = float(closes[-1])
 
         # MA20: last 20 closes (including latest)
-        ma20 = sum(closes[-20:]) / 20.0
+        ma20 = float(rolling_mean(closes, 20, include_current=True)[-1])
 
         # 10d return: close_t / close_t-10 - 1
-        ret_10d = RiskStateMachine._pct_change(closes[-1], closes[-11])
+        ret_10d = RiskStateMachine._pct_change(close, float(closes[-11]))
 
         # 10d drawdown: min(close/running_max -1) within last 10 bars
         last10 = closes[-10:]
-        running_max = []
-        m = -10**18
-        for c in last10:
-            m = max(m, c)
-            running_max.append(m)
-        dd_10d = min([(c / rm - 1.0) if rm != 0 else 0.0 for c, rm in zip(last10, running_max)])
+        running_max = np.maximum.accumulate(last10)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dd = np.where(running_max != 0, last10 / running_max - 1.0, 0.0)
+        dd_10d = float(dd.min())
 
         # volume shrink ratio: avg(last 5) / avg(prev 5) within last 10 bars
-        v_recent = sum(vols[-5:]) / 5.0
-        v_prev = sum(vols[-10:-5]) / 5.0 if sum(vols[-10:-5]) != 0 else 0.0
+        v_ma5 = rolling_mean(vols, 5, include_current=True)
+        v_recent = float(v_ma5[-1])
+        v_prev = float(v_ma5[-6])
         vol_shrink_ratio = (v_recent / v_prev) if v_prev != 0 else 1.0
 
-        below_ma20_3d = all([c < ma20 for c in closes[-3:]])
+        below_ma20_3d = bool((closes[-3:] < ma20).all())
 
         return RiskMetrics(
             ret_10d=ret_10d,
@@ -7,14 +7,23 @@ UnifiedRisk V12 - P0-2 DRS 连续性（Anti-Chop / Persistence）
 - 只做“连续性确认”（count/required/confirmed）
 - 不参与 Gate，不生成交易信号
 - 可审计：evidence 必须包含 yesterday/today/count/required/confirmed
+
+状态存储（state_store）：
+- JsonStateStore：兜底，单文件保存“最近一次运行”的状态（与运行顺序相关）
+- 按交易日存储（实现 load_prev/save_state）：前一状态 = asof 之前最近交易日的状态，
+  与运行顺序无关；重跑同一天幂等
+    - MemoryStateStore：区间回填，逐日在内存中传递
+    - SqliteContinuityStore（core/persistence/sqlite）：生产，表 ur_continuity_state
+- replay_continuity()：按日期顺序重放已存储的 signal，重建任意一天的状态
 """
 
 from __future__ import annotations
 
+import bisect
 import json
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Literal
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
 
 
 DRSSignal = Literal["GREEN", "YELLOW", "RED"]
@@ -80,6 +89,75 @@ class JsonStateStore:
                     pass
 
 
+class MemoryStateStore:
+    """
+    按 (trade_date, observation) 保存状态的内存实现（区间回填用）。
+    - load_prev: asof 之前最近一个交易日的状态
+    - save_state: 覆盖写同一 (asof, observation)
+    """
+
+    def __init__(self) -> None:
+        self._dates: Dict[str, List[str]] = {}
+        self._rows: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def load_prev(self, observation: str, asof: str) -> Optional[Dict[str, Any]]:
+        dates = self._dates.get(observation) or []
+        i = bisect.bisect_left(dates, asof)
+        if i == 0:
+            return None
+        return dict(self._rows[observation][dates[i - 1]])
+
+    def save_state(self, observation: str, asof: str, state: Dict[str, Any]) -> None:
+        rows = self._rows.setdefault(observation, {})
+        if asof not in rows:
+            bisect.insort(self._dates.setdefault(observation, []), asof)
+        rows[asof] = dict(state)
+
+    def get(self, observation: str, asof: str) -> Optional[Dict[str, Any]]:
+        row = self._rows.get(observation, {}).get(asof)
+        return dict(row) if row is not None else None
+
+    def signals(self, observation: str) -> List[Tuple[str, str]]:
+        rows = self._rows.get(observation, {})
+        return [(d, rows[d].get("signal")) for d in self._dates.get(observation, [])]
+
+
+def continuity_step(
+    prev: Optional[Dict[str, Any]], today_signal: str, config: Optional["DRSContinuityConfig"] = None
+) -> Dict[str, Any]:
+    """单步连续计数（冻结规则）：与上一状态 signal 相同则 +1，否则重置为 1。"""
+    config = config or DRSContinuityConfig()
+    prev = prev if isinstance(prev, dict) else {}
+    prev_count = prev.get("count", 0)
+    if not isinstance(prev_count, int) or prev_count < 0:
+        prev_count = 0
+    count = prev_count + 1 if prev.get("signal") == today_signal else 1
+    required = config.required(today_signal)
+    return {
+        "prev_asof": prev.get("asof"),
+        "prev_signal": prev.get("signal"),
+        "prev_count": prev_count,
+        "count": count,
+        "required": required,
+        "confirmed": bool(count >= required),
+    }
+
+
+def replay_continuity(
+    signals: Iterable[Tuple[str, str]], config: Optional["DRSContinuityConfig"] = None
+) -> Dict[str, Dict[str, Any]]:
+    """按 asof 升序重放 (asof, signal)，返回 {asof: {asof, signal, count, required, confirmed}}。"""
+    out: Dict[str, Dict[str, Any]] = {}
+    prev: Optional[Dict[str, Any]] = None
+    for asof, signal in sorted(signals, key=lambda x: x[0]):
+        if not isinstance(signal, str) or not signal:
+            continue
+        step = continuity_step(prev, signal, config)
+        prev = {"asof": asof, "signal": signal, "count": step["count"]}
+        out[asof] = {**prev, "required": step["required"], "confirmed": step["confirmed"]}
+    return out
+
+
 class DRSContinuity:
     """
     将“单日 DRS”升级为“带连续确认的 DRS”。
@@ -87,7 +165,7 @@ class DRSContinuity:
     输入：
       - drs_obs: dict，必须包含 observation.signal / observation.meaning（你现有结构）
       - asof: str，交易日（YYYY-MM-DD）
-      - state_store: 可选，需实现 load()/save()
+      - state_store: 可选，需实现 load()/save()，或按交易日的 load_prev()/save_state()
 
     输出：
       - 返回更新后的 drs_obs（原结构不变，只新增 observation.persistence 和 evidence.continuity）
@@ -133,28 +211,30 @@ class DRSContinuity:
         if state_store is None:
             state_store = JsonStateStore(fallback_state_path)
 
-        state = state_store.load() if hasattr(state_store, "load") else {}
-        if not isinstance(state, dict):
-            state = {}
-
-        prev = state.get(cls.STATE_KEY, {})
+        # 按交易日存储：前一状态 = asof 之前最近交易日（与运行顺序无关）
+        dated = hasattr(state_store, "load_prev") and hasattr(state_store, "save_state")
+        state: Dict[str, Any] = {}
+        if dated:
+            try:
+                prev = state_store.load_prev(cls.STATE_KEY, asof)
+            except Exception:
+                prev = None
+        else:
+            state = state_store.load() if hasattr(state_store, "load") else {}
+            if not isinstance(state, dict):
+                state = {}
+            prev = state.get(cls.STATE_KEY, {})
         if not isinstance(prev, dict):
             prev = {}
 
-        prev_asof = prev.get("asof")
-        prev_signal = prev.get("signal")
-        prev_count = prev.get("count", 0)
-        if not isinstance(prev_count, int) or prev_count < 0:
-            prev_count = 0
-
         # ---- 连续计数逻辑（冻结） ----
         # 仅比较 signal 是否相同；日期仅用于审计，不做跳日修正（后续可接入交易日历）
-        if prev_signal == today_signal:
-            count = prev_count + 1
-        else:
-            count = 1
-
-        confirmed = bool(count >= required)
+        step = continuity_step(prev, today_signal, config)
+        prev_asof = step["prev_asof"]
+        prev_signal = step["prev_signal"]
+        prev_count = step["prev_count"]
+        count = step["count"]
+        confirmed = step["confirmed"]
 
         # ---- 写回 observation.persistence（不改原字段）----
         obs["persistence"] = {
@@ -177,12 +257,19 @@ class DRSContinuity:
         }
 
         # ---- 更新 state ----
-        state[cls.STATE_KEY] = {
+        row = {
             "asof": asof,
             "signal": today_signal,
             "count": count,
         }
-        if hasattr(state_store, "save"):
-            state_store.save(state)
+        if dated:
+            try:
+                state_store.save_state(cls.STATE_KEY, asof, row)
+            except Exception as e:
+                drs_obs["evidence"]["continuity"]["warning"] = f"state_save_failed:{type(e).__name__}"
+        else:
+            state[cls.STATE_KEY] = row
+            if hasattr(state_store, "save"):
+                state_store.save(state)
 
         return drs_obs
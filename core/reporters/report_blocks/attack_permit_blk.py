@@ -70,6 +70,7 @@ class AttackPermitBlock(ReportBlockRendererBase):
 
     block_alias = "governance.attack_permit"
     title = "进攻许可（AttackPermit · DOS）"
+    depends_on_doc_partial = False
 
     def render(self, context: ReportContext, doc_partial: Dict[str, Any]) -> ReportBlock:
         warnings: List[str] = []
@@ -21,6 +21,7 @@ class ExecutionSummaryBlock(ReportBlockRendererBase):
 
     block_alias = "execution.summary"
     title = "执行层评估（Execution · 2–5D）"
+    depends_on_doc_partial = False
 
     def render(
         self,
@@ -29,6 +29,7 @@ class ExitReadinessBlock(ReportBlockRendererBase):
 
     block_alias = "exit.readiness"
     title = "出场准备度（Exit Readiness · Governance）"
+    depends_on_doc_partial = False
 
     def render(
         self,
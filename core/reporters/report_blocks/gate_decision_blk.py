@@ -26,6 +26,7 @@ class GateDecisionBlock(ReportBlockRendererBase):
 
     block_alias = "governance.gate"
     title = "制度门禁（Gate · Decision）"
+    depends_on_doc_partial = False
 
     @staticmethod
     def _normalize_mode(mode: Optional[str]) -> str:
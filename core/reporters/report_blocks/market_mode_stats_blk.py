@@ -79,6 +79,7 @@ class _HistRow:
 class MarketModeStatsBlock(ReportBlockRendererBase):
     block_alias = "governance.market_mode_stats"
     title = "市场制度统计（Market Mode Stats）"
+    depends_on_doc_partial = False
 
     def render(self, context: ReportContext, doc_partial: Dict[str, Any]) -> ReportBlock:
         warnings: List[str] = []
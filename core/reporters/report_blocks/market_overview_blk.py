@@ -21,6 +21,7 @@ log = get_logger(__name__)
 class MarketOverviewBlock(ReportBlockRendererBase):
     block_alias = "market.overview"
     title = "大盘概览（收盘事实）"
+    depends_on_doc_partial = False
 
     def render(self, context: ReportContext, doc_partial: Dict[str, Any]) -> ReportBlock:
         warnings: List[str] = []
@@ -20,6 +20,7 @@ from core.reporters.utils.state_render import stage_zh, shift_zh, safe_dict
 class MarketRegimeHistoryBlock(ReportBlockRendererBase):
     block_alias = "market.regime_history"
     title = "阶段轨迹（Regime History · Human Layer）"
+    depends_on_doc_partial = False
 
     def render(self, context: ReportContext, doc_partial: Dict[str, Any]) -> ReportBlock:
         warnings: List[str] = []
@@ -66,6 +66,7 @@ def _detect_stage(trend: str, drs_sig: Optional[str], adv_ratio: Optional[float]
 class MarketRegimeNarrativeBlock(ReportBlockRendererBase):
     block_alias = "market.regime_narrative"
     title = "市场阶段判断（Human Layer）"
+    depends_on_doc_partial = False
 
     def render(self, context: ReportContext, doc_partial: Dict[str, Any]) -> ReportBlock:
         warnings: List[str] = []
@@ -62,6 +62,7 @@ def _detect_stage(trend: str, drs_sig: Optional[str], adv_ratio: Optional[float]
 class MarketRegimeRepairPathBlock(ReportBlockRendererBase):
     block_alias = "market.regime_repair_path"
     title = "修复路径提示（Repair Path · Human Layer）"
+    depends_on_doc_partial = False
 
     def render(self, context: ReportContext, doc_partial: Dict[str, Any]) -> ReportBlock:
         warnings: List[str] = []
@@ -19,6 +19,11 @@ class ReportBlockRendererBase(ABC):
     block_alias: str
     title: str
 
+    # False = render() only reads context + the seeded doc_partial (actionhint / summary)
+    # and never writes doc_partial; such blocks may be rendered concurrently.
+    # Default True keeps undeclared / legacy blocks on the sequential path.
+    depends_on_doc_partial: bool = True
+
     @abstractmethod
     def render(
         self,
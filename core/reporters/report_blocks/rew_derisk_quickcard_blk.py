@@ -29,6 +29,7 @@ class RewDeriskQuickcardBlock(ReportBlockRendererBase):
 
     block_alias = "rew.derisk_quickcard"
     title = "REW→De-risk 执行速查卡（只读）"
+    depends_on_doc_partial = False
 
     # Frozen schema version (for report_dump / replay)
     _SCHEMA_VERSION = "P0-36.REW_DERISK_QUICKCARD.V1"
@@ -77,6 +77,7 @@ def _short(name: str, src: Any) -> str:
 class RotationSnapshotBlock(ReportBlockRendererBase):
     block_alias = "rotation.snapshot"
     title = "板块轮换（Sector Rotation · Snapshot）"
+    depends_on_doc_partial = False
 
     def render(self, context: ReportContext, doc_partial: Dict[str, Any]) -> ReportBlock:
         warnings: List[str] = []
@@ -17,6 +17,7 @@ log = get_logger(__name__)
 class RotationSwitchBlock(ReportBlockRendererBase):
     block_alias = "rotation.switch"
     title = "板块轮动开关（Rotation Switch）"
+    depends_on_doc_partial = False
 
     def render(self, context: ReportContext, doc_partial: Dict[str, Any]) -> ReportBlock:
         warnings: List[str] = []
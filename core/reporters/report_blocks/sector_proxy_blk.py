@@ -23,6 +23,8 @@ class SectorProxyBlock(ReportBlockRendererBase):
     3) slots["sector_proxy"]
     """
 
+    depends_on_doc_partial = False
+
     def __init__(self, block_alias: str = "sector.proxy", title: str = "板块代理验证（Sector Proxy · Validation）") -> None:
         self.block_alias = "sector.proxy"
         self.title = "板块代理验证（Sector Proxy · Validation）"
@@ -24,6 +24,7 @@ log = get_logger(__name__)
 class StructureFactsBlock(ReportBlockRendererBase):
     block_alias = "structure.facts"
     title = "结构事实（Structure Facts · 技术轨）"
+    depends_on_doc_partial = False
 
     def render(self, context: ReportContext, doc_partial: Dict[str, Any]) -> ReportBlock:
         warnings: List[str] = []
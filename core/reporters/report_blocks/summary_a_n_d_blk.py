@@ -32,6 +32,7 @@ class SummaryANDBlock(ReportBlockRendererBase):
 
     block_alias = "summary"
     title = "简要总结（Summary · A / N / D）"
+    depends_on_doc_partial = False
 
     def render(
         self,
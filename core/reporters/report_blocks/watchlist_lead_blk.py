@@ -679,6 +679,7 @@ def _render_leading_panels_section(wl: Dict[str, Any]) -> List[str]:
 class WatchlistLeadBlock(ReportBlockRendererBase):
     block_alias = "watchlist.lead"
     title = "WatchlistLead（持仓/关注池 · 观察层）"
+    depends_on_doc_partial = False
 
     def render(self, context: ReportContext, doc_partial: Dict[str, Any]) -> ReportBlock:
         warnings: List[str] = []
@@ -3,9 +3,11 @@ from __future__ import annotations
 import logging
 import json
 import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from core.reporters.report_context import ReportContext
 from core.reporters.report_types import ReportBlock, ReportDocument
@@ -20,6 +22,11 @@ except Exception:  # pragma: no cover
 
 BlockBuilder = Callable[[ReportContext, Dict[str, Any]], ReportBlock]
 
+# Block render modes (report_blocks.yaml: render.mode; ctor render_mode overrides YAML)
+RENDER_MODE_SEQUENTIAL = "sequential"
+RENDER_MODE_CONCURRENT = "concurrent"
+DEFAULT_RENDER_MAX_WORKERS = 4
+
 
 @dataclass(frozen=True)
 class BlockSpec:
@@ -67,6 +74,8 @@ class ReportEngine:
         #summary_mapper: Any,
         block_builders: Optional[Dict[str, BlockBuilder]] = None,  # key = block_alias (optional; YAML can drive builders)
         block_specs_path: Optional[str] = None,
+        render_mode: Optional[str] = None,
+        max_workers: Optional[int] = None,
     ) -> None:
         self.market = market
         self.actionhint_service = actionhint_service
@@ -78,6 +87,11 @@ class ReportEngine:
         self._block_specs_cache: Dict[str, List[BlockSpec]] = {}
         self._blocks_doc_cache: Dict[str, Dict[str, Any]] = {}
         self._builders_cache: Dict[str, Dict[str, BlockBuilder]] = {}
+
+        self._render_mode = render_mode
+        self._render_max_workers = max_workers
+        # per-block render time (ms) of the last build_report() call, keyed by block_alias
+        self.last_block_timings_ms: Dict[str, float] = {}
         
         # Safety: only allow importing builders from these module prefixes.
         self._allowed_builder_module_prefixes: List[str] = [
@@ -343,6 +357,153 @@ class ReportEngine:
         self._builders_cache[cache_key] = resolved
         return resolved
 
+    def _resolve_render_cfg(self, *, kind: str, slots: Dict[str, Any]) -> Tuple[str, int, List[str]]:
+        """Resolve (mode, max_workers, forced_sequential_aliases) from ctor / report_blocks.yaml `render`."""
+        cfg: Dict[str, Any] = {}
+        try:
+            doc = self._load_blocks_doc(kind=kind, slots=slots)
+            r = doc.get("render")
+            if isinstance(r, dict):
+                cfg = r
+        except Exception:
+            cfg = {}
+
+        mode = self._render_mode or cfg.get("mode") or RENDER_MODE_SEQUENTIAL
+        mode = str(mode).strip().lower()
+        if mode not in (RENDER_MODE_SEQUENTIAL, RENDER_MODE_CONCURRENT):
+            LOG.warning("unknown render mode: %s (fallback=%s)", mode, RENDER_MODE_SEQUENTIAL)
+            mode = RENDER_MODE_SEQUENTIAL
+
+        workers = self._render_max_workers or cfg.get("max_workers") or DEFAULT_RENDER_MAX_WORKERS
+        try:
+            workers = max(int(workers), 1)
+        except Exception:
+            workers = DEFAULT_RENDER_MAX_WORKERS
+
+        seq = cfg.get("sequential_blocks")
+        forced = [str(x).strip() for x in seq if isinstance(x, str) and x.strip()] if isinstance(seq, list) else []
+        return mode, workers, forced
+
+    @staticmethod
+    def _depends_on_doc_partial(builder: Callable[..., Any]) -> bool:
+        """Block declaration (class attr `depends_on_doc_partial`); undeclared builders are treated as dependent."""
+        for obj in (getattr(builder, "__self__", None), builder):
+            if obj is None:
+                continue
+            v = getattr(obj, "depends_on_doc_partial", None)
+            if isinstance(v, bool):
+                return v
+        return True
+
+    def _render_one(
+        self,
+        *,
+        spec: BlockSpec,
+        builder: Optional[BlockBuilder],
+        context: ReportContext,
+        doc_partial: Dict[str, Any],
+        timings: Dict[str, float],
+    ) -> ReportBlock:
+        t0 = time.perf_counter()
+        if builder is None:
+            LOG.warning("missing block builder: %s", spec.block_alias)
+            blk = ReportBlock(
+                block_alias=spec.block_alias,
+                title=spec.title,
+                payload={"note": "BLOCK_NOT_IMPLEMENTED"},
+                warnings=[f"missing_builder:{spec.block_alias}"],
+            )
+        else:
+            blk = self._safe_call_builder(spec=spec, builder=builder, context=context, doc_partial=doc_partial)
+        timings[spec.block_alias] = round((time.perf_counter() - t0) * 1000.0, 2)
+        return blk
+
+    def _render_blocks(
+        self,
+        *,
+        context: ReportContext,
+        doc_partial: Dict[str, Any],
+    ) -> Tuple[List[ReportBlock], str]:
+        """Render YAML-listed blocks; returns (blocks in YAML order, effective mode).
+
+        concurrent mode:
+        - blocks declaring depends_on_doc_partial=False render in a thread pool,
+          each on its own shallow copy of the seeded doc_partial
+        - the rest (dependent / undeclared / render.sequential_blocks) render on the
+          calling thread in YAML order, sharing doc_partial exactly as sequential mode
+        - placeholders are produced by _safe_call_builder either way
+        """
+        builders = self._resolve_builders(kind=context.kind, slots=context.slots)
+        specs = self._resolve_block_specs(kind=context.kind, slots=context.slots)
+        mode, workers, forced = self._resolve_render_cfg(kind=context.kind, slots=context.slots)
+
+        timings: Dict[str, float] = {}
+        self.last_block_timings_ms = timings
+
+        pool_idx: List[int] = []
+        if mode == RENDER_MODE_CONCURRENT:
+            for i, spec in enumerate(specs):
+                b = builders.get(spec.block_alias)
+                if b is None or spec.block_alias in forced:
+                    continue
+                if not self._depends_on_doc_partial(b):
+                    pool_idx.append(i)
+
+        if len(pool_idx) < 2 or workers < 2:
+            blocks = [
+                self._render_one(
+                    spec=spec,
+                    builder=builders.get(spec.block_alias),
+                    context=context,
+                    doc_partial=doc_partial,
+                    timings=timings,
+                )
+                for spec in specs
+            ]
+            return blocks, RENDER_MODE_SEQUENTIAL
+
+        seed = dict(doc_partial)
+        results: List[Optional[ReportBlock]] = [None] * len(specs)
+        with ThreadPoolExecutor(max_workers=min(workers, len(pool_idx)), thread_name_prefix="report-block") as ex:
+            futures = {
+                i: ex.submit(
+                    self._render_one,
+                    spec=specs[i],
+                    builder=builders.get(specs[i].block_alias),
+                    context=context,
+                    doc_partial=dict(seed),
+                    timings=timings,
+                )
+                for i in pool_idx
+            }
+
+            for i, spec in enumerate(specs):
+                if i in futures:
+                    continue
+                results[i] = self._render_one(
+                    spec=spec,
+                    builder=builders.get(spec.block_alias),
+                    context=context,
+                    doc_partial=doc_partial,
+                    timings=timings,
+                )
+
+            for i, fut in futures.items():
+                spec = specs[i]
+                try:
+                    results[i] = fut.result()
+                except Exception as e:
+                    # _safe_call_builder already converts builder errors; this guards executor failures
+                    LOG.exception("block render task failed: %s", spec.block_alias)
+                    results[i] = self._placeholder_block(
+                        spec=spec,
+                        note="BLOCK_BUILDER_EXCEPTION",
+                        warnings=[f"error:block_builder_exception:{spec.block_alias}"],
+                        extra={"error": f"{type(e).__name__}: {e}"},
+                    )
+
+        return [b for b in results if b is not None], RENDER_MODE_CONCURRENT
+
     def build_report_no(self, *, context: ReportContext) -> ReportDocument:
         meta = {
             "market": self.market,
@@ -623,26 +784,16 @@ class ReportEngine:
             "summary": summary,
         }
 
-        blocks: List[ReportBlock] = []
-
-        builders = self._resolve_builders(kind=context.kind, slots=context.slots)
-
-
-        for spec in self._resolve_block_specs(kind=context.kind, slots=context.slots):
-            builder = builders.get(spec.block_alias)
-            if builder is None:
-                LOG.warning("missing block builder: %s", spec.block_alias)
-                blocks.append(
-                    ReportBlock(
-                        block_alias=spec.block_alias,
-                        title=spec.title,
-                        payload={"note": "BLOCK_NOT_IMPLEMENTED"},
-                        warnings=[f"missing_builder:{spec.block_alias}"],
-                    )
-                )
-            else:
-                blk = self._safe_call_builder(spec=spec, builder=builder, context=context, doc_partial=doc_partial)
-                blocks.append(blk)
+        t_blocks = time.perf_counter()
+        blocks, render_mode = self._render_blocks(context=context, doc_partial=doc_partial)
+        meta["render_mode"] = render_mode
+        meta["block_timings_ms"] = dict(self.last_block_timings_ms)
+        LOG.info(
+            "[ReportEngine] blocks rendered mode=%s n=%d total_ms=%.1f",
+            render_mode,
+            len(blocks),
+            (time.perf_counter() - t_blocks) * 1000.0,
+        )
 
 
                 # -------- Attack Window (auto block) --------
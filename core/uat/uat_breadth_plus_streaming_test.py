@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+UAT: fetch_breadth_plus_metrics 流式分块执行（按 symbol 增量归约，结果与整表 pandas rolling 一致）
+
+Run:
+  python -m pytest -q core/uat/uat_breadth_plus_streaming_test.py
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from core.adapters.providers.db_provider_duckdb_market import (  # noqa: E402
+    DBDuckDBMarketProvider,
+    write_month_partition,
+)
+
+ASOF = "2026-03-31"
+TABLE = "CN_STOCK_DAILY_PRICE"
+
+
+def _panel() -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    dates = pd.bdate_range("2025-10-01", ASOF)
+    rows = []
+    for k in range(40):
+        # short histories (<20 / <50 rows) and symbols missing the asof day are included
+        d = dates[-(5 + 4 * k):] if k % 7 else dates[:-3]
+        close = np.round(10 + np.cumsum(rng.normal(0, 0.3, len(d))), 2)
+        rows += [dict(SYMBOL=f"{600000 + k:06d}", TRADE_DATE=x.date(), CLOSE=c) for x, c in zip(d, close)]
+    return pd.DataFrame(rows)
+
+
+def _expected(df: pd.DataFrame, look_back_days: int) -> dict:
+    """The previous in-memory implementation (whole window in one frame)."""
+    df = df[pd.to_datetime(df["TRADE_DATE"]) >= pd.Timestamp(ASOF) - pd.Timedelta(days=look_back_days)]
+    df = df.rename(columns=str.lower).sort_values(["symbol", "trade_date"]).reset_index(drop=True)
+    g = df.groupby("symbol", sort=False)["close"]
+    df["ma20"] = g.transform(lambda s: s.rolling(20, min_periods=20).mean())
+    df["ma50"] = g.transform(lambda s: s.rolling(50, min_periods=50).mean())
+    df["max_prev"] = g.transform(lambda s: s.shift(1).rolling(20, min_periods=20).max())
+    df["min_prev"] = g.transform(lambda s: s.shift(1).rolling(20, min_periods=20).min())
+    d0 = df[df["trade_date"] == pd.Timestamp(ASOF).date()]
+    return {
+        "total": len(d0),
+        "valid_ma50": int(d0["ma50"].notna().sum()),
+        "valid_nhnl": int(d0["max_prev"].notna().sum()),
+        "above_ma20": int((d0["close"] > d0["ma20"]).sum()),
+        "above_ma50": int((d0["close"] > d0["ma50"]).sum()),
+        "new_high": int((d0["close"] >= d0["max_prev"]).sum()),
+        "new_low": int((d0["close"] <= d0["min_prev"]).sum()),
+    }
+
+
+def test_breadth_plus_streaming_matches_full_window(tmp_path):
+    df = _panel()
+    for (y, m), part in df.groupby([pd.to_datetime(df["TRADE_DATE"]).dt.year, pd.to_datetime(df["TRADE_DATE"]).dt.month]):
+        write_month_partition(str(tmp_path), TABLE, "TRADE_DATE", part, y, m)
+    p = DBDuckDBMarketProvider(root=str(tmp_path))
+
+    exp = _expected(df, 120)
+    assert exp["valid_ma50"] and exp["total"] > exp["valid_ma50"]
+
+    results = [p.fetch_breadth_plus_metrics(ASOF, 120, chunk_rows=n) for n in (37, 2048, 100_000)]
+    assert results[0] == results[1] == results[2]
+    out = results[0]
+    assert out["data_status"] == "OK"
+    cov = out["coverage"]
+    assert (cov["total"], cov["valid_ma50"], cov["valid_nhnl"]) == (exp["total"], exp["valid_ma50"], exp["valid_nhnl"])
+    assert (out["new_high"], out["new_low"]) == (exp["new_high"], exp["new_low"])
+    assert out["pct_above_ma50_pct"] == round(exp["above_ma50"] / exp["valid_ma50"] * 100.0, 2)
+
+    assert p.fetch_breadth_plus_metrics("2025-06-30", 30)["reason"] == "empty_price_window"
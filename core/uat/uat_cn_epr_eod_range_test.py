@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""UAT: EPR run_eod_range (one price load, in-memory state) matches the per-day run_eod loop.
+
+Run:
+    python -m pytest -q core/uat/uat_cn_epr_eod_range_test.py
+"""
+from __future__ import annotations
+
+import sqlite3
+from datetime import date, timedelta
+
+from core.personal_tactical.cn_entry_pool_rotation import engine as epr_engine
+from core.personal_tactical.cn_entry_pool_rotation import oracle_facts
+from core.personal_tactical.cn_entry_pool_rotation.config import EntryPoolItem, EPRConfig, _default_schema_path
+from core.personal_tactical.cn_entry_pool_rotation.sqlite_store import SQLiteStore
+
+
+def _series():
+    # business days only; symbol A breaks out once (late Jan 2025), B never does
+    out = {"A.SZ": [], "B.SZ": []}
+    d = date(2024, 6, 3)
+    i = 0
+    while d <= date(2025, 3, 31):
+        if d.weekday() < 5:
+            spike = i == 170
+            out["A.SZ"].append((d, 10.0 + (5.0 if spike else 0.01 * (i % 7)), 1000.0 * (3 if spike else 1)))
+            out["B.SZ"].append((d, 20.0 - 0.01 * (i % 5), 500.0))
+            i += 1
+        d += timedelta(days=1)
+    return out
+
+
+def _engine(tmp_path, name, monkeypatch, calls):
+    full = _series()
+
+    def fake_between(engine, start_date, end_date, oracle_symbols):
+        calls.append((start_date, end_date))
+        return {s: [x for x in full[s] if start_date <= x[0] <= end_date] for s in oracle_symbols}
+
+    monkeypatch.setattr(oracle_facts, "get_price_series_between", fake_between)
+    monkeypatch.setattr(epr_engine, "get_price_series_between", fake_between)
+
+    cfg = EPRConfig(
+        oracle_dsn="unused",
+        sqlite_path=tmp_path / name,
+        sqlite_schema_path=_default_schema_path(),
+        entry_pool={
+            "A": EntryPoolItem("A", "AI", "a", "A.SZ", "BREAKOUT", 2),
+            "B": EntryPoolItem("B", "SEMI", "b", "B.SZ", "BREAKOUT", 2),
+        },
+    )
+    eng = epr_engine.CNEntryPoolRotationEngine.__new__(epr_engine.CNEntryPoolRotationEngine)
+    eng.cfg = cfg
+    eng.oracle_engine = None
+    eng.store = SQLiteStore(cfg.sqlite_path, cfg.sqlite_schema_path)
+    return eng
+
+
+def _dump(path):
+    conn = sqlite3.connect(str(path))
+    snaps = conn.execute(
+        "SELECT trade_date, symbol, state, breakout_level, confirm_ok_streak, fail_streak, cooldown_days_left "
+        "FROM cn_epr_state_snap ORDER BY trade_date, symbol"
+    ).fetchall()
+    events = conn.execute(
+        "SELECT trade_date, symbol, from_state, to_state, reason_code, payload_json "
+        "FROM cn_epr_state_event ORDER BY trade_date, symbol"
+    ).fetchall()
+    conn.close()
+    return snaps, events
+
+
+def test_range_matches_per_day(tmp_path, monkeypatch):
+    start, end = date(2025, 1, 1), date(2025, 3, 31)
+
+    daily_calls = []
+    daily = _engine(tmp_path, "daily.db", monkeypatch, daily_calls)
+    d = start
+    while d <= end:
+        try:
+            daily.run_eod(d.isoformat())
+        except RuntimeError:
+            pass  # weekend: missing facts
+        d += timedelta(days=1)
+
+    range_calls = []
+    ranged = _engine(tmp_path, "range.db", monkeypatch, range_calls)
+    results = ranged.run_eod_range(start.isoformat(), end.isoformat(), flush_days=7)
+
+    assert len(range_calls) == 1
+    assert len(daily_calls) == (end - start).days + 1
+    assert all(r.error is None for r in results)
+    assert len(results) == len({x[0] for x in _series()["A.SZ"] if start <= x[0] <= end})
+
+    snaps, events = _dump(tmp_path / "range.db")
+    assert (snaps, events) == _dump(tmp_path / "daily.db")
+    assert [e[3] for e in events] == ["TRIGGERED"]
+    assert [(r.trade_date, r.newly_triggered) for r in results if r.newly_triggered] == [(events[0][0], ["A"])]
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""UAT: batched EPR hit analytics match the former per-hit forward-metric loop.
+
+Run:
+    python -m pytest -q core/uat/uat_cn_epr_hit_analytics_test.py
+"""
+from __future__ import annotations
+
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from core.personal_tactical.cn_entry_pool_rotation.hit_analytics import (
+    forward_metrics_batch,
+    index_close_series,
+    read_breakout_levels,
+)
+
+_WINDOW = 30
+
+
+def _rows(seed):
+    rnd = random.Random(seed)
+    out, d, c = [], date(2025, 1, 2), 10.0
+    while d < date(2025, 6, 30):
+        if d.weekday() < 5 and rnd.random() > 0.1:
+            c *= 1.0 + rnd.uniform(-0.05, 0.05)
+            out.append((d, c))
+        d += timedelta(days=1)
+    return out
+
+
+def _reference(rows, hit_d, entry_offset):
+    # per-hit loop: fetch [hit, hit+window], linear index, slice forward
+    series = [r for r in rows if hit_d <= r[0] <= hit_d + timedelta(days=_WINDOW)]
+    idx = next((i for i, (d, _) in enumerate(series) if d == hit_d), None)
+    out = {"hit_close": None, "entry_date": None, "entry_close": None}
+    out.update({f"ret_{n}d": None for n in (1, 5, 10, 20)})
+    out.update({f"max_dd_{n}d": None for n in (10, 20)})
+    if idx is None:
+        return out
+    out["hit_close"] = series[idx][1]
+    e = idx + entry_offset
+    if e >= len(series):
+        return out
+    entry = series[e][1]
+    forward = [c for _, c in series[e + 1:]]
+    out["entry_date"] = series[e][0].isoformat()
+    out["entry_close"] = entry
+    for n in (1, 5, 10, 20):
+        out[f"ret_{n}d"] = forward[n - 1] / entry - 1.0 if len(forward) >= n else None
+    for n in (10, 20):
+        out[f"max_dd_{n}d"] = min(forward[:n]) / entry - 1.0 if forward else None
+    return out
+
+
+@pytest.mark.parametrize("entry_offset", [0, 1])
+def test_batch_matches_per_hit(entry_offset):
+    data = {"A": _rows(1), "B": _rows(2)}
+    series = {s: index_close_series(r) for s, r in data.items()}
+    hits = [(d, s) for s in ("A", "B", "C") for d, _ in _rows(3)[::4]]  # C has no prices
+    hits.append((date(2025, 1, 4), "A"))  # Saturday
+
+    got = forward_metrics_batch(hits, series, window_days=_WINDOW, entry_offset=entry_offset)
+    for (d, s), m in zip(hits, got):
+        ref = _reference(data.get(s, []), d, entry_offset)
+        assert m.keys() == ref.keys()
+        for k, v in ref.items():
+            assert m[k] == (pytest.approx(v) if isinstance(v, float) else v), (d, s, k)
+
+
+def test_breakout_levels_single_query(tmp_path):
+    db = tmp_path / "epr.db"
+    conn = sqlite3.connect(str(db))
+    conn.execute("CREATE TABLE cn_epr_state_snap (trade_date TEXT, symbol TEXT, breakout_level REAL)")
+    conn.executemany(
+        "INSERT INTO cn_epr_state_snap VALUES (?, ?, ?)",
+        [("2025-01-02", "A", 1.5), ("2025-01-02", "B", 2.5), ("2025-01-03", "A", None)],
+    )
+    conn.commit()
+    conn.close()
+
+    hits = [(date(2025, 1, 2), "A"), (date(2025, 1, 3), "A")]
+    assert read_breakout_levels(db, hits) == {("2025-01-02", "A"): 1.5}
+    assert read_breakout_levels(tmp_path / "missing.db", hits) == {}
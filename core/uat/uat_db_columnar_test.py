@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+UAT: 列式结果传输（cursor → 声明 dtype 的 NumPy 列 → DataFrame，无逐行 Row / dict）
+
+Run:
+  python -m pytest -q core/uat/uat_db_columnar_test.py
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.adapters.providers.db_columnar import (
+    STOCK_CLOSE_COLUMNS,
+    STOCK_CLOSE_DTYPES,
+    fetch_frame,
+    rows_to_frame,
+    stock_closes_frame,
+)
+
+ROWS = [
+    ("600000", "SH", "2026-01-29", 10.0, 1.0, 10.1, 1e8),
+    ("000001", "SZ", "2026-01-30", 9.0, None, 9.0, None),
+    ("600000", "SH", "2026-01-30", 10.1, -0.99, 10.0, 2e8),
+]
+
+
+def test_fetch_frame_declared_dtypes_across_chunks():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (symbol, exchange, trade_date, pre_close, chg_pct, close, amount)")
+    conn.executemany("INSERT INTO t VALUES (?, ?, ?, ?, ?, ?, ?)", ROWS)
+    cur = conn.execute("SELECT * FROM t")
+
+    df = fetch_frame(cur, STOCK_CLOSE_DTYPES, chunk_rows=2)
+    assert list(df.columns) == STOCK_CLOSE_COLUMNS
+    assert df["trade_date"].dtype == np.dtype("datetime64[ns]")
+    assert df["amount"].dtype == np.float64 and np.isnan(df["amount"].iloc[1])
+    assert df["chg_pct"].tolist()[::2] == [1.0, -0.99]
+    pd.testing.assert_frame_equal(df, rows_to_frame(ROWS, STOCK_CLOSE_COLUMNS, STOCK_CLOSE_DTYPES))
+
+    empty = fetch_frame(conn.execute("SELECT * FROM t WHERE 0"), STOCK_CLOSE_DTYPES)
+    assert empty.empty and empty["close"].dtype == np.float64
+
+
+def test_duckdb_frame_matches_row_path(tmp_path):
+    pytest.importorskip("duckdb")
+    from core.adapters.providers.db_provider_duckdb_market import DBDuckDBMarketProvider, write_month_partition
+
+    src = pd.DataFrame(ROWS, columns=[c.upper() for c in STOCK_CLOSE_COLUMNS])
+    src["TRADE_DATE"] = pd.to_datetime(src["TRADE_DATE"]).dt.date
+    write_month_partition(str(tmp_path), "CN_STOCK_DAILY_PRICE", "TRADE_DATE", src, 2026, 1)
+    p = DBDuckDBMarketProvider(root=str(tmp_path))
+
+    frame = p.query_stock_closes_frame("2026-01-01", "2026-01-30")
+    legacy = rows_to_frame(p.query_stock_closes("2026-01-01", "2026-01-30"), STOCK_CLOSE_COLUMNS, STOCK_CLOSE_DTYPES)
+    key = ["symbol", "trade_date"]
+    pd.testing.assert_frame_equal(
+        frame.sort_values(key).reset_index(drop=True),
+        legacy.sort_values(key).reset_index(drop=True),
+        check_dtype=False,
+    )
+    assert frame["trade_date"].dtype == np.dtype("datetime64[ns]")
+
+    class _RowsOnly:
+        def query_stock_closes(self, window_start, trade_date):
+            return p.query_stock_closes(window_start, trade_date)
+
+    assert len(stock_closes_frame(_RowsOnly(), "2026-01-30", "2026-01-30")) == 2
+
+    snap = p.load_latest_full_market_eod_frame("2026-02-02")
+    assert snap["_meta"]["resolved_trade_date"] == date(2026, 1, 30)
+    assert sorted(snap["frame"]["symbol"]) == ["000001", "600000"]
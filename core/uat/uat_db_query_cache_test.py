@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+UAT: execute_mysql 之下的持久化查询结果缓存（仅已收盘历史日期；按表失效；LRU 容量淘汰）
+
+Run:
+  python -m pytest -q core/uat/uat_db_query_cache_test.py
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event
+
+pytest.importorskip("pyarrow")
+
+from core.adapters.providers.db_columnar import rows_to_frame  # noqa: E402
+from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider  # noqa: E402
+from core.adapters.providers.db_query_cache import QueryResultCache  # noqa: E402
+
+CUTOFF = date(2026, 1, 30)  # latest closed trade date
+SQL = "SELECT SYMBOL AS symbol, TRADE_DATE AS trade_date, CLOSE AS close FROM PX WHERE TRADE_DATE <= :d"
+
+
+def _provider(tmp_path, max_bytes=1 << 30):
+    eng = create_engine("sqlite://")
+    with eng.begin() as c:
+        c.exec_driver_sql("CREATE TABLE PX (SYMBOL TEXT, TRADE_DATE TEXT, CLOSE REAL)")
+        c.exec_driver_sql(
+            "INSERT INTO PX VALUES ('600000','2026-01-28',10.5),('000001','2026-01-29',NULL),('600000','2026-01-30',10.7)"
+        )
+    calls = []
+    event.listen(eng, "before_cursor_execute", lambda *a, **k: calls.append(1))
+
+    p = DBMySQLMarketProvider.__new__(DBMySQLMarketProvider)  # no MySQL config / network
+    p.mysql_engine = eng
+    p.query_cache = QueryResultCache(
+        root=str(tmp_path / "qc"), max_bytes=max_bytes, tables=["PX", "OTHER"], cutoff=lambda: CUTOFF
+    )
+    return p, calls
+
+
+def test_query_cache_read_through_and_invalidation(tmp_path):
+    p, calls = _provider(tmp_path)
+
+    first = p.execute_mysql(SQL, {"d": date(2026, 1, 29)})
+    again = p.execute_mysql(SQL, {"d": "2026-01-29"})  # date and ISO string bind to the same key
+    third = p.execute_mysql("  " + SQL.replace(" FROM", "\n  FROM"), {"d": date(2026, 1, 29)})
+    assert len(calls) == 1  # whitespace-normalised SQL + same params -> cache hit
+    assert [tuple(r) for r in third] == [tuple(r) for r in first] == [tuple(r) for r in again]
+    assert third[0].symbol == "600000" and third[1].close is None
+
+    # the latest closed date itself is never cached
+    p.execute_mysql(SQL, {"d": CUTOFF})
+    p.execute_mysql(SQL, {"d": CUTOFF})
+    assert len(calls) == 3
+
+    # columnar path keeps declared dtypes on a hit
+    dtypes = {"symbol": "object", "trade_date": "datetime64[ns]", "close": "float64"}
+    f1 = p.execute_mysql_frame(SQL, {"d": date(2026, 1, 29)}, dtypes)
+    f2 = p.execute_mysql_frame(SQL, {"d": date(2026, 1, 29)}, dtypes)
+    assert len(calls) == 4
+    assert str(f2["trade_date"].dtype) == "datetime64[ns]"
+    assert f2["close"].tolist()[0] == f1["close"].tolist()[0] == 10.5
+
+    # upstream reload of PX drops every entry reading it
+    assert p.query_cache.invalidate("OTHER") == 0
+    assert p.query_cache.invalidate("px") == 2  # one rows entry + one frame entry
+    p.execute_mysql(SQL, {"d": date(2026, 1, 29)})
+    assert len(calls) == 5
+
+
+def test_query_cache_lru_eviction(tmp_path):
+    p, calls = _provider(tmp_path, max_bytes=1)  # every write evicts down to the budget
+    p.execute_mysql(SQL, {"d": date(2026, 1, 28)})
+    p.execute_mysql(SQL, {"d": date(2026, 1, 29)})
+    assert p.query_cache.stats()["entries"] == 0
+
+    p.query_cache.max_bytes = 1 << 30
+    p.execute_mysql(SQL, {"d": date(2026, 1, 28)})
+    size = p.query_cache.stats()["bytes"]
+    p.query_cache.max_bytes = size * 2
+    p.execute_mysql(SQL, {"d": date(2026, 1, 29)})
+    p.execute_mysql(SQL, {"d": date(2026, 1, 28)})  # touch -> most recently used
+    p.execute_mysql(SQL, {"d": date(2026, 1, 27)})  # evicts the 01-29 entry
+    n = len(calls)
+    p.execute_mysql(SQL, {"d": date(2026, 1, 28)})
+    assert len(calls) == n
+    p.execute_mysql(SQL, {"d": date(2026, 1, 29)})
+    assert len(calls) == n + 1
+
+
+def test_query_cache_frame_hit_equals_fetched_frame(tmp_path):
+    cache = QueryResultCache(root=str(tmp_path / "qc"), cutoff=lambda: CUTOFF)
+    names = ["symbol", "trade_date", "close", "vol", "list_date", "ts", "px", "note"]
+    dtypes = {"symbol": "object", "trade_date": "datetime64[ns]", "close": "float64"}
+    rows = [
+        ("600000", datetime(2026, 1, 28), 10.5, 100, date(1999, 11, 10), datetime(2026, 1, 28, 15, 0), Decimal("1.25"), "a"),
+        ("000001", datetime(2026, 1, 29), None, None, None, None, None, None),
+        ("300750", datetime(2026, 1, 29), 3.0, 7, date(2018, 6, 11), datetime(2026, 1, 29, 9, 30), Decimal("2.50"), float("nan")),
+    ]
+    fetched = rows_to_frame(rows, names, dtypes)
+    params = {"d": date(2026, 1, 29)}
+
+    cache.put_frame(SQL, params, dtypes, fetched)
+    hit = cache.get_frame(SQL, params, dtypes)
+
+    pd.testing.assert_frame_equal(hit, fetched)
+    assert list(hit.dtypes) == list(fetched.dtypes)
+    for col in ("vol", "list_date", "ts", "px"):  # undeclared object columns: same Python values, None stays None
+        assert [(type(v), v) for v in hit[col]] == [(type(v), v) for v in fetched[col]]
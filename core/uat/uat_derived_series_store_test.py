@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+UAT: C/D/E/F 派生日序列增量存储（只追加缺失日期；rebuild 按当前定义重算）
+
+Run:
+  python -m pytest -q core/uat/uat_derived_series_store_test.py
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pandas as pd
+
+from core.adapters.datasources.cn import derived_series as ds
+
+DATES = pd.bdate_range("2026-01-05", "2026-02-27")
+
+
+class _FakeDB:
+    """fetch_etf_hist_series over a fixed daily table; records every look_back_days asked for."""
+
+    def __init__(self):
+        self.calls = []
+        self.scale = 1.0
+        self.daily = pd.DataFrame(
+            {
+                "total_change_amount": [float(i) for i in range(len(DATES))],
+                "total_volume": 100.0,
+                "total_amount": 1000.0,
+            },
+            index=DATES.rename("trade_date"),
+        )
+
+    def fetch_etf_hist_series(self, start_date, look_back_days=60):
+        self.calls.append(int(look_back_days))
+        end = pd.Timestamp(start_date)
+        lo = end - timedelta(days=int(look_back_days))
+        return self.daily.loc[(self.daily.index >= lo) & (self.daily.index <= end)] * self.scale
+
+
+def test_derived_series_appends_only_new_dates_and_rebuilds(tmp_path):
+    db, path = _FakeDB(), str(tmp_path / "derived.db")
+
+    first = ds.load_frame("etf_flow", db, "2026-02-20", 30, db_path=path)
+    assert db.calls == [30]
+    assert first.index.max() == pd.Timestamp("2026-02-20")
+
+    # next day: one tiny aggregation for the new date, the lookback is read from the store
+    nxt = ds.load_frame("etf_flow", db, "2026-02-23", 30, db_path=path)
+    assert db.calls == [30, 2]
+    expected = db.daily.loc[pd.Timestamp("2026-01-24"):pd.Timestamp("2026-02-23")]
+    assert list(nxt.index) == list(expected.index)
+    assert nxt["total_change_amount"].tolist() == expected["total_change_amount"].tolist()
+
+    # same day again: pure lookup
+    ds.load_frame("etf_flow", db, "2026-02-23", 30, db_path=path)
+    assert db.calls == [30, 2]
+
+    # definition change -> rebuild from a date recomputes stored rows
+    db.scale = 2.0
+    n = ds.rebuild("etf_flow", db, "2026-02-16", "2026-02-23", db_path=path)
+    assert n == 6
+    after = ds.load_frame("etf_flow", db, "2026-02-23", 30, db_path=path)
+    assert after.loc["2026-02-23", "total_volume"] == 200.0
+    assert after.loc["2026-02-13", "total_volume"] == 100.0
+
+
+def test_derived_series_fills_interior_gaps(tmp_path):
+    db, path = _FakeDB(), str(tmp_path / "derived.db")
+
+    ds.load_frame("etf_flow", db, "2026-01-20", 10, db_path=path)
+    ds.load_frame("etf_flow", db, "2026-02-10", 5, db_path=path)
+    assert db.calls == [10, 5]
+
+    # window 01-13..02-12: only the never-computed 01-21..02-04 hole and the two new days are aggregated
+    out = ds.load_frame("etf_flow", db, "2026-02-12", 30, db_path=path)
+    assert db.calls == [10, 5, 14, 1]
+    expected = db.daily.loc[pd.Timestamp("2026-01-13"):pd.Timestamp("2026-02-12")]
+    assert len(out) == 23
+    assert list(out.index) == list(expected.index)
+
+    ds.load_frame("etf_flow", db, "2026-02-12", 30, db_path=path)
+    assert db.calls == [10, 5, 14, 1]
+
+
+def test_liquidity_day_metrics():
+    df_day = pd.DataFrame(
+        {
+            "symbol": ["600000", "000001", "300750", "601318"],
+            "amount": [40.0, 30.0, 20.0, 10.0],
+            "chg_pct": [-1.0, -2.0, 1.0, -0.5],
+            "ma20_amount": [50.0, 20.0, 20.0, 20.0],
+        }
+    )
+    m = ds.liquidity_day_metrics(df_day)
+    assert m == {"top20_ratio": 1.0, "big_small_ratio": 1.0, "down_low_ratio": round(2 / 3, 4)}
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+UAT: DRS 连续性状态按交易日存储（内存 / SQLite）+ 重放重建
+
+Run:
+  python -m pytest -q core/uat/uat_drs_continuity_store_test.py
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+
+from core.persistence.sqlite.sqlite_continuity_store import SqliteContinuityStore
+from core.regime.observation.drs_continuity import DRSContinuity, MemoryStateStore, replay_continuity
+
+DAYS = ["2026-01-05", "2026-01-06", "2026-01-07", "2026-01-08", "2026-01-09"]
+SIGNALS = ["GREEN", "GREEN", "YELLOW", "YELLOW", "YELLOW"]
+
+
+def _apply(store, asof, signal):
+    out = DRSContinuity.apply(drs_obs={"observation": {"signal": signal}}, asof=asof, state_store=store)
+    return out["evidence"]["continuity"]
+
+
+def test_memory_store_is_order_independent_and_idempotent():
+    store = MemoryStateStore()
+    for d, s in zip(DAYS, SIGNALS):
+        _apply(store, d, s)
+    # rerun a middle day: same result, later days untouched
+    ev = _apply(store, DAYS[3], SIGNALS[3])
+    assert ev["prev_asof"] == DAYS[2] and ev["count"] == 2 and ev["confirmed"] is True
+    assert [store.get(DRSContinuity.STATE_KEY, d)["count"] for d in DAYS] == [1, 2, 1, 2, 3]
+
+    expected = replay_continuity(zip(DAYS, SIGNALS))
+    assert {d: v["count"] for d, v in expected.items()} == dict(zip(DAYS, [1, 2, 1, 2, 3]))
+
+
+def test_sqlite_store_rebuild_and_legacy_seed(tmp_path):
+    legacy = tmp_path / "drs_persistence.json"
+    legacy.write_text(json.dumps({"drs_persistence": {"asof": "2026-01-02", "signal": "GREEN", "count": 2}}), encoding="utf-8")
+
+    store = SqliteContinuityStore(sqlite3.connect(":memory:"), legacy_json_path=str(legacy))
+    # backfill out of order: later day first, then the earlier days
+    for i in [4, 0, 1, 2, 3]:
+        _apply(store, DAYS[i], SIGNALS[i])
+    assert store.get(DRSContinuity.STATE_KEY, DAYS[0])["count"] == 3  # seeded from legacy json
+
+    store.rebuild(DRSContinuity.STATE_KEY)
+    assert [store.get(DRSContinuity.STATE_KEY, d)["count"] for d in DAYS] == [1, 2, 1, 2, 3]
+    assert store.load_prev(DRSContinuity.STATE_KEY, "2026-01-12")["asof"] == DAYS[-1]
+
+
+def test_engine_continuity_store_shares_the_run_connection(tmp_path):
+    from core.engines.cn.ashare_daily_engine import AShareDailyEngine, _ur_open_persist_conn
+    from core.persistence.sqlite.sqlite_run_writer import SqliteRunWriter
+
+    eng = AShareDailyEngine.__new__(AShareDailyEngine)
+    eng.continuity_store = None
+    eng._conn = _ur_open_persist_conn(str(tmp_path / "ur.db"))
+
+    store = eng._get_continuity_store()
+    assert store.conn is eng._conn and "continuity" in eng._conn.ur_schema_ready
+
+    # inside the run transaction the state is written with the run (rolled back together)
+    try:
+        with SqliteRunWriter(eng._conn).transaction():
+            _apply(eng._get_continuity_store(), DAYS[0], SIGNALS[0])
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert store.get(DRSContinuity.STATE_KEY, DAYS[0]) is None
+    _apply(store, DAYS[0], SIGNALS[0])
+    assert store.get(DRSContinuity.STATE_KEY, DAYS[0])["count"] == 1
+
+
+def test_engine_teardown_forgets_the_closed_connection(tmp_path, monkeypatch):
+    from core.engines.cn import ashare_daily_engine as ade
+
+    monkeypatch.setattr(ade, "UNIFIEDRISK_DB_PATH", str(tmp_path / "ur.db"))
+    eng = ade.AShareDailyEngine.__new__(ade.AShareDailyEngine)
+    eng.continuity_store = None
+    first = eng._get_continuity_store().conn
+
+    eng._close_persist_conn()  # end of run
+    assert eng._conn is None
+    again = eng._get_continuity_store()  # reused engine instance: fresh, open connection
+    assert again.conn is not first and again.conn is eng._conn
+    _apply(again, DAYS[0], SIGNALS[0])
+    assert again.get(DRSContinuity.STATE_KEY, DAYS[0])["count"] == 1
+    eng._close_persist_conn()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""UAT: zt/zbgc pools are frozen per closed trade date and prefetched ranges replay without network.
+
+Run:
+    python -m pytest -q core/uat/uat_em_pool_store_test.py
+"""
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from core.utils.em_pool_store import get_pool, is_date_closed, prefetch_em_pools
+
+
+def _fetchers(calls):
+    def mk(kind):
+        def fetch(date_em):
+            calls.append((kind, date_em))
+            if date_em == "20990105":
+                return pd.DataFrame()  # empty (no limit-ups, or a transient failure): never frozen
+            return pd.DataFrame({"代码": ["000001"], "炸板次数": [1]})
+        return fetch
+    return {"zt": mk("zt"), "zbgc": mk("zbgc")}
+
+
+def test_prefetch_then_offline_reads(tmp_path):
+    root = str(tmp_path)
+    calls = []
+    after_close = datetime(2099, 1, 6, 16, 0)
+    stats = prefetch_em_pools(date(2099, 1, 2), date(2099, 1, 6), root=root, fetch_fns=_fetchers(calls), now=after_close)
+    # 2099-01-02 Fri, 05 Mon, 06 Tue (weekend skipped) × 2 kinds
+    assert stats == {"cached": 0, "fetched": 4, "unfrozen": 0, "empty": 2, "failed": 0}
+
+    again = prefetch_em_pools(date(2099, 1, 2), date(2099, 1, 6), root=root, fetch_fns=_fetchers(calls), now=after_close)
+    assert again["cached"] == 4 and again["empty"] == 2 and len(calls) == 8  # empty dates retried
+
+    df, source = get_pool("zt", "2099-01-02", allow_fetch=False, root=root)
+    assert source == "cache" and len(df) == 1
+    assert get_pool("zbgc", "20990105", allow_fetch=False, root=root) == (None, "miss")
+
+
+def test_open_session_not_frozen(tmp_path):
+    root = str(tmp_path)
+    calls = []
+    intraday = datetime(2099, 1, 6, 10, 30)
+    assert not is_date_closed("2099-01-06", intraday)
+    _, source = get_pool("zt", "2099-01-06", root=root, fetch_fn=_fetchers(calls)["zt"], now=intraday)
+    assert source == "fetch_unfrozen"
+    assert get_pool("zt", "2099-01-06", allow_fetch=False, root=root) == (None, "miss")
+    with pytest.raises(ValueError):
+        get_pool("bad", "2099-01-06", root=root)
+
+
+def test_empty_frozen_file_is_a_miss(tmp_path):
+    from core.utils.em_pool_store import pool_path, read_pool
+
+    root = str(tmp_path)
+    path = pool_path("zt", "2099-01-05", root)
+    (tmp_path / "zt").mkdir()
+    pd.DataFrame({"代码": []}).to_parquet(path, index=False)  # written by an older version
+    assert read_pool("zt", "2099-01-05", root) is None
+
+    calls = []
+    df, source = get_pool("zt", "2099-01-05", root=root, fetch_fn=_fetchers(calls)["zt"], now=datetime(2099, 1, 6, 16, 0))
+    assert source == "fetch_empty" and df.empty and calls == [("zt", "20990105")]
+    assert len(pd.read_parquet(path)) == 0  # not re-frozen
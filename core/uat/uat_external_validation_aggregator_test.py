@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""UAT: bulk ExternalValidationAggregator matches per-row forward returns.
+
+Run:
+    python -m pytest -q core/uat/uat_external_validation_aggregator_test.py
+"""
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from core.validation.external_validation_aggregator import AggregationConfig, ExternalValidationAggregator
+from self_db_testV0 import ensure_ext_schema
+
+_DATES = ["2099-01-%02d" % d for d in range(2, 12)]
+
+
+def _make_conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    ensure_ext_schema(conn)
+    conn.execute(
+        "CREATE TABLE ext_market_snapshot (trade_date TEXT, symbol TEXT, close REAL, PRIMARY KEY (trade_date, symbol))"
+    )
+    for i, td in enumerate(_DATES):
+        conn.execute("INSERT INTO ext_market_snapshot VALUES (?, 'HS300', ?)", (td, 100.0 + i))
+        # ZZ500 has a NULL close on day 4 and misses the last day
+        if i < len(_DATES) - 1:
+            conn.execute("INSERT INTO ext_market_snapshot VALUES (?, 'ZZ500', ?)", (td, None if i == 4 else 50.0 + 2 * i))
+
+    conn.executemany(
+        "INSERT INTO ext_report_claim (claim_id, claim_type, description, target_symbol, expected_regime) VALUES (?, ?, '', ?, 'UP')",
+        [("C1", "INDEX_TREND", "HS300"), ("C2", "BREADTH", None), ("C3", "INDEX_TREND", "ZZ500")],
+    )
+    for i, td in enumerate(_DATES):
+        for cid in ("C1", "C2", "C3"):
+            verdict = "SUPPORTED" if (i + len(cid)) % 2 == 0 else "WEAKENED"
+            conn.execute("INSERT INTO ext_claim_verdict (trade_date, claim_id, verdict) VALUES (?, ?, ?)", (td, cid, verdict))
+    return conn
+
+
+def test_bulk_followups_and_summary():
+    conn = _make_conn()
+    ExternalValidationAggregator(conn, AggregationConfig(lookback_days=8, horizons=(1, 3))).run(asof_date=_DATES[-1])
+
+    window = _DATES[-8:]
+    closes = {
+        "HS300": {td: 100.0 + i for i, td in enumerate(_DATES)},
+        "ZZ500": {td: (None if i == 4 else 50.0 + 2 * i) for i, td in enumerate(_DATES[:-1])},
+    }
+    expected = {}
+    for cid, sym in (("C1", "HS300"), ("C2", "HS300"), ("C3", "ZZ500")):
+        cal = sorted(closes[sym])
+        for td in window:
+            if td not in closes[sym] or closes[sym][td] is None:
+                continue
+            for h in (1, 3):
+                j = cal.index(td) + h
+                if j < len(cal) and closes[sym][cal[j]] is not None:
+                    expected[(td, cid, h)] = closes[sym][cal[j]] / closes[sym][td] - 1.0
+
+    got = {
+        (td, cid, h): ret
+        for td, cid, h, ret in conn.execute("SELECT trade_date, claim_id, horizon, ret_cum FROM ext_claim_followup")
+    }
+    assert got.keys() == expected.keys()
+    for k, v in expected.items():
+        assert got[k] == pytest.approx(v)
+
+    rows = conn.execute(
+        "SELECT horizon, total_cnt, avg_ret_all FROM ext_validation_summary WHERE asof_date=? ORDER BY horizon",
+        (_DATES[-1],),
+    ).fetchall()
+    assert [r[0] for r in rows] == [1, 3]
+    for h, total, avg_all in rows:
+        assert total == 8 * 3
+        xs = [v for (td, cid, hh), v in expected.items() if hh == h]
+        assert avg_all == pytest.approx(sum(xs) / len(xs))
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""UAT: process-eligible factors run in worker processes against a shared-memory snapshot and return FactorResults.
+
+Run:
+    python -m pytest -q core/uat/uat_factor_process_pool_test.py
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from core.engines.cn.ashare_daily_engine import AShareDailyEngine
+from core.factors import factor_process_pool as fpp
+from core.factors.factor_result import FactorResult
+from core.utils import logger as ur_logger
+
+
+class _PidFactor:
+    def __init__(self, name: str = "pid"):
+        self.name = name
+
+    def compute(self, snapshot):
+        rows = snapshot["panel"]["rows"]
+        return FactorResult(
+            name=self.name,
+            score=float(sum(r["v"] for r in rows) % 100),
+            level="NEUTRAL",
+            details={"pid": os.getpid(), "n": len(rows), "trade_date": snapshot["trade_date"]},
+        )
+
+
+class _LoggingFactor(_PidFactor):
+    def compute(self, snapshot):
+        fr = super().compute(snapshot)
+        ur_logger.get_logger("UatPool.Worker").warning("worker pid=%s td=%s", fr.details["pid"], snapshot["trade_date"])
+        return fr
+
+
+class _FailingFactor:
+    def compute(self, snapshot):
+        raise RuntimeError("boom")
+
+
+def _engine(process_pool):
+    eng = AShareDailyEngine.__new__(AShareDailyEngine)
+    eng.weights_cfg = {
+        "factor_pipeline": {
+            "enabled": ["heavy", "light", "broken"],
+            "registry": {
+                "heavy": f"{__name__}:_PidFactor",
+                "light": f"{__name__}:_PidFactor",
+                "broken": f"{__name__}:_FailingFactor",
+                "logging": f"{__name__}:_LoggingFactor",
+            },
+            "params": {"heavy": {"name": "heavy"}, "light": {"name": "light"}},
+            "process_pool": process_pool,
+        }
+    }
+    return eng
+
+
+def _snapshot(td):
+    return {"trade_date": td, "panel": {"rows": [{"v": i} for i in range(5000)]}, "lock": None}
+
+
+@pytest.fixture(autouse=True)
+def _pool():
+    yield
+    fpp.shutdown_factor_pool()
+
+
+def test_process_pool_factors_match_in_process():
+    spec = {"enabled": True, "workers": 2, "factors": ["heavy", "broken"]}
+    eng = _engine(spec)
+    pooled = [eng._compute_factors(_snapshot(td)) for td in ("2026-01-05", "2026-01-06")]  # backfill: pool reused
+    local = _engine({"enabled": False})._compute_factors(_snapshot("2026-01-06"))
+
+    last = pooled[-1]
+    assert list(last) == ["heavy", "light", "broken"]  # enabled order kept
+    assert last["heavy"].details["pid"] != os.getpid()
+    assert last["light"].details["pid"] == os.getpid()
+    assert last["heavy"].score == local["heavy"].score
+    assert last["heavy"].details["trade_date"] == "2026-01-06"  # worker remapped the new snapshot
+    assert last["broken"].details == {"data_status": "ERROR", "error": "boom"}
+    assert last["broken"].details == local["broken"].details
+
+
+def test_unpicklable_snapshot_falls_back_in_process():
+    eng = _engine({"enabled": True, "workers": 2, "factors": ["heavy"]})
+    snap = dict(_snapshot("2026-01-07"), lock=threading.Lock())
+    out = eng._compute_factors(snap)
+    assert out["heavy"].details["pid"] == os.getpid()
+    assert fpp.load_process_pool_spec({"process_pool": {"workers": "x", "factors": "heavy"}}) == fpp.ProcessPoolSpec(enabled=False)
+
+
+@pytest.fixture
+def _restore_root():
+    root = logging.getLogger()
+    saved = (list(root.handlers), root.level)
+    yield
+    fpp.shutdown_factor_pool()
+    ur_logger.stop_logging()
+    root.handlers[:] = saved[0]
+    root.setLevel(saved[1])
+    ur_logger.configure_levels(default="INFO", levels={})
+
+
+def test_worker_logs_reach_the_parent_sinks(tmp_path, _restore_root):
+    cfg = {"level": "INFO", "queue": True, "jsonl": {"enabled": True}}
+    log_path = ur_logger.setup_logging("cn", "uat", cfg=cfg, logs_dir=str(tmp_path))
+    eng = _engine({"enabled": True, "workers": 1, "factors": ["logging"]})
+    eng.weights_cfg["factor_pipeline"]["enabled"] = ["logging"]
+
+    with ur_logger.log_context(run_id="run-pool", stage="FACTORS"):
+        out = eng._compute_factors(_snapshot("2026-01-08"))
+    pid = out["logging"].details["pid"]
+    assert pid != os.getpid()
+    fpp.shutdown_factor_pool()  # workers exit -> their queue feeders flush
+    ur_logger.stop_logging()
+
+    msg = f"worker pid={pid} td=2026-01-08"
+    assert f"[UatPool.Worker] (WARNING) {msg}" in Path(log_path).read_text(encoding="utf-8")
+    lines = [json.loads(x) for x in Path(log_path[:-4] + ".jsonl").read_text(encoding="utf-8").splitlines()]
+    rec = next(x for x in lines if x["msg"] == msg)
+    assert (rec["run_id"], rec["stage"]) == ("run-pool", "FACTORS")
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""UAT: startup entry points must not import data-source stacks (akshare / sqlalchemy / baostock ...).
+
+Run:
+    python -m pytest -q core/uat/uat_import_budget_test.py
+
+Wall-clock budgets are checked by tools/check_import_budget.py (machine-dependent);
+this test only enforces the deterministic forbidden-module part.
+"""
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+_TOOL = Path(__file__).resolve().parents[2] / "tools" / "check_import_budget.py"
+
+
+def _load_tool():
+    spec = importlib.util.spec_from_file_location("check_import_budget", _TOOL)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod  # dataclasses resolve the defining module via sys.modules
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_startup_targets_have_no_forbidden_imports():
+    tool = _load_tool()
+    for t in tool.TARGETS:
+        m = tool.measure(t.module, repeat=1)
+        assert tool.forbidden_hits(m.imported, t.forbidden) == [], t.module
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""UAT: intraday warm daemon keeps the static snapshot resident and refreshes only the overlay.
+
+Run:
+    python -m pytest -q core/uat/uat_intraday_daemon_test.py
+"""
+from __future__ import annotations
+
+from core.engines.cn.intraday_daemon import IntradayWarmDaemon, WarmIntradayEngine
+
+
+class _FakeFetcher:
+    def __init__(self):
+        self.calls = 0
+
+    def prepare_daily_market_snapshot(self):
+        self.calls += 1
+        return {"trade_date": "2099-01-02", "amount_raw": {"total_amount": 1.0}}
+
+
+class _FakeIntradayDS:
+    def __init__(self):
+        self.calls = 0
+
+    def build_block(self, trade_date, refresh_mode="none"):
+        self.calls += 1
+        return {"trade_date": trade_date, "tick": self.calls}
+
+
+def _warm_engine():
+    # skip AShareDailyEngine.__init__ (baostock trade-time lookup)
+    eng = WarmIntradayEngine.__new__(WarmIntradayEngine)
+    eng.trade_date = "2099-01-02"
+    eng.is_intraday = True
+    eng.refresh_mode = "readonly"
+    eng._fetcher = _FakeFetcher()
+    eng._static_snapshot = None
+    eng._intraday_sources = [("amount", _FakeIntradayDS())]
+    return eng
+
+
+def test_static_snapshot_fetched_once():
+    eng = _warm_engine()
+    s1 = eng._fetch_snapshot()
+    s1["amount_raw"]["total_amount"] = 99.0  # pipeline-side mutation must not leak into the resident copy
+    s2 = eng._fetch_snapshot()
+
+    assert eng._fetcher.calls == 1
+    assert s2["amount_raw"]["total_amount"] == 1.0
+    assert s1["intraday_overlay"]["amount"]["tick"] == 1
+    assert s2["intraday_overlay"]["amount"]["tick"] == 2
+
+
+class _FakeEngine:
+    def __init__(self, refresh_mode="none", trade_date_override=None):
+        self.trade_date = "2099-01-02"
+        self.report_kind = "Intraday"
+        self.is_intraday = True
+        self.runs = 0
+
+    def run(self):
+        self.runs += 1
+        if self.runs == 2:
+            raise RuntimeError("transient")
+
+
+def test_daemon_ticks_are_fail_soft():
+    sleeps = []
+    d = IntradayWarmDaemon(
+        interval_s=60,
+        max_ticks=3,
+        stop_at_close=False,
+        engine_factory=_FakeEngine,
+        sleep_fn=sleeps.append,
+    )
+    d.run_forever()
+
+    assert d.engine.runs == 3
+    assert d.ticks == 3
+    # no sleep after the last tick
+    assert len(sleeps) == 2 and all(0 < s <= 60 for s in sleeps)
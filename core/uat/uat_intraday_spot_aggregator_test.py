@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""UAT: intraday breadth / amount counters are updated from spot snapshot deltas and match a full rescan.
+
+Run:
+    python -m pytest -q core/uat/uat_intraday_spot_aggregator_test.py
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from core.adapters.datasources.cn import amount_intraday_source as ais
+from core.adapters.datasources.cn import market_sentiment_intraday_source as msis
+from core.utils import intraday_spot_aggregator as isa
+from core.utils.intraday_spot_aggregator import IntradaySpotAggregator
+from core.utils.spot_snapshot_service import SpotSnapshotService
+
+TD = "20990102"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = datetime(2099, 1, 2, 9, 31, 0)
+
+    def __call__(self):
+        return self.now
+
+
+def _universe(n=400, seed=7):
+    rng = np.random.default_rng(seed)
+    prefixes = ["600", "000", "300", "688", "830", "430", "002"]
+    rows = []
+    for i in range(n):
+        p = prefixes[i % len(prefixes)]
+        code = f"{p}{i:03d}"
+        ex = "SH" if p in ("600", "688") else ("BJ" if p in ("830", "430") else "SZ")
+        name = ("*ST" if i % 11 == 0 else "") + f"N{i}"
+        rows.append((f"{code}.{ex}", name))
+    df = pd.DataFrame(rows, columns=["symbol", "name"])
+    df["chg_pct"] = rng.choice([-20.0, -10.0, -5.0, -1.2, 0.0, 0.7, 4.96, 9.96, 19.97, 30.0], size=n)
+    df["成交额"] = rng.integers(1, 10**6, size=n) * 1e3
+    df.loc[3, "chg_pct"] = np.nan
+    return df
+
+
+def _full_scan(df):
+    chg = pd.to_numeric(df["chg_pct"], errors="coerce")
+    sym6 = df["symbol"].astype(str).str.extract(r"(\d{6})", expand=False)
+    limit = pd.Series(10.0, index=df.index)
+    limit = limit.where(~sym6.str[:3].isin({"300", "301", "688", "689"}), 20.0)
+    limit = limit.where(~(sym6.str[:1].isin({"8"}) | sym6.str[:2].isin({"43", "83", "87"})), 30.0)
+    nm = df["name"].astype(str).str.upper()
+    limit = limit.where(~((nm.str.startswith("*ST") | nm.str.startswith("ST")) & (limit == 10.0)), 5.0)
+    amt = {x: round(df.loc[df["symbol"].str.endswith("." + x), "成交额"].sum() / 1e8, 2) for x in ("SH", "SZ", "BJ")}
+    return {
+        "adv": int((chg > 0).sum()),
+        "dec": int((chg < 0).sum()),
+        "flat": int((chg == 0).sum()),
+        "limit_up": int((chg >= limit - 0.05).sum()),
+        "limit_down": int((chg <= -(limit - 0.05)).sum()),
+        "limit_up_naive": int((chg >= 9.9).sum()),
+        "limit_down_naive": int((chg <= -9.9).sum()),
+        "sh": amt["SH"], "sz": amt["SZ"], "bj": amt["BJ"],
+    }
+
+
+def _ticks():
+    rng = np.random.default_rng(11)
+    df = _universe()
+    frames = [df.copy()]
+    for _ in range(5):
+        df = df.copy()
+        idx = rng.choice(len(df), size=25, replace=False)
+        df.loc[idx, "chg_pct"] = rng.choice([-10.0, -0.3, 0.0, 2.5, 9.97, 20.0], size=len(idx))
+        df.loc[idx[:10], "成交额"] += 5e6
+        frames.append(df.copy())
+    # a halted symbol drops out and a new listing appears
+    df = df.drop(index=5).reset_index(drop=True)
+    df.loc[len(df)] = ["301999.SZ", "N新", 55.0, 1e9]
+    frames.append(df)
+    return frames
+
+
+def test_incremental_counters_match_full_scan_and_build_series(tmp_path):
+    frames, clock = _ticks(), _Clock()
+    state = {"i": -1}
+
+    def fetch():
+        return frames[state["i"]]
+
+    svc = SpotSnapshotService(max_age_s=60, bucket_minutes=5, root=str(tmp_path), fetch_fn=fetch, clock=clock)
+    agg = IntradaySpotAggregator(service=svc)
+
+    for i, frame in enumerate(frames):
+        state["i"] = i
+        clock.now += timedelta(minutes=5)
+        s = agg.refresh(TD)
+        ref = _full_scan(frame)
+        got = {k: s[k] for k in ref if k in s}
+        got.update({k: s["amount"][k] for k in ("sh", "sz", "bj")})
+        assert got == ref, f"tick {i}"
+        assert s["n_symbols"] == len(frame)
+        # same snapshot requested by another datasource within the tick: no re-apply
+        assert agg.refresh(TD) == s
+
+    series = agg.series(TD)
+    assert len(series) == len(frames)
+    assert [p["bucket"] for p in series] == sorted(p["bucket"] for p in series)
+    assert series[0]["changed"] == len(frames[0])
+    assert all(p["changed"] <= 25 for p in series[1:-1])
+    assert series[-1]["changed"] == 1  # only the new listing (the halted one is removed)
+
+
+def test_flat_first_snapshot_does_not_lock_ratio_unit(tmp_path):
+    base = _universe(n=40).assign(chg_pct=0.0)
+    opened = base.copy()
+    opened.loc[:9, "chg_pct"] = 0.5
+    opened.loc[10:19, "chg_pct"] = 1.2
+    opened.loc[20:24, "chg_pct"] = -0.2
+    frames, clock, state = [base, opened, opened.copy()], _Clock(), {"i": 0}
+
+    svc = SpotSnapshotService(max_age_s=60, bucket_minutes=5, root=str(tmp_path), fetch_fn=lambda: frames[state["i"]], clock=clock)
+    agg = IntradaySpotAggregator(service=svc)
+
+    first = agg.refresh(TD)  # 09:31 everything flat: unit undecidable
+    assert (first["flat"], first["limit_up"]) == (40, 0)
+
+    for i in (1, 2):
+        state["i"] = i
+        clock.now += timedelta(minutes=5)
+        s = agg.refresh(TD)
+        assert not s["ratio_unit"]
+        ref = _full_scan(frames[i])
+        assert {k: s[k] for k in ("adv", "dec", "flat", "limit_up", "limit_down")} == {
+            k: ref[k] for k in ("adv", "dec", "flat", "limit_up", "limit_down")
+        }
+    assert (s["adv"], s["dec"], s["limit_up"]) == (20, 5, 0)
+    assert agg.series(TD)[1]["changed"] == 40  # unit switched: every row re-counted
+
+
+def test_amount_intraday_source_uses_aggregator(tmp_path, monkeypatch):
+    frame, clock = _universe(), _Clock()
+    svc = SpotSnapshotService(root=str(tmp_path / "spot"), fetch_fn=lambda: frame, clock=clock)
+    agg = IntradaySpotAggregator(service=svc)
+    monkeypatch.setattr(isa, "get_intraday_aggregator", lambda: agg)
+    monkeypatch.setattr(ais, "get_spot_view", lambda *a, **k: (_ for _ in ()).throw(AssertionError("full scan")))
+
+    ds = ais.AmountDataSource.__new__(ais.AmountDataSource)
+    ds.cache_root = str(tmp_path / "cache")
+    ds.history_root = str(tmp_path / "history")
+    (tmp_path / "cache").mkdir()
+
+    blk = ds.build_block(TD, refresh_mode="full")
+    ref = _full_scan(frame)
+    assert (blk["sh"], blk["sz"], blk["bj"]) == (ref["sh"], ref["sz"], ref["bj"])
+    assert blk["total"] == round(ref["sh"] + ref["sz"] + ref["bj"], 2)
+
+
+def test_sources_share_one_usability_rule(tmp_path, monkeypatch):
+    # symbols present but no usable chg_pct: every intraday source must fall back, not just some
+    frame, clock = _universe(n=20).assign(chg_pct=np.nan), _Clock()
+    svc = SpotSnapshotService(root=str(tmp_path / "spot"), fetch_fn=lambda: frame, clock=clock)
+    agg = IntradaySpotAggregator(service=svc)
+    monkeypatch.setattr(isa, "get_intraday_aggregator", lambda: agg)
+    assert agg.refresh(TD)["n_symbols"] == 20 and not isa.summary_usable(agg.refresh(TD))
+    assert isa.intraday_summary(TD) is None
+
+    scans = []
+    for mod in (ais, msis):
+        monkeypatch.setattr(mod, "get_spot_view", lambda *a, **k: scans.append(1) or frame)
+    for mod, cls in ((ais, ais.AmountDataSource), (msis, msis.MarketSentimentDataSource)):
+        ds = cls.__new__(cls)
+        ds.cache_root = str(tmp_path / "cache")
+        ds.history_root = str(tmp_path / "history")
+        (tmp_path / "cache").mkdir(exist_ok=True)
+        ds.build_block(TD, refresh_mode="full")
+    assert len(scans) == 2
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+UAT: 非阻塞日志管线（QueueHandler / QueueListener、子系统级别、JSON-lines sink 带 run_id / stage）
+以及日志调用惰性 %-style 格式化约束（所有级别；LEGACY_EAGER_LOGGING 中的旧模块仅约束 DEBUG）
+
+Run:
+  python -m pytest -q core/uat/uat_logging_pipeline_test.py
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import logging
+import logging.handlers
+from pathlib import Path
+
+import pytest
+
+from core.utils import logger as ur_logger
+from core.utils.logger import get_logger, log_context, setup_logging, stop_logging
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+LOG_LEVELS = ("debug", "info", "warning", "warn", "error", "exception", "critical")
+LOGGER_NAMES = ("log", "logger", "_log", "_logger")
+
+# pre-existing modules still on f-string INFO+ calls; new / touched code must not be added here
+LEGACY_EAGER_LOGGING = {
+    "core/adapters/block_builder/block_builder_base.py",
+    "core/adapters/datasources/cn/north_nps_source.py",
+    "core/adapters/providers/provider_base.py",
+    "core/adapters/providers/provider_bs.py",
+    "core/adapters/providers/provider_router.py",
+    "core/adapters/providers/provider_yf.py",
+    "core/factors/cn/turnover_factor.py",
+    "core/utils/yf_utils.py",
+}
+
+
+def _is_logger(node: ast.expr) -> bool:
+    name = node.id if isinstance(node, ast.Name) else node.attr if isinstance(node, ast.Attribute) else ""
+    return name.lower() in LOGGER_NAMES or name == "logging"
+
+
+def _eager_log_calls(path: Path, levels=LOG_LEVELS) -> list:
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8-sig"))
+    except (SyntaxError, UnicodeDecodeError):
+        return []  # *_bak / broken snapshots are not imported
+    hits = []
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr in levels):
+            continue
+        # .debug( on anything; other levels only on loggers (argparse's ap.error(f"...") is fine)
+        if not node.args or (node.func.attr != "debug" and not _is_logger(node.func.value)):
+            continue
+        msg = node.args[0]
+        eager = isinstance(msg, ast.JoinedStr) or (
+            isinstance(msg, ast.Call) and isinstance(msg.func, ast.Attribute) and msg.func.attr == "format"
+        ) or (isinstance(msg, ast.BinOp) and isinstance(msg.op, ast.Mod))
+        if eager:
+            hits.append(f"{path.relative_to(REPO_ROOT).as_posix()}:{node.lineno}")
+    return hits
+
+
+def test_logging_is_lazy_percent_style():
+    hits = []
+    for sub in ("core", "tools", "benchmarks", "tests"):
+        for path in sorted((REPO_ROOT / sub).rglob("*.py")):
+            legacy = path.relative_to(REPO_ROOT).as_posix() in LEGACY_EAGER_LOGGING
+            hits += _eager_log_calls(path, ("debug",) if legacy else LOG_LEVELS)
+    assert hits == [], "use LOG.info('x=%s', x), not f-strings / .format / %: " + ", ".join(hits)
+
+
+def test_legacy_allowlist_is_current():
+    # once a legacy module is converted it drops off the list and stays enforced
+    stale = sorted(p for p in LEGACY_EAGER_LOGGING if not _eager_log_calls(REPO_ROOT / p))
+    assert stale == [], "remove from LEGACY_EAGER_LOGGING: " + ", ".join(stale)
+
+
+@pytest.fixture
+def _restore_root():
+    root = logging.getLogger()
+    saved = (list(root.handlers), root.level)
+    yield
+    stop_logging()
+    root.handlers[:] = saved[0]
+    root.setLevel(saved[1])
+    ur_logger.configure_levels(default="INFO", levels={})
+
+
+class _Counting:
+    calls = 0
+
+    def __str__(self) -> str:
+        _Counting.calls += 1
+        return "counted"
+
+
+def test_queue_pipeline_levels_and_jsonl(tmp_path, _restore_root):
+    cfg = {
+        "level": "INFO",
+        "queue": True,
+        "levels": {"UatLog": "DEBUG", "UatLog.Quiet": "WARNING"},
+        "jsonl": {"enabled": True},
+    }
+    log_path = setup_logging("cn", "uat", cfg=cfg, logs_dir=str(tmp_path))
+    root = logging.getLogger()
+    assert len(root.handlers) == 1 and isinstance(root.handlers[0], logging.handlers.QueueHandler)
+
+    loud, quiet, other = get_logger("UatLog.Loud"), get_logger("UatLog.Quiet.Sub"), get_logger("UatOther")
+    assert (loud.level, quiet.level, other.level) == (logging.DEBUG, logging.WARNING, logging.INFO)
+
+    # disabled level: the argument is never formatted
+    quiet.info("skipped %s", _Counting())
+    other.debug("skipped %s", _Counting())
+    assert _Counting.calls == 0
+
+    with log_context(run_id="run-1", stage="FACTORS"):
+        loud.debug("factor=%s score=%.1f", "breadth", 0.25)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            quiet.exception("failed %s", "x")
+    other.info("outside")
+    stop_logging()  # drains the queue and closes the sinks
+
+    lines = [json.loads(x) for x in Path(log_path[:-4] + ".jsonl").read_text(encoding="utf-8").splitlines()]
+    by_msg = {x["msg"]: x for x in lines}
+    assert by_msg["factor=breadth score=0.2"]["run_id"] == "run-1"
+    assert by_msg["factor=breadth score=0.2"]["stage"] == "FACTORS"
+    assert by_msg["failed x"]["level"] == "ERROR" and "ValueError: boom" in by_msg["failed x"]["exc"]
+    assert by_msg["outside"]["run_id"] is None
+    assert "skipped counted" not in by_msg
+
+    text = Path(log_path).read_text(encoding="utf-8")
+    assert "[UatLog.Loud] (DEBUG) factor=breadth score=0.2" in text
+    assert "ValueError: boom" in text
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""UAT: regime_stack_validator Parquet cache + vectorized metrics match the CSV / groupby-rolling path.
+
+Run:
+    python -m pytest -q core/uat/uat_regime_stack_loader_test.py
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.regime_stack_validator.src import data_loader
+from tools.regime_stack_validator.src.metrics import compute_metrics
+
+
+def _write_csv(path):
+    rng = np.random.default_rng(3)
+    dates = pd.bdate_range("2024-11-01", "2025-03-31")
+    syms = [str(i) for i in (1, 2, 600, 300750)]
+    rows = []
+    for s_i, sym in enumerate(syms):
+        px = 10 * np.cumprod(1 + rng.normal(0, 0.02, len(dates)))
+        for d_i, d in enumerate(dates):
+            if (d_i + s_i) % 17 == 0:
+                continue  # suspension gaps
+            rows.append((sym, "sh" if s_i % 2 else "sz", d.strftime("%Y-%m-%d"), round(px[d_i], 3)))
+    pd.DataFrame(rows, columns=["SYMBOL", "EXCHANGE", "TRADE_DATE", "CLOSE"]).to_csv(path, index=False)
+
+
+def _reference_metrics(df, window):
+    df = df.copy()
+    df["ret"] = df["close"] / df["prev_close"] - 1
+    df["adv"] = df["close"] > df["prev_close"]
+    df["rolling_low"] = df.groupby("code", observed=True)["close"].transform(lambda x: x.rolling(window).min())
+    df["new_low"] = df["close"] == df["rolling_low"]
+    g = df.groupby("date")
+    return pd.DataFrame({
+        "date": g["adv"].mean().index,
+        "adv_ratio": g["adv"].mean().values,
+        "median_return": g["ret"].median().values,
+        "new_low_ratio": g["new_low"].mean().values,
+    })
+
+
+def test_parquet_cache_matches_csv_and_metrics_match_rolling(tmp_path):
+    if data_loader.pa is None:
+        pytest.skip("pyarrow not installed")
+    csv_path = str(tmp_path / "prices.csv")
+    _write_csv(csv_path)
+
+    via_csv = data_loader.load_market_data(csv_path, "2025-01-02", 40)
+    cache = str(tmp_path / "pq")
+    via_pq = data_loader.load_market_data(csv_path, "2025-01-02", 40, cache_dir=cache)
+    assert data_loader._cache_fresh(csv_path, cache)
+
+    assert list(via_pq["code"].astype(str)) == list(via_csv["code"].astype(str))
+    assert (via_pq["date"].to_numpy(dtype="datetime64[s]") == via_csv["date"].to_numpy(dtype="datetime64[s]")).all()
+    np.testing.assert_allclose(via_pq["prev_close"], via_csv["prev_close"], equal_nan=True)
+    assert via_csv["date"].min() >= pd.Timestamp("2025-01-02")
+
+    got = compute_metrics(via_csv, 10)
+    ref = _reference_metrics(via_csv, 10)
+    pd.testing.assert_frame_equal(got.drop(columns=["new_low_persistence"]), ref, check_dtype=False)
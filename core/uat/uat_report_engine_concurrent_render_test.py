@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""UAT: ReportEngine concurrent block rendering keeps YAML order and sequential output.
+
+Run:
+    python -m pytest -q core/uat/uat_report_engine_concurrent_render_test.py
+"""
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from core.reporters.report_context import ReportContext
+from core.reporters.report_engine import ReportEngine
+from core.reporters.report_types import ReportBlock
+
+
+_YAML = """
+reports:
+  EOD:
+    blocks: [a.indep, b.writer, c.indep, d.reader, e.boom, f.indep]
+"""
+
+
+def _indep(alias):
+    def _b(context, doc_partial):
+        return ReportBlock(
+            block_alias=alias,
+            title=alias,
+            payload={"summary": doc_partial.get("summary"), "thread": threading.current_thread().name},
+        )
+    _b.depends_on_doc_partial = False
+    return _b
+
+
+def _writer(context, doc_partial):
+    doc_partial["shared"] = "from_b"
+    return ReportBlock(block_alias="b.writer", title="b.writer", payload={"thread": threading.current_thread().name})
+
+
+def _reader(context, doc_partial):
+    return ReportBlock(block_alias="d.reader", title="d.reader", payload={"shared": doc_partial.get("shared")})
+
+
+def _boom(context, doc_partial):
+    raise RuntimeError("boom")
+
+
+_boom.depends_on_doc_partial = False
+
+
+def _engine(tmp_path: Path, mode: str) -> ReportEngine:
+    p = tmp_path / "blocks.yaml"
+    p.write_text(_YAML, encoding="utf-8")
+    return ReportEngine(
+        market="CN",
+        actionhint_service=None,
+        block_specs_path=str(p),
+        render_mode=mode,
+        max_workers=3,
+        block_builders={
+            "a.indep": _indep("a.indep"),
+            "b.writer": _writer,
+            "c.indep": _indep("c.indep"),
+            "d.reader": _reader,
+            "e.boom": _boom,
+            "f.indep": _indep("f.indep"),
+        },
+    )
+
+
+def _render(engine: ReportEngine):
+    ctx = ReportContext(trade_date="2099-01-01", kind="EOD", slots={}, actionhint={"summary": "N"})
+    return engine._render_blocks(context=ctx, doc_partial={"actionhint": {"summary": "N"}, "summary": "N"})
+
+
+def test_concurrent_matches_sequential(tmp_path):
+    seq_blocks, seq_mode = _render(_engine(tmp_path, "sequential"))
+    eng = _engine(tmp_path, "concurrent")
+    con_blocks, con_mode = _render(eng)
+
+    assert seq_mode == "sequential"
+    assert con_mode == "concurrent"
+    assert [b.block_alias for b in con_blocks] == [b.block_alias for b in seq_blocks]
+
+    by_alias = {b.block_alias: b for b in con_blocks}
+    # dependent blocks stay on the calling thread and still share doc_partial
+    assert by_alias["d.reader"].payload["shared"] == "from_b"
+    assert by_alias["b.writer"].payload["thread"] == threading.current_thread().name
+    # independent blocks see the seeded doc_partial and run in the pool
+    assert by_alias["a.indep"].payload["summary"] == "N"
+    assert by_alias["a.indep"].payload["thread"].startswith("report-block")
+    # builder errors still become placeholders
+    assert by_alias["e.boom"].payload["content"][0] == "BLOCK_BUILDER_EXCEPTION"
+    assert set(eng.last_block_timings_ms) == {b.block_alias for b in con_blocks}
+
+
+def test_unknown_mode_falls_back_to_sequential(tmp_path):
+    _, mode = _render(_engine(tmp_path, "bogus"))
+    assert mode == "sequential"
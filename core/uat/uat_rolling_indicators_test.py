@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""UAT: vectorized rolling indicators match the per-date list scans they replaced.
+
+Run:
+    python -m pytest -q core/uat/uat_rolling_indicators_test.py
+"""
+from __future__ import annotations
+
+import math
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from core.personal_tactical.cn_entry_pool_rotation.oracle_facts import build_facts_from_series, index_price_series
+from core.personal_tactical.cn_position_governance.oracle_facts import PriceBar
+from core.personal_tactical.cn_position_governance.state_machine import RiskStateMachine
+from core.utils.rolling_indicators import rolling_max, rolling_mean
+
+
+def _rows(n=300, seed=7):
+    rnd = random.Random(seed)
+    out, d, c = [], date(2024, 1, 1), 10.0
+    while len(out) < n:
+        if d.weekday() < 5 and rnd.random() > 0.05:  # sparse holidays
+            c *= 1.0 + rnd.uniform(-0.04, 0.04)
+            out.append((d, c, rnd.uniform(100, 1000)))
+        d += timedelta(days=1)
+    return out
+
+
+def test_rolling_helpers_match_naive():
+    xs = [r[1] for r in _rows(50)]
+    hi = rolling_max(xs, 5)
+    ma = rolling_mean(xs, 5, include_current=True)
+    for i in range(len(xs)):
+        if i < 5:
+            assert math.isnan(hi[i])
+        else:
+            assert hi[i] == max(xs[i - 5:i])
+        if i < 4:
+            assert math.isnan(ma[i])
+        else:
+            assert ma[i] == pytest.approx(sum(xs[i - 4:i + 1]) / 5)
+
+
+def test_epr_facts_match_list_scan():
+    rows = _rows()
+    index = index_price_series({"X": rows})
+    for d, close, vol in rows[::7]:
+        # legacy semantics: clip to [d - 180d, d], last N rows strictly before d
+        start = d - timedelta(days=60 + 120)
+        prior = [r for r in rows if start <= r[0] < d]
+        facts, missing = build_facts_from_series(index, d, {"x": "X"})
+        if len(prior) < 60:
+            assert missing == ["X"]
+            continue
+        f = facts["x"]
+        assert f.close == close and f.volume == vol
+        assert f.high_60d == max(r[1] for r in prior[-60:])
+        assert f.vol_ma20 == pytest.approx(sum(r[2] for r in prior[-20:]) / 20)
+        assert f.rows_loaded == len(prior) + 1
+
+    facts, missing = build_facts_from_series(index, date(2024, 1, 6), {"x": "X"})  # Saturday
+    assert missing == ["X"]
+
+
+def test_risk_metrics_reference():
+    bars = [PriceBar(trade_date=r[0], close=r[1], volume=r[2]) for r in _rows(35)]
+    m = RiskStateMachine.compute_metrics(bars)
+    closes = [b.close for b in bars]
+    vols = [b.volume for b in bars]
+    ma20 = sum(closes[-20:]) / 20
+    assert m.ma20 == pytest.approx(ma20)
+    assert m.ret_10d == pytest.approx(closes[-1] / closes[-11] - 1)
+    assert m.dd_10d == pytest.approx(min(c / max(closes[-10:][: i + 1]) - 1 for i, c in enumerate(closes[-10:])))
+    assert m.vol_shrink_ratio == pytest.approx(sum(vols[-5:]) / sum(vols[-10:-5]))
+    assert m.below_ma20_3d == all(c < ma20 for c in closes[-3:])
+    assert RiskStateMachine.compute_metrics(bars[:20]) is None
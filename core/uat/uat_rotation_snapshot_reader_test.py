@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+UAT: rotation snapshot 一次查询读取 entry / holding / exit（baseline run_id 进程内只解析一次；日期区间批量读取）
+
+Run:
+  python -m pytest -q core/uat/uat_rotation_snapshot_reader_test.py
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, event
+
+from core.adapters.datasources.cn import rotation_snapshot_source as rss
+from core.adapters.providers import db_rotation_snapshot as drs
+from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider
+from core.adapters.providers.db_query_cache import QueryResultCache
+
+RUN = "RUN_A"
+D1, D2 = "2026-01-08", "2026-01-09"
+
+
+def _provider():
+    eng = create_engine("sqlite://")
+    with eng.begin() as c:
+        c.exec_driver_sql("CREATE TABLE CN_BASELINE_REGISTRY_T (run_id TEXT, baseline_key TEXT, is_active INT)")
+        c.exec_driver_sql(f"INSERT INTO CN_BASELINE_REGISTRY_T VALUES ('{RUN}', 'DEFAULT_BASELINE', 1)")
+        for kind, table in drs.ROTATION_SNAPSHOT_TABLES.items():
+            c.exec_driver_sql(f"CREATE TABLE {table} ({', '.join(drs.ROTATION_KIND_COLUMNS[kind])})")
+
+        def ins(kind, **kw):
+            cols = drs.ROTATION_KIND_COLUMNS[kind]
+            row = {"RUN_ID": RUN, "SECTOR_TYPE": "IND", **kw}
+            c.exec_driver_sql(
+                f"INSERT INTO {drs.ROTATION_SNAPSHOT_TABLES[kind]} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                tuple(row.get(k) for k in cols),
+            )
+
+        for td in (D1, D2):
+            ins("ENTRY", TRADE_DATE=td, SECTOR_ID=12, SECTOR_NAME="B", ENTRY_RANK=2, SIGNAL_SCORE=0.5)
+            ins("ENTRY", TRADE_DATE=td, SECTOR_ID=11, SECTOR_NAME="A", ENTRY_RANK=None, SIGNAL_SCORE=None)
+            ins("ENTRY", TRADE_DATE=td, SECTOR_ID=13, SECTOR_NAME="C", ENTRY_RANK=1, SIGNAL_SCORE=0.9)
+            ins("HOLDING", TRADE_DATE=td, SECTOR_ID=21, SECTOR_NAME="Z", HOLD_DAYS=3, MIN_HOLD_DAYS=5)
+            ins("HOLDING", TRADE_DATE=td, SECTOR_ID=22, SECTOR_NAME="Y", HOLD_DAYS=1, MIN_HOLD_DAYS=5)
+        ins("EXIT", TRADE_DATE=D2, SECTOR_ID=-1, SECTOR_NAME="ALL", SOURCE_JSON='{"reason_code": "NO_EXIT"}')
+        ins("ENTRY", TRADE_DATE="2026-01-10", SECTOR_ID=14, SECTOR_NAME="D", ENTRY_RANK=1)  # outside range
+
+    calls = []
+    event.listen(eng, "before_cursor_execute", lambda *a, **k: calls.append(1))
+    p = DBMySQLMarketProvider.__new__(DBMySQLMarketProvider)  # no MySQL config / network
+    p.mysql_engine = eng
+    p.query_cache = None
+    return p, calls
+
+
+@pytest.fixture
+def ds(monkeypatch):
+    p, calls = _provider()
+    monkeypatch.setattr(rss, "get_db_provider", lambda: p)
+    drs.reset_default_run_id()
+    yield rss.RotationSnapshotDataSource.__new__(rss.RotationSnapshotDataSource), calls
+    drs.reset_default_run_id()
+
+
+def test_rotation_snapshot_single_query_per_date(ds):
+    src, calls = ds
+    blk = src.build_block(D2)
+    assert len(calls) == 2  # baseline run_id + one combined snapshot query
+    src.build_block(D1)
+    assert len(calls) == 3  # run_id memoized
+
+    assert blk["meta"] == {"trade_date": D2, "run_id": RUN, "data_status": "OK"}
+    entry = blk["entry"]["rows"]
+    assert [r["SECTOR_NAME"] for r in entry] == ["C", "B", "A"]  # rank asc, NULL rank last
+    assert list(entry[0]) == drs.ROTATION_KIND_COLUMNS["ENTRY"]
+    assert entry[0]["SIGNAL_SCORE"] == 0.9 and entry[2]["SIGNAL_SCORE"] is None
+    assert [(r["SECTOR_NAME"], r["HOLD_DAYS"]) for r in blk["holding"]["rows"]] == [("Y", 1), ("Z", 3)]
+    assert list(blk["holding"]["rows"][0]) == drs.ROTATION_KIND_COLUMNS["HOLDING"]
+    assert blk["exit"]["rows"] == [] and json.loads(blk["exit"]["summary"]["SOURCE_JSON"])["reason_code"] == "NO_EXIT"
+    json.dumps(blk)  # raw block stays JSON-serializable
+
+    assert src.build_block("2026-01-07")["meta"]["data_status"] == "EMPTY"
+
+
+def test_rotation_snapshot_range_one_query(ds):
+    src, calls = ds
+    blocks = src.build_blocks(D1, D2)
+    assert len(calls) == 2
+    assert sorted(blocks) == [D1, D2]
+    assert blocks[D1]["exit"]["summary"] is None and blocks[D2]["exit"]["summary"] is not None
+    assert blocks[D1]["entry"] == src.build_block(D1)["entry"]
+
+
+def test_rotation_snapshot_query_cache_hit_matches_uncached(tmp_path):
+    pytest.importorskip("pyarrow")
+    p, calls = _provider()
+    uncached = drs.snapshot_records(drs.rotation_snapshots_frame(p, RUN, D1, D2))
+
+    p.query_cache = QueryResultCache(root=str(tmp_path / "qc"), cutoff=lambda: date(2099, 1, 1))
+    miss = drs.rotation_snapshots_frame(p, RUN, D1, D2)
+    n = len(calls)
+    hit = drs.rotation_snapshots_frame(p, RUN, D1, D2)
+    assert len(calls) == n  # served from the cache
+    # compare serialized: 2 vs 2.0 (int column with NULLs widened to float) must count as a difference
+    dumps = [json.dumps(drs.snapshot_records(f), sort_keys=True) for f in (hit, miss)]
+    assert dumps == [json.dumps(uncached, sort_keys=True)] * 2
+    assert [r["ENTRY_RANK"] for r in drs.snapshot_records(hit)[D1]["ENTRY"]] == [1, 2, None]
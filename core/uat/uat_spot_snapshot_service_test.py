@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""UAT: intraday spot snapshots are shared within the staleness window, projected per consumer, and diffable per bucket.
+
+Run:
+    python -m pytest -q core/uat/uat_spot_snapshot_service_test.py
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from core.utils.spot_snapshot_service import SpotSnapshotService
+
+
+class _Clock:
+    def __init__(self):
+        self.now = datetime(2099, 1, 2, 10, 1, 0)
+
+    def __call__(self):
+        return self.now
+
+
+def _fetcher():
+    state = {"calls": 0}
+
+    def fetch():
+        state["calls"] += 1
+        px = 10.0 + (state["calls"] - 1) * 0.1
+        return pd.DataFrame({
+            "代码": ["sz000001", "sh600000", "bj830799"],
+            "最新价": [px, 8.0, 5.0],
+            "成交额": [1e8, 2e8, 3e6],
+            "chg_pct": [1.0, -0.5, 0.0],
+        })
+
+    return fetch, state
+
+
+def test_reuse_projection_and_delta(tmp_path):
+    clock = _Clock()
+    fetch, state = _fetcher()
+    svc = SpotSnapshotService(max_age_s=60, bucket_minutes=5, root=str(tmp_path), fetch_fn=fetch, clock=clock)
+
+    a = svc.get_snapshot("20990102")
+    clock.now += timedelta(seconds=30)
+    b = svc.get_snapshot("20990102")
+    assert state["calls"] == 1 and a is b
+    assert list(a.view(["symbol", "成交额", "missing"]).columns) == ["symbol", "成交额"]
+    assert set(a.view(["symbol"])["symbol"]) == {"000001.SZ", "600000.SH", "830799.BJ"}
+
+    # consumers get independent frames
+    v = a.view(["chg_pct"])
+    v["chg_pct"] = 0.0
+    assert a.view(["chg_pct"])["chg_pct"].tolist() == [1.0, -0.5, 0.0]
+
+    # a fresh service (new process) reuses the bucket file within the window
+    svc2 = SpotSnapshotService(max_age_s=3600, bucket_minutes=5, root=str(tmp_path), fetch_fn=fetch, clock=clock)
+    assert svc2.get_snapshot("20990102").num_rows == 3 and state["calls"] == 1
+
+    # next bucket: stale → refetch; delta only shows the changed row
+    clock.now += timedelta(minutes=5)
+    c = svc.get_snapshot("20990102")
+    assert state["calls"] == 2 and c.bucket == "1005" and svc.previous_snapshot("20990102").bucket == "1000"
+    d = svc.delta("20990102", ["最新价"])
+    assert d["symbol"].tolist() == ["000001.SZ"]
+    assert abs(float(d["最新价"].iloc[0]) - 10.1) < 1e-9
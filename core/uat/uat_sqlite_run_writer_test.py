@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""UAT: run-scoped SQLite writer — L1 rows + L2 publish + run status in one transaction.
+
+Run:
+    python -m pytest -q core/uat/uat_sqlite_run_writer_test.py
+"""
+from __future__ import annotations
+
+import pytest
+
+from core.persistence.sqlite.sqlite_connection import connect_sqlite, ensure_schema_once
+from core.persistence.sqlite.sqlite_l2_publisher import SqliteL2Publisher
+from core.persistence.sqlite.sqlite_run_persistence import SqliteRunPersistence
+from core.persistence.sqlite.sqlite_run_writer import SqliteRunWriter, in_run_transaction
+from core.persistence.sqlite.sqlite_schema import ensure_schema_l2
+from core.persistence.sqlite.sqlite_schema_l1 import ensure_schema_l1
+
+TD = "2099-02-03"
+
+
+def _open(tmp_path):
+    conn = connect_sqlite(str(tmp_path / "ur.db"))
+    for _ in range(2):  # second call is a no-op on the same connection
+        ensure_schema_once(conn, "l1", ensure_schema_l1)
+        ensure_schema_once(conn, "l2", ensure_schema_l2)
+    stmts = []
+    conn.set_trace_callback(stmts.append)
+    return conn, stmts
+
+
+def _persist(conn, run_id, n_factors=5, fail_after_publish=False):
+    rp = SqliteRunPersistence(conn)
+    writer = SqliteRunWriter(conn)
+    with writer.transaction():
+        assert in_run_transaction(conn)
+        writer.add_snapshot(run_id, "internal_snapshot", {"k": 1})
+        writer.add_gate(run_id=run_id, gate="A", drs="NORMAL", frf="NORMAL", action_hint=None, rule_hits=None)
+        for i in range(n_factors):
+            writer.add_factor(run_id, f"f{i}", {"score": i}, factor_version="")
+        writer.flush()
+        SqliteL2Publisher(conn).publish(
+            trade_date=TD,
+            report_kind="EOD",
+            report_text="# report\n",
+            des_payload={
+                "context": {"trade_date": TD, "kind": "EOD", "run_id": run_id},
+                "factors": {},
+                "structure": {},
+                "governance": {"gate": "A"},
+                "rule_trace": {},
+                "meta": {"run_id": run_id},
+            },
+            engine_version="t",
+            meta={"run_id": run_id},
+        )
+        if fail_after_publish:
+            raise RuntimeError("boom")
+        rp.finish_run(run_id, status="COMPLETED")
+    assert not in_run_transaction(conn)
+
+
+def _count(conn, sql, *args):
+    return conn.execute(sql, args).fetchone()[0]
+
+
+def test_run_writer_single_commit_and_audit(tmp_path):
+    conn, stmts = _open(tmp_path)
+    run_id = SqliteRunPersistence(conn).start_run(trade_date=TD, report_kind="EOD", engine_version="t")
+    stmts.clear()
+
+    _persist(conn, run_id, n_factors=12)
+
+    assert sum(s.strip().upper().startswith("COMMIT") for s in stmts) == 1
+    assert sum("PRAGMA TABLE_INFO" in s.upper() for s in stmts) <= 2  # audit + run_meta, once each
+    assert _count(conn, "SELECT COUNT(*) FROM ur_factor_result WHERE run_id=?", run_id) == 12
+    assert _count(conn, "SELECT COUNT(*) FROM ur_report_des_link WHERE trade_date=?", TD) == 1
+    assert conn.execute("SELECT status FROM ur_run_meta WHERE run_id=?", (run_id,)).fetchone()[0] == "COMPLETED"
+    assert _count(conn, "SELECT COUNT(*) FROM ur_persistence_audit WHERE event='AUDIT_HASH'") == 1
+
+
+def test_run_writer_rolls_back_l1_and_l2_together(tmp_path):
+    conn, _ = _open(tmp_path)
+    run_id = SqliteRunPersistence(conn).start_run(trade_date=TD, report_kind="EOD", engine_version="t")
+
+    with pytest.raises(RuntimeError):
+        _persist(conn, run_id, fail_after_publish=True)
+
+    assert _count(conn, "SELECT COUNT(*) FROM ur_factor_result") == 0
+    assert _count(conn, "SELECT COUNT(*) FROM ur_snapshot_raw") == 0
+    assert _count(conn, "SELECT COUNT(*) FROM ur_report_artifact") == 0
+    assert _count(conn, "SELECT COUNT(*) FROM ur_persistence_audit") == 0
+    # run_meta committed before the run transaction survives for FAILED bookkeeping
+    assert conn.execute("SELECT status FROM ur_run_meta WHERE run_id=?", (run_id,)).fetchone()[0] == "STARTED"
+
+    # the connection is usable again (standalone publish path still commits itself)
+    _persist(conn, run_id)
+    assert _count(conn, "SELECT COUNT(*) FROM ur_report_artifact") == 1
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""UAT: concurrent sweep executor checkpoints runs.csv and resumes without rerunning finished combos.
+
+Run:
+    python -m pytest -q core/uat/uat_sweep_exec_resume_test.py
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import contextmanager
+
+from tests.sweep_exec import CheckpointWriter, ExistingRuns, fetch_existing_run_ids, load_checkpoint, run_combos
+
+LOG = logging.getLogger("uat_sweep_exec")
+
+
+class _Conn:
+    autocommit = True
+
+    def rollback(self):
+        pass
+
+
+class _Pool:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.acquired = 0
+
+    @contextmanager
+    def acquire(self):
+        with self.lock:
+            self.acquired += 1
+        yield _Conn()
+
+
+def _rows(n):
+    return [{"run_id": f"R{i}", "ep": 0.9, "xp": 0.5, "xc": 2, "k": 2, "status": "INIT", "error": ""} for i in range(n)]
+
+
+def test_resume_skips_done_and_existing_retries_failed(tmp_path):
+    csv_path = str(tmp_path / "runs.csv")
+    calls = []
+
+    def crashing(conn, row):
+        calls.append(row["run_id"])
+        if row["run_id"] == "R3":
+            raise RuntimeError("ORA-03113: end-of-file on communication channel")
+
+    rows = _rows(6)
+    first = run_combos(pool=_Pool(), rows=rows, call=crashing, checkpoint=CheckpointWriter(csv_path),
+                       logger=LOG, workers=3, existing=ExistingRuns(validated={"R5"}))
+    assert [r["status"] for r in first] == ["OK", "OK", "OK", "FAIL", "OK", "SKIP_EXISTING"]
+    assert sorted(calls) == ["R0", "R1", "R2", "R3", "R4"]
+    saved = load_checkpoint(csv_path)
+    assert list(saved) == [r["run_id"] for r in rows]
+    assert saved["R3"]["status"] == "FAIL" and "ORA-03113" in saved["R3"]["error"]
+
+    calls.clear()
+    second = run_combos(pool=_Pool(), rows=rows, call=lambda conn, row: calls.append(row["run_id"]),
+                        checkpoint=CheckpointWriter(csv_path), logger=LOG, workers=2)
+    assert calls == ["R3"]
+    assert [r["status"] for r in second] == ["SKIP_DONE"] * 3 + ["OK", "SKIP_DONE", "SKIP_DONE"]
+    assert all(r["status"] == "OK" for r in load_checkpoint(csv_path).values())
+
+
+def test_failed_checkpoint_beats_existing_oracle_rows(tmp_path):
+    csv_path = str(tmp_path / "runs.csv")
+    cp = CheckpointWriter(csv_path)
+    # R1 failed mid-write: partial rows exist in Oracle, checkpoint says FAIL
+    cp.append({"run_id": "R1", "status": "FAIL", "error": "ORA-00060"})
+    called = []
+
+    out = run_combos(
+        pool=_Pool(), rows=_rows(3)[1:], call=lambda conn, row: called.append(row["run_id"]),
+        checkpoint=cp, logger=LOG, workers=1, existing=ExistingRuns(validated={"R1", "R2"}, backtested={"R1", "R2"}),
+    )
+    assert called == ["R1"]  # retried, not hidden behind SKIP_EXISTING
+    assert [r["status"] for r in out] == ["OK", "SKIP_EXISTING"]
+    assert load_checkpoint(csv_path)["R1"]["status"] == "OK" and load_checkpoint(csv_path)["R1"]["error"] != "already in Oracle"
+
+
+def test_backtested_but_unvalidated_run_is_revalidated_on_resume(tmp_path):
+    csv_path = str(tmp_path / "runs.csv")
+    full, validated = [], []
+    # R0 interrupted after SP_RUN_SECTOR_ROT_BACKTEST committed: BT_DAILY rows, no validation, no checkpoint
+    out = run_combos(
+        pool=_Pool(), rows=_rows(2), call=lambda conn, row: full.append(row["run_id"]),
+        checkpoint=CheckpointWriter(csv_path), logger=LOG, workers=1,
+        existing=ExistingRuns(backtested={"R0"}), validate=lambda conn, row: validated.append(row["run_id"]),
+    )
+    assert (full, validated) == (["R1"], ["R0"])
+    assert [r["status"] for r in out] == ["OK", "OK"]
+    assert load_checkpoint(csv_path)["R0"]["error"] != "already in Oracle"
+
+
+class _FailingCursor:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, **kw):
+        raise RuntimeError("ORA-00942: table or view does not exist")
+
+
+class _LookupConn:
+    def cursor(self):
+        return _FailingCursor()
+
+
+def test_existing_lookup_failure_is_reported(tmp_path, caplog):
+    found = fetch_existing_run_ids(_LookupConn(), "GRID", LOG)
+    assert found.validated == found.backtested == set() and len(found.errors) == 2
+    with caplog.at_level("INFO", logger=LOG.name):
+        run_combos(pool=_Pool(), rows=_rows(1), call=lambda conn, row: None,
+                   checkpoint=CheckpointWriter(str(tmp_path / "runs.csv")), logger=LOG, existing=found)
+    assert "lookup_failed=2" in caplog.text
@@ -0,0 +1,166 @@
+# core/utils/em_pool_store.py
+# -*- coding: utf-8 -*-
+"""
+UnifiedRisk V12 - 东财涨停池 / 炸板池 本地按日存储
+
+职责：
+    - ak.stock_zt_pool_em(date)      → data/cn/market/em_pool/zt/zt_YYYYMMDD.parquet
+    - ak.stock_zt_pool_zbgc_em(date) → data/cn/market/em_pool/zbgc/zbgc_YYYYMMDD.parquet
+    - 读优先：本地有文件 → 直接读，不联网
+    - 冻结：交易日收盘后（BJ 15:30 之后 / 历史日期）拉到的结果才落盘，落盘后不再覆盖
+      （盘中结果仍会变化，只返回不写）
+    - prefetch_em_pools(): 区间批量预取，回放 / 回填时无需联网
+
+约定：
+    - 空表不落盘：东财瞬时失败也返回空表，冻结后会永久把 count 记为 0；
+      本地 0 行文件（旧版本写入）按未命中处理，下次重新拉取
+    - 拉取失败抛出异常，由调用方决定降级方式
+"""
+
+from __future__ import annotations
+
+import os
+import time as _time
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from core.datasources.datasource_base import DataSourceConfig
+from core.utils.logger import get_logger
+from core.utils.time_utils import now_bj
+from core.utils.trade_calendar import is_trading_day
+
+LOG = get_logger("EmPoolStore")
+
+POOL_KINDS = ("zt", "zbgc")
+FREEZE_AFTER = time(15, 30)
+
+
+def _ak_fetcher(kind: str) -> Callable[[str], pd.DataFrame]:
+    import akshare as ak  # local import: avoid hard dependency at module import time
+
+    return {"zt": ak.stock_zt_pool_em, "zbgc": ak.stock_zt_pool_zbgc_em}[kind]
+
+
+def _date_em(trade_date: str) -> str:
+    return str(trade_date).replace("-", "")
+
+
+def pool_path(kind: str, trade_date: str, root: Optional[str] = None) -> str:
+    if kind not in POOL_KINDS:
+        raise ValueError(f"unknown em pool kind: {kind}")
+    if root is None:
+        cfg = DataSourceConfig(market="cn", ds_name="em_pool")
+        root = os.path.join(cfg.market_root, "em_pool")
+    d = _date_em(trade_date)
+    return os.path.join(root, kind, f"{kind}_{d}.parquet")
+
+
+def is_date_closed(trade_date: str, now: Optional[datetime] = None) -> bool:
+    """历史日期，或当日 BJ 15:30 之后：池子不再变化，可冻结。"""
+    now = now or now_bj()
+    d = datetime.strptime(_date_em(trade_date), "%Y%m%d").date()
+    today = now.date()
+    return d < today or (d == today and now.time() >= FREEZE_AFTER)
+
+
+def read_pool(kind: str, trade_date: str, root: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """本地冻结文件；不存在 / 0 行 / 读取失败 → None。"""
+    path = pool_path(kind, trade_date, root)
+    if not os.path.exists(path):
+        return None
+    try:
+        df = pd.read_parquet(path)
+    except Exception as e:
+        LOG.warning("[EmPoolStore] 读取失败 %s: %s", path, e)
+        return None
+    if df.empty:
+        LOG.debug("[EmPoolStore] empty frozen pool treated as miss: %s", path)
+        return None
+    return df
+
+
+def _write_pool(df: pd.DataFrame, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    df.reset_index(drop=True).to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def get_pool(
+    kind: str,
+    trade_date: str,
+    *,
+    allow_fetch: bool = True,
+    root: Optional[str] = None,
+    fetch_fn: Optional[Callable[[str], pd.DataFrame]] = None,
+    now: Optional[datetime] = None,
+) -> Tuple[Optional[pd.DataFrame], str]:
+    """
+    返回 (df, source)；source ∈ {"cache", "fetch", "fetch_unfrozen", "fetch_empty", "miss"}。
+    fetch_empty：拉到空表（无法区分“无涨停”与瞬时失败），原样返回但不冻结。
+    allow_fetch=False：只读本地（离线回放）。
+    """
+    df = read_pool(kind, trade_date, root)
+    if df is not None:
+        return df, "cache"
+    if not allow_fetch:
+        return None, "miss"
+
+    fetch = fetch_fn or _ak_fetcher(kind)
+    df = fetch(_date_em(trade_date))
+    if df is None:
+        return None, "fetch"
+    if df.empty:
+        return df, "fetch_empty"
+
+    if not is_date_closed(trade_date, now):
+        return df, "fetch_unfrozen"
+
+    path = pool_path(kind, trade_date, root)
+    try:
+        _write_pool(df, path)
+        LOG.info("[EmPoolStore] frozen %s %s rows=%s -> %s", kind, trade_date, len(df), path)
+    except Exception as e:
+        LOG.error("[EmPoolStore] 保存失败 %s: %s", path, e)
+    return df, "fetch"
+
+
+def iter_trading_days(start: date, end: date) -> Iterable[date]:
+    d = start
+    while d <= end:
+        if is_trading_day(d):
+            yield d
+        d += timedelta(days=1)
+
+
+def prefetch_em_pools(
+    start: date,
+    end: date,
+    *,
+    kinds: Iterable[str] = POOL_KINDS,
+    root: Optional[str] = None,
+    sleep_s: float = 0.0,
+    fetch_fns: Optional[Dict[str, Callable[[str], pd.DataFrame]]] = None,
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """区间预取：已冻结的日期跳过；返回 {cached, fetched, unfrozen, empty, failed}（empty 下次重试）。"""
+    stats = {"cached": 0, "fetched": 0, "unfrozen": 0, "empty": 0, "failed": 0}
+    kinds = list(kinds)
+    for d in iter_trading_days(start, end):
+        td = d.strftime("%Y%m%d")
+        for kind in kinds:
+            if read_pool(kind, td, root) is not None:
+                stats["cached"] += 1
+                continue
+            try:
+                _, source = get_pool(kind, td, root=root, fetch_fn=(fetch_fns or {}).get(kind), now=now)
+            except Exception as e:
+                stats["failed"] += 1
+                LOG.warning("[EmPoolStore] prefetch failed kind=%s date=%s: %s", kind, td, e)
+                continue
+            stats[{"fetch_unfrozen": "unfrozen", "fetch_empty": "empty"}.get(source, "fetched")] += 1
+            if sleep_s > 0:
+                _time.sleep(sleep_s)
+    return stats
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+UnifiedRisk V12 - 盘中宽度 / 成交额增量聚合（按 spot 快照差量更新）
+
+daemon 每个 tick 的盘中数据源（amount_intraday / market_sentiment_intraday /
+market_sentiment INTRADAY）原先都对 5000+ 行全行情重新统计 adv/dec/flat、
+涨跌停数与成交额。这里常驻：
+    - 每个 symbol 的上次状态（chg_pct / 涨跌停阈值 / 成交额 / 交易所）
+    - 全市场计数器（adv / dec / flat / limit_up / limit_down / 成交额 sh/sz/bj）
+新快照到来时只对变化（新增 / 消失）的行做 -旧 +新，计数器更新为 O(changes)；
+同一快照（bucket + fetched_at）被多个数据源请求时直接复用结果。
+每应用一份快照记一个时间点（同一 bucket 覆盖），形成盘中宽度 / 成交额时间序列。
+
+约定：
+    - 快照来自 SpotSnapshotService（refresh_mode == "full" 的盘中路径）
+    - 涨跌停阈值与 MarketSentimentDataSource 一致：300/301/688/689 → 20%，
+      8 / 43 / 83 / 87 → 30%，其它 10%；主板 ST（名称 *ST / ST 前缀）→ 5%
+    - chg_pct 单位逐快照判定（max|chg| <= 1 视为比例 ×100）；一旦出现 max|chg| > 1
+      即锁定为百分比直到换日；单位变化时全部行按新单位重新计数
+    - 缺 symbol / chg_pct 列时返回 None，由调用方回退全量统计
+    - 数据源统一经 intraday_summary() 取用（同一快照对所有数据源"可用"判定一致）
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.utils.logger import get_logger
+from core.utils.spot_snapshot_service import SpotSnapshot, SpotSnapshotService, get_spot_service
+
+LOG = get_logger("SpotAggregator")
+
+AMOUNT_COL = "成交额"
+SPOT_AGG_COLUMNS = ("symbol", "name", "chg_pct", AMOUNT_COL)
+
+BOARD20_PREFIX = ("300", "301", "688", "689")
+BOARD30_PREFIX = ("8", "43", "83", "87")
+LIMIT_PCT_DEFAULT = 10.0
+LIMIT_PCT_20 = 20.0
+LIMIT_PCT_30 = 30.0
+LIMIT_PCT_ST = 5.0
+LIMIT_TOL = 0.05
+NAIVE_LIMIT_PCT = 9.9  # 旧版 intraday 源的统一 ±9.9% 阈值
+
+COUNTER_KEYS = (
+    "adv", "dec", "flat",
+    "limit_up", "limit_down",
+    "limit_up_naive", "limit_down_naive",
+    "bad_symbol",
+)
+EXCHANGES = ("SH", "SZ", "BJ")
+
+_SYM6 = re.compile(r"(\d{6})")
+
+# per-symbol state: (chg_pct, limit_pct, amount 元, exchange, bad_symbol)
+_SymState = Tuple[float, float, float, str, bool]
+
+
+def limit_pct_for(symbol: str, name: Any = None) -> Tuple[float, bool]:
+    """(涨跌停幅度 %, symbol 是否无法解析)；规则同 MarketSentimentDataSource.build_intraday_block。"""
+    m = _SYM6.search(str(symbol))
+    if m is None:
+        return LIMIT_PCT_DEFAULT, True
+    code = m.group(1)
+    if code.startswith(BOARD20_PREFIX):
+        return LIMIT_PCT_20, False
+    if code.startswith(BOARD30_PREFIX):
+        return LIMIT_PCT_30, False
+    if isinstance(name, str):
+        nm = name.strip().upper()
+        if nm.startswith("*ST") or nm.startswith("ST"):
+            return LIMIT_PCT_ST, False
+    return LIMIT_PCT_DEFAULT, False
+
+
+class _DayState:
+    def __init__(self, trade_date: str) -> None:
+        self.trade_date = trade_date
+        self.symbols: Dict[str, _SymState] = {}
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTER_KEYS, 0)
+        self.amount: Dict[str, float] = dict.fromkeys(EXCHANGES, 0.0)
+        self.frame: Optional[pd.DataFrame] = None  # 上次应用的快照（index=symbol）
+        self.last_key: Optional[Tuple[str, datetime]] = None
+        self.scale: Optional[float] = None
+        self.scale_locked = False  # 已见过 max|chg| > 1：百分比单位，当日不再判定
+        self.has_name = False
+        self.series: List[Dict[str, Any]] = []
+
+    # ------------------------------------------------------------
+    def _bump(self, st: _SymState, sign: int) -> None:
+        chg, limit_pct, amount, exch, bad = st
+        c = self.counters
+        if chg == chg:  # NaN 不计入 adv / dec / flat（与向量化比较一致）
+            if chg > 0:
+                c["adv"] += sign
+            elif chg < 0:
+                c["dec"] += sign
+            else:
+                c["flat"] += sign
+            if chg >= limit_pct - LIMIT_TOL:
+                c["limit_up"] += sign
+            elif chg <= -(limit_pct - LIMIT_TOL):
+                c["limit_down"] += sign
+            if chg >= NAIVE_LIMIT_PCT:
+                c["limit_up_naive"] += sign
+            elif chg <= -NAIVE_LIMIT_PCT:
+                c["limit_down_naive"] += sign
+        if bad:
+            c["bad_symbol"] += sign
+        if exch in self.amount:
+            self.amount[exch] += sign * amount
+
+    def remove(self, symbol: str) -> None:
+        st = self.symbols.pop(symbol, None)
+        if st is not None:
+            self._bump(st, -1)
+
+    def put(self, symbol: str, chg: float, amount: float, name: Any) -> None:
+        self.remove(symbol)
+        limit_pct, bad = limit_pct_for(symbol, name)
+        exch = symbol.rsplit(".", 1)[-1].upper() if "." in symbol else ""
+        st = (chg, limit_pct, amount, exch, bad)
+        self.symbols[symbol] = st
+        self._bump(st, +1)
+
+    # ------------------------------------------------------------
+    def summary(self) -> Dict[str, Any]:
+        c = self.counters
+        total = c["adv"] + c["dec"] + c["flat"]
+        sh, sz, bj = (round(self.amount[x] / 1e8, 2) for x in EXCHANGES)
+        bucket, fetched_at = self.last_key if self.last_key else (None, None)
+        return {
+            "trade_date": self.trade_date,
+            "bucket": bucket,
+            "fetched_at": fetched_at.isoformat(timespec="seconds") if fetched_at else None,
+            **c,
+            "total": total,
+            "n_symbols": len(self.symbols),
+            "ratio_unit": self.scale == 100.0,
+            "has_name": self.has_name,
+            "amount": {"sh": sh, "sz": sz, "bj": bj, "total": round(sh + sz + bj, 2)},
+        }
+
+
+class IntradaySpotAggregator:
+    """进程内常驻的盘中宽度 / 成交额计数器（线程安全；只保留最近一个交易日）。"""
+
+    def __init__(self, service: Optional[SpotSnapshotService] = None) -> None:
+        self._service = service
+        self._lock = threading.Lock()
+        self._day: Optional[_DayState] = None
+
+    def service(self) -> SpotSnapshotService:
+        return self._service if self._service is not None else get_spot_service()
+
+    # ------------------------------------------------------------
+    def refresh(self, trade_date: str) -> Optional[Dict[str, Any]]:
+        """取当前 spot 快照并增量应用；快照不可用或缺必需列时返回 None。"""
+        snap = self.service().get_snapshot(trade_date)
+        if snap is None:
+            return None
+        return self.apply(snap)
+
+    def apply(self, snap: SpotSnapshot) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            day = self._day
+            if day is None or day.trade_date != snap.trade_date:
+                day = _DayState(snap.trade_date)
+            key = (snap.bucket, snap.fetched_at)
+            if day.last_key == key:
+                return day.summary()
+
+            df = snap.view(SPOT_AGG_COLUMNS)
+            if "symbol" not in df.columns or "chg_pct" not in df.columns:
+                LOG.warning("[SpotAggregator] spot missing symbol/chg_pct columns=%s", list(df.columns))
+                return None
+            changed = self._apply_frame(day, df)
+            day.last_key = key
+            self._day = day
+
+            point = {k: v for k, v in day.summary().items() if k not in ("trade_date", "has_name", "ratio_unit")}
+            point["changed"] = changed
+            if day.series and day.series[-1]["bucket"] == snap.bucket:
+                day.series[-1] = point
+            else:
+                day.series.append(point)
+            LOG.debug("[SpotAggregator] %s %s changed=%s symbols=%s", snap.trade_date, snap.bucket, changed, len(day.symbols))
+            return day.summary()
+
+    @staticmethod
+    def _apply_frame(day: _DayState, df: pd.DataFrame) -> int:
+        df = df.assign(symbol=df["symbol"].astype(str))
+        df = df.drop_duplicates("symbol", keep="last").set_index("symbol")
+        chg = pd.to_numeric(df["chg_pct"], errors="coerce")
+        scale = day.scale
+        if not day.scale_locked:
+            # 全平 / 全 NaN 的开盘快照无法区分单位，不能据此锁定整日
+            max_abs = chg.abs().max()
+            day.scale_locked = bool(max_abs == max_abs and float(max_abs) > 1.0)
+            scale = 1.0 if day.scale_locked else 100.0
+        rescaled = day.scale is not None and scale != day.scale
+        day.scale = scale
+        day.has_name = "name" in df.columns
+        cur = pd.DataFrame(
+            {
+                "chg_pct": chg * scale,
+                "amount": pd.to_numeric(df[AMOUNT_COL], errors="coerce").fillna(0.0) if AMOUNT_COL in df.columns else 0.0,
+                "name": df["name"] if "name" in df.columns else None,
+            },
+            index=df.index,
+        )
+
+        prev = day.frame
+        if prev is not None:
+            for sym in prev.index.difference(cur.index):
+                day.remove(sym)
+        if prev is None or rescaled:
+            mask = np.ones(len(cur), dtype=bool)
+        else:
+            # 向量化对齐找出变化行；计数器只对这些行做 -旧 +新
+            old = prev.reindex(cur.index)
+            mask = ~cur.index.isin(prev.index)
+            for col in ("chg_pct", "amount", "name"):
+                a, b = cur[col], old[col]
+                mask |= ~((a == b) | (a.isna() & b.isna())).to_numpy()
+
+        rows = cur[mask]
+        for sym, c, amt, name in zip(rows.index, rows["chg_pct"].to_numpy(), rows["amount"].to_numpy(), rows["name"].to_numpy()):
+            day.put(sym, float(c), float(amt), name)
+        day.frame = cur
+        return int(mask.sum())
+
+    # ------------------------------------------------------------
+    def summary(self, trade_date: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            day = self._day
+            return day.summary() if day is not None and day.trade_date == trade_date else None
+
+    def series(self, trade_date: str) -> List[Dict[str, Any]]:
+        """当日已应用快照的时间序列（每 bucket 一点，时间升序）。"""
+        with self._lock:
+            day = self._day
+            return [dict(p) for p in day.series] if day is not None and day.trade_date == trade_date else []
+
+    def clear(self) -> None:
+        with self._lock:
+            self._day = None
+
+
+_AGGREGATOR: Optional[IntradaySpotAggregator] = None
+_AGGREGATOR_LOCK = threading.Lock()
+
+
+def get_intraday_aggregator() -> IntradaySpotAggregator:
+    global _AGGREGATOR
+    with _AGGREGATOR_LOCK:
+        if _AGGREGATOR is None:
+            _AGGREGATOR = IntradaySpotAggregator()
+        return _AGGREGATOR
+
+
+def summary_usable(summary: Optional[Dict[str, Any]]) -> bool:
+    """快照可用：至少一个 symbol 且至少一个有效 chg_pct（adv + dec + flat > 0）。"""
+    return bool(summary) and int(summary.get("n_symbols") or 0) > 0 and int(summary.get("total") or 0) > 0
+
+
+def intraday_summary(trade_date: str) -> Optional[Dict[str, Any]]:
+    """盘中数据源入口：refresh() 的 summary；失败或快照不可用时返回 None，调用方回退全量统计。"""
+    try:
+        summary = get_intraday_aggregator().refresh(trade_date)
+    except Exception as e:
+        LOG.warning("[SpotAggregator] refresh failed, fallback to full scan: %s", e)
+        return None
+    return summary if summary_usable(summary) else None
@@ -7,16 +7,53 @@ UnifiedRisk V12 - Logging Utility
 - 控制台输出
 - 文件输出（按 market + mode 自动命名）
 - 所有模块共享同一 logging 配置
+- 非阻塞：root 只挂一个 QueueHandler，console / file / jsonl 由 QueueListener 后台线程写出
+- 子系统级别：config.yaml logging.levels（logger 名前缀 → level，最长前缀优先）
+- 结构化 sink（可选）：JSON-lines，每行带 run_id / stage（set_log_context / log_context）
+- 子进程（ProcessPoolExecutor worker）：initializer=init_worker_logging, initargs=worker_logging_args()，
+  worker 的 root 只挂一个指向 multiprocessing 队列的 QueueHandler，由父进程的 listener 写到同一组 sink
+
+约定：日志调用一律 %-style 惰性格式化（LOG.debug("x=%s", x)），禁止 f-string / .format，
+级别关闭时不产生任何字符串拼接。core/uat/uat_logging_pipeline_test.py 对所有级别检查；
+尚未迁移的旧模块列在其 LEGACY_EAGER_LOGGING 中，只检查 DEBUG。
 """
 
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
+import multiprocessing
 import os
+import queue
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Any, Dict, Optional
 
 # 全局 logger registry
 _LOGGERS = {}
 _LOG_DIR = None
 
+# 子系统级别（logger 名前缀 → level）与默认级别
+_LEVELS: Dict[str, int] = {}
+_DEFAULT_LEVEL = logging.INFO
+
+_LISTENER: Optional[logging.handlers.QueueListener] = None
+
+# 子进程日志：进程内只建一个 multiprocessing 队列（常驻 worker 一直持有它），
+# listener 随 setup_logging / stop_logging 重建，写入当前这组 sink
+_WORKER_QUEUE: Any = None
+_WORKER_LISTENER: Optional[logging.handlers.QueueListener] = None
+
+_FMT = "[%(asctime)s] [%(name)s] (%(levelname)s) %(message)s"
+_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+# run / stage 上下文（contextvars：线程 / asyncio 各自独立）
+_RUN_ID: contextvars.ContextVar = contextvars.ContextVar("ur_log_run_id", default=None)
+_STAGE: contextvars.ContextVar = contextvars.ContextVar("ur_log_stage", default=None)
+_UNSET = object()
+
 
 # ==============================================================
 #  获取 logger （V12 统一接口）
@@ -24,32 +61,221 @@ _LOG_DIR = None
 def get_logger(name: str) -> logging.Logger:
     """
     获取 logger，如果不存在则创建。
+    级别按 logging.levels 最长前缀匹配（未配置 → logging.level，默认 INFO）。
     """
     if name in _LOGGERS:
         return _LOGGERS[name]
 
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    logger.setLevel(_level_for(name))
     _LOGGERS[name] = logger
     return logger
 
 
+def _level_for(name: str) -> int:
+    best, level = -1, _DEFAULT_LEVEL
+    for prefix, lvl in _LEVELS.items():
+        if (name == prefix or name.startswith(prefix + ".")) and len(prefix) > best:
+            best, level = len(prefix), lvl
+    return level
+
+
+def _parse_level(value: Any, default: int = logging.INFO) -> int:
+    if isinstance(value, int):
+        return value
+    lvl = logging.getLevelName(str(value or "").strip().upper())
+    return lvl if isinstance(lvl, int) else default
+
+
+def configure_levels(default: Any = None, levels: Optional[Dict[str, Any]] = None) -> None:
+    """设置默认级别与子系统级别，并应用到已创建的 logger。"""
+    global _DEFAULT_LEVEL, _LEVELS
+    if default is not None:
+        _DEFAULT_LEVEL = _parse_level(default)
+    if levels is not None:
+        _LEVELS = {str(k): _parse_level(v, _DEFAULT_LEVEL) for k, v in levels.items()}
+    for name, logger in _LOGGERS.items():
+        logger.setLevel(_level_for(name))
+    # 直接 logging.getLogger(__name__) 的模块未显式设级别 → 继承前缀 logger
+    for prefix, lvl in _LEVELS.items():
+        if prefix not in _LOGGERS:
+            logging.getLogger(prefix).setLevel(lvl)
+
+
+# ==============================================================
+#  run_id / stage 上下文
+# ==============================================================
+def get_log_context() -> Dict[str, Any]:
+    """当前上下文的 {run_id, stage}（跨进程提交任务时随任务带走）。"""
+    return {"run_id": _RUN_ID.get(), "stage": _STAGE.get()}
+
+
+def set_log_context(run_id: Any = _UNSET, stage: Any = _UNSET) -> None:
+    """设置当前上下文的 run_id / stage（写入之后的每条日志记录）。"""
+    if run_id is not _UNSET:
+        _RUN_ID.set(run_id)
+    if stage is not _UNSET:
+        _STAGE.set(stage)
+
+
+@contextmanager
+def log_context(run_id: Any = _UNSET, stage: Any = _UNSET):
+    """with log_context(stage="persist"): ...  —— 退出时恢复原值。"""
+    tokens = []
+    if run_id is not _UNSET:
+        tokens.append((_RUN_ID, _RUN_ID.set(run_id)))
+    if stage is not _UNSET:
+        tokens.append((_STAGE, _STAGE.set(stage)))
+    try:
+        yield
+    finally:
+        for var, tok in reversed(tokens):
+            var.reset(tok)
+
+
+class _ContextFilter(logging.Filter):
+    """在调用线程上给 record 打 run_id / stage（contextvars 只能在产生日志的线程读取）。"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = _RUN_ID.get()
+        record.stage = _STAGE.get()
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """一条记录一行 JSON：ts / level / logger / msg / run_id / stage / module / line / exc。"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "run_id": getattr(record, "run_id", None),
+            "stage": getattr(record, "stage", None),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    入队前只做 msg % args 与异常文本化（record 可跨线程），
+    不套 Formatter：各下游 handler 仍按自己的格式输出。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _logging_cfg() -> Dict[str, Any]:
+    try:
+        from core.utils.config_loader import load_config
+
+        cfg = (load_config() or {}).get("logging") or {}
+        return cfg if isinstance(cfg, dict) else {}
+    except Exception:
+        return {}
+
+
+def _start_worker_listener() -> None:
+    global _WORKER_LISTENER
+    if _WORKER_QUEUE is None or _LISTENER is None or _WORKER_LISTENER is not None:
+        return
+    _WORKER_LISTENER = logging.handlers.QueueListener(_WORKER_QUEUE, *_LISTENER.handlers, respect_handler_level=True)
+    _WORKER_LISTENER.start()
+
+
+def worker_logging_args() -> tuple:
+    """
+    父进程侧：init_worker_logging 的 initargs。
+    queue 模式下返回 multiprocessing 队列（并确保父进程在消费它）；
+    非 queue 模式返回 None，fork 出的 worker 沿用继承的 file / console handler。
+    """
+    global _WORKER_QUEUE
+    if _LISTENER is not None and _WORKER_QUEUE is None:
+        _WORKER_QUEUE = multiprocessing.Queue()
+    _start_worker_listener()
+    q = _WORKER_QUEUE if _LISTENER is not None else None
+    return (q, _DEFAULT_LEVEL, dict(_LEVELS))
+
+
+def init_worker_logging(q: Any, default_level: int, levels: Dict[str, int]) -> None:
+    """
+    子进程侧（ProcessPoolExecutor initializer）：
+    fork 继承的 root QueueHandler 指向父进程的内存队列，子进程里没有 listener，日志会被丢弃；
+    这里换成指向 multiprocessing 队列的 QueueHandler，并同步级别配置（spawn 时不继承）。
+    """
+    configure_levels(default=default_level, levels=levels)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(default_level)
+    if q is None:
+        return
+    root_logger.handlers.clear()
+    qh = _QueueHandler(q)
+    qh.addFilter(_ContextFilter())
+    root_logger.addHandler(qh)
+
+
+def stop_logging() -> None:
+    """停止 QueueListener（flush 队列中剩余记录）；atexit 自动调用。"""
+    global _LISTENER, _WORKER_LISTENER
+    worker_listener, _WORKER_LISTENER = _WORKER_LISTENER, None
+    if worker_listener is not None:
+        try:
+            worker_listener.stop()
+        except Exception:
+            pass
+    listener, _LISTENER = _LISTENER, None
+    if listener is not None:
+        try:
+            listener.stop()
+        except Exception:
+            pass
+        for h in listener.handlers:
+            try:
+                h.close()
+            except Exception:
+                pass
+
+
 # ==============================================================
 #  主初始化：setup_logging（你当前项目缺少的关键函数）
 # ==============================================================
-def setup_logging(market: str, mode: str):
+def setup_logging(market: str, mode: str, cfg: Optional[Dict[str, Any]] = None, logs_dir: Optional[str] = None):
     """
     初始化 logging：
     - 生成 logs 目录
-    - 创建 log file handler
+    - 创建 log file handler（+ 可选 jsonl handler）
     - 设置 console handler
-    - 所有 logger 共用 root handler
+    - 所有 logger 共用 root handler（queue=true 时为单个 QueueHandler）
+
+    cfg 缺省读 config.yaml 的 logging 段：
+        level: INFO
+        queue: true
+        levels: {"DS": "WARNING", ...}
+        jsonl: {enabled: false}
     """
 
-    global _LOG_DIR
+    global _LOG_DIR, _LISTENER
+
+    cfg = _logging_cfg() if cfg is None else (cfg or {})
 
-    root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-    logs_dir = os.path.join(root_dir, "logs")
+    if logs_dir is None:
+        root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        logs_dir = os.path.join(root_dir, "logs")
     os.makedirs(logs_dir, exist_ok=True)
 
     # log path 格式：logs/cn_ashare_daily_2025-12-08-153000.log
@@ -59,53 +285,74 @@ def setup_logging(market: str, mode: str):
 
     _LOG_DIR = logs_dir
 
+    configure_levels(default=cfg.get("level", "INFO"), levels=cfg.get("levels") or {})
+
     # ----------------------------------------------------------
     # 创建 root logger（V12 推荐方式）
     # ----------------------------------------------------------
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
+    root_logger.setLevel(_DEFAULT_LEVEL)
 
-    # 清空旧 handler（防止重复输出）
+    # 清空旧 handler（防止重复输出），并停掉上一次的 listener
+    stop_logging()
     if root_logger.handlers:
         root_logger.handlers.clear()
 
+    fmt = logging.Formatter(_FMT, _DATEFMT)
+
     # ----------------------------------------------------------
-    # File Handler
+    # File Handler / Console Handler
+    # 级别由各 logger 决定（子系统可单独开 DEBUG），handler 不再二次过滤
     # ----------------------------------------------------------
     file_handler = logging.FileHandler(log_path, encoding="utf-8")
-    file_handler.setLevel(logging.INFO)
-    file_fmt = logging.Formatter(
-        "[%(asctime)s] [%(name)s] (%(levelname)s) %(message)s",
-        "%Y-%m-%d %H:%M:%S",
-    )
-    file_handler.setFormatter(file_fmt)
+    file_handler.setFormatter(fmt)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(fmt)
+
+    handlers = [file_handler, console_handler]
 
     # ----------------------------------------------------------
-    # Console Handler
+    # JSON-lines sink（可选，便于事后按 run_id / stage 检索）
     # ----------------------------------------------------------
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_fmt = logging.Formatter(
-        "[%(asctime)s] [%(name)s] (%(levelname)s) %(message)s",
-        "%Y-%m-%d %H:%M:%S",
-    )
-    console_handler.setFormatter(console_fmt)
+    jsonl_cfg = cfg.get("jsonl") or {}
+    jsonl_path = None
+    if isinstance(jsonl_cfg, dict) and jsonl_cfg.get("enabled"):
+        jsonl_path = os.path.join(logs_dir, f"{market}_{mode}_{timestamp}.jsonl")
+        jsonl_handler = logging.FileHandler(jsonl_path, encoding="utf-8")
+        jsonl_handler.setFormatter(JsonLinesFormatter())
+        jsonl_handler.setLevel(_parse_level(jsonl_cfg.get("level", "NOTSET"), logging.NOTSET))
+        handlers.append(jsonl_handler)
 
     # ----------------------------------------------------------
     # 将 handler 添加到 root
     # ----------------------------------------------------------
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    context_filter = _ContextFilter()
+    if cfg.get("queue", True):
+        q: "queue.SimpleQueue" = queue.SimpleQueue()
+        qh = _QueueHandler(q)
+        qh.addFilter(context_filter)
+        root_logger.addHandler(qh)
+        _LISTENER = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+        _LISTENER.start()
+        _start_worker_listener()
+    else:
+        for h in handlers:
+            h.addFilter(context_filter)
+            root_logger.addHandler(h)
 
     # ----------------------------------------------------------
     # 初始化完成日志
     # ----------------------------------------------------------
     logger = get_logger("Logger")
-    logger.info("Logging initialized: %s", log_path)
+    logger.info("Logging initialized: %s jsonl=%s", log_path, jsonl_path)
 
     return log_path
 
 
+atexit.register(stop_logging)
+
+
 # ==============================================================
 # 方便外部模块获取当前 log 目录
 # ==============================================================
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Rolling indicators on sorted daily series (NumPy, one vectorized pass).
+
+约定：
+- 输入序列按 trade_date 升序，一行一个交易日
+- include_current=False：窗口为 [i-window, i)（不含当日，EPR high_60d / vol_ma20）
+- include_current=True ：窗口为 [i-window+1, i]（含当日，position governance ma20）
+- 历史不足 window 行的位置为 NaN
+- 日期统一转为 ordinal（int64）后用 searchsorted 定位，O(log n)
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def date_ordinals(dates: Iterable[date]) -> np.ndarray:
+    """date / datetime → int64 ordinal array (searchsorted key)."""
+    return np.fromiter(
+        ((d.date() if hasattr(d, "date") else d).toordinal() for d in dates),
+        dtype=np.int64,
+    )
+
+
+def _windows(values: np.ndarray, window: int, include_current: bool) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """(out, view): out[k] ← reduce(view[k]) where view[k] is the window ending at row k(+1)."""
+    x = np.asarray(values, dtype=float)
+    out = np.full(x.shape[0], np.nan)
+    w = int(window)
+    if w <= 0 or x.shape[0] < w + (0 if include_current else 1):
+        return out, None
+    src = x if include_current else x[:-1]
+    return out, sliding_window_view(src, w)
+
+
+def rolling_max(values: np.ndarray, window: int, include_current: bool = False) -> np.ndarray:
+    out, view = _windows(values, window, include_current)
+    if view is not None:
+        out[int(window) - (1 if include_current else 0):] = view.max(axis=1)
+    return out
+
+
+def rolling_min(values: np.ndarray, window: int, include_current: bool = False) -> np.ndarray:
+    out, view = _windows(values, window, include_current)
+    if view is not None:
+        out[int(window) - (1 if include_current else 0):] = view.min(axis=1)
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int, include_current: bool = False) -> np.ndarray:
+    out, view = _windows(values, window, include_current)
+    if view is not None:
+        out[int(window) - (1 if include_current else 0):] = view.sum(axis=1) / float(window)
+    return out
@@ -0,0 +1,270 @@
+# core/utils/spot_snapshot_service.py
+# -*- coding: utf-8 -*-
+"""
+UnifiedRisk V12 - 盘中 A 股全行情快照服务（多数据源共享）
+
+职责：
+    - 盘中 ak.stock_zh_a_spot() 全市场拉取，每个时间桶（bucket_minutes）一份 parquet：
+        data/cn/market/spot/intraday/YYYYMMDD/zh_spot_YYYYMMDD_HHMM.parquet
+    - max_age_s 内的重复请求直接复用最近一份快照（内存 → 磁盘），不再重复下载 5000+ 行
+    - 快照以 Arrow Table 不可变持有；消费方通过 view(columns) 拿列裁剪后的独立 DataFrame，
+      互相之间不共享可变对象
+    - delta(): 相对上一个时间桶发生变化（或新增）的行
+
+约定：
+    - symbol 列标准化为 000001.SZ / 600000.SH / 830799.BJ（与 SpotStore 一致）
+    - pyarrow 缺失时退化为 DataFrame 持有 + 列裁剪 copy
+    - 拉取失败返回 None，由调用方给出 neutral block
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover - optional dependency
+    pa = None
+
+from core.datasources.datasource_base import DataSourceConfig
+from core.utils.logger import get_logger
+from core.utils.time_utils import now_bj
+
+LOG = get_logger("SpotSnapshot")
+
+DEFAULT_MAX_AGE_S = 60.0
+DEFAULT_BUCKET_MINUTES = 5
+_FETCHED_AT_KEY = b"fetched_at"
+
+
+def _default_fetch() -> pd.DataFrame:
+    import akshare as ak
+
+    return ak.stock_zh_a_spot()
+
+
+def normalize_spot_symbols(df: pd.DataFrame) -> pd.DataFrame:
+    """'代码' → 'symbol'（000001.SZ）；失败只记日志。"""
+    if "代码" in df.columns and "symbol" not in df.columns:
+        from core.adapters.cache.symbol_cache import normalize_ashare_symbol
+
+        try:
+            df = df.assign(symbol=df["代码"].map(normalize_ashare_symbol))
+        except Exception as e:
+            LOG.error("[SpotSnapshot] symbol 标准化失败: %s", e)
+    return df
+
+
+@dataclass(frozen=True)
+class SpotSnapshot:
+    trade_date: str
+    bucket: str               # HHMM（时间桶起点）
+    fetched_at: datetime
+    data: object              # pa.Table（或 pyarrow 缺失时的 DataFrame）
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.data.column_names) if pa is not None and isinstance(self.data, pa.Table) else list(self.data.columns)
+
+    @property
+    def num_rows(self) -> int:
+        return int(self.data.num_rows) if pa is not None and isinstance(self.data, pa.Table) else int(len(self.data))
+
+    def view(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """列裁剪后的独立 DataFrame；不存在的列忽略（由调用方自行校验必需列）。"""
+        cols = self.columns if columns is None else [c for c in dict.fromkeys(columns) if c in self.columns]
+        if pa is not None and isinstance(self.data, pa.Table):
+            return self.data.select(cols).to_pandas()
+        return self.data[cols].copy()
+
+    def age_s(self, now: datetime) -> float:
+        return (now - self.fetched_at).total_seconds()
+
+
+class SpotSnapshotService:
+    """进程内共享的盘中 spot 快照（线程安全；同一时刻只有一个下载在进行）。"""
+
+    def __init__(
+        self,
+        *,
+        max_age_s: float = DEFAULT_MAX_AGE_S,
+        bucket_minutes: int = DEFAULT_BUCKET_MINUTES,
+        root: Optional[str] = None,
+        fetch_fn: Callable[[], pd.DataFrame] = _default_fetch,
+        clock: Callable[[], datetime] = now_bj,
+    ) -> None:
+        self.max_age_s = float(max_age_s)
+        self.bucket_minutes = max(int(bucket_minutes), 1)
+        self._root = root
+        self._fetch = fetch_fn
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._latest: Dict[str, SpotSnapshot] = {}
+        self._previous: Dict[str, SpotSnapshot] = {}
+
+    # ------------------------------------------------------------
+    def root(self) -> str:
+        if self._root is None:
+            cfg = DataSourceConfig(market="cn", ds_name="spot")
+            self._root = os.path.join(cfg.market_root, "spot", "intraday")
+        return self._root
+
+    def bucket_of(self, ts: datetime) -> str:
+        minute = (ts.minute // self.bucket_minutes) * self.bucket_minutes
+        return f"{ts.hour:02d}{minute:02d}"
+
+    def bucket_path(self, trade_date: str, bucket: str) -> str:
+        return os.path.join(self.root(), trade_date, f"zh_spot_{trade_date}_{bucket}.parquet")
+
+    def _list_buckets(self, trade_date: str) -> List[str]:
+        d = os.path.join(self.root(), trade_date)
+        if not os.path.isdir(d):
+            return []
+        prefix = f"zh_spot_{trade_date}_"
+        return sorted(f[len(prefix):-len(".parquet")] for f in os.listdir(d) if f.startswith(prefix) and f.endswith(".parquet"))
+
+    def _load_bucket(self, trade_date: str, bucket: str) -> Optional[SpotSnapshot]:
+        path = self.bucket_path(trade_date, bucket)
+        try:
+            if pa is not None:
+                table = pq.read_table(path)
+                raw = (table.schema.metadata or {}).get(_FETCHED_AT_KEY)
+                fetched_at = datetime.fromisoformat(raw.decode()) if raw else None
+                table = table.replace_schema_metadata(None)
+                data = table
+            else:
+                data = pd.read_parquet(path)
+                fetched_at = None
+            if fetched_at is None:
+                fetched_at = datetime.fromtimestamp(os.path.getmtime(path), tz=self._clock().tzinfo)
+        except Exception as e:
+            LOG.warning("[SpotSnapshot] 读取 bucket 失败 %s: %s", path, e)
+            return None
+        return SpotSnapshot(trade_date=trade_date, bucket=bucket, fetched_at=fetched_at, data=data)
+
+    @staticmethod
+    def _wrap(trade_date: str, bucket: str, fetched_at: datetime, df: pd.DataFrame) -> SpotSnapshot:
+        data = pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata(None) if pa is not None else df
+        return SpotSnapshot(trade_date=trade_date, bucket=bucket, fetched_at=fetched_at, data=data)
+
+    @staticmethod
+    def _save(snap: SpotSnapshot, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if pa is not None:
+            # fetched_at 写入 schema metadata：跨进程复用时按拉取时间（而非文件 mtime）判断 staleness
+            meta = {_FETCHED_AT_KEY: snap.fetched_at.isoformat().encode()}
+            pq.write_table(snap.data.replace_schema_metadata(meta), path)
+        else:
+            snap.data.to_parquet(path, index=False)
+
+    def _set_latest(self, snap: SpotSnapshot) -> None:
+        cur = self._latest.get(snap.trade_date)
+        if cur is not None and cur.bucket != snap.bucket:
+            self._previous[snap.trade_date] = cur
+        self._latest[snap.trade_date] = snap
+
+    # ------------------------------------------------------------
+    def get_snapshot(self, trade_date: str, *, max_age_s: Optional[float] = None) -> Optional[SpotSnapshot]:
+        """max_age_s 内复用（内存 → 当前 bucket 文件）；否则拉取一次并落盘。"""
+        limit = self.max_age_s if max_age_s is None else float(max_age_s)
+        with self._lock:
+            now = self._clock()
+            snap = self._latest.get(trade_date)
+            if snap is not None and snap.age_s(now) <= limit:
+                return snap
+
+            bucket = self.bucket_of(now)
+            if snap is None or snap.bucket != bucket:
+                disk = self._load_bucket(trade_date, bucket) if os.path.exists(self.bucket_path(trade_date, bucket)) else None
+                if disk is not None and disk.age_s(now) <= limit:
+                    self._set_latest(disk)
+                    LOG.info("[SpotSnapshot] reuse bucket %s %s rows=%s", trade_date, bucket, disk.num_rows)
+                    return disk
+
+            try:
+                df = self._fetch()
+            except Exception as e:
+                LOG.error("[SpotSnapshot] ak.stock_zh_a_spot() 调用失败: %s", e)
+                return snap
+            if df is None or df.empty:
+                LOG.warning("[SpotSnapshot] 空行情 trade_date=%s", trade_date)
+                return snap
+
+            fresh = self._wrap(trade_date, bucket, now, normalize_spot_symbols(df))
+            path = self.bucket_path(trade_date, bucket)
+            try:
+                self._save(fresh, path)
+            except Exception as e:
+                LOG.error("[SpotSnapshot] 保存 bucket 失败 %s: %s", path, e)
+
+            self._set_latest(fresh)
+            LOG.info("[SpotSnapshot] fetched %s %s rows=%s", trade_date, bucket, fresh.num_rows)
+            return fresh
+
+    def previous_snapshot(self, trade_date: str) -> Optional[SpotSnapshot]:
+        """上一个时间桶（内存优先，其次磁盘上早于当前 bucket 的最近一份）。"""
+        with self._lock:
+            cur = self._latest.get(trade_date)
+            prev = self._previous.get(trade_date)
+            if prev is not None:
+                return prev
+            earlier = [b for b in self._list_buckets(trade_date) if cur is None or b < cur.bucket]
+            if not earlier:
+                return None
+            prev = self._load_bucket(trade_date, earlier[-1])
+            if prev is not None:
+                self._previous[trade_date] = prev
+            return prev
+
+    def delta(self, trade_date: str, columns: Sequence[str], key: str = "symbol") -> pd.DataFrame:
+        """当前快照相对上一 bucket 变化（或新增）的行，列为 [key] + columns。"""
+        cur = self.get_snapshot(trade_date)
+        if cur is None:
+            return pd.DataFrame(columns=[key, *columns])
+        cols = [key, *[c for c in columns if c != key]]
+        now_df = cur.view(cols)
+        prev = self.previous_snapshot(trade_date)
+        if prev is None or key not in now_df.columns:
+            return now_df
+        prev_df = prev.view(cols)
+        merged = now_df.merge(prev_df, on=key, how="left", suffixes=("", "__prev"), indicator=True)
+        changed = merged["_merge"] == "left_only"
+        for c in cols[1:]:
+            if c in now_df.columns and f"{c}__prev" in merged.columns:
+                a, b = merged[c], merged[f"{c}__prev"]
+                changed |= ~((a == b) | (a.isna() & b.isna()))
+        return merged.loc[changed, [c for c in cols if c in now_df.columns]].reset_index(drop=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._latest.clear()
+            self._previous.clear()
+
+
+_SERVICE: Optional[SpotSnapshotService] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_spot_service() -> SpotSnapshotService:
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = SpotSnapshotService()
+        return _SERVICE
+
+
+def configure_spot_service(*, max_age_s: Optional[float] = None, bucket_minutes: Optional[int] = None) -> SpotSnapshotService:
+    """调整进程级服务参数（daemon 启动时按 tick 间隔设置 staleness window）。"""
+    svc = get_spot_service()
+    if max_age_s is not None:
+        svc.max_age_s = float(max_age_s)
+    if bucket_minutes is not None:
+        svc.bucket_minutes = max(int(bucket_minutes), 1)
+    return svc
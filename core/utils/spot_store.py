@@ -7,12 +7,15 @@ UnifiedRisk V12 - A 股全行情本地存取工具
     - 有本地文件 -> 读 parquet
     - 无本地文件 / full 刷新 -> 调 ak.stock_zh_a_spot() 并写 parquet
     - 提供 DataFrame 给 amount / sentiment / 其它因子使用
+    - 盘中 full 刷新走 SpotSnapshotService（时间桶快照 + staleness 复用），
+      各数据源通过 get_spot_view() 拿列裁剪后的独立 DataFrame
 """
 
 from __future__ import annotations
 
 import os
 from functools import lru_cache
+from typing import Optional, Sequence
 
 import pandas as pd
 import akshare as ak
@@ -20,6 +23,7 @@ import akshare as ak
 from core.datasources.datasource_base import DataSourceConfig,DataSourceBase
 from core.utils.logger import get_logger
 from core.adapters.cache.symbol_cache import normalize_ashare_symbol
+from core.utils.spot_snapshot_service import get_spot_service
 
 LOG = get_logger("SpotStore")
 
@@ -62,16 +66,16 @@ def get_spot_daily(trade_date: str, refresh_mode: str = "none") -> pd.DataFrame:
     """
     path = _get_spot_path(trade_date)
     # 时间戳 15:35:45
-    LOG.info(f"[SpotStore] get_spot_daily trade_date={trade_date}, mode={refresh_mode}")
+    LOG.info("[SpotStore] get_spot_daily trade_date=%s, mode=%s", trade_date, refresh_mode)
 
     # ========== 1) full 模式：先删文件，再走统一逻辑 ==========
     if refresh_mode == "full":
         if os.path.exists(path):
             try:
                 os.remove(path)
-                LOG.info(f"[SpotStore] full mode: 删除旧 spot 文件: {path}")
+                LOG.info("[SpotStore] full mode: 删除旧 spot 文件: %s", path)
             except Exception as e:
-                LOG.warning(f"[SpotStore] full mode: 删除旧文件失败: {e}")
+                LOG.warning("[SpotStore] full mode: 删除旧文件失败: %s", e)
 
     df: pd.DataFrame | None = None
 
@@ -79,10 +83,10 @@ def get_spot_daily(trade_date: str, refresh_mode: str = "none") -> pd.DataFrame:
     if os.path.exists(path):
         # 2.1 优先读本地 parquet
         try:
-            LOG.info(f"[SpotStore] Load spot parquet: {path}")
+            LOG.info("[SpotStore] Load spot parquet: %s", path)
             df = pd.read_parquet(path)
         except Exception as e:
-            LOG.error(f"[SpotStore] 读取 parquet 失败: {e}")
+            LOG.error("[SpotStore] 读取 parquet 失败: %s", e)
             df = None
 
         # 2.2 如果读出来是空的，再拉 ak
@@ -91,7 +95,7 @@ def get_spot_daily(trade_date: str, refresh_mode: str = "none") -> pd.DataFrame:
             try:
                 df = ak.stock_zh_a_spot()
             except Exception as e:
-                LOG.error(f"[SpotStore] ak.stock_zh_a_spot() 调用失败: {e}")
+                LOG.error("[SpotStore] ak.stock_zh_a_spot() 调用失败: %s", e)
                 df = None
 
             # 拉到数据就覆盖写回 parquet
@@ -99,29 +103,29 @@ def get_spot_daily(trade_date: str, refresh_mode: str = "none") -> pd.DataFrame:
                 try:
                     os.makedirs(os.path.dirname(path), exist_ok=True)
                     df.to_parquet(path, index=False)
-                    LOG.info(f"[SpotStore] Saved spot parquet (overwrite): {path}, rows={len(df)}")
+                    LOG.info("[SpotStore] Saved spot parquet (overwrite): %s, rows=%s", path, len(df))
                 except Exception as e:
-                    LOG.error(f"[SpotStore] 保存 parquet 失败: {e}")
+                    LOG.error("[SpotStore] 保存 parquet 失败: %s", e)
     else:
         # 2.3 本地没有 parquet → 必须拉一次 ak
-        LOG.info(f"[SpotStore] 本地无 parquet，拉取 ak.stock_zh_a_spot() for {trade_date}")
+        LOG.info("[SpotStore] 本地无 parquet，拉取 ak.stock_zh_a_spot() for %s", trade_date)
         try:
             df = ak.stock_zh_a_spot()
         except Exception as e:
-            LOG.error(f"[SpotStore] ak.stock_zh_a_spot() 调用失败: {e}")
+            LOG.error("[SpotStore] ak.stock_zh_a_spot() 调用失败: %s", e)
             df = None
 
         if df is not None and not df.empty:
             try:
                 os.makedirs(os.path.dirname(path), exist_ok=True)
                 df.to_parquet(path, index=False)
-                LOG.info(f"[SpotStore] Saved spot parquet: {path}, rows={len(df)}")
+                LOG.info("[SpotStore] Saved spot parquet: %s, rows=%s", path, len(df))
             except Exception as e:
-                LOG.error(f"[SpotStore] 保存 parquet 失败: {e}")
+                LOG.error("[SpotStore] 保存 parquet 失败: %s", e)
 
     # ========== 3) 最终兜底 ==========
     if df is None or df.empty:
-        LOG.warning(f"[SpotStore] 无法获取 A 股全行情数据（trade_date={trade_date}）")
+        LOG.warning("[SpotStore] 无法获取 A 股全行情数据（trade_date=%s）", trade_date)
         return pd.DataFrame()
 
     # ========== 4) 标准化 symbol 字段 ==========
@@ -130,6 +134,31 @@ def get_spot_daily(trade_date: str, refresh_mode: str = "none") -> pd.DataFrame:
             df["symbol"] = df["代码"].apply(normalize_ashare_symbol)
             LOG.info("[SpotStore] 标准化 symbol 字段完成")
         except Exception as e:
-            LOG.error(f"[SpotStore] symbol 标准化失败: {e}")
+            LOG.error("[SpotStore] symbol 标准化失败: %s", e)
 
     return df
+
+
+def get_spot_view(
+    trade_date: str,
+    refresh_mode: str = "none",
+    columns: Optional[Sequence[str]] = None,
+    *,
+    intraday: bool = True,
+) -> pd.DataFrame:
+    """
+    数据源统一入口：返回列裁剪后的独立 DataFrame（调用方可随意修改，不影响其它数据源）。
+
+    - intraday 且 refresh_mode == "full"：SpotSnapshotService（max_age_s 内复用同一快照）
+    - 其它：get_spot_daily（按交易日 parquet / lru_cache）
+    - columns 中不存在的列忽略，必需列由调用方自行校验
+    """
+    if intraday and refresh_mode == "full":
+        snap = get_spot_service().get_snapshot(trade_date)
+        return snap.view(columns) if snap is not None else pd.DataFrame()
+
+    df = get_spot_daily(trade_date, refresh_mode=refresh_mode)
+    if df is None or df.empty:
+        return pd.DataFrame()
+    cols = list(df.columns) if columns is None else [c for c in dict.fromkeys(columns) if c in df.columns]
+    return df[cols].copy()
@@ -11,6 +11,8 @@ from __future__ import annotations
 import sqlite3
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
   
 
 
@@ -31,6 +33,10 @@ class ExternalValidationAggregator:
         Compute:
         - ext_claim_followup for claims within lookback window ending at asof_date
         - ext_validation_summary (rates + avg follow-up returns)
+
+        Set-based: verdicts / claims / closes are each loaded in one query for the
+        whole window, forward returns are computed per symbol on a trade-date index,
+        and all rows are written with executemany in a single transaction.
         """
         trade_dates = self._get_lookback_trade_dates(asof_date, self._cfg.lookback_days)
         if not trade_dates:
@@ -40,39 +46,71 @@ class ExternalValidationAggregator:
         claim_map = {c["claim_id"]: c for c in claims}
 
         # 1) follow-up returns per (trade_date, claim_id, horizon)
-        for td in trade_dates:
-            verdicts = self._load_verdicts(td)
-            if not verdicts:
+        verdicts = self._load_verdicts_window(trade_dates)
+
+        # group verdicts by target symbol: symbol -> [(trade_date, claim_id)]
+        by_symbol: Dict[str, List[Tuple[str, str]]] = {}
+        for v in verdicts:
+            claim = claim_map.get(v["claim_id"])
+            if claim is None:
+                # claim removed/disabled after the fact → treat as skip (do not mutate history)
                 continue
-
-            for v in verdicts:
-                claim_id = v["claim_id"]
-                claim = claim_map.get(claim_id)
-                if claim is None:
-                    # claim removed/disabled after the fact → treat as skip (do not mutate history)
-                    continue
-
-                target_symbol = claim.get("target_symbol") or self._cfg.default_symbol
-                close_t = self._get_close(td, target_symbol)
-                if close_t is None:
-                    # cannot compute follow-up, but still keep summary counts
-                    continue
-
-                for h in self._cfg.horizons:
-                    td_h = self._shift_trade_date(td, target_symbol, h)
-                    if td_h is None:
-                        continue
-                    close_h = self._get_close(td_h, target_symbol)
-                    if close_h is None:
-                        continue
-                    ret_cum = (close_h / close_t) - 1.0
-                    self._upsert_followup(td, claim_id, h, target_symbol, ret_cum)
-
-        # 2) summary rows for each horizon at asof_date
+            target_symbol = claim.get("target_symbol") or self._cfg.default_symbol
+            by_symbol.setdefault(target_symbol, []).append((v["trade_date"], v["claim_id"]))
+
+        followups: List[Tuple[str, str, int, str, float]] = []
+        if by_symbol:
+            lower = trade_dates[0] if min(self._cfg.horizons, default=0) >= 0 else None
+            series = self._load_close_series(sorted(by_symbol), lower)
+            for symbol, items in by_symbol.items():
+                followups.extend(self._forward_returns(symbol, items, series.get(symbol)))
+
+        with self._conn:
+            if followups:
+                self._conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO ext_claim_followup
+                    (trade_date, claim_id, horizon, target_symbol, ret_cum)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    followups,
+                )
+
+            # 2) summary rows for each horizon at asof_date
+            self._upsert_summaries(asof_date, trade_dates)
+
+    def _forward_returns(
+        self,
+        symbol: str,
+        items: List[Tuple[str, str]],
+        series: Optional[Tuple[List[str], np.ndarray]],
+    ) -> List[Tuple[str, str, int, str, float]]:
+        """(trade_date, claim_id) → follow-up rows, shifted on the symbol's own trade-date index."""
+        if series is None:
+            return []
+        dates, closes = series
+        pos = {d: i for i, d in enumerate(dates)}
+
+        keep = [(td, cid, pos[td]) for td, cid in items if td in pos]
+        if not keep:
+            return []
+        idx = np.fromiter((k[2] for k in keep), dtype=np.int64, count=len(keep))
+        close_t = closes[idx]
+
+        out: List[Tuple[str, str, int, str, float]] = []
+        n = len(dates)
         for h in self._cfg.horizons:
-            self._upsert_summary(asof_date, trade_dates, horizon=h)
-
-        self._conn.commit()
+            j = idx + int(h)
+            ok = (j >= 0) & (j < n) & ~np.isnan(close_t)
+            if not ok.any():
+                continue
+            ret = np.full(len(idx), np.nan)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ret[ok] = closes[j[ok]] / close_t[ok] - 1.0
+            for k in np.flatnonzero(np.isfinite(ret)):
+                td, cid, _ = keep[k]
+                out.append((td, cid, int(h), symbol, float(ret[k])))
+        return out
 
     # -------------------------
     # Reads
@@ -98,29 +136,45 @@ class ExternalValidationAggregator:
             )
         return out
 
-    def _load_verdicts(self, trade_date: str) -> List[Dict]:
+    def _load_verdicts_window(self, trade_dates: List[str]) -> List[Dict]:
+        wanted = set(trade_dates)
         rows = self._conn.execute(
             """
-            SELECT claim_id, verdict
+            SELECT trade_date, claim_id, verdict
             FROM ext_claim_verdict
-            WHERE trade_date=?
+            WHERE trade_date BETWEEN ? AND ?
+            ORDER BY trade_date, claim_id
             """,
-            (trade_date,),
+            (trade_dates[0], trade_dates[-1]),
         ).fetchall()
-        return [{"claim_id": cid, "verdict": v} for cid, v in rows]
+        # window = market-calendar dates; verdicts on non-snapshot dates are ignored
+        return [{"trade_date": td, "claim_id": cid, "verdict": v} for td, cid, v in rows if td in wanted]
 
-    def _get_close(self, trade_date: str, symbol: str) -> Optional[float]:
-        row = self._conn.execute(
-            """
-            SELECT close
+    def _load_close_series(
+        self, symbols: List[str], start_date: Optional[str]
+    ) -> Dict[str, Tuple[List[str], np.ndarray]]:
+        """
+        symbol -> (trade_dates, closes) ordered by trade_date; NULL close → NaN.
+        Row order is the per-symbol market calendar proxy used for the +n shift.
+        """
+        placeholders = ",".join(["?"] * len(symbols))
+        sql = f"""
+            SELECT symbol, trade_date, close
             FROM ext_market_snapshot
-            WHERE trade_date=? AND symbol=?
-            """,
-            (trade_date, symbol),
-        ).fetchone()
-        if row is None or row[0] is None:
-            return None
-        return float(row[0])
+            WHERE symbol IN ({placeholders})
+        """
+        params: List = list(symbols)
+        if start_date is not None:
+            sql += " AND trade_date >= ?"
+            params.append(start_date)
+        sql += " ORDER BY symbol, trade_date"
+
+        raw: Dict[str, Tuple[List[str], List[float]]] = {}
+        for symbol, td, close in self._conn.execute(sql, params):
+            dates, closes = raw.setdefault(symbol, ([], []))
+            dates.append(td)
+            closes.append(float(close) if close is not None else np.nan)
+        return {s: (d, np.asarray(c, dtype=float)) for s, (d, c) in raw.items()}
 
     def _get_lookback_trade_dates(self, asof_date: str, lookback_days: int) -> List[str]:
         rows = self._conn.execute(
@@ -136,55 +190,14 @@ class ExternalValidationAggregator:
         # reverse to chronological for readability
         return [r[0] for r in reversed(rows)]
 
-    def _shift_trade_date(self, trade_date: str, symbol: str, n: int) -> Optional[str]:
-        """
-        Find the trade_date shifted by +n within ext_market_snapshot for given symbol.
-        Uses ordering by trade_date as the market calendar proxy.
-        """
-        rows = self._conn.execute(
-            """
-            SELECT trade_date
-            FROM ext_market_snapshot
-            WHERE symbol=?
-            ORDER BY trade_date
-            """,
-            (symbol,),
-        ).fetchall()
-        dates = [r[0] for r in rows]
-        try:
-            i = dates.index(trade_date)
-        except ValueError:
-            return None
-        j = i + n
-        if j < 0 or j >= len(dates):
-            return None
-        return dates[j]
-
     # -------------------------
     # Writes
     # -------------------------
 
-    def _upsert_followup(
-        self,
-        trade_date: str,
-        claim_id: str,
-        horizon: int,
-        target_symbol: str,
-        ret_cum: float,
-    ) -> None:
-        self._conn.execute(
-            """
-            INSERT OR REPLACE INTO ext_claim_followup
-            (trade_date, claim_id, horizon, target_symbol, ret_cum)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (trade_date, claim_id, horizon, target_symbol, float(ret_cum)),
-        )
-
-    def _upsert_summary(self, asof_date: str, trade_dates: List[str], horizon: int) -> None:
-        # counts by verdict across the window
+    def _upsert_summaries(self, asof_date: str, trade_dates: List[str]) -> None:
         placeholders = ",".join(["?"] * len(trade_dates))
 
+        # counts by verdict across the window (same for every horizon)
         rows = self._conn.execute(
             f"""
             SELECT v.verdict, COUNT(1)
@@ -203,37 +216,46 @@ class ExternalValidationAggregator:
         total = sum(counts.values())
         supported_rate = (counts["SUPPORTED"] / total) if total > 0 else None
 
-        # follow-up averages (all + supported)
-        # join verdict to followup on horizon
-        rows_all = self._conn.execute(
-            f"""
-            SELECT f.ret_cum
-            FROM ext_claim_followup f
-            WHERE f.horizon=?
-              AND f.trade_date IN ({placeholders})
-              AND f.ret_cum IS NOT NULL
-            """,
-            (horizon, *trade_dates),
-        ).fetchall()
-
-        rows_sup = self._conn.execute(
+        # follow-up returns (all + supported) for every horizon in one pass
+        rows_f = self._conn.execute(
             f"""
-            SELECT f.ret_cum
+            SELECT f.horizon, f.ret_cum, v.verdict
             FROM ext_claim_followup f
-            JOIN ext_claim_verdict v
+            LEFT JOIN ext_claim_verdict v
               ON v.trade_date=f.trade_date AND v.claim_id=f.claim_id
-            WHERE f.horizon=?
-              AND f.trade_date IN ({placeholders})
-              AND v.verdict='SUPPORTED'
+            WHERE f.trade_date IN ({placeholders})
               AND f.ret_cum IS NOT NULL
             """,
-            (horizon, *trade_dates),
+            tuple(trade_dates),
         ).fetchall()
 
-        avg_all = self._avg([float(r[0]) for r in rows_all])
-        avg_sup = self._avg([float(r[0]) for r in rows_sup])
+        rets_all: Dict[int, List[float]] = {}
+        rets_sup: Dict[int, List[float]] = {}
+        for h, ret, verdict in rows_f:
+            rets_all.setdefault(int(h), []).append(float(ret))
+            if verdict == "SUPPORTED":
+                rets_sup.setdefault(int(h), []).append(float(ret))
+
+        out = []
+        for h in self._cfg.horizons:
+            avg_all = self._avg(rets_all.get(int(h), []))
+            avg_sup = self._avg(rets_sup.get(int(h), []))
+            out.append(
+                (
+                    asof_date,
+                    int(self._cfg.lookback_days),
+                    int(h),
+                    int(total),
+                    int(counts["SUPPORTED"]),
+                    int(counts["WEAKENED"]),
+                    int(counts["UNVERIFIABLE"]),
+                    float(supported_rate) if supported_rate is not None else None,
+                    float(avg_all) if avg_all is not None else None,
+                    float(avg_sup) if avg_sup is not None else None,
+                )
+            )
 
-        self._conn.execute(
+        self._conn.executemany(
             """
             INSERT OR REPLACE INTO ext_validation_summary
             (asof_date, lookback_days, horizon,
@@ -241,18 +263,7 @@ class ExternalValidationAggregator:
              supported_rate, avg_ret_all, avg_ret_supported)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                asof_date,
-                int(self._cfg.lookback_days),
-                int(horizon),
-                int(total),
-                int(counts["SUPPORTED"]),
-                int(counts["WEAKENED"]),
-                int(counts["UNVERIFIABLE"]),
-                float(supported_rate) if supported_rate is not None else None,
-                float(avg_all) if avg_all is not None else None,
-                float(avg_sup) if avg_sup is not None else None,
-            ),
+            out,
         )
 
     def _avg(self, xs: List[float]) -> Optional[float]:
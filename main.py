@@ -3,7 +3,9 @@
 import argparse
 
 from core.utils.logger import setup_logging, get_logger
-from core.engines.cn.ashare_daily_engine import AShareDailyEngine
+
+# 重依赖（engine / baostock / pandas / pytz）在参数解析之后按需 import，
+# --help / 参数错误不承担 import 成本（见 tools/check_import_budget.py）
 
 
 def parse_args():
@@ -14,6 +16,10 @@ def parse_args():
     parser.add_argument("--full-refresh", action="store_true")
     parser.add_argument("--ss-refresh", action="store_true")
     parser.add_argument("--trade-date", type=str, default=None, help="Force trade date (YYYY-MM-DD)")
+    parser.add_argument("--daemon", action="store_true", help="Warm-start intraday loop (keep providers / EOD history in memory)")
+    parser.add_argument("--interval", type=float, default=300.0, help="Daemon refresh cadence in seconds")
+    parser.add_argument("--max-ticks", type=int, default=None, help="Daemon: stop after N refreshes")
+    parser.add_argument("--spot-max-age", type=float, default=None, help="Daemon: reuse an intraday spot snapshot younger than N seconds")
 
     return parser.parse_args()
 
@@ -26,9 +32,6 @@ def get_refresh_mode(args):
     return "readonly"
 
 
-import baostock as bs
-import pandas as pd
-import pytz
 from datetime import datetime, timedelta, time
 A_SHARE_OPEN = time(9, 30)   # 开盘时间
 A_SHARE_CLOSE = time(15, 0)  # 收盘时间
@@ -43,6 +46,10 @@ def get_intraday_status_and_last_trade_date() -> tuple[bool, str]:
             - is_intraday: True 表示当前是交易日且在 9:30~15:00 之间
             - last_trade_date: 最近的交易日（'YYYY-MM-DD'）
     """
+    import baostock as bs
+    import pandas as pd
+    import pytz
+
     tz = pytz.timezone('Asia/Shanghai')
     now = datetime.now(tz)
 
@@ -128,6 +135,20 @@ def main():
         # ✅ V12：只调用，不接收，不解析
         #is_intraday, trade_date = get_intraday_status_and_last_trade_date()
         #assert trade_date, "定位最后交易日失败！"
+        if args.daemon:
+            from core.engines.cn.intraday_daemon import IntradayWarmDaemon
+
+            IntradayWarmDaemon(
+                refresh_mode=refresh_mode,
+                interval_s=args.interval,
+                max_ticks=args.max_ticks,
+                trade_date_override=args.trade_date,
+                spot_max_age_s=args.spot_max_age,
+            ).run_forever()
+            return
+
+        from core.engines.cn.ashare_daily_engine import AShareDailyEngine
+
         daily_engine = AShareDailyEngine(refresh_mode=refresh_mode, trade_date_override=args.trade_date)
         daily_engine.run( )
 
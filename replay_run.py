@@ -13,6 +13,11 @@ Re-render (recompute) and diff:
   python replay_run.py --db data/persistent/unifiedrisk.db --run-id <RUN_ID> --mode recompute \
       --block-specs config/report_blocks.yaml --out out/replay
 
+Range re-render + drift summary (process pool, read-only connection per worker):
+  python replay_run.py --db data/persistent/unifiedrisk.db --from 2025-01-01 --to 2025-12-31 \
+      --kind EOD --workers 4 --block-specs config/report_blocks.yaml --out out/replay_range
+  python replay_run.py --db data/persistent/unifiedrisk.db --range --kind EOD --limit 250 --workers 4
+
 Notes:
 - recompute mode re-renders markdown from persisted L2 decision-evidence (des_payload)
   using *current* report blocks/specs. It does NOT recompute factors/gate.
@@ -23,24 +28,18 @@ import argparse
 import json
 import sqlite3
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
-from core.actions.actionhint_service import ActionHintService
-from core.persistence.audit_diff import diffs_to_markdown
-from core.persistence.replay_runner import dump_json, replay_run
 from core.persistence.run_store import ReportDump, RunPayload, RunStore
 from core.persistence.sqlite.sqlite_connection import connect_sqlite
 from core.persistence.sqlite.sqlite_run_store import SqliteRunStore
-from core.reporters.report_context import ReportContext
-from core.reporters.report_engine import ReportEngine
-from core.reporters.report_renderer import MarkdownRenderer
-from core.reporters.report_blocks.market_overview_blk import MarketOverviewBlock
-from core.reporters.report_blocks.structure_facts_blk import StructureFactsBlock
-from core.reporters.report_blocks.summary_a_n_d_blk import SummaryANDBlock
-from core.reporters.report_blocks.execution_summary_blk import ExecutionSummaryBlock
-from core.reporters.report_blocks.execution_quick_reference_blk import ExecutionQuickReferenceBlock
-from core.reporters.report_blocks.exit_readiness_blk import ExitReadinessBlock
-from core.reporters.report_blocks.context_overnight_blk import ContextOvernightBlock
+
+# Report / replay modules are imported lazily: --list only needs the run store.
+
+DEFAULT_LIST_LIMIT = 20
+
+# One ReportEngine per (process, block_specs_path): range replays re-render hundreds of runs
+_ENGINE_CACHE: Dict[Optional[str], object] = {}
 
 
 def get_store(db_path: str) -> RunStore:
@@ -49,6 +48,39 @@ def get_store(db_path: str) -> RunStore:
     return SqliteRunStore(conn)
 
 
+def _get_engine(block_specs_path: Optional[str]):
+    engine = _ENGINE_CACHE.get(block_specs_path)
+    if engine is not None:
+        return engine
+
+    from core.actions.actionhint_service import ActionHintService
+    from core.reporters.report_blocks.context_overnight_blk import ContextOvernightBlock
+    from core.reporters.report_blocks.execution_quick_reference_blk import ExecutionQuickReferenceBlock
+    from core.reporters.report_blocks.execution_summary_blk import ExecutionSummaryBlock
+    from core.reporters.report_blocks.exit_readiness_blk import ExitReadinessBlock
+    from core.reporters.report_blocks.market_overview_blk import MarketOverviewBlock
+    from core.reporters.report_blocks.structure_facts_blk import StructureFactsBlock
+    from core.reporters.report_blocks.summary_a_n_d_blk import SummaryANDBlock
+    from core.reporters.report_engine import ReportEngine
+
+    engine = ReportEngine(
+        market="CN",
+        actionhint_service=ActionHintService(),
+        block_builders={
+            "summary": SummaryANDBlock().render,
+            "structure.facts": StructureFactsBlock().render,
+            "context.overnight": ContextOvernightBlock().render,
+            "market.overview": MarketOverviewBlock().render,
+            "execution.summary": ExecutionSummaryBlock().render,
+            "execution_quick_reference": ExecutionQuickReferenceBlock().render,
+            "exit.readiness": ExitReadinessBlock().render,
+        },
+        block_specs_path=block_specs_path,
+    )
+    _ENGINE_CACHE[block_specs_path] = engine
+    return engine
+
+
 def v12_rerender_builder(payload: RunPayload, block_specs_path: Optional[str]) -> ReportDump:
     stored = payload.report_dump or {}
     des_payload = stored.get("des_payload")
@@ -87,20 +119,10 @@ def v12_rerender_builder(payload: RunPayload, block_specs_path: Optional[str]) -
             "or payload.gate_decision.* / report_meta.*"
         )
 
-    engine = ReportEngine(
-        market="CN",
-        actionhint_service=ActionHintService(),
-        block_builders={
-            "summary": SummaryANDBlock().render,
-            "structure.facts": StructureFactsBlock().render,
-            "context.overnight": ContextOvernightBlock().render,
-            "market.overview": MarketOverviewBlock().render,
-            "execution.summary": ExecutionSummaryBlock().render,
-            "execution_quick_reference": ExecutionQuickReferenceBlock().render,
-            "exit.readiness": ExitReadinessBlock().render,
-        },
-        block_specs_path=block_specs_path,
-    )
+    from core.reporters.renderers.markdown_renderer import MarkdownRenderer
+    from core.reporters.report_context import ReportContext
+
+    engine = _get_engine(block_specs_path)
 
     ctx = ReportContext(kind=payload.kind, trade_date=payload.trade_date, slots=des_payload)
     doc = engine.build_report(ctx)
@@ -117,20 +139,38 @@ def main() -> None:
     ap.add_argument("--block-specs", default=None, help="Path to report_blocks.yaml")
     ap.add_argument("--out", default="out/replay", help="Output directory")
     ap.add_argument("--trade-date", default=None, help="Filter for --list")
-    ap.add_argument("--kind", default=None, help="Filter for --list")
-    ap.add_argument("--limit", type=int, default=20, help="Limit for --list")
+    ap.add_argument("--kind", default=None, help="Filter for --list / range")
+    ap.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help=f"--list: most recent N (default {DEFAULT_LIST_LIMIT}); range: most recent N runs (default: all in range)",
+    )
     ap.add_argument("--list", action="store_true", help="List runs (uses find_runs)")
     ap.add_argument("--float-atol", type=float, default=1e-8)
     ap.add_argument("--ignore", action="append", default=[], help="Ignore glob paths (repeatable)")
+    ap.add_argument("--range", action="store_true", help="Replay a range of runs (see --from/--to/--kind/--limit)")
+    ap.add_argument("--from", dest="date_from", default=None, help="Range start trade_date (inclusive)")
+    ap.add_argument("--to", dest="date_to", default=None, help="Range end trade_date (inclusive)")
+    ap.add_argument("--status", default=None, help="Range: only runs with this status (e.g. COMPLETED)")
+    ap.add_argument("--workers", type=int, default=1, help="Range: process pool size")
     args = ap.parse_args()
 
+    if args.range or args.date_from or args.date_to:
+        run_range(args)
+        return
+
     store = get_store(args.db)
 
     if args.list or not args.run_id:
-        runs = store.find_runs(trade_date=args.trade_date, kind=args.kind, limit=int(args.limit))
+        limit = DEFAULT_LIST_LIMIT if args.limit is None else int(args.limit)
+        runs = store.find_runs(trade_date=args.trade_date, kind=args.kind, limit=limit)
         print(json.dumps(runs, ensure_ascii=False, indent=2))
         return
 
+    from core.persistence.audit_diff import diffs_to_markdown
+    from core.persistence.replay_runner import dump_json, replay_run
+
     out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -166,5 +206,63 @@ def main() -> None:
     print(json.dumps(summary, ensure_ascii=False, indent=2))
 
 
+def run_range(args: argparse.Namespace) -> None:
+    from core.persistence.replay_range import drift_to_markdown, iter_replay_range, summarize_drift
+    from core.persistence.replay_runner import dump_json
+    from core.persistence.sqlite.sqlite_connection import connect_sqlite_readonly
+
+    # range replays everything in [from, to] unless --limit is given explicitly
+    limit = None if args.limit is None else int(args.limit)
+    store = SqliteRunStore(connect_sqlite_readonly(args.db))
+    # one extra row tells "more than limit matched" apart from "exactly limit matched"
+    runs = store.find_runs_range(
+        start_date=args.date_from,
+        end_date=args.date_to,
+        kind=args.kind,
+        status=args.status,
+        limit=limit + 1 if limit is not None and limit > 0 else None,
+    )
+    limited = limit is not None and limit > 0 and len(runs) > limit
+    if limited:
+        runs = runs[-limit:]
+    run_ids = [str(r["run_id"]) for r in runs]
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    results = list(
+        iter_replay_range(
+            db_path=args.db,
+            run_ids=run_ids,
+            mode=str(args.mode),
+            builder=v12_rerender_builder if args.mode == "recompute" else None,
+            block_specs_path=args.block_specs,
+            float_atol=float(args.float_atol),
+            ignore_globs=args.ignore,
+            workers=int(args.workers),
+        )
+    )
+    summary = summarize_drift(results)
+    summary["filters"] = {
+        "from": args.date_from,
+        "to": args.date_to,
+        "kind": args.kind,
+        "status": args.status,
+        "limit": limit,
+        "mode": str(args.mode),
+    }
+    # a limited range keeps only the most recent N runs: say so instead of truncating silently
+    summary["limited"] = limited
+
+    dump_json(str(out_dir / "range_summary.json"), summary)
+    (out_dir / "range_diff.md").write_text(drift_to_markdown(results, summary), encoding="utf-8")
+
+    brief = {k: summary[k] for k in ("runs", "runs_with_drift", "runs_failed", "diff_total", "drift_by_block")}
+    brief["limit"] = limit
+    brief["limited"] = summary["limited"]
+    brief["out_dir"] = str(out_dir.resolve())
+    print(json.dumps(brief, ensure_ascii=False, indent=2))
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,545 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Sector Rotation - Local Vectorized Backtest Engine (Python v1)
+
+What it does
+- Loads the sector score / return panels ONCE (Oracle, or a local Parquet / SQLite export)
+- Evaluates a whole parameter grid in-process: the time loop runs once and every step is
+  vectorized over (combo x sector) with NumPy, so 81 combos cost roughly one pass
+- Produces CN_SECTOR_ROT_BT_DAILY_T-style NAV / exposure rows, CN_SECTOR_ROT_POS_DAILY_T-style
+  position rows, and the same metrics as SUMMARY_SQL (tests/backtest/runner.py)
+- Parity check: replays one stored SP_RUN_SECTOR_ROT_BACKTEST run and diffs NAV / exposure /
+  action counts / summary metrics against the stored rows
+
+Panel format (long; one row per trade_date x sector)
+    TRADE_DATE, SECTOR_ID, SCORE_PCT, RET
+    - SCORE_PCT: cross-sectional score percentile in [0, 1] on TRADE_DATE (NULL = not rankable)
+    - RET:       sector close-to-close return on TRADE_DATE
+The SP source tables are not part of this repo, so the Oracle panel query is supplied by the
+caller (--panel-sql file, binds :start_dt / :end_dt / :sector_type) and can be exported once with
+`export` for offline runs.
+
+Rule set (Python reference of the SP parameters; verify with `parity` before trusting a grid)
+- signals use day t close; positions decided on t earn day t+1 returns (no look-ahead)
+- held sector: below_cnt += 1 when SCORE_PCT < exit_p (else reset to 0);
+  EXIT when below_cnt >= exit_consecutive and hold_days >= min_hold
+- ENTER only on rebalance days (day index % rebalance_freq == 0): best SCORE_PCT >= enter_p
+  among non-held sectors, filling free slots up to top_k
+- weights: EQ = 1/n_held; SCORE = SCORE_PCT normalized over held sectors; with full_rebuild=1
+  weights are reset to target on every rebalance day, otherwise only when membership changes
+- cost = cost_rate * sum(|w_t - w_t-1|), charged on the day weights change
+- nav_t = nav_t-1 * (1 + sum(w_t-1 * ret_t) - cost_t), nav starts at 1.0
+
+Run (examples)
+    python tests/backtest/vec_backtest.py export --panel-sql panel.sql --out data/sector_rot_panel.parquet
+    python tests/backtest/vec_backtest.py grid --panel data/sector_rot_panel.parquet --prefix SR_VEC_V1
+    python tests/backtest/vec_backtest.py parity --panel data/sector_rot_panel.parquet --run-id SR_GRID_V1_EP90_XP50_XC2_MH5_RF5_K3_GRID \
+        --ep 0.90 --xp 0.50 --xc 2 --k 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from dataclasses import asdict, dataclass
+from itertools import product
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+WEIGHT_MODES = ("EQ", "SCORE")
+SUMMARY_KEYS = [
+    "n_days", "exposed_days", "exposure_ratio", "nav_end", "cagr_252", "mdd_approx",
+    "n_enter", "n_exit", "n_keep", "keep_per_enter",
+]
+
+
+@dataclass(frozen=True)
+class BtParams:
+    run_id: str
+    enter_p: float
+    exit_p: float
+    exit_consecutive: int = 2
+    top_k: int = 2
+    min_hold: int = 5
+    rebalance_freq: int = 5
+    weight_mode: str = "EQ"
+    full_rebuild: int = 1
+    cost_rate: float = 0.0005
+
+
+@dataclass
+class Panel:
+    dates: List[str]          # YYYY-MM-DD, ascending
+    sectors: List[str]
+    score_pct: np.ndarray     # (T, S), NaN = not rankable
+    ret: np.ndarray           # (T, S), NaN treated as 0
+
+
+@dataclass
+class GridResult:
+    params: List[BtParams]
+    dates: List[str]
+    sectors: List[str]
+    nav: np.ndarray           # (C, T)
+    daily_ret: np.ndarray     # (C, T)
+    exposed: np.ndarray       # (C, T) int
+    n_pos: np.ndarray         # (C, T) int
+    turnover: np.ndarray      # (C, T)
+    weights: np.ndarray       # (C, T, S)
+    action: np.ndarray        # (C, T, S) int8: 0 none, 1 ENTER, 2 KEEP, 3 EXIT
+
+
+ACTION_NAMES = {1: "ENTER", 2: "KEEP", 3: "EXIT"}
+
+
+# ---------------------------------------------------------------------
+# Panel I/O
+# ---------------------------------------------------------------------
+def panel_from_long(df: pd.DataFrame) -> Panel:
+    d = df.rename(columns=str.upper)
+    missing = {"TRADE_DATE", "SECTOR_ID", "SCORE_PCT", "RET"} - set(d.columns)
+    if missing:
+        raise ValueError(f"panel missing columns: {sorted(missing)}")
+    d = d.assign(TRADE_DATE=pd.to_datetime(d["TRADE_DATE"]).dt.strftime("%Y-%m-%d"), SECTOR_ID=d["SECTOR_ID"].astype(str))
+    score = d.pivot_table(index="TRADE_DATE", columns="SECTOR_ID", values="SCORE_PCT", aggfunc="last").sort_index()
+    ret = d.pivot_table(index="TRADE_DATE", columns="SECTOR_ID", values="RET", aggfunc="last")
+    ret = ret.reindex(index=score.index, columns=score.columns)
+    return Panel(
+        dates=list(score.index),
+        sectors=list(score.columns),
+        score_pct=score.to_numpy(dtype=float),
+        ret=np.nan_to_num(ret.to_numpy(dtype=float), nan=0.0),
+    )
+
+
+def panel_to_long(p: Panel) -> pd.DataFrame:
+    t, s = np.meshgrid(np.arange(len(p.dates)), np.arange(len(p.sectors)), indexing="ij")
+    return pd.DataFrame({
+        "TRADE_DATE": np.asarray(p.dates)[t.ravel()],
+        "SECTOR_ID": np.asarray(p.sectors)[s.ravel()],
+        "SCORE_PCT": p.score_pct.ravel(),
+        "RET": p.ret.ravel(),
+    })
+
+
+def load_panel_file(path: str, start: Optional[str] = None, end: Optional[str] = None) -> Panel:
+    """Local export: .parquet or SQLite (.db / .sqlite, table sector_rot_panel)."""
+    if path.lower().endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        with sqlite3.connect(path) as conn:
+            df = pd.read_sql_query("SELECT * FROM sector_rot_panel", conn)
+    df.columns = [c.upper() for c in df.columns]
+    dt = pd.to_datetime(df["TRADE_DATE"]).dt.strftime("%Y-%m-%d")
+    if start:
+        df = df[dt >= start]
+    if end:
+        df = df[dt <= end]
+    return panel_from_long(df)
+
+
+def save_panel_file(p: Panel, path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    df = panel_to_long(p)
+    if path.lower().endswith(".parquet"):
+        df.to_parquet(path, index=False)
+        return
+    with sqlite3.connect(path) as conn:
+        df.to_sql("sector_rot_panel", conn, if_exists="replace", index=False)
+
+
+def oracle_connect():
+    import oracledb  # python-oracledb; only needed for Oracle panels / parity
+
+    user = os.environ.get("ORA_USER") or "secopr"
+    pwd = os.environ.get("ORA_PASS") or "secopr"
+    dsn = os.environ.get("ORA_DSN") or "localhost:1521/xe"
+    return oracledb.connect(user=user, password=pwd, dsn=dsn)
+
+
+def load_panel_oracle(conn, panel_sql: str, start: str, end: str, sector_type: str) -> Panel:
+    binds = {"start_dt": start, "end_dt": end, "sector_type": sector_type}
+    binds = {k: v for k, v in binds.items() if f":{k}" in panel_sql}
+    with conn.cursor() as cur:
+        cur.execute(panel_sql, binds)
+        cols = [c[0].upper() for c in cur.description]
+        df = pd.DataFrame(cur.fetchall(), columns=cols)
+    return panel_from_long(df)
+
+
+# ---------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------
+def build_grid(
+    ep_list: Sequence[float],
+    xp_list: Sequence[float],
+    xc_list: Sequence[int],
+    k_list: Sequence[int],
+    *,
+    prefix: str,
+    tag: str,
+    min_hold: int = 5,
+    rebalance_freq: int = 5,
+    weight_mode: str = "EQ",
+    full_rebuild: int = 1,
+    cost_rate: float = 0.0005,
+) -> List[BtParams]:
+    """Same combo order and run_id format as tests/grid_runner.py."""
+    out = []
+    for ep, xp, xc, k in product(ep_list, xp_list, xc_list, k_list):
+        run_id = f"{prefix}_EP{int(round(ep * 100))}_XP{int(round(xp * 100))}_XC{xc}_MH{min_hold}_RF{rebalance_freq}_K{k}_{tag}"
+        out.append(BtParams(run_id, float(ep), float(xp), int(xc), int(k), int(min_hold), int(rebalance_freq),
+                            weight_mode.upper(), int(full_rebuild), float(cost_rate)))
+    return out
+
+
+def _target_weights(held: np.ndarray, score_t: np.ndarray, score_mode: np.ndarray) -> np.ndarray:
+    """(C, S) target weights for the held mask; EQ or SCORE per combo."""
+    n = held.sum(axis=1, keepdims=True)
+    eq = np.where(held, 1.0 / np.maximum(n, 1), 0.0)
+    sc = np.where(held, np.nan_to_num(score_t, nan=0.0)[None, :], 0.0)
+    tot = sc.sum(axis=1, keepdims=True)
+    sc = np.where(tot > 0, sc / np.where(tot > 0, tot, 1.0), eq)
+    return np.where(score_mode[:, None], sc, eq)
+
+
+def run_grid(panel: Panel, params: Sequence[BtParams]) -> GridResult:
+    """Simulate every combo at once: one pass over time, (C x S) arrays per step."""
+    for p in params:
+        if p.weight_mode not in WEIGHT_MODES:
+            raise ValueError(f"unsupported weight_mode={p.weight_mode} run_id={p.run_id}")
+
+    T, S, C = len(panel.dates), len(panel.sectors), len(params)
+    ep = np.array([p.enter_p for p in params])[:, None]
+    xp = np.array([p.exit_p for p in params])[:, None]
+    xc = np.array([p.exit_consecutive for p in params])[:, None]
+    k = np.array([p.top_k for p in params])
+    mh = np.array([p.min_hold for p in params])[:, None]
+    rf = np.maximum(np.array([p.rebalance_freq for p in params]), 1)
+    score_mode = np.array([p.weight_mode == "SCORE" for p in params])
+    full_rebuild = np.array([bool(p.full_rebuild) for p in params])
+    cost_rate = np.array([p.cost_rate for p in params])
+
+    held = np.zeros((C, S), dtype=bool)
+    hold_days = np.zeros((C, S), dtype=np.int64)
+    below = np.zeros((C, S), dtype=np.int64)
+    w = np.zeros((C, S))
+    nav_prev = np.ones(C)
+
+    out_nav = np.empty((C, T))
+    out_ret = np.empty((C, T))
+    out_exp = np.empty((C, T), dtype=np.int64)
+    out_npos = np.empty((C, T), dtype=np.int64)
+    out_turn = np.empty((C, T))
+    out_w = np.empty((C, T, S))
+    out_act = np.zeros((C, T, S), dtype=np.int8)
+
+    for t in range(T):
+        score_t = panel.score_pct[t]
+        valid = ~np.isnan(score_t)
+
+        # 1) P&L of yesterday's weights on today's returns
+        gross = (w * panel.ret[t][None, :]).sum(axis=1)
+
+        # 2) exits (daily)
+        hold_days = np.where(held, hold_days + 1, 0)
+        weak = valid[None, :] & (score_t[None, :] < xp)
+        below = np.where(held & weak, below + 1, 0)
+        exit_now = held & (below >= xc) & (hold_days >= mh)
+        held_after_exit = held & ~exit_now
+
+        # 3) entries (rebalance days only), best score first, up to free slots
+        rebalance = (t % rf) == 0
+        free = np.where(rebalance, np.maximum(k - held_after_exit.sum(axis=1), 0), 0)
+        cand = valid[None, :] & (score_t[None, :] >= ep) & ~held_after_exit & ~exit_now
+        order = np.argsort(-np.nan_to_num(score_t, nan=-np.inf), kind="stable")
+        cand_sorted = cand[:, order]
+        admit_sorted = cand_sorted & (np.cumsum(cand_sorted, axis=1) <= free[:, None])
+        enter_now = np.zeros_like(cand)
+        enter_now[:, order] = admit_sorted
+
+        new_held = held_after_exit | enter_now
+        hold_days = np.where(enter_now, 0, np.where(new_held, hold_days, 0))
+        below = np.where(new_held, below, 0)
+
+        # 4) weights + cost
+        changed = (new_held != held).any(axis=1) | (rebalance & full_rebuild)
+        target = _target_weights(new_held, score_t, score_mode)
+        w_new = np.where(changed[:, None], target, w)
+        turn = np.abs(w_new - w).sum(axis=1)
+        daily = gross - cost_rate * turn
+        nav = nav_prev * (1.0 + daily)
+
+        out_nav[:, t] = nav
+        out_ret[:, t] = daily
+        out_exp[:, t] = new_held.any(axis=1).astype(np.int64)
+        out_npos[:, t] = new_held.sum(axis=1)
+        out_turn[:, t] = turn
+        out_w[:, t, :] = w_new
+        out_act[:, t, :] = np.where(enter_now, 1, np.where(exit_now, 3, np.where(new_held, 2, 0)))
+
+        held, w, nav_prev = new_held, w_new, nav
+
+    return GridResult(list(params), list(panel.dates), list(panel.sectors), out_nav, out_ret, out_exp, out_npos,
+                      out_turn, out_w, out_act)
+
+
+# ---------------------------------------------------------------------
+# Outputs (CN_SECTOR_ROT_BT_DAILY_T / CN_SECTOR_ROT_POS_DAILY_T shapes) + SUMMARY_SQL metrics
+# ---------------------------------------------------------------------
+def bt_daily_rows(res: GridResult, c: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "run_id": res.params[c].run_id,
+        "trade_date": res.dates,
+        "nav": res.nav[c],
+        "daily_ret": res.daily_ret[c],
+        "exposed_flag": res.exposed[c],
+        "n_pos": res.n_pos[c],
+        "turnover": res.turnover[c],
+    })
+
+
+def pos_daily_rows(res: GridResult, c: int) -> pd.DataFrame:
+    t_idx, s_idx = np.nonzero(res.action[c])
+    return pd.DataFrame({
+        "run_id": res.params[c].run_id,
+        "trade_date": np.asarray(res.dates)[t_idx],
+        "sector_id": np.asarray(res.sectors)[s_idx],
+        "action": [ACTION_NAMES[int(a)] for a in res.action[c][t_idx, s_idx]],
+        "weight": res.weights[c][t_idx, s_idx],
+    })
+
+
+def summary_metrics(nav: Sequence[float], exposed: Sequence[int], actions: Sequence[str]) -> Dict[str, Any]:
+    """Same formulas (and rounding) as SUMMARY_SQL, including MAX(nav) as nav_end."""
+    nav = np.asarray(nav, dtype=float)
+    n_days = int(nav.size)
+    if n_days == 0:
+        return {k: None for k in SUMMARY_KEYS}
+    exposed_days = int(np.sum(exposed))
+    nav_end = float(nav.max())
+    acts = pd.Series(list(actions), dtype=object)
+    n_enter = int((acts == "ENTER").sum())
+    n_exit = int((acts == "EXIT").sum())
+    n_keep = int((acts == "KEEP").sum())
+    return {
+        "n_days": n_days,
+        "exposed_days": exposed_days,
+        "exposure_ratio": round(exposed_days / n_days, 4),
+        "nav_end": nav_end,
+        "cagr_252": nav_end ** (252.0 / n_days) - 1.0,
+        "mdd_approx": round(1.0 - float(nav.min()) / nav_end, 4),
+        "n_enter": n_enter,
+        "n_exit": n_exit,
+        "n_keep": n_keep,
+        "keep_per_enter": round(n_keep / n_enter, 2) if n_enter else None,
+    }
+
+
+def grid_summary(res: GridResult) -> pd.DataFrame:
+    rows = []
+    for c, p in enumerate(res.params):
+        acts = [ACTION_NAMES[int(a)] for a in res.action[c][res.action[c] > 0]]
+        rows.append({"run_id": p.run_id, **summary_metrics(res.nav[c], res.exposed[c], acts), "params": json.dumps(asdict(p))})
+    df = pd.DataFrame(rows)
+    return df.sort_values(["cagr_252", "mdd_approx"], ascending=[False, True], kind="stable").reset_index(drop=True)
+
+
+# ---------------------------------------------------------------------
+# Parity against a stored SP run
+# ---------------------------------------------------------------------
+STORED_BT_SQL = """
+SELECT TO_CHAR(trade_date, 'YYYY-MM-DD') AS trade_date, nav, exposed_flag
+FROM SECOPR.CN_SECTOR_ROT_BT_DAILY_T
+WHERE run_id = :run_id
+ORDER BY trade_date
+"""
+
+STORED_POS_SQL = """
+SELECT TO_CHAR(trade_date, 'YYYY-MM-DD') AS trade_date, action
+FROM SECOPR.CN_SECTOR_ROT_POS_DAILY_T
+WHERE run_id = :run_id
+"""
+
+
+def load_stored_run_oracle(conn, run_id: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    out = []
+    for sql in (STORED_BT_SQL, STORED_POS_SQL):
+        with conn.cursor() as cur:
+            cur.execute(sql, run_id=run_id)
+            cols = [c[0].lower() for c in cur.description]
+            out.append(pd.DataFrame(cur.fetchall(), columns=cols))
+    return out[0], out[1]
+
+
+def load_stored_run_sqlite(path: str, run_id: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Offline copy of the stored run (tables bt_daily / pos_daily, same columns as the Oracle tables)."""
+    with sqlite3.connect(path) as conn:
+        bt = pd.read_sql_query(
+            "SELECT trade_date, nav, exposed_flag FROM bt_daily WHERE run_id = ? ORDER BY trade_date", conn, params=(run_id,)
+        )
+        pos = pd.read_sql_query("SELECT trade_date, action FROM pos_daily WHERE run_id = ?", conn, params=(run_id,))
+    return bt, pos
+
+
+def parity_report(
+    res: GridResult,
+    c: int,
+    stored_bt: pd.DataFrame,
+    stored_pos: pd.DataFrame,
+    *,
+    nav_atol: float = 1e-6,
+) -> Dict[str, Any]:
+    """Diff one simulated combo against stored SP rows (aligned on trade_date)."""
+    sim_bt = bt_daily_rows(res, c)
+    sim_pos = pos_daily_rows(res, c)
+    stored_bt = stored_bt.assign(trade_date=pd.to_datetime(stored_bt["trade_date"]).dt.strftime("%Y-%m-%d"))
+    stored_pos = stored_pos.assign(trade_date=pd.to_datetime(stored_pos["trade_date"]).dt.strftime("%Y-%m-%d"))
+
+    m = sim_bt.merge(stored_bt, on="trade_date", how="outer", suffixes=("_sim", "_sp"), indicator=True)
+    both = m[m["_merge"] == "both"]
+    nav_diff = (both["nav_sim"].astype(float) - both["nav_sp"].astype(float)).abs()
+    exp_mismatch = both[both["exposed_flag_sim"].astype(int) != both["exposed_flag_sp"].astype(int)]
+
+    def _counts(df):
+        return df.groupby(["trade_date", "action"]).size()
+
+    act = pd.concat([_counts(sim_pos).rename("sim"), _counts(stored_pos).rename("sp")], axis=1).fillna(0)
+    act_mismatch = act[act["sim"] != act["sp"]]
+
+    sim_sum = summary_metrics(sim_bt["nav"], sim_bt["exposed_flag"], sim_pos["action"])
+    sp_sum = summary_metrics(stored_bt["nav"].astype(float), stored_bt["exposed_flag"].astype(int), stored_pos["action"])
+
+    ok = (
+        int((m["_merge"] != "both").sum()) == 0
+        and (nav_diff.max() if len(nav_diff) else 0.0) <= nav_atol
+        and exp_mismatch.empty
+        and act_mismatch.empty
+    )
+    return {
+        "run_id": res.params[c].run_id,
+        "status": "PASS" if ok else "MISMATCH",
+        "days_only_sim": int((m["_merge"] == "left_only").sum()),
+        "days_only_sp": int((m["_merge"] == "right_only").sum()),
+        "nav_max_abs_diff": float(nav_diff.max()) if len(nav_diff) else None,
+        "first_nav_diff_date": (both.loc[nav_diff > nav_atol, "trade_date"].min() if (nav_diff > nav_atol).any() else None),
+        "exposure_mismatch_days": int(len(exp_mismatch)),
+        "action_mismatch_days": int(act_mismatch.index.get_level_values(0).nunique()) if len(act_mismatch) else 0,
+        "summary_sim": sim_sum,
+        "summary_sp": sp_sum,
+    }
+
+
+# ---------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------
+def _floats(s: str) -> List[float]:
+    return [float(x) for x in s.split(",") if x.strip()]
+
+
+def _ints(s: str) -> List[int]:
+    return [int(x) for x in s.split(",") if x.strip()]
+
+
+def _load_panel(args) -> Panel:
+    if args.panel:
+        return load_panel_file(args.panel, args.start, args.end)
+    if not args.panel_sql:
+        raise SystemExit("need --panel (local export) or --panel-sql (Oracle)")
+    with open(args.panel_sql, "r", encoding="utf-8") as f:
+        sql = f.read()
+    with oracle_connect() as conn:
+        return load_panel_oracle(conn, sql, args.start, args.end, args.sector_type)
+
+
+def main():
+    ap = argparse.ArgumentParser(prog="vec_backtest.py")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    def common(p):
+        p.add_argument("--panel", help="local panel export (.parquet or SQLite)")
+        p.add_argument("--panel-sql", help="Oracle panel query file (TRADE_DATE, SECTOR_ID, SCORE_PCT, RET)")
+        p.add_argument("--start", default="2022-11-07")
+        p.add_argument("--end", default="2026-01-23")
+        p.add_argument("--sector-type", default="ALL")
+        p.add_argument("--min-hold", type=int, default=5)
+        p.add_argument("--rebalance-freq", type=int, default=5)
+        p.add_argument("--weight-mode", default="EQ")
+        p.add_argument("--full-rebuild", type=int, default=1)
+        p.add_argument("--cost-rate", type=float, default=0.0005)
+
+    p_exp = sub.add_parser("export", help="export the Oracle panel for offline runs")
+    common(p_exp)
+    p_exp.add_argument("--out", required=True)
+
+    p_grid = sub.add_parser("grid", help="evaluate a parameter grid locally")
+    common(p_grid)
+    p_grid.add_argument("--ep", default="0.80,0.90,0.98")
+    p_grid.add_argument("--xp", default="0.45,0.50,0.55")
+    p_grid.add_argument("--xc", default="1,2,3")
+    p_grid.add_argument("--k", default="2,3,4")
+    p_grid.add_argument("--prefix", default="SR_VEC_V1")
+    p_grid.add_argument("--tag", default="GRID")
+    p_grid.add_argument("--outdir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "outputs"))
+    p_grid.add_argument("--write-daily", action="store_true", help="also write bt_daily / pos_daily CSVs per run")
+
+    p_par = sub.add_parser("parity", help="diff one combo against a stored SP run")
+    common(p_par)
+    p_par.add_argument("--run-id", required=True)
+    p_par.add_argument("--ep", type=float, required=True)
+    p_par.add_argument("--xp", type=float, required=True)
+    p_par.add_argument("--xc", type=int, default=2)
+    p_par.add_argument("--k", type=int, default=2)
+    p_par.add_argument("--stored", help="SQLite copy of the stored run (bt_daily / pos_daily); default: Oracle")
+    p_par.add_argument("--nav-atol", type=float, default=1e-6)
+
+    args = ap.parse_args()
+    panel = _load_panel(args)
+    print(f"[panel] dates={len(panel.dates)} sectors={len(panel.sectors)}")
+
+    if args.cmd == "export":
+        save_panel_file(panel, args.out)
+        print(f"[export] -> {args.out}")
+        return
+
+    shared = dict(
+        min_hold=args.min_hold, rebalance_freq=args.rebalance_freq, weight_mode=args.weight_mode,
+        full_rebuild=args.full_rebuild, cost_rate=args.cost_rate,
+    )
+
+    if args.cmd == "grid":
+        params = build_grid(_floats(args.ep), _floats(args.xp), _ints(args.xc), _ints(args.k),
+                            prefix=args.prefix, tag=args.tag, **shared)
+        res = run_grid(panel, params)
+        os.makedirs(args.outdir, exist_ok=True)
+        summary = grid_summary(res)
+        out_csv = os.path.join(args.outdir, f"{args.prefix}_vec_summary.csv")
+        summary.to_csv(out_csv, index=False, encoding="utf-8-sig")
+        if args.write_daily:
+            for c in range(len(params)):
+                bt_daily_rows(res, c).to_csv(os.path.join(args.outdir, f"{params[c].run_id}_bt_daily.csv"), index=False)
+                pos_daily_rows(res, c).to_csv(os.path.join(args.outdir, f"{params[c].run_id}_pos_daily.csv"), index=False)
+        print(summary.drop(columns=["params"]).head(10).to_string(index=False))
+        print(f"[grid] combos={len(params)} -> {out_csv}")
+        return
+
+    shared["weight_mode"] = shared["weight_mode"].upper()
+    res = run_grid(panel, [BtParams(args.run_id, args.ep, args.xp, args.xc, args.k, **shared)])
+    if args.stored:
+        bt, pos = load_stored_run_sqlite(args.stored, args.run_id)
+    else:
+        with oracle_connect() as conn:
+            bt, pos = load_stored_run_oracle(conn, args.run_id)
+    rep = parity_report(res, 0, bt, pos, nav_atol=args.nav_atol)
+    print(json.dumps(rep, ensure_ascii=False, indent=2, default=str))
+    sys.exit(0 if rep["status"] == "PASS" else 1)
+
+
+if __name__ == "__main__":
+    main()
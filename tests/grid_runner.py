@@ -9,7 +9,7 @@ What it does
     2) SECOPR.SP_VALIDATE_SECTOR_ROT_RUN
 - Writes:
     - logs/grid_runner.log
-    - outputs/runs.csv (run_id + params + status + error)
+    - outputs/runs.csv (run_id + params + status + error; resumable checkpoint)
     - outputs/summary.sql (paste into SQLcl/SQL*Plus to compare metrics)
 
 How to run (examples)
@@ -20,6 +20,12 @@ How to run (examples)
    pip install oracledb pandas
 3) Run:
    python grid_runner.py --start 2022-11-07 --end 2026-01-23 --sector-type ALL
+   python grid_runner.py --workers 4        # 4 combos in flight over a pooled connection set
+
+Resume
+- outputs/runs.csv is a checkpoint: each finished combo is appended immediately.
+  Restarting skips combos already OK there or already stored in Oracle (see sweep_exec.py);
+  use --fresh to ignore the checkpoint and --rerun-existing to rerun stored run_ids.
 
 Notes
 - This script assumes SP_RUN_SECTOR_ROT_BACKTEST has a compatible signature.
@@ -28,7 +34,6 @@ Notes
 
 import os
 import sys
-import csv
 import json
 import time
 import argparse
@@ -39,10 +44,7 @@ from typing import List, Tuple
 
 import oracledb  # python-oracledb
 
-try:
-    import pandas as pd
-except Exception:
-    pd = None
+from sweep_exec import CheckpointWriter, ExistingRuns, create_pool, fetch_existing_run_ids, run_combos
 
 
 @dataclass(frozen=True)
@@ -83,7 +85,7 @@ def setup_logging(log_dir: str) -> logging.Logger:
     return logger
 
 
-def get_conn(logger: logging.Logger):
+def _conn_params():
     #user = os.environ.get("ORA_USER")
     #pwd  = os.environ.get("ORA_PASS")
     #dsn  = os.environ.get("ORA_DSN")
@@ -97,9 +99,19 @@ def get_conn(logger: logging.Logger):
 
     if not (DB_USER and DB_PASSWORD and DSN):
         raise RuntimeError("Missing ORA_USER / ORA_PASS / ORA_DSN env vars.")
+    return DB_USER, DB_PASSWORD, DSN
 
-    logger.info(f"Connecting to Oracle DSN={DSN} as {DB_USER}")
-    return oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=DSN)
+
+def get_conn(logger: logging.Logger):
+    user, pwd, dsn = _conn_params()
+    logger.info("Connecting to Oracle DSN=%s as %s", dsn, user)
+    return oracledb.connect(user=user, password=pwd, dsn=dsn)
+
+
+def get_pool(logger: logging.Logger, workers: int):
+    user, pwd, dsn = _conn_params()
+    logger.info("Creating Oracle pool DSN=%s as %s max=%s", dsn, user, workers)
+    return create_pool(user, pwd, dsn, workers)
 
 
 def run_id_of(prefix: str, ep: float, xp: float, xc: int, mh: int, rf: int, k: int, tag: str) -> str:
@@ -115,7 +127,7 @@ def call_backtest(cur, cfg: GridConfig, run_id: str, ep: float, xp: float, xc: i
       (p_run_id, p_start_dt, p_end_dt, p_sector_type, p_enter_p, p_exit_p, p_exit_consecutive,
        p_top_k, p_min_hold, p_rebalance_freq, p_weight_mode, p_full_rebuild)
     """
-    logger.info(f"[CALL] SP_RUN_SECTOR_ROT_BACKTEST run_id={run_id} ep={ep} xp={xp} xc={xc} k={k}")
+    logger.info("[CALL] SP_RUN_SECTOR_ROT_BACKTEST run_id=%s ep=%s xp=%s xc=%s k=%s", run_id, ep, xp, xc, k)
     cur.callproc("SECOPR.SP_RUN_SECTOR_ROT_BACKTEST", [
         run_id,
         datetime.strptime(cfg.start_dt, "%Y-%m-%d").date(),
@@ -133,7 +145,7 @@ def call_backtest(cur, cfg: GridConfig, run_id: str, ep: float, xp: float, xc: i
 
 
 def call_validate(cur, run_id: str, logger: logging.Logger):
-    logger.info(f"[CALL] SP_VALIDATE_SECTOR_ROT_RUN run_id={run_id}")
+    logger.info("[CALL] SP_VALIDATE_SECTOR_ROT_RUN run_id=%s", run_id)
     cur.callproc("SECOPR.SP_VALIDATE_SECTOR_ROT_RUN", [run_id])
 
 
@@ -194,6 +206,9 @@ def main():
     ap.add_argument("--prefix", default="SR_GRID_V1")
     ap.add_argument("--tag", default="GRID")
     ap.add_argument("--sleep-sec", type=float, default=0.0)
+    ap.add_argument("--workers", type=int, default=1, help="concurrent combos (pooled connections)")
+    ap.add_argument("--rerun-existing", action="store_true", help="do not skip run_ids already stored in Oracle")
+    ap.add_argument("--fresh", action="store_true", help="ignore the outputs/runs.csv checkpoint")
     args = ap.parse_args()
 
     cfg = GridConfig(
@@ -223,73 +238,65 @@ def main():
     write_summary_sql(os.path.join(out_dir, "summary.sql"), cfg.prefix)
 
     combos = build_grid(cfg)
-    logger.info(f"Total combos: {len(combos)}")
-
-    results = []
-
-    conn = get_conn(logger)
-    try:
-        conn.autocommit = False
+    logger.info("Total combos: %s", len(combos))
+
+    rows = []
+    for ep, xp, xc, k in combos:
+        rows.append({
+            "run_id": run_id_of(cfg.prefix, ep, xp, xc, cfg.min_hold, cfg.rebalance_freq, k, args.tag),
+            "ep": ep, "xp": xp, "xc": xc, "k": k,
+            "start": cfg.start_dt, "end": cfg.end_dt,
+            "sector_type": cfg.sector_type,
+            "min_hold": cfg.min_hold,
+            "rebalance_freq": cfg.rebalance_freq,
+            "weight_mode": cfg.weight_mode,
+            "full_rebuild": cfg.full_rebuild,
+            "status": "INIT",
+            "error": "",
+            "ts_start": "",
+            "ts_end": ""
+        })
+
+    def run_combo(conn, row):
         cur = conn.cursor()
+        call_backtest(cur, cfg, row["run_id"], row["ep"], row["xp"], row["xc"], row["k"], logger)
+        conn.commit()
+        call_validate(cur, row["run_id"], logger)
+        conn.commit()
+        if args.sleep_sec and args.sleep_sec > 0:
+            time.sleep(args.sleep_sec)
+
+    def validate_combo(conn, row):
+        # backtest already committed by an interrupted earlier sweep: only validation is missing
+        call_validate(conn.cursor(), row["run_id"], logger)
+        conn.commit()
 
-        for i, (ep, xp, xc, k) in enumerate(combos, start=1):
-            run_id = run_id_of(cfg.prefix, ep, xp, xc, cfg.min_hold, cfg.rebalance_freq, k, args.tag)
-            logger.info(f"--- [{i}/{len(combos)}] run_id={run_id} ---")
-
-            row = {
-                "run_id": run_id,
-                "ep": ep, "xp": xp, "xc": xc, "k": k,
-                "start": cfg.start_dt, "end": cfg.end_dt,
-                "sector_type": cfg.sector_type,
-                "min_hold": cfg.min_hold,
-                "rebalance_freq": cfg.rebalance_freq,
-                "weight_mode": cfg.weight_mode,
-                "full_rebuild": cfg.full_rebuild,
-                "status": "INIT",
-                "error": "",
-                "ts_start": datetime.now().isoformat(timespec="seconds"),
-                "ts_end": ""
-            }
-
-            try:
-                call_backtest(cur, cfg, run_id, ep, xp, xc, k, logger)
-                conn.commit()
-                call_validate(cur, run_id, logger)
-                conn.commit()
-                row["status"] = "OK"
-            except Exception as e:
-                try:
-                    conn.rollback()
-                except Exception:
-                    pass
-                row["status"] = "FAIL"
-                row["error"] = str(e).replace("\n", " ")[:1500]
-                logger.error(f"[FAIL] run_id={run_id} err={row['error']}")
-            finally:
-                row["ts_end"] = datetime.now().isoformat(timespec="seconds")
-                results.append(row)
-
-            if args.sleep_sec and args.sleep_sec > 0:
-                time.sleep(args.sleep_sec)
+    csv_path = os.path.join(out_dir, "runs.csv")
+    if args.fresh and os.path.exists(csv_path):
+        os.remove(csv_path)
+    checkpoint = CheckpointWriter(csv_path)
 
+    pool = get_pool(logger, args.workers)
+    try:
+        existing = ExistingRuns()
+        if not args.rerun_existing:
+            with pool.acquire() as conn:
+                existing = fetch_existing_run_ids(conn, cfg.prefix, logger)
+        results = run_combos(pool=pool, rows=rows, call=run_combo, checkpoint=checkpoint, logger=logger,
+                             workers=args.workers, existing=existing, validate=validate_combo)
     finally:
         try:
-            conn.close()
+            pool.close()
         except Exception:
             pass
 
-    csv_path = os.path.join(out_dir, "runs.csv")
-    if pd is not None:
-        pd.DataFrame(results).to_csv(csv_path, index=False, encoding="utf-8-sig")
-    else:
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=list(results[0].keys()))
-            w.writeheader()
-            w.writerows(results)
-
     ok = sum(1 for r in results if r["status"] == "OK")
-    logger.info(f"Done. OK={ok} FAIL={len(results)-ok}")
-    logger.info(f"Outputs: {csv_path} and outputs/summary.sql")
+    skipped = sum(1 for r in results if r["status"].startswith("SKIP"))
+    logger.info("Done. OK=%s SKIP=%s FAIL=%s", ok, skipped, len(results)-ok-skipped)
+    if existing.errors:
+        logger.warning("Existing-run lookup FAILED (%s): combos already in Oracle may have been re-run",
+                       "; ".join(existing.errors))
+    logger.info("Outputs: %s and outputs/summary.sql", csv_path)
 
 
 if __name__ == "__main__":
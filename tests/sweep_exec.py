@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Sector Rotation - shared concurrent / resumable executor for grid_runner.py and xp_sweep_runner.py
+
+What it does
+- Runs SP_RUN_SECTOR_ROT_BACKTEST + SP_VALIDATE_SECTOR_ROT_RUN for N combos concurrently over a
+  bounded oracledb connection pool (one pooled connection per in-flight combo, max = workers)
+- Checkpoints every finished combo to outputs/runs.csv immediately (append + flush + fsync),
+  so an interrupted sweep resumes where it stopped:
+    - run_id already OK in runs.csv          -> skipped (status SKIP_DONE)
+    - run_id registered in CN_SECTOR_ROT_BASELINE_T (validated)
+                                              -> skipped (status SKIP_EXISTING), unless --rerun-existing
+    - run_id with BT_DAILY rows but no OK checkpoint (interrupted between backtest and validation)
+                                              -> only SP_VALIDATE_SECTOR_ROT_RUN is re-run
+    - FAIL rows are retried on the next start, even when the run_id has (partial) rows in Oracle
+- At the end runs.csv is compacted to one row per run_id (last status wins)
+- A failed existing-run lookup is reported in the [RESUME] line and the runner's final summary
+
+The stored procedures stay the source of truth; this module only changes how calls are scheduled.
+"""
+
+import csv
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+RUNS_FIELDS = [
+    "run_id", "ep", "xp", "xc", "k", "start", "end", "sector_type", "min_hold", "rebalance_freq",
+    "weight_mode", "full_rebuild", "status", "error", "ts_start", "ts_end",
+]
+
+DONE_STATUSES = ("OK",)
+
+EXISTING_BT_SQL = """
+SELECT DISTINCT run_id FROM SECOPR.CN_SECTOR_ROT_BT_DAILY_T WHERE run_id LIKE :prefix
+"""
+
+EXISTING_BASELINE_SQL = """
+SELECT DISTINCT run_id FROM SECOPR.CN_SECTOR_ROT_BASELINE_T WHERE run_id LIKE :prefix
+"""
+
+
+def load_checkpoint(csv_path: str) -> Dict[str, Dict[str, str]]:
+    """runs.csv -> {run_id: last row}. Missing / unreadable file -> {}."""
+    if not os.path.exists(csv_path):
+        return {}
+    out: Dict[str, Dict[str, str]] = {}
+    try:
+        with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                rid = (row.get("run_id") or "").strip()
+                if rid:
+                    out[rid] = row
+    except Exception:
+        return {}
+    return out
+
+
+class CheckpointWriter:
+    """Thread-safe append-only runs.csv writer (one durable line per finished combo)."""
+
+    def __init__(self, csv_path: str, fields: Sequence[str] = RUNS_FIELDS):
+        self.csv_path = csv_path
+        self.fields = list(fields)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(csv_path)), exist_ok=True)
+        if not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0:
+            with open(csv_path, "w", newline="", encoding="utf-8-sig") as f:
+                csv.DictWriter(f, fieldnames=self.fields).writeheader()
+
+    def append(self, row: Dict[str, Any]) -> None:
+        with self._lock:
+            with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
+                csv.DictWriter(f, fieldnames=self.fields, extrasaction="ignore").writerow(row)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def compact(self, order: Sequence[str]) -> None:
+        """Rewrite runs.csv with one row per run_id (last wins), combos first in grid order."""
+        with self._lock:
+            rows = load_checkpoint(self.csv_path)
+            ordered = [rows[r] for r in order if r in rows] + [v for k, v in rows.items() if k not in set(order)]
+            tmp = self.csv_path + ".tmp"
+            with open(tmp, "w", newline="", encoding="utf-8-sig") as f:
+                w = csv.DictWriter(f, fieldnames=self.fields, extrasaction="ignore")
+                w.writeheader()
+                w.writerows(ordered)
+            os.replace(tmp, self.csv_path)
+
+
+@dataclass
+class ExistingRuns:
+    """What Oracle already holds for a prefix (see fetch_existing_run_ids)."""
+
+    validated: Set[str] = field(default_factory=set)  # registered in CN_SECTOR_ROT_BASELINE_T
+    backtested: Set[str] = field(default_factory=set)  # BT_DAILY rows; validation may not have run
+    errors: List[str] = field(default_factory=list)  # failed lookups: the sets above may be incomplete
+
+
+def fetch_existing_run_ids(conn, prefix: str, logger=None) -> ExistingRuns:
+    """run_ids with this prefix already stored in Oracle (BT_DAILY rows / baseline registry). Fail-soft."""
+    out = ExistingRuns()
+    for sql, found in ((EXISTING_BT_SQL, out.backtested), (EXISTING_BASELINE_SQL, out.validated)):
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql, prefix=f"{prefix}%")
+                found.update(str(r[0]) for r in cur.fetchall() if r and r[0])
+        except Exception as e:
+            out.errors.append(str(e)[:200])
+            if logger is not None:
+                logger.warning("[RESUME] existing-run lookup failed: %s", out.errors[-1])
+    return out
+
+
+def create_pool(user: str, password: str, dsn: str, workers: int):
+    import oracledb  # python-oracledb
+
+    n = max(int(workers), 1)
+    return oracledb.create_pool(user=user, password=password, dsn=dsn, min=1, max=n, increment=1)
+
+
+def _run_one(pool, row: Dict[str, Any], call: Callable[[Any, Dict[str, Any]], None], logger) -> Dict[str, Any]:
+    row = dict(row)
+    row["ts_start"] = datetime.now().isoformat(timespec="seconds")
+    try:
+        with pool.acquire() as conn:
+            conn.autocommit = False
+            try:
+                call(conn, row)
+                row["status"] = "OK"
+            except Exception:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                raise
+    except Exception as e:
+        row["status"] = "FAIL"
+        row["error"] = str(e).replace("\n", " ")[:1500]
+        logger.error("[FAIL] run_id=%s err=%s", row["run_id"], row["error"])
+    row["ts_end"] = datetime.now().isoformat(timespec="seconds")
+    return row
+
+
+def run_combos(
+    *,
+    pool,
+    rows: List[Dict[str, Any]],
+    call: Callable[[Any, Dict[str, Any]], None],
+    checkpoint: CheckpointWriter,
+    logger,
+    workers: int = 1,
+    existing: Optional[ExistingRuns] = None,
+    validate: Optional[Callable[[Any, Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Execute `call(conn, row)` per combo row (conn from the pool; commit inside `call`).
+    Combos whose backtest is already in Oracle but never checkpointed OK only get `validate(conn, row)`
+    (the full `call` when no validate is given).
+    Returns one result row per input row, in input order.
+    """
+    existing = existing or ExistingRuns()
+    prior = load_checkpoint(checkpoint.csv_path)
+    done = {rid for rid, r in prior.items() if r.get("status") in DONE_STATUSES}
+    # a combo that FAILED may have left partial rows in Oracle: the checkpoint wins over the existence probe
+    failed = {rid for rid, r in prior.items() if r.get("status") == "FAIL"}
+    validated = existing.validated - failed
+    backtested = existing.backtested - failed - validated
+
+    results: Dict[str, Dict[str, Any]] = {}
+    todo: List[Dict[str, Any]] = []
+    revalidate: Set[str] = set()
+    for row in rows:
+        rid = row["run_id"]
+        if rid in done:
+            results[rid] = {**row, "status": "SKIP_DONE"}
+        elif rid in validated:
+            results[rid] = {**row, "status": "SKIP_EXISTING"}
+            checkpoint.append({**row, "status": "OK", "error": "already in Oracle"})
+        else:
+            if rid in backtested:
+                revalidate.add(rid)
+            todo.append(row)
+
+    logger.info(
+        "[RESUME] total=%s skip_done=%s skip_existing=%s revalidate=%s todo=%s workers=%s lookup_failed=%s",
+        len(rows),
+        sum(1 for r in results.values() if r["status"] == "SKIP_DONE"),
+        sum(1 for r in results.values() if r["status"] == "SKIP_EXISTING"),
+        len(revalidate),
+        len(todo),
+        workers,
+        len(existing.errors),
+    )
+
+    n = len(todo)
+    with ThreadPoolExecutor(max_workers=max(int(workers), 1)) as ex:
+        futs = {
+            ex.submit(_run_one, pool, row, validate if row["run_id"] in revalidate and validate else call, logger): row["run_id"]
+            for row in todo
+        }
+        for i, fut in enumerate(as_completed(futs), start=1):
+            res = fut.result()
+            checkpoint.append(res)
+            results[res["run_id"]] = res
+            logger.info("--- [%s/%s] run_id=%s status=%s ---", i, n, res["run_id"], res["status"])
+
+    checkpoint.compact([r["run_id"] for r in rows])
+    return [results[r["run_id"]] for r in rows]
@@ -20,18 +20,21 @@ Env vars (required)
 Run
 - pip install -r requirements.txt
 - python xp_sweep_runner.py --prefix SR_XP_SWEEP_V1 --tag XPSWEEP
+- python xp_sweep_runner.py --workers 4   (concurrent combos over a bounded connection pool)
+
+Resume
+- outputs/runs.csv is appended per finished combo; a restart skips combos already OK there or
+  already stored in Oracle (--fresh / --rerun-existing to override). See sweep_exec.py.
 """
 
-import os, sys, csv, json, time, argparse, logging
+import os, sys, json, time, argparse, logging
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from typing import List, Tuple
 
 import oracledb
-try:
-    import pandas as pd
-except Exception:
-    pd = None
+
+from sweep_exec import CheckpointWriter, ExistingRuns, create_pool, fetch_existing_run_ids, run_combos
 
 
 @dataclass(frozen=True)
@@ -72,7 +75,7 @@ def setup_logging(log_dir: str) -> logging.Logger:
     return logger
 
  
-def get_conn(logger: logging.Logger):
+def _conn_params():
     #user = os.environ.get("ORA_USER")
     #pwd  = os.environ.get("ORA_PASS")
     #dsn  = os.environ.get("ORA_DSN")
@@ -86,9 +89,19 @@ def get_conn(logger: logging.Logger):
 
     if not (DB_USER and DB_PASSWORD and DSN):
         raise RuntimeError("Missing ORA_USER / ORA_PASS / ORA_DSN env vars.")
+    return DB_USER, DB_PASSWORD, DSN
+
+
+def get_conn(logger: logging.Logger):
+    user, pwd, dsn = _conn_params()
+    logger.info("Connecting to Oracle DSN=%s as %s", dsn, user)
+    return oracledb.connect(user=user, password=pwd, dsn=dsn)
+
 
-    logger.info(f"Connecting to Oracle DSN={DSN} as {DB_USER}")
-    return oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=DSN)
+def get_pool(logger: logging.Logger, workers: int):
+    user, pwd, dsn = _conn_params()
+    logger.info("Creating Oracle pool DSN=%s as %s max=%s", dsn, user, workers)
+    return create_pool(user, pwd, dsn, workers)
 
 def run_id_of(prefix: str, ep: float, xp: float, xc: int, mh: int, rf: int, k: int, tag: str) -> str:
     ep_i = int(round(ep * 100))
@@ -102,7 +115,7 @@ def call_backtest(cur, cfg: SweepConfig, run_id: str, xp: float, k: int, logger:
       (p_run_id, p_start_dt, p_end_dt, p_sector_type, p_enter_p, p_exit_p, p_exit_consecutive,
        p_top_k, p_min_hold, p_rebalance_freq, p_weight_mode, p_full_rebuild)
     """
-    logger.info(f"[CALL] SP_RUN_SECTOR_ROT_BACKTEST run_id={run_id} ep={cfg.ep} xp={xp} xc={cfg.xc} k={k}")
+    logger.info("[CALL] SP_RUN_SECTOR_ROT_BACKTEST run_id=%s ep=%s xp=%s xc=%s k=%s", run_id, cfg.ep, xp, cfg.xc, k)
     cur.callproc("SECOPR.SP_RUN_SECTOR_ROT_BACKTEST", [
         run_id,
         datetime.strptime(cfg.start_dt, "%Y-%m-%d").date(),
@@ -120,7 +133,7 @@ def call_backtest(cur, cfg: SweepConfig, run_id: str, xp: float, k: int, logger:
 
 
 def call_validate(cur, run_id: str, logger: logging.Logger):
-    logger.info(f"[CALL] SP_VALIDATE_SECTOR_ROT_RUN run_id={run_id}")
+    logger.info("[CALL] SP_VALIDATE_SECTOR_ROT_RUN run_id=%s", run_id)
     cur.callproc("SECOPR.SP_VALIDATE_SECTOR_ROT_RUN", [run_id])
 
 
@@ -196,6 +209,9 @@ def main():
     ap.add_argument("--xp-end", type=float, default=0.58)
     ap.add_argument("--xp-step", type=float, default=0.01)
     ap.add_argument("--sleep-sec", type=float, default=0.0)
+    ap.add_argument("--workers", type=int, default=1, help="concurrent combos (pooled connections)")
+    ap.add_argument("--rerun-existing", action="store_true", help="do not skip run_ids already stored in Oracle")
+    ap.add_argument("--fresh", action="store_true", help="ignore the outputs/runs.csv checkpoint")
     args = ap.parse_args()
 
     k_list = [int(x.strip()) for x in args.k_list.split(",") if x.strip()]
@@ -229,72 +245,65 @@ def main():
     write_summary_sql(os.path.join(out_dir, "summary.sql"), cfg.prefix)
 
     combos = build_combos(cfg)
-    logger.info(f"Total runs: {len(combos)} (xp={len(cfg.xp_list)} * k={len(cfg.k_list)})")
-
-    results = []
-    conn = get_conn(logger)
-    try:
-        conn.autocommit = False
+    logger.info("Total runs: %s (xp=%s * k=%s)", len(combos), len(cfg.xp_list), len(cfg.k_list))
+
+    rows = []
+    for xp, k in combos:
+        rows.append({
+            "run_id": run_id_of(cfg.prefix, cfg.ep, xp, cfg.xc, cfg.min_hold, cfg.rebalance_freq, k, cfg.tag),
+            "ep": cfg.ep, "xp": xp, "xc": cfg.xc, "k": k,
+            "start": cfg.start_dt, "end": cfg.end_dt,
+            "sector_type": cfg.sector_type,
+            "min_hold": cfg.min_hold,
+            "rebalance_freq": cfg.rebalance_freq,
+            "weight_mode": cfg.weight_mode,
+            "full_rebuild": cfg.full_rebuild,
+            "status": "INIT",
+            "error": "",
+            "ts_start": "",
+            "ts_end": ""
+        })
+
+    def run_combo(conn, row):
         cur = conn.cursor()
+        call_backtest(cur, cfg, row["run_id"], row["xp"], row["k"], logger)
+        conn.commit()
+        call_validate(cur, row["run_id"], logger)
+        conn.commit()
+        if args.sleep_sec and args.sleep_sec > 0:
+            time.sleep(args.sleep_sec)
+
+    def validate_combo(conn, row):
+        # backtest already committed by an interrupted earlier sweep: only validation is missing
+        call_validate(conn.cursor(), row["run_id"], logger)
+        conn.commit()
 
-        for i, (xp, k) in enumerate(combos, start=1):
-            run_id = run_id_of(cfg.prefix, cfg.ep, xp, cfg.xc, cfg.min_hold, cfg.rebalance_freq, k, cfg.tag)
-            logger.info(f"--- [{i}/{len(combos)}] run_id={run_id} ---")
-
-            row = {
-                "run_id": run_id,
-                "ep": cfg.ep, "xp": xp, "xc": cfg.xc, "k": k,
-                "start": cfg.start_dt, "end": cfg.end_dt,
-                "sector_type": cfg.sector_type,
-                "min_hold": cfg.min_hold,
-                "rebalance_freq": cfg.rebalance_freq,
-                "weight_mode": cfg.weight_mode,
-                "full_rebuild": cfg.full_rebuild,
-                "status": "INIT",
-                "error": "",
-                "ts_start": datetime.now().isoformat(timespec="seconds"),
-                "ts_end": ""
-            }
-
-            try:
-                call_backtest(cur, cfg, run_id, xp, k, logger)
-                conn.commit()
-                call_validate(cur, run_id, logger)
-                conn.commit()
-                row["status"] = "OK"
-            except Exception as e:
-                try:
-                    conn.rollback()
-                except Exception:
-                    pass
-                row["status"] = "FAIL"
-                row["error"] = str(e).replace("\\n", " ")[:1500]
-                logger.error(f"[FAIL] run_id={run_id} err={row['error']}")
-            finally:
-                row["ts_end"] = datetime.now().isoformat(timespec="seconds")
-                results.append(row)
-
-            if args.sleep_sec and args.sleep_sec > 0:
-                time.sleep(args.sleep_sec)
+    csv_path = os.path.join(out_dir, "runs.csv")
+    if args.fresh and os.path.exists(csv_path):
+        os.remove(csv_path)
+    checkpoint = CheckpointWriter(csv_path)
 
+    pool = get_pool(logger, args.workers)
+    try:
+        existing = ExistingRuns()
+        if not args.rerun_existing:
+            with pool.acquire() as conn:
+                existing = fetch_existing_run_ids(conn, cfg.prefix, logger)
+        results = run_combos(pool=pool, rows=rows, call=run_combo, checkpoint=checkpoint, logger=logger,
+                             workers=args.workers, existing=existing, validate=validate_combo)
     finally:
         try:
-            conn.close()
+            pool.close()
         except Exception:
             pass
 
-    csv_path = os.path.join(out_dir, "runs.csv")
-    if pd is not None:
-        pd.DataFrame(results).to_csv(csv_path, index=False, encoding="utf-8-sig")
-    else:
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=list(results[0].keys()))
-            w.writeheader()
-            w.writerows(results)
-
     ok = sum(1 for r in results if r["status"] == "OK")
-    logger.info(f"Done. OK={ok} FAIL={len(results)-ok}")
-    logger.info(f"Outputs: {csv_path} and outputs/summary.sql")
+    skipped = sum(1 for r in results if r["status"].startswith("SKIP"))
+    logger.info("Done. OK=%s SKIP=%s FAIL=%s", ok, skipped, len(results)-ok-skipped)
+    if existing.errors:
+        logger.warning("Existing-run lookup FAILED (%s): combos already in Oracle may have been re-run",
+                       "; ".join(existing.errors))
+    logger.info("Outputs: %s and outputs/summary.sql", csv_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""UnifiedRisk V12 · Startup import budget check (-X importtime)
+
+Run:
+  python tools/check_import_budget.py
+  python tools/check_import_budget.py --target replay_run --repeat 5
+  python tools/check_import_budget.py --scale 2.0      # slow CI host
+
+Each target module is imported in a fresh interpreter with `-X importtime`:
+- budget: cumulative import time of the target (best of --repeat runs, ms)
+- forbidden: heavy modules that must NOT be imported at startup
+  (data sources / providers are loaded on demand by the engine)
+
+Exit code 1 when any target exceeds its budget or imports a forbidden module.
+Budgets are wall-clock and machine-dependent; forbidden-module checks are not.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Ensure repo root is on sys.path so `core.*` imports work when running as a script
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+# data / network stacks: only the snapshot fetch path may import these
+HEAVY_MODULES: Tuple[str, ...] = ("akshare", "baostock", "yfinance", "sqlalchemy", "pandas")
+
+
+@dataclass(frozen=True)
+class ImportTarget:
+    module: str
+    budget_ms: float
+    forbidden: Tuple[str, ...] = field(default_factory=tuple)
+
+
+TARGETS: Tuple[ImportTarget, ...] = (
+    ImportTarget("main", 300.0, HEAVY_MODULES + ("core.engines.cn.ashare_daily_engine",)),
+    ImportTarget("replay_run", 300.0, HEAVY_MODULES + ("core.reporters.report_engine",)),
+    ImportTarget(
+        "core.engines.cn.ashare_daily_engine",
+        600.0,
+        ("akshare", "baostock", "yfinance", "sqlalchemy", "core.adapters.fetchers.cn.ashare_fetcher"),
+    ),
+)
+
+
+@dataclass
+class ImportMeasure:
+    module: str
+    cumulative_ms: float
+    imported: List[str]
+
+
+def parse_importtime(stderr: str, module: str) -> ImportMeasure:
+    """Parse `-X importtime` output; cumulative_ms is the target's own top-level entry."""
+    imported: List[str] = []
+    cumulative_us: Optional[int] = None
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cum = int(parts[1].strip())
+        except ValueError:
+            continue  # header line
+        raw_name = parts[2]
+        name = raw_name.strip()
+        imported.append(name)
+        if name == module and raw_name.startswith(" ") and not raw_name.startswith("  "):
+            cumulative_us = cum
+    if cumulative_us is None:
+        raise RuntimeError(f"target not found in importtime output: {module}")
+    return ImportMeasure(module=module, cumulative_ms=cumulative_us / 1000.0, imported=imported)
+
+
+def measure(module: str, repeat: int = 3) -> ImportMeasure:
+    """Best-of-N import of `module` in a fresh interpreter (cwd = repo root)."""
+    best: Optional[ImportMeasure] = None
+    for _ in range(max(int(repeat), 1)):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=str(REPO_ROOT),
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+        m = parse_importtime(proc.stderr, module)
+        if best is None or m.cumulative_ms < best.cumulative_ms:
+            best = m
+    assert best is not None
+    return best
+
+
+def forbidden_hits(imported: Sequence[str], forbidden: Sequence[str]) -> List[str]:
+    hits = set()
+    for name in imported:
+        for f in forbidden:
+            if name == f or name.startswith(f + "."):
+                hits.add(f)
+    return sorted(hits)
+
+
+def check(targets: Sequence[ImportTarget], repeat: int, scale: float) -> Tuple[bool, List[Dict[str, object]]]:
+    ok = True
+    rows: List[Dict[str, object]] = []
+    for t in targets:
+        m = measure(t.module, repeat=repeat)
+        budget = t.budget_ms * scale
+        hits = forbidden_hits(m.imported, t.forbidden)
+        status = "OK"
+        if hits:
+            status = "FORBIDDEN"
+        elif m.cumulative_ms > budget:
+            status = "OVER_BUDGET"
+        ok = ok and status == "OK"
+        rows.append(
+            {
+                "module": t.module,
+                "import_ms": round(m.cumulative_ms, 1),
+                "budget_ms": round(budget, 1),
+                "modules": len(m.imported),
+                "forbidden": hits,
+                "status": status,
+            }
+        )
+    return ok, rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(prog="check_import_budget.py")
+    ap.add_argument("--target", action="append", default=[], help="Only check this module (repeatable)")
+    ap.add_argument("--repeat", type=int, default=3, help="Best-of-N runs per target")
+    ap.add_argument("--scale", type=float, default=1.0, help="Multiply all budgets (slow hosts)")
+    ap.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = ap.parse_args()
+
+    targets = [t for t in TARGETS if not args.target or t.module in args.target]
+    if not targets:
+        ap.error(f"unknown target(s): {args.target}")
+
+    ok, rows = check(targets, repeat=args.repeat, scale=args.scale)
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        for r in rows:
+            extra = f" forbidden={','.join(r['forbidden'])}" if r["forbidden"] else ""
+            print(
+                f"{r['status']:<12} {r['module']:<40} {r['import_ms']:>8.1f} ms "
+                f"(budget {r['budget_ms']:.0f} ms, {r['modules']} modules){extra}"
+            )
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
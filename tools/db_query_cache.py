@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+tools/db_query_cache.py
+
+Maintenance for the closed-date DB query result cache (db.query_cache,
+default data/cache/db_query). Entries are only ever written for queries whose
+date parameters are all before the latest closed trade date; after an upstream
+table is reloaded / corrected, drop the entries that read it.
+
+Usage:
+    python tools/db_query_cache.py stats
+    python tools/db_query_cache.py invalidate --table CN_STOCK_DAILY_PRICE
+    python tools/db_query_cache.py invalidate --table CN_FUT_INDEX_HIS --table CN_INDEX_DAILY_PRICE
+    python tools/db_query_cache.py clear
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure repo root on sys.path
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core.adapters.providers.db_query_cache import (  # noqa: E402
+    DEFAULT_CACHE_ROOT,
+    DEFAULT_MAX_MB,
+    QueryResultCache,
+)
+from core.utils.config_loader import load_config  # noqa: E402
+
+
+def main() -> int:
+    cfg = (load_config().get("db", {}) or {}).get("query_cache", {}) or {}
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--root", default=str(cfg.get("root", DEFAULT_CACHE_ROOT)), help="cache root")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats")
+    inv = sub.add_parser("invalidate")
+    inv.add_argument("--table", action="append", required=True, help="upstream table name (repeatable)")
+    sub.add_parser("clear")
+    args = ap.parse_args()
+
+    cache = QueryResultCache(root=args.root, max_bytes=int(cfg.get("max_mb", DEFAULT_MAX_MB)) * 1024 * 1024)
+
+    if args.cmd == "stats":
+        st = cache.stats()
+        print(f"[QueryCache] root={st['root']} entries={st['entries']} size_mb={st['bytes'] / 1024 / 1024:.1f} max_mb={st['max_bytes'] / 1024 / 1024:.0f}")
+        return 0
+    if args.cmd == "invalidate":
+        for table in args.table:
+            print(f"[QueryCache] invalidated {table}: {cache.invalidate(table)} entries")
+        return 0
+    print(f"[QueryCache] cleared {cache.clear()} entries")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+tools/derived_series.py
+
+Maintenance for the derived daily series of the leading-structure blocks
+(etf_flow / futures_basis / options_risk / liquidity_quality), stored one row per
+(block, trade_date) in data/persistent/derived_series.db.
+
+Daily runs append only missing dates. After changing a block's aggregation
+(bump its version in core/adapters/datasources/cn/derived_series.py), rebuild:
+
+Usage:
+    python tools/derived_series.py status
+    python tools/derived_series.py rebuild --from 2025-01-01
+    python tools/derived_series.py rebuild --from 2025-06-01 --to 2026-02-13 --blocks options_risk
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure repo root on sys.path
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core.adapters.datasources.cn.derived_series import (  # noqa: E402
+    DEFAULT_DB_PATH,
+    DERIVED_BLOCKS,
+    open_store,
+    rebuild,
+)
+from core.adapters.providers.db_provider_router import get_db_provider  # noqa: E402
+from core.utils.time_utils import now_bj  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=DEFAULT_DB_PATH, help="derived series sqlite path")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    sub.add_parser("status")
+
+    rb = sub.add_parser("rebuild")
+    rb.add_argument("--from", dest="start", required=True, help="YYYY-MM-DD")
+    rb.add_argument("--to", dest="end", default=None, help="YYYY-MM-DD (default: today BJ)")
+    rb.add_argument("--blocks", default=",".join(DERIVED_BLOCKS), help="comma list of: " + ",".join(DERIVED_BLOCKS))
+    rb.add_argument("--chunk-days", type=int, default=90, help="calendar days per aggregation query")
+    args = ap.parse_args()
+
+    if args.cmd == "status":
+        store = open_store(args.db)
+        try:
+            for block, version, rows, first, last in store.status():
+                current = DERIVED_BLOCKS.get(block)
+                flag = "" if current and current.version == version else "  (stale version)"
+                print(f"[DERIVED] {block} v{version} rows={rows} {first}..{last}{flag}")
+        finally:
+            store.conn.close()
+        return 0
+
+    end = args.end or now_bj().date().isoformat()
+    blocks = [b.strip() for b in args.blocks.split(",") if b.strip()]
+    unknown = [b for b in blocks if b not in DERIVED_BLOCKS]
+    if unknown:
+        print(f"[DERIVED] unknown blocks: {unknown}")
+        return 2
+
+    db = get_db_provider()
+    failed = 0
+    for block in blocks:
+        try:
+            n = rebuild(block, db, args.start, end, chunk_days=args.chunk_days, db_path=args.db)
+            print(f"[DERIVED] rebuilt {block} {args.start}..{end} rows={n}")
+        except Exception as e:
+            failed += 1
+            print(f"[DERIVED] rebuild failed {block}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
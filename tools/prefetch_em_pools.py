@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+tools/prefetch_em_pools.py
+
+Bulk prefetch of Eastmoney limit-up (zt) / broken-limit (zbgc) pools into the frozen per-date
+store (data/cn/market/em_pool/<kind>/<kind>_YYYYMMDD.parquet).
+
+MarketSentimentDataSource reads this store first, so after a prefetch the sentiment blocks of
+any date in the range (EOD reruns, replays, backfills) need no network call.
+Already-frozen dates are skipped; dates that are not closed yet are fetched but not stored.
+
+Usage:
+    python tools/prefetch_em_pools.py --start 2025-10-01 --end 2026-02-13
+    python tools/prefetch_em_pools.py --start 2026-02-13 --kinds zt --sleep 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Ensure repo root on sys.path
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core.utils.em_pool_store import POOL_KINDS, prefetch_em_pools  # noqa: E402
+from core.utils.time_utils import now_bj  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--start", required=True, help="YYYY-MM-DD")
+    ap.add_argument("--end", default=None, help="YYYY-MM-DD (default: today BJ)")
+    ap.add_argument("--kinds", default=",".join(POOL_KINDS), help="comma list of: " + ",".join(POOL_KINDS))
+    ap.add_argument("--sleep", type=float, default=0.3, help="pause between network calls (seconds)")
+    args = ap.parse_args()
+
+    start = datetime.strptime(args.start, "%Y-%m-%d").date()
+    end = datetime.strptime(args.end, "%Y-%m-%d").date() if args.end else now_bj().date()
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()]
+
+    stats = prefetch_em_pools(start, end, kinds=kinds, sleep_s=args.sleep)
+    print(f"[EM_POOL_PREFETCH] range={start}..{end} kinds={','.join(kinds)} {stats}")
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
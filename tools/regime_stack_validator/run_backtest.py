@@ -15,7 +15,8 @@ def main():
     df_prices = load_market_data(
         csv_path=cfg["data"]["price_csv"],
         start_date=cfg["backtest"]["start_date"],
-        days=cfg["backtest"]["days"]
+        days=cfg["backtest"]["days"],
+        cache_dir=cfg["data"].get("parquet_cache"),
     )
 
     df_metrics = compute_metrics(df_prices, cfg["metrics"]["new_low_window"])
@@ -1,7 +1,115 @@
+import json
+import os
+
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    import pyarrow.dataset as ds
+except Exception:  # pragma: no cover - optional dependency
+    pa = None
+
+MANIFEST = "_source.json"
+
+
+def _window(start_date, days):
+    # 交易日，不用自然日
+    start = pd.to_datetime(start_date)
+    end = start + pd.tseries.offsets.BDay(days)
+    return start, end
+
+
+def _finalize(df):
+    """sorted (code, date) frame → standard output schema with prev_close per stock."""
+    df = df.sort_values(["code", "date"], kind="stable").reset_index(drop=True)
+    df["prev_close"] = df.groupby("code", observed=True)["close"].shift(1)
+    return df[["date", "code", "close", "prev_close"]]
+
 
-def load_market_data(csv_path, start_date, days):
+def _source_sig(csv_path):
+    st = os.stat(csv_path)
+    return {"csv": os.path.abspath(csv_path), "size": st.st_size, "mtime": int(st.st_mtime)}
+
+
+def _cache_fresh(csv_path, cache_dir):
+    try:
+        with open(os.path.join(cache_dir, MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f) == _source_sig(csv_path)
+    except Exception:
+        return False
+
+
+def build_parquet_cache(csv_path, cache_dir):
+    """
+    One-time CSV → Parquet dataset conversion (hive-partitioned by year).
+
+    Columns: date (timestamp), code (dictionary / categorical), close (float64).
+    The CSV is streamed in record batches, so conversion memory stays bounded.
+    A manifest (source size + mtime) marks the cache fresh; a changed CSV triggers a rebuild.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required for the Parquet cache")
+
+    reader = pacsv.open_csv(
+        csv_path,
+        convert_options=pacsv.ConvertOptions(
+            include_columns=["SYMBOL", "EXCHANGE", "TRADE_DATE", "CLOSE"],
+            column_types={"SYMBOL": pa.string(), "EXCHANGE": pa.string(), "TRADE_DATE": pa.timestamp("s"), "CLOSE": pa.float64()},
+            timestamp_parsers=["%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y/%m/%d %H:%M:%S", "%Y/%m/%d"],
+        ),
+    )
+
+    def batches():
+        for b in reader:
+            code = pc.binary_join_element_wise(
+                pc.utf8_lpad(b.column("SYMBOL"), width=6, padding="0"),
+                pc.utf8_upper(b.column("EXCHANGE")),
+                ".",
+            )
+            date = b.column("TRADE_DATE")
+            yield pa.record_batch(
+                [date, code.dictionary_encode(), b.column("CLOSE"), pc.year(date)],
+                names=["date", "code", "close", "year"],
+            )
+
+    schema = pa.schema([
+        ("date", pa.timestamp("s")),
+        ("code", pa.dictionary(pa.int32(), pa.string())),
+        ("close", pa.float64()),
+        ("year", pa.int64()),
+    ])
+    ds.write_dataset(
+        batches(),
+        cache_dir,
+        schema=schema,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("year", pa.int64())]), flavor="hive"),
+        existing_data_behavior="delete_matching",
+    )
+    with open(os.path.join(cache_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(_source_sig(csv_path), f)
+
+
+def load_market_data_parquet(cache_dir, start_date, days):
+    """Read only the backtest window: year partitions pruned, date filter pushed into the scan."""
+    start, end = _window(start_date, days)
+    dataset = ds.dataset(cache_dir, format="parquet", partitioning="hive")
+    table = dataset.to_table(
+        columns=["date", "code", "close"],
+        filter=(ds.field("year") >= start.year) & (ds.field("year") <= end.year)
+        & (ds.field("date") >= pa.scalar(start.to_pydatetime(), pa.timestamp("s")))
+        & (ds.field("date") <= pa.scalar(end.to_pydatetime(), pa.timestamp("s"))),
+    )
+    df = table.to_pandas()
+    # dictionary order follows the CSV; sort categories so (code, date) ordering matches the CSV path
+    codes = df["code"].cat.remove_unused_categories()
+    df["code"] = codes.cat.reorder_categories(sorted(codes.cat.categories))
+    return _finalize(df)
+
+
+def load_market_data(csv_path, start_date, days, cache_dir=None):
     """
     Load market data from CSV snapshot.
 
@@ -12,11 +120,23 @@ def load_market_data(csv_path, start_date, days):
     - CLOSE
 
     Extra columns are ignored.
+
+    cache_dir: optional Parquet dataset built from csv_path on first use (requires pyarrow);
+    later runs read only the window's partitions. Falls back to the CSV path if unavailable.
     """
 
-    # 1. Read CSV
+    if cache_dir and pa is not None:
+        try:
+            if not _cache_fresh(csv_path, cache_dir):
+                build_parquet_cache(csv_path, cache_dir)
+            return load_market_data_parquet(cache_dir, start_date, days)
+        except Exception as e:
+            print(f"[WARN] parquet cache unavailable, reading CSV: {e}")
+
+    # 1. Read CSV (only the needed columns)
     df = pd.read_csv(
         csv_path,
+        usecols=["SYMBOL", "EXCHANGE", "TRADE_DATE", "CLOSE"],
         parse_dates=["TRADE_DATE"],
         dtype={
             "SYMBOL": str,
@@ -24,27 +144,16 @@ def load_market_data(csv_path, start_date, days):
         }
     )
 
-    # 2. Normalize code
-    df["code"] = df["SYMBOL"].str.zfill(6) + "." + df["EXCHANGE"].str.upper()
-
-    # 3. Sort by code + trade date
-    df = df.sort_values(["code", "TRADE_DATE"])
-
-    # 4. Slice backtest window (交易日，不用自然日)
-    start = pd.to_datetime(start_date)
-    end = start + pd.tseries.offsets.BDay(days)
-
+    # 2. Slice backtest window before any per-row string work
+    start, end = _window(start_date, days)
     df = df[(df["TRADE_DATE"] >= start) & (df["TRADE_DATE"] <= end)]
 
-    # 5. Derive prev_close per stock
-    df["prev_close"] = df.groupby("code")["CLOSE"].shift(1)
-
-    # 6. Standardize output schema
-    df_out = df.rename(columns={
-        "TRADE_DATE": "date",
-        "CLOSE": "close"
-    })[
-        ["date", "code", "close", "prev_close"]
-    ]
+    # 3. Normalize code (categorical)
+    code = df["SYMBOL"].str.zfill(6) + "." + df["EXCHANGE"].str.upper()
 
-    return df_out
+    # 4. Standardize output schema + prev_close per stock
+    return _finalize(pd.DataFrame({
+        "date": df["TRADE_DATE"].to_numpy(),
+        "code": pd.Categorical(code),
+        "close": df["CLOSE"].to_numpy(dtype=float),
+    }))
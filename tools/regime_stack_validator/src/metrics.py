@@ -1,26 +1,56 @@
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def grouped_rolling_min(values, group_start, window):
+    """
+    Rolling min over `window` rows within each group of a (group, date)-sorted array.
+
+    Same result as groupby(code).transform(lambda x: x.rolling(window).min()):
+    NaN until a group has `window` rows, NaN if the window contains NaN.
+    """
+    x = np.asarray(values, dtype=float)
+    out = np.full(x.shape[0], np.nan)
+    w = int(window)
+    if w <= 0 or x.shape[0] < w:
+        return out
+    out[w - 1:] = sliding_window_view(x, w).min(axis=1)
+    # rows whose window crosses a group boundary
+    pos_in_group = np.arange(x.shape[0]) - group_start
+    out[pos_in_group < w - 1] = np.nan
+    return out
+
 
 def compute_metrics(df, window):
-    df = df.copy()
+    """Per-date breadth metrics; df is the (code, date)-sorted frame from data_loader."""
+    close = df["close"].to_numpy(dtype=float)
+    prev_close = df["prev_close"].to_numpy(dtype=float)
 
-    df["ret"] = df["close"] / df["prev_close"] - 1
-    df["adv"] = df["close"] > df["prev_close"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = close / prev_close - 1
+    adv = close > prev_close
 
-    adv = df.groupby("date")["adv"].mean()
-    median_ret = df.groupby("date")["ret"].median()
+    # group starts per code (input is sorted by code, date)
+    code_idx = pd.factorize(df["code"], sort=False)[0]
+    is_start = np.r_[True, code_idx[1:] != code_idx[:-1]]
+    group_start = np.maximum.accumulate(np.where(is_start, np.arange(len(code_idx)), 0))
 
-    df["rolling_low"] = df.groupby("code")["close"].transform(
-        lambda x: x.rolling(window).min()
-    )
-    df["new_low"] = df["close"] == df["rolling_low"]
+    rolling_low = grouped_rolling_min(close, group_start, window)
+    new_low = close == rolling_low
 
-    new_low_ratio = df.groupby("date")["new_low"].mean()
+    # per-date means via bincount on the date index
+    date_idx, dates = pd.factorize(df["date"], sort=True)
+    n = np.bincount(date_idx, minlength=len(dates)).astype(float)
+    adv_ratio = np.bincount(date_idx, weights=adv, minlength=len(dates)) / n
+    new_low_ratio = np.bincount(date_idx, weights=new_low, minlength=len(dates)) / n
+    median_ret = pd.Series(ret).groupby(date_idx).median().reindex(range(len(dates))).to_numpy()
 
     metrics = pd.DataFrame({
-        "date": adv.index,
-        "adv_ratio": adv.values,
-        "median_return": median_ret.values,
-        "new_low_ratio": new_low_ratio.values,
+        "date": dates,
+        "adv_ratio": adv_ratio,
+        "median_return": median_ret,
+        "new_low_ratio": new_low_ratio,
     })
 
     metrics["new_low_persistence"] = (
@@ -16,6 +16,11 @@ This version is consistent and schema-agnostic:
 - This does NOT depend on state_event completeness, and stays stable across CLI formatting.
 - HIT line includes symbol codes.
 
+Default mode uses engine.run_eod_range(): one Oracle price query for the whole range,
+trading days from the price calendar, in-memory state, batched SQLite flushes; newly
+TRIGGERED symbols come from the in-memory prior state (same rule as above).
+--per-day keeps the legacy loop (run_eod per calendar day + snap comparison).
+
 Output:
 - Writes to data/cn_epr_breakout_scan.log
 """
@@ -109,48 +114,55 @@ def main():
         action="store_true",
         help="Do not write log file; only print findings to stdout.",
     )
+    ap.add_argument(
+        "--per-day",
+        action="store_true",
+        help="Legacy mode: run_eod() per calendar day (one Oracle query per day).",
+    )
     args = ap.parse_args()
 
     engine = build_engine()
 
     scan_started = datetime.now().isoformat(timespec="seconds")
-    header = f"[SCAN_START] {scan_started} range={START_DATE.isoformat()}..{END_DATE.isoformat()}"
-    if args.dry_run:
-        print(header)
-    else:
-        append_log(header)
+
+    def emit(msg: str) -> None:
+        if args.dry_run:
+            print(msg)
+        else:
+            append_log(msg)
+
+    emit(f"[SCAN_START] {scan_started} range={START_DATE.isoformat()}..{END_DATE.isoformat()}")
 
     hit_count = 0
     skip_count = 0
 
-    for d in daterange(START_DATE, END_DATE):
-        td = d.isoformat()
-        try:
-            engine.run_eod(td)
-        except Exception as e:
-            skip_count += 1
-            msg = f"[SKIP] {td} {type(e).__name__}: {e}"
-            if args.dry_run:
-                print(msg)
-            else:
-                append_log(msg)
-            continue
-
-        syms = _get_newly_triggered_symbols(td)
-        if syms:
-            hit_count += 1
-            ts = datetime.now().isoformat(timespec="seconds")
-            msg = f"[HIT] {ts} trade_date={td} symbols={','.join(syms)}"
-            if args.dry_run:
-                print(msg)
-            else:
-                append_log(msg)
-
-    tail = f"[SCAN_END] {datetime.now().isoformat(timespec='seconds')} hits={hit_count} skips={skip_count}"
-    if args.dry_run:
-        print(tail)
+    if args.per_day:
+        for d in daterange(START_DATE, END_DATE):
+            td = d.isoformat()
+            try:
+                engine.run_eod(td)
+            except Exception as e:
+                skip_count += 1
+                emit(f"[SKIP] {td} {type(e).__name__}: {e}")
+                continue
+
+            syms = _get_newly_triggered_symbols(td)
+            if syms:
+                hit_count += 1
+                ts = datetime.now().isoformat(timespec="seconds")
+                emit(f"[HIT] {ts} trade_date={td} symbols={','.join(syms)}")
     else:
-        append_log(tail)
+        for r in engine.run_eod_range(START_DATE.isoformat(), END_DATE.isoformat()):
+            if r.error:
+                skip_count += 1
+                emit(f"[SKIP] {r.trade_date} {r.error}")
+                continue
+            if r.newly_triggered:
+                hit_count += 1
+                ts = datetime.now().isoformat(timespec="seconds")
+                emit(f"[HIT] {ts} trade_date={r.trade_date} symbols={','.join(r.newly_triggered)}")
+
+    emit(f"[SCAN_END] {datetime.now().isoformat(timespec='seconds')} hits={hit_count} skips={skip_count}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+tools/sync_duckdb_mirror.py
+
+Incremental MySQL -> Parquet sync of the market tables read by the duckdb provider
+(db.type: duckdb). Layout: <root>/<TABLE>/year=YYYY/month=MM/part.parquet.
+
+Without --since, each dated table resumes from the month of its last mirrored date
+(that month is re-exported, so a partially mirrored month is completed); the universe
+table is rewritten in full. MySQL connection settings come from db.mysql / MYSQL_* env.
+
+Usage:
+    python tools/sync_duckdb_mirror.py
+    python tools/sync_duckdb_mirror.py --since 2023-01-01 --tables stock_daily,index_daily
+    python tools/sync_duckdb_mirror.py --root D:/mirror/cn_market
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure repo root on sys.path
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core.adapters.providers.db_provider_duckdb_market import (  # noqa: E402
+    DEFAULT_MIRROR_ROOT,
+    MIRROR_DATE_COLUMNS,
+    sync_mirror,
+)
+from core.adapters.providers.db_provider_mysql_market import DBMySQLMarketProvider  # noqa: E402
+from core.utils.config_loader import load_config  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--root", default=None, help=f"mirror root (default: db.duckdb.root or {DEFAULT_MIRROR_ROOT})")
+    ap.add_argument("--tables", default="", help="comma list of: " + ",".join(MIRROR_DATE_COLUMNS))
+    ap.add_argument("--since", default=None, help="YYYY-MM-DD: re-export from this date (default: resume)")
+    ap.add_argument("--until", default=None, help="YYYY-MM-DD: last date to export")
+    args = ap.parse_args()
+
+    duck_cfg = (load_config().get("db", {}) or {}).get("duckdb", {}) or {}
+    root = args.root or str(duck_cfg.get("root", DEFAULT_MIRROR_ROOT))
+    only = [t.strip() for t in args.tables.split(",") if t.strip()] or None
+
+    src = DBMySQLMarketProvider()
+    if src.mysql_engine is None:
+        print("[DUCKDB_MIRROR] mysql engine not available")
+        return 2
+
+    stats = sync_mirror(src.mysql_engine, src.tables, root, only=only, since=args.since, until=args.until)
+    for s in stats:
+        print(f"[DUCKDB_MIRROR] root={root} {s}")
+    return 1 if any("error" in s for s in stats) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())